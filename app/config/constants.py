@@ -117,8 +117,9 @@ class Timeouts:
     QUEUE_GET_TIMEOUT: float = 1.0  # Queue get operation timeout
 
     # API/Network timeouts
-    EVENT_HANDLER_TIMEOUT: float = 5.0  # Event handler execution timeout
+    EVENTSUB_DISPATCH_TIMEOUT: float = 120.0  # Inbox dispatch of one EventSub event
     IMAGE_SYNC_QUEUE_TIMEOUT: float = 5.0  # Image sync queue timeout
+    WEBSOCKET_SEND_TIMEOUT: float = 10.0  # Single WebSocket frame write timeout
 
     # Subprocess timeouts
     FFMPEG_VERSION_CHECK: int = 5  # FFmpeg version check timeout
@@ -141,15 +142,21 @@ class CacheConfig:
     # Cache sizes
     DEFAULT_CACHE_SIZE: int = 1000  # Default cache max size
     SMALL_CACHE_SIZE: int = 500  # Small cache max size
+    FILE_STAT_INDEX_SIZE: int = 20000  # Recording file-stat index entries
 
     # TTL values (in seconds)
     EVENT_DEDUPLICATION_TTL: int = 600  # Event deduplication TTL (10 minutes, covers the webhook's 600s replay-acceptance window)
     NOTIFICATION_DEBOUNCE_TTL: int = 300  # Notification debounce TTL (5 minutes)
     BROADCAST_DEBOUNCE_TTL: int = 60  # WebSocket broadcast debounce TTL (1 minute)
     IMAGE_CACHE_TTL: int = 3600  # Image cache TTL (1 hour)
+    MISSING_IMAGE_TTL: int = 300  # Categories known to have no image (5 minutes)
     CONFIG_CACHE_TTL: int = 300  # Configuration cache TTL (5 minutes)
     SHORT_CACHE_TTL: int = 2  # Short-lived cache TTL
+    STREAMER_SNAPSHOT_TTL: int = 10  # Streamer list snapshot (event-invalidated)
     FALLBACK_CACHE_TTL: int = 300  # Fallback cache TTL (5 minutes)
+    PROCESSING_STATE_CACHE_TTL: int = 900  # Post-processing state view (15 minutes)
+    SESSION_VALIDATION_CACHE_TTL: int = 60  # Validated auth sessions (1 minute)
+    FILE_STAT_INDEX_TTL: int = 600  # Recording file-stat index (10 minutes)
 
 
 # ============================================================================
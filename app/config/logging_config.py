@@ -56,10 +56,13 @@ def setup_logging():
             "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
         )
 
+    # Handlers run in a listener thread; the logging call only enqueues
+    from app.services.system.log_writer import queue_handlers
+
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    handlers = [console_handler]
 
     # Ensure log directories exist - use environment variable or fallback
     logs_base = (
@@ -87,15 +90,15 @@ def setup_logging():
         # Set the suffix for rotated files (will be streamvault.log.2025-09-17)
         rotating_handler.suffix = "%Y-%m-%d"
 
-        logger.addHandler(rotating_handler)
+        handlers.append(rotating_handler)
+        queue_handlers(logger, *handlers)
 
         # Verify handler was added successfully
         logger.info(f"📝 TimedRotatingFileHandler configured for: {log_file_path}")
 
     except Exception as e:
         # If handler creation fails, log to console only
-        console_handler.setFormatter(formatter)
-        logger.addHandler(console_handler)
+        queue_handlers(logger, console_handler)
         logger.error(
             f"❌ Failed to create TimedRotatingFileHandler for {log_file_path}: {e}"
         )
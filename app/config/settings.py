@@ -188,6 +188,10 @@ class Settings(BaseSettings):
     HSTS_MAX_AGE: int = 31536000  # 1 year
     CONTENT_SECURITY_POLICY: Optional[str] = None
 
+    # Event-loop stall detector (diagnostics, off by default)
+    LOOP_MONITOR_ENABLED: bool = False
+    LOOP_MONITOR_STALL_MS: int = 100
+
     @property
     def allowed_origins(self) -> List[str]:
         """
@@ -0,0 +1,284 @@
+"""
+Durable EventSub inbox with asynchronous, per-broadcaster ordered dispatch.
+
+The webhook callback only verifies the signature, stores the notification
+in the ``eventsub_inbox`` table and returns 204. Dispatch to the
+EventHandlerRegistry handlers happens here:
+
+- one worker per broadcaster, so online/update/offline for a channel are
+  handled in the order Twitch delivered them
+- a global semaphore bounds how many handlers run at once when many
+  channels go live at the top of the hour
+- failed handlers are retried a few times, then the row is marked failed
+- rows still pending at startup (crash/restart between ACK and handling)
+  are replayed
+"""
+
+import asyncio
+import json
+import logging
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Deque, Dict, List, Optional
+
+from sqlalchemy.exc import IntegrityError
+
+from app.config.constants import TIMEOUTS
+from app.database import SessionLocal
+from app.models import EventSubInboxMessage
+
+logger = logging.getLogger("streamvault")
+
+# Handlers running at the same time across all broadcasters
+MAX_CONCURRENT_DISPATCHES = 8
+
+MAX_DISPATCH_ATTEMPTS = 3
+RETRY_DELAY_SECONDS = 5.0
+
+# Pending events older than this are not replayed (the stream state they
+# describe is long gone; recovery/live checks handle that case)
+MAX_REPLAY_AGE = timedelta(hours=6)
+
+# Handled rows are kept this long for debugging, then pruned on startup
+RETENTION = timedelta(days=7)
+
+
+@dataclass
+class InboxMessage:
+    """A stored notification waiting for dispatch"""
+
+    id: int
+    message_id: str
+    event_type: str
+    broadcaster_user_id: Optional[str]
+    event: Dict[str, Any]
+    attempts: int = 0
+
+
+class EventSubInbox:
+    """Persists EventSub notifications and dispatches them in the background"""
+
+    def __init__(self, max_concurrency: int = MAX_CONCURRENT_DISPATCHES):
+        self._registry = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._queues: Dict[str, Deque[InboxMessage]] = {}
+        self._workers: Dict[str, asyncio.Task] = {}
+        self._running = False
+
+    @property
+    def is_running(self) -> bool:
+        return self._running
+
+    async def start(self, event_registry) -> int:
+        """Start dispatching to ``event_registry.handlers``; replay pending rows"""
+        self._registry = event_registry
+        self._running = True
+
+        pending = await asyncio.to_thread(self._load_pending)
+        for message in pending:
+            self._enqueue(message)
+        if pending:
+            logger.info(f"📥 Replaying {len(pending)} pending EventSub notifications")
+
+        try:
+            await asyncio.to_thread(self._prune)
+        except Exception as e:
+            logger.warning(f"Could not prune EventSub inbox: {e}")
+        return len(pending)
+
+    async def stop(self) -> None:
+        """Stop workers; unfinished messages stay pending for the next start"""
+        self._running = False
+        workers = list(self._workers.values())
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        self._workers.clear()
+        self._queues.clear()
+
+    async def accept(
+        self, message_id: str, event_type: str, event: Dict[str, Any]
+    ) -> bool:
+        """Store a verified notification and queue it for dispatch.
+
+        Returns False if the message is already in the inbox (Twitch retry).
+        Raises if the message could not be stored; the caller must not ACK.
+        """
+        message = await asyncio.to_thread(self._persist, message_id, event_type, event)
+        if message is None:
+            return False
+
+        if self._running:
+            self._enqueue(message)
+        else:
+            logger.warning(
+                f"EventSub inbox not running, {event_type} ({message_id}) will be "
+                "dispatched on next start"
+            )
+        return True
+
+    def _enqueue(self, message: InboxMessage) -> None:
+        key = message.broadcaster_user_id or ""
+        self._queues.setdefault(key, deque()).append(message)
+        if key not in self._workers:
+            self._workers[key] = asyncio.create_task(self._drain(key))
+
+    async def _drain(self, key: str) -> None:
+        """Dispatch one broadcaster's messages in arrival order"""
+        queue = self._queues[key]
+        try:
+            while queue:
+                await self._dispatch(queue[0])
+                queue.popleft()
+        finally:
+            self._workers.pop(key, None)
+            if not queue:
+                self._queues.pop(key, None)
+
+    async def _dispatch(self, message: InboxMessage) -> None:
+        handler = self._registry.handlers.get(message.event_type)
+        if handler is None:
+            logger.warning(f"No handler found for event type: {message.event_type}.")
+            await self._mark(message, "failed", error="no handler")
+            return
+
+        while True:
+            message.attempts += 1
+            try:
+                async with self._semaphore:
+                    await asyncio.wait_for(
+                        handler(message.event),
+                        timeout=TIMEOUTS.EVENTSUB_DISPATCH_TIMEOUT,
+                    )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                error = str(e) or type(e).__name__
+                logger.error(
+                    f"Error in event handler for {message.event_type} "
+                    f"(attempt {message.attempts}/{MAX_DISPATCH_ATTEMPTS}): {error}",
+                    exc_info=not isinstance(e, asyncio.TimeoutError),
+                )
+                if message.attempts >= MAX_DISPATCH_ATTEMPTS:
+                    await self._mark(message, "failed", error=error)
+                    return
+                await self._mark(message, "pending", error=error)
+                await asyncio.sleep(RETRY_DELAY_SECONDS * message.attempts)
+            else:
+                logger.info(f"Event {message.event_type} handled successfully.")
+                await self._mark(message, "done")
+                return
+
+    async def _mark(
+        self, message: InboxMessage, status: str, error: Optional[str] = None
+    ) -> None:
+        try:
+            await asyncio.to_thread(self._update_status, message, status, error)
+        except Exception as e:
+            # The event itself was handled; at worst it is replayed once
+            logger.error(f"Could not update EventSub inbox row {message.id}: {e}")
+
+    # ----- Database helpers (blocking, run in a worker thread) -----
+
+    @staticmethod
+    def _persist(
+        message_id: str, event_type: str, event: Dict[str, Any]
+    ) -> Optional[InboxMessage]:
+        broadcaster_user_id = (event or {}).get("broadcaster_user_id")
+        with SessionLocal() as db:
+            row = EventSubInboxMessage(
+                message_id=message_id,
+                event_type=event_type,
+                broadcaster_user_id=broadcaster_user_id,
+                payload=json.dumps(event or {}),
+                status="pending",
+                attempts=0,
+            )
+            db.add(row)
+            try:
+                db.commit()
+            except IntegrityError:
+                db.rollback()
+                logger.debug(f"EventSub message {message_id} already in inbox")
+                return None
+            return InboxMessage(
+                id=row.id,
+                message_id=message_id,
+                event_type=event_type,
+                broadcaster_user_id=broadcaster_user_id,
+                event=event or {},
+            )
+
+    @staticmethod
+    def _update_status(
+        message: InboxMessage, status: str, error: Optional[str]
+    ) -> None:
+        with SessionLocal() as db:
+            row = db.get(EventSubInboxMessage, message.id)
+            if row is None:
+                return
+            row.status = status
+            row.attempts = message.attempts
+            row.last_error = error
+            if status != "pending":
+                row.processed_at = datetime.now(timezone.utc)
+            db.commit()
+
+    @staticmethod
+    def _load_pending() -> List[InboxMessage]:
+        cutoff = datetime.now(timezone.utc) - MAX_REPLAY_AGE
+        messages = []
+        with SessionLocal() as db:
+            rows = (
+                db.query(EventSubInboxMessage)
+                .filter(EventSubInboxMessage.status == "pending")
+                .order_by(EventSubInboxMessage.id)
+                .all()
+            )
+            for row in rows:
+                received_at = row.received_at
+                if received_at and received_at.tzinfo is None:
+                    received_at = received_at.replace(tzinfo=timezone.utc)
+                if received_at and received_at < cutoff:
+                    row.status = "expired"
+                    row.processed_at = datetime.now(timezone.utc)
+                    continue
+                try:
+                    event = json.loads(row.payload)
+                except (TypeError, ValueError):
+                    row.status = "failed"
+                    row.last_error = "invalid payload"
+                    continue
+                messages.append(
+                    InboxMessage(
+                        id=row.id,
+                        message_id=row.message_id,
+                        event_type=row.event_type,
+                        broadcaster_user_id=row.broadcaster_user_id,
+                        event=event,
+                        attempts=row.attempts or 0,
+                    )
+                )
+            db.commit()
+        return messages
+
+    @staticmethod
+    def _prune() -> None:
+        cutoff = datetime.now(timezone.utc) - RETENTION
+        with SessionLocal() as db:
+            deleted = (
+                db.query(EventSubInboxMessage)
+                .filter(
+                    EventSubInboxMessage.status != "pending",
+                    EventSubInboxMessage.received_at < cutoff,
+                )
+                .delete(synchronize_session=False)
+            )
+            db.commit()
+        if deleted:
+            logger.debug(f"Pruned {deleted} handled EventSub inbox rows")
+
+
+# Global instance
+eventsub_inbox = EventSubInbox()
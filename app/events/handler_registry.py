@@ -13,6 +13,7 @@ from app.services.notification_service import NotificationService
 from app.services.recording.recording_service import RecordingService
 from app.services.recording.config_manager import ConfigManager
 from app.services.api.twitch_api import twitch_api
+from app.services.streamers.streamer_snapshot import invalidate_streamer_snapshot
 from app.models import (
     Streamer,
     Stream,
@@ -336,6 +337,7 @@ class EventHandlerRegistry:
                     streamer.is_live = True
                     streamer.last_updated = datetime.now(timezone.utc)
                     db.commit()
+                    invalidate_streamer_snapshot("stream.online")
 
                     # Send notification only via notification_service to avoid duplicates
                     logger.info(
@@ -434,6 +436,7 @@ class EventHandlerRegistry:
                         # (not available in stream.offline event)
 
                     db.commit()
+                    invalidate_streamer_snapshot("stream.offline")
 
                     # Send notification only via notification_service to avoid duplicates
                     logger.info(
@@ -593,6 +596,7 @@ class EventHandlerRegistry:
                 streamer.last_updated = datetime.now(timezone.utc)
 
                 db.commit()
+                invalidate_streamer_snapshot("channel.update")
                 logger.debug(f"Updated streamer info in database: {streamer.title}")
 
                 stream = self._resolve_event_target_stream(db, streamer.id)
@@ -53,6 +53,7 @@ from app.database import engine, SessionLocal
 from app.services.core.auth_service import AuthService
 import app.models as models
 from app.dependencies import websocket_manager, get_event_registry, get_current_user
+from app.events.eventsub_inbox import eventsub_inbox
 from app.services.images.image_sync_service import image_sync_service
 from app.middleware.error_handler import error_handler
 from app.middleware.logging import logging_middleware
@@ -172,6 +173,15 @@ async def lifespan(app: FastAPI):
 
         # Initialize EventSub
         event_registry = await get_event_registry()
+
+        # Start inbox dispatch before subscribing so replayed and new
+        # notifications are handled as soon as they arrive
+        try:
+            await eventsub_inbox.start(event_registry)
+            logger.info("✅ EventSub inbox dispatcher started")
+        except Exception as e:
+            logger.error(f"❌ Error starting EventSub inbox: {e}", exc_info=True)
+
         await event_registry.initialize_eventsub()
         logger.info("EventSub initialized successfully")
 
@@ -321,6 +331,15 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.error(f"Error starting WebSocket broadcast task: {e}", exc_info=True)
 
+        # Optional event-loop stall detector (diagnostics)
+        if settings.LOOP_MONITOR_ENABLED:
+            try:
+                from app.utils.loop_monitor import loop_monitor
+
+                await loop_monitor.start(settings.LOOP_MONITOR_STALL_MS / 1000)
+            except Exception as e:
+                logger.error(f"Error starting event-loop monitor: {e}", exc_info=True)
+
         # Start Proxy Health Check Service
         try:
             from app.services.proxy.proxy_health_service import proxy_health_service
@@ -352,6 +371,14 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("🛑 Starting application shutdown...")
 
+    # Stop EventSub dispatch so no new recordings start during shutdown;
+    # unhandled notifications stay in the inbox and are replayed on startup
+    try:
+        await eventsub_inbox.stop()
+        logger.info("✅ EventSub inbox dispatcher stopped")
+    except Exception as e:
+        logger.error(f"❌ Error stopping EventSub inbox: {e}")
+
     # Gracefully shutdown recording service first (most critical)
     if recording_service:
         try:
@@ -389,6 +416,14 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"❌ Error stopping WebSocket broadcast task: {e}")
 
+    # Stop event-loop monitor
+    try:
+        from app.utils.loop_monitor import loop_monitor
+
+        await loop_monitor.stop()
+    except Exception as e:
+        logger.error(f"❌ Error stopping event-loop monitor: {e}")
+
     # Stop Proxy Health Check Service
     try:
         logger.info("🔄 Stopping proxy health check service...")
@@ -456,6 +491,14 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.error(f"❌ Error during EventSub shutdown: {e}")
 
+    # Close the pooled Twitch API session
+    try:
+        from app.services.api.twitch_api import twitch_api
+
+        await twitch_api.close()
+    except Exception as e:
+        logger.error(f"❌ Error closing Twitch API session: {e}")
+
     # Stop image sync service
     try:
         await image_sync_service.stop_sync_worker()
@@ -463,6 +506,14 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"❌ Error stopping image sync service: {e}")
 
+    # Stop image processing workers
+    try:
+        from app.services.images.image_processing import shutdown_image_executor
+
+        shutdown_image_executor()
+    except Exception as e:
+        logger.error(f"❌ Error stopping image processing executor: {e}")
+
     # Stop recording auto-fix service (optional component; ignore if not present)
     try:
         try:
@@ -487,6 +538,10 @@ async def lifespan(app: FastAPI):
             await engine.dispose()
         else:
             engine.dispose()
+
+        from app.utils.async_db_utils import dispose_async_engine
+
+        await dispose_async_engine()
         logger.info("✅ Database connections closed")
     except Exception as e:
         logger.error(f"❌ Error disposing database engine: {e}")
@@ -873,6 +928,7 @@ async def get_websocket_connections(current_user=Depends(get_current_user)):
                         if hasattr(ws.application_state, "value")
                         else str(ws.application_state)
                     ),
+                    "outbound": websocket_manager.get_connection_stats(connection_id),
                 }
             )
 
@@ -888,11 +944,33 @@ async def get_websocket_connections(current_user=Depends(get_current_user)):
     return {
         "total_connections": len(connections),
         "unique_clients": len(clients),
+        "slow_consumer_disconnects": websocket_manager.slow_consumer_disconnects,
         "clients": list(clients.values()),
         "connections": connections,
     }
 
 
+@app.get("/admin/event-loop")
+async def get_event_loop_stalls(
+    top: int = Query(20, ge=1, le=100), current_user=Depends(get_current_user)
+):
+    """Admin endpoint with event-loop lag and the call sites that block it"""
+    from app.utils.loop_monitor import loop_monitor
+
+    return loop_monitor.get_statistics(top)
+
+
+@app.get("/admin/event-loop/metrics")
+async def get_event_loop_metrics(current_user=Depends(get_current_user)):
+    """Event-loop lag and stall metrics in Prometheus text format"""
+    from app.utils.loop_monitor import loop_monitor
+
+    return Response(
+        content=loop_monitor.render_prometheus(),
+        media_type="text/plain; version=0.0.4",
+    )
+
+
 # EventSub Routes
 
 
@@ -998,25 +1076,15 @@ async def eventsub_callback(request: Request):
                 logger.debug(f"Processing EventSub notification: {event_type}")
                 logger.debug(f"Event data: {event_data}")
 
-                handler = event_registry.handlers.get(event_type)
-                if handler:
+                if event_type in event_registry.handlers:
+                    # Store, ACK right away and dispatch in the background;
+                    # handlers can take far longer than Twitch waits
                     try:
-                        await asyncio.wait_for(
-                            handler(event_data), timeout=TIMEOUTS.EVENT_HANDLER_TIMEOUT
-                        )
-                        logger.info(f"Event {event_type} handled successfully.")
+                        await eventsub_inbox.accept(message_id, event_type, event_data)
                         return Response(status_code=204)
-                    except asyncio.TimeoutError:
-                        logger.error(f"Handler for {event_type} timed out.")
-                        event_registry.forget_message(
-                            message_id,
-                            event_type,
-                            (event_data or {}).get("broadcaster_user_id"),
-                        )
-                        return Response(status_code=500)
                     except Exception as e:
                         logger.error(
-                            f"Error in event handler for {event_type}: {e}",
+                            f"Failed to store {event_type} in EventSub inbox: {e}",
                             exc_info=True,
                         )
                         event_registry.forget_message(
@@ -1,8 +1,14 @@
 from fastapi import Request
 from fastapi.responses import RedirectResponse, JSONResponse
-from app.services.core.auth_service import AuthService
+from app.services.core.auth_service import (
+    AuthService,
+    is_session_cached,
+    session_cache,
+)
 from app.services.core.api_key_service import ApiKeyService
 from app.database import SessionLocal
+from app.utils.async_db_utils import async_session_scope
+import asyncio
 import logging
 
 logger = logging.getLogger("streamvault")
@@ -52,6 +58,13 @@ def _extract_api_key(request_or_headers) -> str | None:
     return None
 
 
+def _validate_api_key(api_key: str) -> int | None:
+    """Validate an API key with a sync session (run in a worker thread)"""
+    with SessionLocal() as db:
+        record = ApiKeyService(db=db).validate(api_key)
+        return record.id if record else None
+
+
 class AuthMiddleware:
     def __init__(self, app):
         self.app = app
@@ -79,21 +92,24 @@ class AuthMiddleware:
                 await ws.accept()
                 await ws.close(code=4001, reason="Authentication required")
                 return
-            db = SessionLocal()
+
+            # Fast path: session validated recently, no DB round-trip needed
+            if is_session_cached(session_token):
+                return await self.app(scope, receive, send)
+
             try:
-                auth_service = AuthService(db=db)
-                if not await auth_service.validate_session(session_token):
-                    logger.warning("WebSocket connection rejected: invalid session")
-                    await ws.accept()
-                    await ws.close(code=4001, reason="Invalid session")
-                    return
+                async with async_session_scope() as db:
+                    valid = await AuthService(db=db).validate_session(session_token)
             except Exception as e:
                 logger.error(f"WebSocket auth error: {e}")
                 await ws.accept()
                 await ws.close(code=4003, reason="Authentication service unavailable")
                 return
-            finally:
-                db.close()
+            if not valid:
+                logger.warning("WebSocket connection rejected: invalid session")
+                await ws.accept()
+                await ws.close(code=4001, reason="Invalid session")
+                return
             return await self.app(scope, receive, send)
 
         # Process HTTP requests
@@ -142,101 +158,96 @@ class AuthMiddleware:
         if any(request.url.path.startswith(path) for path in public_paths):
             return await self.app(scope, receive, send)
 
-        # Create per-request services
-        db = SessionLocal()
+        # Fast path: admin known and session validated recently (cookie or
+        # PWA Bearer token) - skip opening a DB session entirely
+        if session_cache.admin_exists:
+            cached_token = request.cookies.get("session")
+            if not cached_token:
+                cached_token = _extract_bearer_token(scope.get("headers", []))
+            if cached_token and is_session_cached(cached_token):
+                return await self.app(scope, receive, send)
+
+        # Decide with a short-lived async session so no pooled connection is
+        # held while the request itself runs
         try:
-            auth_service = AuthService(db=db)
-
-            admin_exists = await auth_service.admin_exists()
-
-            if not admin_exists:
-                if not request.url.path.startswith("/auth/setup"):
-                    if is_json_request:
-                        return await JSONResponse(
-                            {"error": "Setup required", "redirect": "/auth/setup"},
-                            status_code=307,
-                        )(scope, receive, send)
-                    return await RedirectResponse(url="/auth/setup", status_code=307)(
-                        scope, receive, send
-                    )
+            async with async_session_scope() as db:
+                denial = await self._check_http_auth(db, request, is_json_request)
+        except Exception as e:
+            logger.error(f"Auth middleware error for {request.url.path}: {e}")
+            # SECURITY: Fail closed when auth cannot be verified (CWE-280)
+            return await JSONResponse(
+                {"error": "Authentication service unavailable"}, status_code=503
+            )(scope, receive, send)
 
-            session_token = request.cookies.get("session")
+        if denial is not None:
+            return await denial(scope, receive, send)
+        return await self.app(scope, receive, send)
 
-            # PWA fallback: check Authorization header if no cookie
-            if not session_token:
-                auth_header = request.headers.get("authorization", "")
-                if auth_header.startswith("Bearer "):
-                    session_token = auth_header[7:]
-
-            # API-key fallback (X-API-Key or "Authorization: ApiKey <token>").
-            # Sessions/cookies always take precedence. The /api/api-keys
-            # management endpoints intentionally REJECT API-key auth because those
-            # routes re-validate that an interactive session exists, so a
-            # stolen key cannot be used to mint or revoke more keys.
-            if not session_token:
-                api_key = _extract_api_key(request)
-                if api_key:
-                    # SECURITY: Never allow API-key auth on the management
-                    # endpoints. Minting/revoking keys must require an
-                    # interactive session.
-                    if request.url.path.startswith("/api/api-keys"):
-                        logger.warning(
-                            f"Blocked API-key auth attempt on management endpoint {request.url.path}"
-                        )
-                    else:
-                        api_key_service = ApiKeyService(db=db)
-                        record = api_key_service.validate(api_key)
-                        if record:
-                            logger.debug(
-                                f"Authenticated via API key id={record.id} for {request.url.path}"
-                            )
-                            return await self.app(scope, receive, send)
-                        else:
-                            logger.warning(
-                                f"Rejected invalid API key for {request.url.path}"
-                            )
+    async def _check_http_auth(self, db, request: Request, is_json_request: bool):
+        """Return a response rejecting the request, or None to let it through"""
+        auth_service = AuthService(db=db)
 
-            if not session_token:
-                logger.debug(
-                    f"No session cookie or Bearer token for {request.url.path}"
-                )
-                if not request.url.path.startswith("/auth/login"):
-                    if is_json_request:
-                        return await JSONResponse(
-                            {
-                                "error": "Authentication required",
-                                "redirect": "/auth/login",
-                            },
-                            status_code=401,
-                        )(scope, receive, send)
-                    return await RedirectResponse(url="/auth/login", status_code=307)(
-                        scope, receive, send
+        admin_exists = await auth_service.admin_exists()
+
+        if not admin_exists:
+            if not request.url.path.startswith("/auth/setup"):
+                if is_json_request:
+                    return JSONResponse(
+                        {"error": "Setup required", "redirect": "/auth/setup"},
+                        status_code=307,
                     )
-            elif not await auth_service.validate_session(session_token):
-                logger.debug(f"Invalid session token for {request.url.path}")
-                if not request.url.path.startswith("/auth/login"):
-                    if is_json_request:
-                        return await JSONResponse(
-                            {
-                                "error": "Authentication required",
-                                "redirect": "/auth/login",
-                            },
-                            status_code=401,
-                        )(scope, receive, send)
-                    return await RedirectResponse(url="/auth/login", status_code=307)(
-                        scope, receive, send
+                return RedirectResponse(url="/auth/setup", status_code=307)
+
+        session_token = request.cookies.get("session")
+
+        # PWA fallback: check Authorization header if no cookie
+        if not session_token:
+            auth_header = request.headers.get("authorization", "")
+            if auth_header.startswith("Bearer "):
+                session_token = auth_header[7:]
+
+        # API-key fallback (X-API-Key or "Authorization: ApiKey <token>").
+        # Sessions/cookies always take precedence. The /api/api-keys
+        # management endpoints intentionally REJECT API-key auth because those
+        # routes re-validate that an interactive session exists, so a
+        # stolen key cannot be used to mint or revoke more keys.
+        if not session_token:
+            api_key = _extract_api_key(request)
+            if api_key:
+                # SECURITY: Never allow API-key auth on the management
+                # endpoints. Minting/revoking keys must require an
+                # interactive session.
+                if request.url.path.startswith("/api/api-keys"):
+                    logger.warning(
+                        f"Blocked API-key auth attempt on management endpoint {request.url.path}"
                     )
+                else:
+                    key_id = await asyncio.to_thread(_validate_api_key, api_key)
+                    if key_id is not None:
+                        logger.debug(
+                            f"Authenticated via API key id={key_id} for {request.url.path}"
+                        )
+                        return None
+                    else:
+                        logger.warning(
+                            f"Rejected invalid API key for {request.url.path}"
+                        )
 
-            return await self.app(scope, receive, send)
-        except Exception as e:
-            logger.error(f"Auth middleware error for {request.url.path}: {e}")
-            # SECURITY: Fail closed when auth cannot be verified (CWE-280)
+        if not session_token:
+            logger.debug(f"No session cookie or Bearer token for {request.url.path}")
+        elif not await auth_service.validate_session(session_token):
+            logger.debug(f"Invalid session token for {request.url.path}")
+        else:
+            return None
+
+        if not request.url.path.startswith("/auth/login"):
             if is_json_request:
-                return await JSONResponse(
-                    {"error": "Authentication service unavailable"}, status_code=503
-                )(scope, receive, send)
-            return await JSONResponse(
-                {"error": "Authentication service unavailable"}, status_code=503
-            )(scope, receive, send)
-        finally:
-            db.close()
+                return JSONResponse(
+                    {
+                        "error": "Authentication required",
+                        "redirect": "/auth/login",
+                    },
+                    status_code=401,
+                )
+            return RedirectResponse(url="/auth/login", status_code=307)
+        return None
@@ -291,6 +291,33 @@ class ApiKey(Base):
     revoked_at = Column(DateTime(timezone=True), nullable=True)
 
 
+class EventSubInboxMessage(Base):
+    """Durable inbox for verified EventSub notifications.
+
+    Webhook notifications are stored here before Twitch gets its 2xx and are
+    dispatched to the event handlers asynchronously. Rows still ``pending``
+    at startup are replayed, so a restart between ACK and handling does not
+    lose a stream.online.
+    """
+
+    __tablename__ = "eventsub_inbox"
+    __table_args__ = (
+        Index("idx_eventsub_inbox_status_id", "status", "id"),
+        {"extend_existing": True},
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    message_id = Column(String, unique=True, nullable=False)
+    event_type = Column(String, nullable=False)
+    broadcaster_user_id = Column(String, nullable=True)
+    payload = Column(Text, nullable=False)  # JSON-encoded event object
+    status = Column(String, nullable=False, default="pending")
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    received_at = Column(DateTime(timezone=True), server_default=func.now())
+    processed_at = Column(DateTime(timezone=True), nullable=True)
+
+
 class NotificationSettings(Base):
     __tablename__ = "notification_settings"
     __table_args__ = {"extend_existing": True}
@@ -451,6 +478,9 @@ class RecordingSettings(Base):
         Boolean, default=True
     )  # Use direct connection when all proxies fail
 
+    # Remux to fragmented MP4 while recording (Migration 041)
+    live_remux = Column(Boolean, nullable=False, default=False)
+
 
 class StreamerRecordingSettings(Base):
     __tablename__ = "streamer_recording_settings"
@@ -704,9 +734,10 @@ class ProxySettings(Base):
     Selection Algorithm:
     1. Filter: Only enabled=TRUE proxies
     2. Prioritize: healthy > degraded > failed (by health_status)
-    3. Sort: By priority field (ascending, 0 = highest)
-    4. Sort: By average_response_time_ms (ascending, faster = better)
-    5. Return: First match or None
+    3. Prioritize: By priority field (ascending, 0 = highest)
+    4. Pick: Weighted random by recent p50 latency and failure rate
+       (in-memory scoreboard in ProxyHealthService)
+    5. Return: Selected proxy or None
     """
 
     __tablename__ = "proxy_settings"
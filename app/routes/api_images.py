@@ -176,14 +176,16 @@ async def get_all_categories_image_info(db: Session = Depends(get_db)):
     try:
         categories = db.query(Category).all()
 
+        image_urls = unified_image_service.get_category_image_urls(
+            [category.name for category in categories]
+        )
+
         result = []
         for category in categories:
-            image_url = unified_image_service.get_category_image_url(category.name)
-
             result.append(
                 {
                     "category_name": category.name,
-                    "image_url": image_url,
+                    "image_url": image_urls.get(category.name),
                     "cached": category.name in unified_image_service._category_cache,
                 }
             )
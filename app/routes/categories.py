@@ -196,15 +196,7 @@ async def get_category_image(category_name: str):
 async def get_multiple_category_images(category_names: List[str]):
     """Get URLs for multiple category images in a single request to reduce load"""
     try:
-        results = {}
-        for category_name in category_names:
-            try:
-                image_url = unified_image_service.get_category_image_url(category_name)
-                results[category_name] = image_url
-            except Exception as e:
-                logger.warning(f"Failed to get image for {category_name}: {e}")
-                results[category_name] = None
-
+        results = unified_image_service.get_category_image_urls(category_names)
         return {"category_images": results}
     except Exception as e:
         logger.error(f"Error getting batch category images: {e}")
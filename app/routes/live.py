@@ -12,6 +12,7 @@ Endpoints:
 """
 
 import logging
+import re
 from typing import Optional
 from urllib.parse import quote
 
@@ -19,9 +20,10 @@ from fastapi import (
     APIRouter,
     HTTPException,
     Depends,
+    Query,
     Request,
 )
-from fastapi.responses import FileResponse, Response
+from fastapi.responses import Response
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
@@ -34,6 +36,8 @@ logger = logging.getLogger("streamvault")
 
 router = APIRouter(prefix="/api/live", tags=["live"])
 
+_SEGMENT_NAME_PATTERN = re.compile(r"^segment_(\d+)\.ts$")
+
 
 def _append_playback_token_to_playlist(playlist: str, token: str) -> str:
     """Append the playback token to segment URIs in a media playlist."""
@@ -197,11 +201,17 @@ async def get_stream_status(session_id: str):
 
 
 @router.get("/stream/{session_id}/playlist.m3u8")
-async def get_hls_playlist(session_id: str, token: Optional[str] = None):
+async def get_hls_playlist(
+    session_id: str,
+    token: Optional[str] = None,
+    hls_msn: Optional[int] = Query(None, alias="_HLS_msn"),
+):
     """
     Serve the HLS playlist (.m3u8) for a live stream.
 
-    This is the entry point for the video player.
+    This is the entry point for the video player. With ``_HLS_msn`` the
+    request blocks until that media sequence number is available
+    (LL-HLS blocking playlist reload).
     """
     try:
         session = live_streaming_service.get_session(session_id)
@@ -210,28 +220,34 @@ async def get_hls_playlist(session_id: str, token: Optional[str] = None):
         if not session.validate_playback_token(token):
             raise HTTPException(status_code=403, detail="Invalid live playback token")
 
-        playlist_path = session.playlist_path
-
-        # Wait a moment for playlist to be created
-        if not playlist_path.exists():
-            import asyncio
-
-            await asyncio.sleep(0.5)
-
-        if not playlist_path.exists():
+        segments = session.segments
+        if segments is None:
             raise HTTPException(
                 status_code=503, detail="Stream not ready yet, retry shortly"
             )
 
+        if hls_msn is not None and hls_msn > segments.last_sequence:
+            # Several target durations ahead is a client error per the spec
+            if hls_msn > segments.last_sequence + 2:
+                raise HTTPException(status_code=400, detail="Invalid _HLS_msn")
+            await segments.wait_for_sequence(
+                hls_msn, timeout=3 * live_streaming_service.HLS_SEGMENT_DURATION
+            )
+
         # Update access time
         session.touch()
 
-        playlist = playlist_path.read_text(encoding="utf-8")
-        playlist = _append_playback_token_to_playlist(playlist, session.playback_token)
+        # Token rewriting happens once per new segment, not on every poll
+        version = segments.version
+        if session.playlist_cache is None or session.playlist_cache[0] != version:
+            playlist = _append_playback_token_to_playlist(
+                segments.render_playlist(), session.playback_token
+            )
+            session.playlist_cache = (version, playlist)
 
         # Serve with appropriate HLS headers
         return Response(
-            content=playlist,
+            content=session.playlist_cache[1],
             media_type="application/vnd.apple.mpegurl",
             headers={
                 "Cache-Control": "no-cache",
@@ -251,11 +267,11 @@ async def get_hls_segment(
     session_id: str, segment_name: str, token: Optional[str] = None
 ):
     """
-    Serve an HLS segment (.ts file) for a live stream.
+    Serve an HLS segment (.ts) for a live stream from the in-memory ring.
 
     Args:
         session_id: The streaming session ID
-        segment_name: Segment filename (e.g., segment_000.ts)
+        segment_name: Segment filename (e.g., segment_42.ts)
     """
     try:
         session = live_streaming_service.get_session(session_id)
@@ -264,19 +280,24 @@ async def get_hls_segment(
         if not session.validate_playback_token(token):
             raise HTTPException(status_code=403, detail="Invalid live playback token")
 
-        segment_path = session.output_dir / segment_name
-
-        if not segment_path.exists():
+        match = _SEGMENT_NAME_PATTERN.match(segment_name)
+        segment = (
+            session.segments.get_segment(int(match.group(1)))
+            if match and session.segments is not None
+            else None
+        )
+        if segment is None:
             raise HTTPException(status_code=404, detail="Segment not found")
 
         # Update access time
         session.touch()
 
-        return FileResponse(
-            path=str(segment_path),
+        return Response(
+            content=segment.data,
             media_type="video/mp2t",
             headers={
-                "Cache-Control": "no-cache",
+                # Segments never change once published
+                "Cache-Control": "private, max-age=60",
                 "Access-Control-Allow-Origin": "*",
             },
         )
@@ -16,6 +16,7 @@ from pydantic import BaseModel, field_validator
 from app.database import SessionLocal
 from app.models import ProxySettings, RecordingSettings
 from app.dependencies import get_current_user
+from app.services.core.settings_snapshot import invalidate_settings_snapshot
 from app.services.proxy.proxy_health_service import proxy_health_service
 from app.utils.proxy_url_helper import (
     encode_proxy_url,
@@ -176,6 +177,7 @@ async def add_proxy(request: ProxyAddRequest, user=Depends(get_current_user)):
         db.add(new_proxy)
         db.commit()
         db.refresh(new_proxy)
+        proxy_health_service.invalidate_scoreboard()
 
         logger.info(
             f"✅ Added new proxy: {new_proxy.masked_url} (priority {new_proxy.priority})"
@@ -216,6 +218,7 @@ async def delete_proxy(proxy_id: int, user=Depends(get_current_user)):
 
         db.delete(proxy)
         db.commit()
+        proxy_health_service.invalidate_scoreboard()
 
         logger.info(f"🗑️ Deleted proxy: {masked_url} (ID: {proxy_id})")
 
@@ -249,19 +252,23 @@ async def toggle_proxy(proxy_id: int, user=Depends(get_current_user)):
         else:
             logger.info(f"⏸️ Disabled proxy: {proxy.masked_url}")
 
+        proxy_data = proxy.to_dict(mask_password=True)
         db.commit()
+        proxy_health_service.invalidate_scoreboard()
 
         # Broadcast status update
         import asyncio
 
         asyncio.create_task(
-            proxy_health_service._broadcast_proxy_status(proxy, auto_disabled=False)
+            proxy_health_service._broadcast_proxy_status(
+                proxy_data, auto_disabled=False
+            )
         )
 
         return {
             "success": True,
-            "enabled": proxy.enabled,
-            "message": f"Proxy {'enabled' if proxy.enabled else 'disabled'} successfully",
+            "enabled": proxy_data["enabled"],
+            "message": f"Proxy {'enabled' if proxy_data['enabled'] else 'disabled'} successfully",
         }
 
 
@@ -308,6 +315,7 @@ async def update_proxy_priority(
         proxy.priority = request.priority
 
         db.commit()
+        proxy_health_service.invalidate_scoreboard()
 
         logger.info(
             f"🔄 Updated proxy priority: {proxy.masked_url} - {old_priority} → {request.priority}"
@@ -452,6 +460,7 @@ async def update_proxy_config(
             settings.fallback_to_direct_connection = fallback_to_direct_connection
 
         db.commit()
+        invalidate_settings_snapshot("proxy configuration updated")
 
         logger.info("✅ Proxy configuration updated")
 
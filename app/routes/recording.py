@@ -20,6 +20,8 @@ from app.services.recording.config_manager import (
     FILENAME_PRESETS,
 )  # Import FILENAME_PRESETS from config_manager
 from app.services.system.logging_service import logging_service
+from app.services.streamers.streamer_snapshot import invalidate_streamer_snapshot
+from app.services.core.settings_snapshot import invalidate_settings_snapshot
 from app.services.unified_image_service import unified_image_service
 from app.services.communication.websocket_manager import websocket_manager
 from sqlalchemy.orm import Session, joinedload
@@ -62,6 +64,7 @@ async def get_recording_settings():
                 )
                 db.add(settings)
                 db.commit()
+                invalidate_settings_snapshot("recording settings created")
                 db.refresh(settings)
 
             # Parse the cleanup policy if it exists
@@ -90,6 +93,7 @@ async def get_recording_settings():
                 max_streams_per_streamer=getattr(
                     settings, "max_streams_per_streamer", 0
                 ),
+                live_remux=getattr(settings, "live_remux", False),
                 cleanup_policy=cleanup_policy,
             )
 
@@ -138,6 +142,10 @@ async def update_recording_settings(settings_data: RecordingSettingsSchema):
                     settings_data.max_streams_per_streamer
                 )
 
+            # Only when sent, so older clients don't switch it off
+            if "live_remux" in settings_data.model_fields_set:
+                existing_settings.live_remux = settings_data.live_remux
+
             # Update cleanup policy if provided
             if (
                 hasattr(settings_data, "cleanup_policy")
@@ -151,6 +159,7 @@ async def update_recording_settings(settings_data: RecordingSettingsSchema):
 
             # Save changes
             db.commit()
+            invalidate_settings_snapshot("recording settings updated")
             # This refreshes the instance after commit so it's bound to the session
             db.refresh(existing_settings)
 
@@ -183,6 +192,7 @@ async def update_recording_settings(settings_data: RecordingSettingsSchema):
                 max_streams_per_streamer=getattr(
                     existing_settings, "max_streams_per_streamer", 0
                 ),
+                live_remux=getattr(existing_settings, "live_remux", False),
                 cleanup_policy=cleanup_policy,
             )
     except Exception as e:
@@ -243,7 +253,10 @@ async def get_all_streamer_recording_settings():
                     )
                 )
 
+            created = bool(db.new)
             db.commit()
+            if created:
+                invalidate_settings_snapshot("streamer recording settings created")
             return result
     except Exception as e:
         logger.error(f"Error fetching streamer recording settings: {e}", exc_info=True)
@@ -554,6 +567,8 @@ async def update_streamer_recording_settings(
             )
 
         db.commit()
+        invalidate_settings_snapshot("streamer recording settings updated")
+        invalidate_streamer_snapshot("recording settings updated")
         # Return updated settings with streamer info
         try:
             cleanup_policy = None
@@ -800,6 +815,7 @@ async def update_streamer_cleanup_policy(
                 streamer_settings.cleanup_policy = json.dumps(policy_schema.dict())
 
         db.commit()
+        invalidate_settings_snapshot("streamer cleanup policy updated")
 
         return {"status": "success", "message": "Cleanup policy updated successfully"}
     except HTTPException:
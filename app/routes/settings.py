@@ -12,6 +12,7 @@ import logging
 from datetime import datetime, timezone
 from typing import List
 from app.services.notification_service import NotificationService
+from app.services.core.settings_snapshot import invalidate_settings_snapshot
 from app.services.unified_image_service import unified_image_service
 
 logger = logging.getLogger("streamvault")
@@ -50,6 +51,7 @@ async def get_settings():
             settings = GlobalSettings()
             db.add(settings)
             db.commit()
+            invalidate_settings_snapshot("global settings created")
         return GlobalSettingsSchema(
             notification_url=settings.notification_url,
             notifications_enabled=settings.notifications_enabled,
@@ -357,6 +359,7 @@ async def update_settings(settings_data: GlobalSettingsSchema):
             settings.https_proxy = settings_data.https_proxy or ""
 
             db.commit()
+            invalidate_settings_snapshot("global settings updated")
 
             notification_service = NotificationService()
             notification_service._initialize_apprise()
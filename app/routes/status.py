@@ -23,6 +23,7 @@ from app.models import (
     StreamEvent,
 )
 from app.services.background_queue_service import background_queue_service
+from app.services.system.log_writer import get_logging_stats
 from app.services.unified_image_service import unified_image_service
 
 router = APIRouter(prefix="/status", tags=["status"])
@@ -126,6 +127,7 @@ async def get_system_status() -> Dict[str, Any]:
                     "timestamp": datetime.utcnow().isoformat(),
                 },
                 "background_queue": queue_stats,
+                "logging": get_logging_stats(),
             }
 
     except Exception as e:
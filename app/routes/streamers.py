@@ -2,8 +2,13 @@ from typing import List, Dict, Any
 from datetime import datetime, timezone
 import os
 from fastapi import APIRouter, Depends, HTTPException, Body
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from app.services.streamer_service import StreamerService
+from app.services.core.settings_snapshot import invalidate_settings_snapshot
+from app.services.streamers.streamer_snapshot import (
+    invalidate_streamer_snapshot,
+    streamer_snapshot_cache,
+)
 from app.services.unified_image_service import unified_image_service
 from app.services.communication.websocket_manager import (
     websocket_manager,
@@ -29,6 +34,7 @@ from pathlib import Path
 import json
 import re
 from app.utils import async_file
+from app.utils.file_stat_index import file_stat_index
 
 logger = logging.getLogger("streamvault")
 
@@ -46,6 +52,7 @@ async def delete_files_async(files_to_delete: list) -> tuple[list, int]:
             path_obj = Path(file_path)
             if await async_file.path_exists(path_obj):
                 await async_file.path_unlink(path_obj)
+                file_stat_index.invalidate(str(path_obj))
                 deleted_files.append(str(path_obj))
                 logger.info(f"Deleted file: {path_obj}")
 
@@ -244,7 +251,16 @@ async def get_streamers(
     """Get all streamers with their current status
 
     Returns a dictionary with 'streamers' key for frontend compatibility.
+    The rendered list is served from a short-lived snapshot that is
+    invalidated on stream online/offline, recording start/stop and edits.
     """
+    body = await streamer_snapshot_cache.get_or_build(
+        lambda: _render_streamers_list(streamer_service)
+    )
+    return Response(content=body, media_type="application/json")
+
+
+async def _render_streamers_list(streamer_service: StreamerService) -> bytes:
     streamers = await streamer_service.get_streamers()
 
     # Convert StreamerResponse objects to dictionaries for the response
@@ -293,7 +309,7 @@ async def get_streamers(
         )
 
     # Return in the format expected by frontend
-    return {"streamers": streamers_data}
+    return JSONResponse({"streamers": streamers_data}).body
 
 
 @router.delete("/subscriptions", status_code=200)
@@ -561,6 +577,8 @@ async def add_streamer(
                 ]
 
             db.commit()
+            invalidate_streamer_snapshot("recording settings updated")
+            invalidate_settings_snapshot("streamer recording settings updated")
             logger.info(
                 f"Set recording settings for streamer {new_streamer.username}: enabled={recording_enabled}"
             )
@@ -1094,6 +1112,8 @@ async def update_streamer_settings(
 
         db.commit()
         db.refresh(recording_settings)
+        invalidate_streamer_snapshot("recording settings updated")
+        invalidate_settings_snapshot("streamer recording settings updated")
 
         # Return updated settings
         return {
@@ -1,16 +1,21 @@
-from fastapi import APIRouter, HTTPException, Request, Depends, Query
-from fastapi.responses import StreamingResponse, FileResponse, JSONResponse
+from fastapi import APIRouter, HTTPException, Request, Response, Depends, Query
+from fastapi.responses import FileResponse, JSONResponse, RedirectResponse
+import asyncio
+import base64
 import os
 import urllib.parse
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 import logging
 from pathlib import Path
 import mimetypes
 import re
 from secrets import token_urlsafe
 from datetime import datetime, timezone
+from sqlalchemy import and_, exists, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.database import get_db
+from app.utils.async_db_utils import get_async_db
 from app.models import Stream, Streamer, Recording, ActiveRecordingState
 from app.utils.security_enhanced import (
     safe_file_access,
@@ -23,12 +28,19 @@ from app.utils.security import (
     ALLOWED_VIDEO_EXTENSIONS,
 )
 from app.utils.streamer_cache import get_valid_streamers
+from app.utils.file_stat_index import FileStat, file_stat_index
+from app.utils.range_response import RecordingFileResponse
 from app.utils.token_store import (
     store_share_token,
     validate_share_token,
     cleanup_expired_tokens,
 )
 from app.services.core.auth_service import AuthService
+from app.services.media.segment_playlist_service import (
+    SEGMENT_PART_PATTERN,
+    is_segment_directory,
+    segment_playlist_service,
+)
 
 logger = logging.getLogger("streamvault")
 
@@ -154,26 +166,17 @@ def parse_ffmpeg_chapters(ffmpeg_content: str) -> list:
     return chapters
 
 
-def get_video_thumbnail_url(stream_id: int, recording_path: str) -> Optional[str]:
+async def get_video_thumbnail_url(
+    stream_id: int, recording_path: str
+) -> Optional[str]:
     """Get the correct thumbnail URL for a video"""
     try:
-        recording_path_obj = Path(recording_path)
-        base_filename = recording_path_obj.stem
-        video_dir = recording_path_obj.parent
-
-        # Priority order for thumbnail files:
-        # 1. {base_filename}-thumb.jpg (Plex format, usually correct)
-        # 2. {base_filename}_thumbnail.jpg (fallback)
-
-        thumbnail_candidates = [
-            video_dir / f"{base_filename}-thumb.jpg",
-            video_dir / f"{base_filename}_thumbnail.jpg",
-        ]
-
-        for thumbnail_path in thumbnail_candidates:
-            if thumbnail_path.exists() and thumbnail_path.is_file():
-                # Return relative URL for API access
-                return f"/api/videos/{stream_id}/thumbnail"
+        # Candidates (-thumb.jpg, then _thumbnail.jpg) are resolved by the
+        # index; a miss is probed off the event loop
+        stat = (await file_stat_index.lookup_many([recording_path]))[recording_path]
+        if stat.thumbnail_path:
+            # Return relative URL for API access
+            return f"/api/videos/{stream_id}/thumbnail"
 
         return None
     except Exception as e:
@@ -212,254 +215,331 @@ def is_video_file(filename: str) -> bool:
     return Path(filename).suffix.lower() in video_extensions
 
 
-@router.get("/videos")
-async def get_videos(request: Request, db: Session = Depends(get_db)):
-    """Get all videos from database with file verification"""
-    # Check authentication via session cookie
-    session_token = request.cookies.get("session")
-    if not session_token:
-        raise HTTPException(status_code=401, detail="Authentication required")
+def _encode_video_cursor(started_at: Optional[datetime], stream_id: int) -> str:
+    """Encode a (started_at, stream id) position as an opaque cursor"""
+    started = started_at.isoformat() if started_at else ""
+    raw = f"{started}|{stream_id}".encode("ascii")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
 
-    # Validate session
-    auth_service = AuthService(db)
-    if not await auth_service.validate_session(session_token):
-        raise HTTPException(status_code=401, detail="Invalid session")
-
-    videos = []
 
+def _decode_video_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
     try:
-        # Strategy 1: Get videos from streams that have recording_path set
-        streams_with_paths = (
-            db.query(Stream, Streamer)
-            .join(Streamer, Stream.streamer_id == Streamer.id)
-            .filter(Stream.recording_path.isnot(None), Stream.recording_path != "")
-            .order_by(Stream.started_at.desc())
-            .all()
-        )
-
-        logger.debug(f"Found {len(streams_with_paths)} streams with recording paths")
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("ascii")
+        started, stream_id = raw.rsplit("|", 1)
+        return (datetime.fromisoformat(started) if started else None), int(stream_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
 
-        for stream, streamer in streams_with_paths:
-            try:
-                recording_path = Path(stream.recording_path)
 
-                if recording_path.exists() and recording_path.is_file():
-                    file_stats = recording_path.stat()
+def _after_video_cursor(position: Tuple[Optional[datetime], int]):
+    """Keyset predicate for rows after ``position`` in newest-first order.
 
-                    duration = None
-                    if stream.started_at and stream.ended_at:
-                        duration = (stream.ended_at - stream.started_at).total_seconds()
+    Streams without a start time sort last (ordered by id among themselves).
+    """
+    started, stream_id = position
+    if started is None:
+        return and_(Stream.started_at.is_(None), Stream.id < stream_id)
+    return or_(
+        Stream.started_at < started,
+        and_(Stream.started_at == started, Stream.id < stream_id),
+        Stream.started_at.is_(None),
+    )
 
-                    # Get thumbnail URL with null fallback
-                    thumbnail_url = get_video_thumbnail_url(
-                        stream.id, str(recording_path)
-                    )
 
-                    video_info = {
-                        "id": stream.id,
-                        "title": stream.title or f"Stream {stream.id}",
-                        "streamer_name": streamer.username,
-                        "streamer_id": streamer.id,
-                        "file_path": str(recording_path),
-                        "file_size": file_stats.st_size,
-                        "created_at": stream.started_at.isoformat()
-                        if stream.started_at
-                        else None,
-                        "started_at": stream.started_at.isoformat()
-                        if stream.started_at
-                        else None,
-                        "ended_at": stream.ended_at.isoformat()
-                        if stream.ended_at
-                        else None,
-                        "duration": duration,
-                        "category_name": stream.category_name,
-                        "language": stream.language,
-                        "thumbnail_url": thumbnail_url,  # Always included (null if not found)
-                        "has_thumbnail": thumbnail_url
-                        is not None,  # Explicit flag for frontend
-                    }
-                    videos.append(video_info)
-                    logger.debug(
-                        f"Added video from stream: {stream.title} by {streamer.username}"
-                    )
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
 
-            except Exception as e:
-                logger.error(f"Error processing stream {stream.id}: {e}")
-                continue
 
-        # Strategy 2: Get videos from recordings that have valid files but no recording_path in stream
-        recordings_with_files = (
-            db.query(Recording, Stream, Streamer)
-            .join(Stream, Recording.stream_id == Stream.id)
-            .join(Streamer, Stream.streamer_id == Streamer.id)
-            .filter(
-                Recording.path.isnot(None),
-                Recording.path != "",
-                Recording.status.in_(["completed", "post_processing"]),
-            )
-            .order_by(Recording.start_time.desc())
-            .all()
-        )
+def _video_info(
+    stream: Stream,
+    streamer: Streamer,
+    file_path: Optional[str],
+    stat: Optional[FileStat],
+    started: Optional[datetime],
+    ended: Optional[datetime],
+    duration: Optional[float],
+) -> Dict[str, Any]:
+    thumbnail_url = (
+        f"/api/videos/{stream.id}/thumbnail"
+        if stat is not None and stat.thumbnail_path
+        else None
+    )
+    return {
+        "id": stream.id,
+        "title": stream.title or f"Stream {stream.id}",
+        "streamer_name": streamer.username,
+        "streamer_id": streamer.id,
+        "file_path": file_path,
+        "file_size": stat.size if stat is not None and stat.exists else 0,
+        "created_at": _isoformat(started),
+        "started_at": _isoformat(started),
+        "ended_at": _isoformat(ended),
+        "duration": duration,
+        "category_name": stream.category_name,
+        "language": stream.language,
+        "thumbnail_url": thumbnail_url,  # Always included (null if not found)
+        "has_thumbnail": thumbnail_url is not None,  # Explicit flag for frontend
+    }
 
-        logger.debug(f"Found {len(recordings_with_files)} recordings with file paths")
 
-        # Keep track of streams we've already added to avoid duplicates
-        added_stream_ids = {video["id"] for video in videos}
+def _resolve_video(
+    entry: Dict[str, Any], stats: Dict[str, FileStat]
+) -> Optional[Dict[str, Any]]:
+    """Pick the first usable source for a stream, in the original priority.
+
+    1. Stream.recording_path pointing at an existing file
+    2. A completed/post-processing Recording (prefer .mp4 over .ts)
+    3. A currently-active recording (surfaced with is_recording=True)
+    """
+    stream, streamer = entry["stream"], entry["streamer"]
+
+    if entry["recording_path"]:
+        stat = stats.get(entry["recording_path"])
+        if stat and stat.exists and stat.is_file:
+            duration = None
+            if stream.started_at and stream.ended_at:
+                duration = (stream.ended_at - stream.started_at).total_seconds()
+            return _video_info(
+                stream,
+                streamer,
+                entry["recording_path"],
+                stat,
+                stream.started_at,
+                stream.ended_at,
+                duration,
+            )
 
-        for recording, stream, streamer in recordings_with_files:
-            # Skip if we already added this stream
-            if stream.id in added_stream_ids:
+    for recording in entry["recordings"]:
+        recording_path = Path(recording.path)
+        for candidate in (str(recording_path.with_suffix(".mp4")), recording.path):
+            stat = stats.get(candidate)
+            if not (stat and stat.exists):
                 continue
+            # Update the stream's recording_path for future use (self-healing)
+            if not stream.recording_path:
+                stream.recording_path = candidate
+                entry["healed"] = True
+                logger.debug(
+                    f"Auto-updated recording_path for stream {stream.id}: {candidate}"
+                )
+            duration = None
+            if recording.start_time and recording.end_time:
+                duration = (recording.end_time - recording.start_time).total_seconds()
+            elif stream.started_at and stream.ended_at:
+                duration = (stream.ended_at - stream.started_at).total_seconds()
+            return _video_info(
+                stream,
+                streamer,
+                candidate,
+                stat,
+                recording.start_time or stream.started_at,
+                recording.end_time or stream.ended_at,
+                duration,
+            )
 
-            try:
-                # Try both .ts and .mp4 files
-                recording_path = Path(recording.path)
-                mp4_path = recording_path.with_suffix(".mp4")
-
-                final_path = None
-                file_stats = None
+    state = entry["active_state"]
+    if state is not None:
+        # The .ts file may still be growing, so report best-effort size and
+        # mark is_recording=True so the frontend renders a "Live recording"
+        # badge instead of a play button.
+        ts_path = state.ts_output_path or None
+        stat = stats.get(ts_path) if ts_path else None
+        if stat is not None and not stat.is_file:
+            stat = FileStat(exists=False, thumbnail_path=stat.thumbnail_path)
+        started = state.started_at or stream.started_at
+        duration = None
+        if started:
+            duration = (datetime.now(timezone.utc) - started).total_seconds()
+        video = _video_info(stream, streamer, ts_path, stat, started, None, duration)
+        video["is_recording"] = True
+        video["recording_id"] = state.recording_id
+        return video
+
+    return None
 
-                # Prefer .mp4 if it exists
-                if mp4_path.exists():
-                    final_path = mp4_path
-                    file_stats = mp4_path.stat()
-                elif recording_path.exists():
-                    final_path = recording_path
-                    file_stats = recording_path.stat()
-
-                if final_path and file_stats:
-                    # Update the stream's recording_path for future use (self-healing)
-                    if not stream.recording_path:
-                        stream.recording_path = str(final_path)
-                        logger.debug(
-                            f"Auto-updated recording_path for stream {stream.id}: {final_path}"
-                        )
-
-                    duration = None
-                    if recording.start_time and recording.end_time:
-                        duration = (
-                            recording.end_time - recording.start_time
-                        ).total_seconds()
-                    elif stream.started_at and stream.ended_at:
-                        duration = (stream.ended_at - stream.started_at).total_seconds()
 
-                    # Get thumbnail with null fallback
-                    thumbnail_url = get_video_thumbnail_url(stream.id, str(final_path))
+@router.get("/videos")
+async def get_videos(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    cursor: Optional[str] = Query(None),
+    streamer_id: Optional[int] = Query(None),
+    category: Optional[str] = Query(None),
+    start_date: Optional[datetime] = Query(None),
+    end_date: Optional[datetime] = Query(None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Get videos from database with file verification.
+
+    Results are ordered newest first and can be filtered by streamer,
+    category and start-date range. Without ``limit`` the whole list is
+    returned; with ``limit`` the response is one page and the cursor for the
+    next page is sent in the ``X-Next-Cursor`` header. The cursor is applied
+    as a keyset predicate in SQL, recordings and active states are loaded
+    only for the streams on the page, and existence, size and thumbnail data
+    come from the file-stat index.
+    """
+    # Check authentication via session cookie
+    session_token = request.cookies.get("session")
+    if not session_token:
+        raise HTTPException(status_code=401, detail="Authentication required")
 
-                    video_info = {
-                        "id": stream.id,
-                        "title": stream.title or f"Stream {stream.id}",
-                        "streamer_name": streamer.username,
-                        "streamer_id": streamer.id,
-                        "file_path": str(final_path),
-                        "file_size": file_stats.st_size,
-                        "created_at": (
-                            (recording.start_time or stream.started_at).isoformat()
-                            if (recording.start_time or stream.started_at)
-                            else None
-                        ),
-                        "started_at": (
-                            (recording.start_time or stream.started_at).isoformat()
-                            if (recording.start_time or stream.started_at)
-                            else None
-                        ),
-                        "ended_at": (
-                            (recording.end_time or stream.ended_at).isoformat()
-                            if (recording.end_time or stream.ended_at)
-                            else None
-                        ),
-                        "duration": duration,
-                        "category_name": stream.category_name,
-                        "language": stream.language,
-                        "thumbnail_url": thumbnail_url,  # Always included (null if not found)
-                        "has_thumbnail": thumbnail_url
-                        is not None,  # Explicit flag for frontend
-                    }
-                    videos.append(video_info)
-                    added_stream_ids.add(stream.id)
-                    logger.debug(
-                        f"Added video from recording: {stream.title} by {streamer.username}"
-                    )
+    # Validate session
+    auth_service = AuthService(db)
+    if not await auth_service.validate_session(session_token):
+        raise HTTPException(status_code=401, detail="Invalid session")
 
-            except Exception as e:
-                logger.error(f"Error processing recording {recording.id}: {e}")
-                continue
+    try:
+        position = _decode_video_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    def apply_filters(query):
+        if streamer_id is not None:
+            query = query.where(Stream.streamer_id == streamer_id)
+        if category:
+            query = query.where(Stream.category_name == category)
+        if start_date:
+            query = query.where(Stream.started_at >= start_date)
+        if end_date:
+            query = query.where(Stream.started_at <= end_date)
+        return query
 
-        # Strategy 3: Surface CURRENTLY-RECORDING streams so the user can see
-        # them on the videos list before the recording finishes. We pull from
-        # ActiveRecordingState (the persistence table) which is the same source
-        # the recovery loop trusts. The .ts file may still be growing, so we
-        # report best-effort size and mark is_recording=True so the frontend
-        # can render a "Live recording" badge instead of a play button.
-        try:
-            active_states = (
-                db.query(ActiveRecordingState, Stream, Streamer)
-                .join(Stream, ActiveRecordingState.stream_id == Stream.id)
-                .join(Streamer, Stream.streamer_id == Streamer.id)
-                .filter(ActiveRecordingState.status == "active")
-                .all()
-            )
+    videos = []
 
-            for state, stream, streamer in active_states:
-                if stream.id in added_stream_ids:
-                    # Already covered (e.g. a finished mp4 exists alongside the live ts).
-                    continue
-                try:
-                    ts_path = (
-                        Path(state.ts_output_path) if state.ts_output_path else None
+    try:
+        # Streams with at least one possible source: their own recording_path,
+        # a completed/post-processing Recording, or a CURRENTLY-RECORDING
+        # ActiveRecordingState (the same source the recovery loop trusts)
+        has_source = or_(
+            and_(Stream.recording_path.isnot(None), Stream.recording_path != ""),
+            exists().where(
+                Recording.stream_id == Stream.id,
+                Recording.path.isnot(None),
+                Recording.path != "",
+                Recording.status.in_(["completed", "post_processing"]),
+            ),
+            exists().where(
+                ActiveRecordingState.stream_id == Stream.id,
+                ActiveRecordingState.status == "active",
+            ),
+        )
+        base_query = apply_filters(
+            select(Stream, Streamer)
+            .join(Streamer, Stream.streamer_id == Streamer.id)
+            .where(has_source)
+        ).order_by(Stream.started_at.desc().nulls_last(), Stream.id.desc())
+
+        # Fetch limit + 1 rows per round trip; further batches are only
+        # needed when rows on the page turn out to have no file on disk
+        batch_size = limit + 1 if limit else None
+        last_stream = None
+        has_more = False
+        healed = 0
+        while True:
+            query = base_query
+            if position is not None:
+                query = query.where(_after_video_cursor(position))
+            if batch_size:
+                query = query.limit(batch_size)
+            rows = (await db.execute(query)).all()
+            if not rows:
+                break
+            position = (rows[-1][0].started_at, rows[-1][0].id)
+
+            # One entry per stream on this batch collecting every source
+            entries: Dict[int, Dict[str, Any]] = {
+                stream.id: {
+                    "stream": stream,
+                    "streamer": streamer,
+                    "recording_path": stream.recording_path or None,
+                    "recordings": [],
+                    "active_state": None,
+                    "healed": False,
+                }
+                for stream, streamer in rows
+            }
+            stream_ids = list(entries)
+
+            recordings = (
+                await db.execute(
+                    select(Recording)
+                    .where(
+                        Recording.stream_id.in_(stream_ids),
+                        Recording.path.isnot(None),
+                        Recording.path != "",
+                        Recording.status.in_(["completed", "post_processing"]),
                     )
-                    file_size = 0
-                    file_path_str = str(ts_path) if ts_path else None
-                    if ts_path and ts_path.exists() and ts_path.is_file():
-                        file_size = ts_path.stat().st_size
+                    .order_by(Recording.start_time.desc())
+                )
+            ).scalars()
+            for recording in recordings:
+                entries[recording.stream_id]["recordings"].append(recording)
 
-                    started = state.started_at or stream.started_at
-                    duration = None
-                    if started:
-                        duration = (
-                            datetime.now(timezone.utc) - started
-                        ).total_seconds()
-
-                    thumbnail_url = (
-                        get_video_thumbnail_url(stream.id, file_path_str)
-                        if file_path_str
-                        else None
+            try:
+                active_states = (
+                    await db.execute(
+                        select(ActiveRecordingState).where(
+                            ActiveRecordingState.stream_id.in_(stream_ids),
+                            ActiveRecordingState.status == "active",
+                        )
                     )
+                ).scalars()
+                for state in active_states:
+                    entries[state.stream_id]["active_state"] = state
+            except Exception as e:
+                logger.error(f"Error querying active recording states: {e}")
+
+            paths = []
+            live_paths = []
+            for entry in entries.values():
+                if entry["recording_path"]:
+                    paths.append(entry["recording_path"])
+                for recording in entry["recordings"]:
+                    paths.append(str(Path(recording.path).with_suffix(".mp4")))
+                    paths.append(recording.path)
+                state = entry["active_state"]
+                if state is not None and state.ts_output_path:
+                    live_paths.append(state.ts_output_path)
+
+            stats = await file_stat_index.lookup_many(paths)
+            if live_paths:
+                # Growing .ts files: always probe fresh (few at a time)
+                stats.update(
+                    await asyncio.to_thread(file_stat_index.refresh_many, live_paths)
+                )
 
-                    videos.append(
-                        {
-                            "id": stream.id,
-                            "title": stream.title or f"Stream {stream.id}",
-                            "streamer_name": streamer.username,
-                            "streamer_id": streamer.id,
-                            "file_path": file_path_str,
-                            "file_size": file_size,
-                            "created_at": started.isoformat() if started else None,
-                            "started_at": started.isoformat() if started else None,
-                            "ended_at": None,
-                            "duration": duration,
-                            "category_name": stream.category_name,
-                            "language": stream.language,
-                            "thumbnail_url": thumbnail_url,
-                            "has_thumbnail": thumbnail_url is not None,
-                            "is_recording": True,
-                            "recording_id": state.recording_id,
-                        }
-                    )
-                    added_stream_ids.add(stream.id)
+            for row_index, (stream, _) in enumerate(rows):
+                entry = entries[stream.id]
+                try:
+                    video = _resolve_video(entry, stats)
                 except Exception as e:
-                    logger.error(
-                        f"Error surfacing active recording {state.recording_id}: {e}"
-                    )
+                    logger.error(f"Error processing stream {stream.id}: {e}")
                     continue
-        except Exception as e:
-            logger.error(f"Error querying active recording states: {e}")
+                if entry["healed"]:
+                    healed += 1
+                if video is None:
+                    continue
+                videos.append(video)
+                last_stream = stream
+                if limit and len(videos) >= limit:
+                    has_more = row_index + 1 < len(rows) or len(rows) == batch_size
+                    break
+
+            if not batch_size or len(rows) < batch_size:
+                break
+            if len(videos) >= limit:
+                break
 
         # Commit any auto-updates to recording_path
-        if len(videos) > len(streams_with_paths):
-            db.commit()
-            logger.debug(
-                f"Auto-updated {len(videos) - len(streams_with_paths)} recording paths"
+        if healed:
+            await db.commit()
+            logger.debug(f"Auto-updated {healed} recording paths")
+
+        if limit and has_more and last_stream is not None:
+            response.headers["X-Next-Cursor"] = _encode_video_cursor(
+                last_stream.started_at, last_stream.id
             )
 
         logger.info(f"Returning {len(videos)} videos")
@@ -762,7 +842,7 @@ async def stream_video_public(
 
         # Get file info
         try:
-            file_size = file_path.stat().st_size
+            stat_result = file_path.stat()
         except OSError as e:
             logger.error(f"Error accessing file: {e}")
             raise HTTPException(status_code=500, detail="Error accessing file")
@@ -772,68 +852,13 @@ async def stream_video_public(
         if not mime_type:
             mime_type = "video/mp4"
 
-        # Handle range requests (important for seeking in VLC)
-        range_header = request.headers.get("range") if request else None
-        if range_header:
-            try:
-                range_match = re.match(r"bytes=(\d+)-(\d*)", range_header)
-                if not range_match:
-                    raise HTTPException(status_code=400, detail="Invalid range header")
-
-                start = int(range_match.group(1))
-                end = (
-                    int(range_match.group(2)) if range_match.group(2) else file_size - 1
-                )
-
-                if start >= file_size or end >= file_size or start > end:
-                    raise HTTPException(status_code=416, detail="Range not satisfiable")
-
-                chunk_size = end - start + 1
-
-                def generate_chunk():
-                    with open(str(file_path), "rb") as f:
-                        f.seek(start)
-                        remaining = chunk_size
-                        while remaining > 0:
-                            read_size = min(8192, remaining)
-                            data = f.read(read_size)
-                            if not data:
-                                break
-                            remaining -= len(data)
-                            yield data
-
-                headers = {
-                    "Content-Range": f"bytes {start}-{end}/{file_size}",
-                    "Accept-Ranges": "bytes",
-                    "Content-Length": str(chunk_size),
-                    "Content-Type": mime_type,
-                    "Cache-Control": "no-cache",
-                }
-
-                return StreamingResponse(
-                    generate_chunk(), status_code=206, headers=headers
-                )
-            except ValueError:
-                # Invalid range header, serve full file
-                pass
-
-        # No range request, stream entire file
-        def generate_file():
-            with open(str(file_path), "rb") as f:
-                while True:
-                    data = f.read(8192)
-                    if not data:
-                        break
-                    yield data
-
-        headers = {
-            "Content-Length": str(file_size),
-            "Accept-Ranges": "bytes",
-            "Content-Type": mime_type,
-            "Cache-Control": "no-cache",
-        }
-
-        return StreamingResponse(generate_file(), headers=headers)
+        # Range requests are important for seeking in VLC
+        return RecordingFileResponse(
+            file_path,
+            media_type=mime_type,
+            headers={"Cache-Control": "no-cache"},
+            stat_result=stat_result,
+        )
 
     except HTTPException:
         raise
@@ -901,26 +926,21 @@ async def stream_video_by_id(
             logger.error(f"Path validation failed for stream {stream_id}: {e.detail}")
             raise HTTPException(status_code=403, detail="Invalid file path")
 
+        file_path = Path(validated_path)
+
+        # For segmented recordings (24h+ streams), recording_path points to a
+        # directory of *_partNNN.ts files; those are played via the HLS playlist
+        if is_segment_directory(file_path):
+            logger.info(f"Redirecting segmented recording to HLS: {file_path}")
+            return RedirectResponse(
+                url=f"/api/videos/{stream_id}/hls/playlist.m3u8", status_code=307
+            )
+
         try:
             validate_file_type(validated_path, ALLOWED_VIDEO_EXTENSIONS)
         except ValueError as e:
             logger.error(f"Invalid file type for stream {stream_id}: {e}")
             raise HTTPException(status_code=400, detail="Internal server error")
-        file_path = Path(validated_path)
-
-        # Handle both regular files and segmented recordings
-        # For segmented recordings (24h+ streams), recording_path points to a directory with segments
-        is_segmented = file_path.is_dir() and file_path.name.endswith("_segments")
-
-        if is_segmented:
-            # For segmented recordings, stream the first segment or concatenated file
-            # TODO: Implement proper segment streaming or concatenation
-            logger.error(
-                f"Segmented recording streaming not yet fully supported: {file_path}"
-            )
-            raise HTTPException(
-                status_code=501, detail="Segmented recordings require special handling"
-            )
 
         # Verify file exists
         if not file_path.exists():
@@ -937,8 +957,8 @@ async def stream_video_by_id(
 
         # Get file info
         try:
-            file_size = file_path.stat().st_size
-            logger.info(f"File size: {file_size} bytes")
+            stat_result = file_path.stat()
+            logger.info(f"File size: {stat_result.st_size} bytes")
         except OSError as e:
             logger.error(f"Error accessing file stats: {e}")
             raise HTTPException(status_code=500, detail="Cannot access video file")
@@ -948,73 +968,110 @@ async def stream_video_by_id(
         if not mime_type:
             mime_type = "video/mp4"
 
-        # Handle range requests
-        range_header = request.headers.get("range")
-        if range_header:
-            # Parse range header
-            try:
-                range_match = re.match(r"bytes=(\d+)-(\d*)", range_header)
-                if not range_match:
-                    raise HTTPException(status_code=400, detail="Invalid range header")
+        # Single/multi-range, If-Range and conditional (304) requests
+        return RecordingFileResponse(
+            file_path,
+            media_type=mime_type,
+            headers={"Cache-Control": "no-cache"},
+            stat_result=stat_result,
+        )
 
-                start = int(range_match.group(1))
-                end = (
-                    int(range_match.group(2)) if range_match.group(2) else file_size - 1
-                )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error streaming video {stream_id}: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
 
-                if start >= file_size or end >= file_size or start > end:
-                    raise HTTPException(status_code=416, detail="Range not satisfiable")
-
-                chunk_size = end - start + 1
-
-                def generate_chunk():
-                    with open(str(file_path), "rb") as f:
-                        f.seek(start)
-                        remaining = chunk_size
-                        while remaining > 0:
-                            read_size = min(8192, remaining)
-                            data = f.read(read_size)
-                            if not data:
-                                break
-                            remaining -= len(data)
-                            yield data
-
-                headers = {
-                    "Content-Range": f"bytes {start}-{end}/{file_size}",
-                    "Accept-Ranges": "bytes",
-                    "Content-Length": str(chunk_size),
-                    "Content-Type": mime_type,
-                    "Cache-Control": "no-cache",
-                }
 
-                return StreamingResponse(
-                    generate_chunk(), status_code=206, headers=headers
-                )
-            except ValueError:
-                raise HTTPException(status_code=400, detail="Invalid range header")
-        else:
-            # No range request, stream entire file
-            def generate_file():
-                with open(str(file_path), "rb") as f:
-                    while True:
-                        data = f.read(8192)
-                        if not data:
-                            break
-                        yield data
-
-            headers = {
-                "Content-Length": str(file_size),
-                "Accept-Ranges": "bytes",
-                "Content-Type": mime_type,
-                "Cache-Control": "no-cache",
-            }
+async def _get_segment_directory(
+    stream_id: int, request: Request, db: Session
+) -> Tuple[Stream, Path]:
+    """Authenticate and resolve the segments directory of a stream"""
+    session_token = request.cookies.get("session")
+    if not session_token:
+        raise HTTPException(status_code=401, detail="Authentication required")
+
+    auth_service = AuthService(db)
+    if not await auth_service.validate_session(session_token):
+        raise HTTPException(status_code=401, detail="Invalid session")
+
+    stream = db.query(Stream).filter(Stream.id == stream_id).first()
+    if not stream or not stream.recording_path:
+        raise HTTPException(status_code=404, detail="Video not found")
+
+    # SECURITY: Validate path
+    try:
+        validated_path = validate_path_security(stream.recording_path, "read")
+    except HTTPException as e:
+        logger.error(f"Path validation failed for stream {stream_id}: {e.detail}")
+        raise HTTPException(status_code=403, detail="Invalid file path")
+
+    segment_dir = Path(validated_path)
+    if not is_segment_directory(segment_dir):
+        raise HTTPException(status_code=404, detail="Not a segmented recording")
+
+    return stream, segment_dir
+
+
+@router.get("/videos/{stream_id}/hls/playlist.m3u8")
+async def get_segmented_video_playlist(
+    stream_id: int, request: Request, db: Session = Depends(get_db)
+):
+    """Serve a segmented recording as one seekable HLS playlist"""
+    try:
+        stream, segment_dir = await _get_segment_directory(stream_id, request, db)
+
+        playlist = await segment_playlist_service.build_playlist(
+            segment_dir,
+            segment_url=lambda name: (
+                f"/api/videos/{stream_id}/hls/{urllib.parse.quote(name)}"
+            ),
+            # Still recording: EVENT playlist the player keeps reloading
+            is_complete=stream.ended_at is not None,
+        )
 
-            return StreamingResponse(generate_file(), headers=headers)
+        return Response(
+            content=playlist,
+            media_type="application/vnd.apple.mpegurl",
+            headers={"Cache-Control": "no-cache"},
+        )
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error streaming video {stream_id}: {e}")
+        logger.error(f"Error building HLS playlist for stream {stream_id}: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/videos/{stream_id}/hls/{segment_name}")
+async def get_segmented_video_part(
+    stream_id: int, segment_name: str, request: Request, db: Session = Depends(get_db)
+):
+    """Serve byte ranges of one part of a segmented recording"""
+    try:
+        _, segment_dir = await _get_segment_directory(stream_id, request, db)
+
+        # Only plain *_partNNN.ts names inside the segments directory
+        if Path(segment_name).name != segment_name or not (
+            SEGMENT_PART_PATTERN.search(segment_name)
+        ):
+            raise HTTPException(status_code=400, detail="Invalid segment name")
+
+        part_path = segment_dir / segment_name
+        if not part_path.is_file():
+            raise HTTPException(status_code=404, detail="Segment not found")
+
+        return RecordingFileResponse(
+            part_path,
+            media_type="video/mp2t",
+            headers={"Cache-Control": "no-cache"},
+            stat_result=part_path.stat(),
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error serving segment {segment_name} of stream {stream_id}: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
@@ -1208,7 +1265,7 @@ async def stream_video(
 
         # Get file info
         try:
-            file_size = file_path.stat().st_size
+            stat_result = file_path.stat()
         except OSError:
             raise HTTPException(status_code=500, detail="Error accessing file")
 
@@ -1216,54 +1273,12 @@ async def stream_video(
         mime_type, _ = mimetypes.guess_type(str(file_path))
         if not mime_type:
             mime_type = "video/mp4"
-        # Handle range requests
-        range_header = request.headers.get("range")
-        if range_header:
-            # Parse range header
-            try:
-                range_match = re.match(r"bytes=(\d+)-(\d*)", range_header)
-                if not range_match:
-                    raise HTTPException(status_code=400, detail="Invalid range header")
-
-                start = int(range_match.group(1))
-                end = (
-                    int(range_match.group(2)) if range_match.group(2) else file_size - 1
-                )
-
-                if start >= file_size or end >= file_size or start > end:
-                    raise HTTPException(status_code=416, detail="Range not satisfiable")
-
-                chunk_size = end - start + 1
-
-                def generate_chunk():
-                    with open(str(file_path), "rb") as f:
-                        f.seek(start)
-                        remaining = chunk_size
-                        while remaining > 0:
-                            read_size = min(8192, remaining)
-                            data = f.read(read_size)
-                            if not data:
-                                break
-                            remaining -= len(data)
-                            yield data
-
-                headers = {
-                    "Content-Range": f"bytes {start}-{end}/{file_size}",
-                    "Accept-Ranges": "bytes",
-                    "Content-Length": str(chunk_size),
-                    "Content-Type": mime_type,
-                }
-
-                return StreamingResponse(
-                    generate_chunk(), status_code=206, headers=headers
-                )
-            except Exception as e:
-                logger.error(f"Range request processing failed: {e}")
-                # Fall through to return full file
-
-        # Return full file
-        return FileResponse(
-            str(file_path), media_type=mime_type, filename=decoded_filename
+        # Full file or range request (single/multi-range, If-Range, 304)
+        return RecordingFileResponse(
+            file_path,
+            media_type=mime_type,
+            filename=decoded_filename,
+            stat_result=stat_result,
         )
 
     except HTTPException:
@@ -1419,7 +1434,7 @@ async def get_videos_by_streamer(
                         duration = (stream.ended_at - stream.started_at).total_seconds()
 
                     # Get thumbnail with null fallback
-                    thumbnail_url = get_video_thumbnail_url(
+                    thumbnail_url = await get_video_thumbnail_url(
                         stream.id, str(recording_path)
                     )
 
@@ -1518,7 +1533,7 @@ async def stream_video_by_filename(
 
         # Get file info using safe path
         try:
-            file_size = file_path.stat().st_size
+            stat_result = file_path.stat()
         except OSError:
             raise HTTPException(status_code=500, detail="Error accessing file")
 
@@ -1527,51 +1542,12 @@ async def stream_video_by_filename(
         if not mime_type:
             mime_type = "video/mp4"
 
-        # Handle range requests for video streaming
-        range_header = request.headers.get("range")
-        if range_header:
-            # Parse range header
-            try:
-                ranges = range_header.replace("bytes=", "").split("-")
-                start = int(ranges[0]) if ranges[0] else 0
-                end = int(ranges[1]) if ranges[1] else file_size - 1
-
-                # Validate range
-                if start >= file_size or end >= file_size or start > end:
-                    raise HTTPException(status_code=416, detail="Range not satisfiable")
-
-                chunk_size = end - start + 1
-
-                def generate_chunk():
-                    # Use safe path for file operations
-                    with open(str(file_path), "rb") as f:
-                        f.seek(start)
-                        remaining = chunk_size
-                        while remaining > 0:
-                            chunk = f.read(min(8192, remaining))
-                            if not chunk:
-                                break
-                            remaining -= len(chunk)
-                            yield chunk
-
-                headers = {
-                    "Content-Range": f"bytes {start}-{end}/{file_size}",
-                    "Accept-Ranges": "bytes",
-                    "Content-Length": str(chunk_size),
-                    "Content-Type": mime_type,
-                }
-
-                return StreamingResponse(
-                    generate_chunk(), status_code=206, headers=headers
-                )
-
-            except ValueError:
-                # Invalid range header, serve full file
-                pass
-
-        # Return full file using safe path
-        return FileResponse(
-            str(file_path), media_type=mime_type, filename=decoded_filename
+        # Full file or range request using safe path
+        return RecordingFileResponse(
+            file_path,
+            media_type=mime_type,
+            filename=decoded_filename,
+            stat_result=stat_result,
         )
 
     except HTTPException:
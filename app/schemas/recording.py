@@ -58,6 +58,14 @@ class RecordingSettingsSchema(BaseModel):
         default=0,
         description="Maximum number of streams to keep per streamer (0 = unlimited)",
     )
+    live_remux: bool = Field(
+        default=False,
+        description=(
+            "Remux to MP4 while recording instead of after the stream ends. "
+            "The MP4 is not rewritten at the end: its tags are taken when the "
+            "segment starts and chapters are kept in the sidecar chapter files"
+        ),
+    )
     cleanup_policy: Optional[CleanupPolicySchema] = None
 
 
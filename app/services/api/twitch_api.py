@@ -3,16 +3,190 @@ Twitch API Service for StreamVault
 
 Centralized service for making Twitch API calls. Provides methods for getting
 user information, game data, category information, and other Twitch API interactions.
+
+All Helix calls share one pooled keep-alive session and a token bucket that
+follows the ``Ratelimit-*`` response headers. Lookups by id/login are
+coalesced: concurrent callers asking for the same or different ids within a
+short window share batched requests of up to 100 ids each.
 """
 
+import asyncio
 import logging
+import time
 import aiohttp
-from typing import Dict, Any, Optional, List
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
 from app.config.settings import settings
 from app.utils.retry_decorator import twitch_api_retry, NonRetryableError
 
 logger = logging.getLogger("streamvault")
 
+# Helix accepts at most 100 ids/logins per request and returns 100 items per page
+HELIX_MAX_IDS = 100
+
+# Upper bound for cursor pagination of open-ended queries
+HELIX_MAX_PAGES = 10
+
+# How long a lookup waits for other callers to join its batch
+HELIX_BATCH_WINDOW = 0.02
+
+# App access token budget (points per minute) until headers say otherwise
+HELIX_DEFAULT_RATE_LIMIT = 800
+
+
+def _chunks(items: List[str], size: int = HELIX_MAX_IDS) -> Iterator[List[str]]:
+    for index in range(0, len(items), size):
+        yield items[index : index + size]
+
+
+class HelixRateLimiter:
+    """Token bucket fed by Helix ``Ratelimit-Limit/Remaining/Reset`` headers"""
+
+    def __init__(self, limit: int = HELIX_DEFAULT_RATE_LIMIT, window: float = 60.0):
+        self.limit = limit
+        self.window = window
+        self.tokens = float(limit)
+        self._updated = time.monotonic()
+        self._reset_at: Optional[float] = None  # Unix time the bucket refills
+        # After a 429 nothing is sent until the server-side reset
+        self._held = False
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        if not self._held:
+            self.tokens = min(
+                self.limit,
+                self.tokens + (now - self._updated) * self.limit / self.window,
+            )
+        self._updated = now
+        if self._reset_at is not None and time.time() >= self._reset_at:
+            self.tokens = float(self.limit)
+            self._reset_at = None
+            self._held = False
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent"""
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) * self.window / self.limit
+                if self._reset_at is not None:
+                    until_reset = max(0.0, self._reset_at - time.time())
+                    wait = until_reset if self._held else min(wait, until_reset)
+                logger.debug(f"Helix rate limit reached, waiting {wait:.2f}s")
+                await asyncio.sleep(max(wait, 0.01))
+
+    def update(self, headers) -> None:
+        """Sync the bucket with the server's view after a response"""
+        try:
+            limit = headers.get("Ratelimit-Limit")
+            remaining = headers.get("Ratelimit-Remaining")
+            reset = headers.get("Ratelimit-Reset")
+            if limit:
+                self.limit = max(1, int(limit))
+            if remaining is not None:
+                self._refill()
+                self.tokens = min(self.tokens, float(remaining))
+            if reset:
+                self._reset_at = float(reset)
+        except (TypeError, ValueError):
+            pass
+
+    def hold_until_reset(self) -> None:
+        """Block requests until Ratelimit-Reset after the server sent a 429"""
+        self._refill()
+        self.tokens = 0.0
+        # Without a reset time the regular refill rate paces the retry
+        self._held = self._reset_at is not None
+
+
+class HelixBatcher:
+    """Coalesces concurrent lookups of one Helix id parameter.
+
+    Ids requested while a batch is collecting (or already in flight) share
+    its result; each flush is split into requests of HELIX_MAX_IDS ids.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[List[str]], Awaitable[List[Dict[str, Any]]]],
+        result_key: str,
+        normalize: Callable[[str], str] = str,
+        window: float = HELIX_BATCH_WINDOW,
+    ):
+        self._fetch = fetch
+        self._result_key = result_key
+        self._normalize = normalize
+        self._window = window
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._flush_scheduled = False
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def lookup(self, ids: List[str]) -> List[Dict[str, Any]]:
+        """Items for the given ids, in request order; unknown ids are omitted"""
+        loop = asyncio.get_running_loop()
+        futures = []
+        for key in dict.fromkeys(self._normalize(item) for item in ids if item):
+            future = self._inflight.get(key) or self._pending.get(key)
+            if future is None:
+                future = loop.create_future()
+                self._pending[key] = future
+            futures.append(future)
+
+        if self._pending and not self._flush_scheduled:
+            self._flush_scheduled = True
+            loop.call_later(self._window, self._flush)
+
+        # Shielded: a cancelled caller must not cancel lookups shared with others
+        results = await asyncio.gather(*(asyncio.shield(f) for f in futures))
+        return [item for item in results if item is not None]
+
+    def _flush(self) -> None:
+        self._flush_scheduled = False
+        batch, self._pending = self._pending, {}
+        self._inflight.update(batch)
+        for chunk in _chunks(list(batch)):
+            task = asyncio.create_task(self._run(chunk, batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, chunk: List[str], batch: Dict[str, asyncio.Future]) -> None:
+        try:
+            items = await self._fetch(chunk)
+        except Exception as e:
+            for key in chunk:
+                future = batch[key]
+                if not future.done():
+                    future.set_exception(e)
+                    # Avoid "exception never retrieved" if every caller is gone
+                    future.exception()
+        else:
+            found = {
+                self._normalize(str(item.get(self._result_key))): item
+                for item in items or []
+            }
+            for key in chunk:
+                if not batch[key].done():
+                    batch[key].set_result(found.get(key))
+        finally:
+            for key in chunk:
+                if self._inflight.get(key) is batch[key]:
+                    del self._inflight[key]
+
 
 class TwitchAPIService:
     """Centralized Twitch API service"""
@@ -22,111 +196,178 @@ class TwitchAPIService:
         self.client_secret = settings.TWITCH_APP_SECRET
         self.base_url = "https://api.twitch.tv/helix"
         self._access_token = None
+        self._token_lock = asyncio.Lock()
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        self.rate_limiter = HelixRateLimiter()
+
+        self._users_by_id = HelixBatcher(self._fetch_users_by_id, "id")
+        self._users_by_login = HelixBatcher(
+            self._fetch_users_by_login, "login", normalize=str.lower
+        )
+        self._streams_by_user_id = HelixBatcher(
+            self._fetch_streams_by_user_id, "user_id"
+        )
+        self._games_by_id = HelixBatcher(self._fetch_games_by_id, "id")
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Shared keep-alive session (recreated if closed or on a new loop)"""
+        loop = asyncio.get_running_loop()
+        if (
+            self._session is None
+            or self._session.closed
+            or self._session_loop is not loop
+        ):
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=20, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=30),
+            )
+            self._session_loop = loop
+        return self._session
+
+    async def close(self) -> None:
+        """Close the pooled HTTP session"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
 
     @twitch_api_retry
     async def get_access_token(self) -> str:
         """Get or refresh Twitch access token"""
-        if not self._access_token:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    "https://id.twitch.tv/oauth2/token",
-                    params={
-                        "client_id": self.client_id,
-                        "client_secret": self.client_secret,
-                        "grant_type": "client_credentials",
-                    },
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        self._access_token = data["access_token"]
-                        logger.debug("Successfully obtained Twitch access token")
-                    elif response.status in [401, 403]:
-                        # Authentication/authorization errors should not be retried
-                        error_text = await response.text()
-                        logger.error(
-                            f"Failed to get Twitch access token: {response.status} - {error_text}"
-                        )
-                        raise NonRetryableError(
-                            f"Authentication failed: {response.status}"
-                        )
-                    else:
-                        # Network/server errors can be retried
-                        error_text = await response.text()
-                        logger.error(
-                            f"Failed to get Twitch access token: {response.status} - {error_text}"
-                        )
-                        raise ConnectionError(
-                            f"Failed to get access token: {response.status}"
-                        )
-        return self._access_token
-
-    @twitch_api_retry
-    async def get_users_by_login(self, usernames: List[str]) -> List[Dict[str, Any]]:
-        """Get user data by username(s)"""
-        if not usernames:
-            return []
-
-        token = await self.get_access_token()
-
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                f"{self.base_url}/users",
-                params={"login": usernames},
-                headers={
-                    "Client-ID": self.client_id,
-                    "Authorization": f"Bearer {token}",
+        if self._access_token:
+            return self._access_token
+
+        async with self._token_lock:
+            if self._access_token:
+                return self._access_token
+
+            session = await self._get_session()
+            async with session.post(
+                "https://id.twitch.tv/oauth2/token",
+                params={
+                    "client_id": self.client_id,
+                    "client_secret": self.client_secret,
+                    "grant_type": "client_credentials",
                 },
             ) as response:
                 if response.status == 200:
                     data = await response.json()
-                    return data.get("data", [])
-                elif response.status in [401, 403, 404]:
-                    # Client errors should not be retried
+                    self._access_token = data["access_token"]
+                    logger.debug("Successfully obtained Twitch access token")
+                elif response.status in [401, 403]:
+                    # Authentication/authorization errors should not be retried
                     error_text = await response.text()
                     logger.error(
-                        f"Failed to get users by login. Status: {response.status} - {error_text}"
+                        f"Failed to get Twitch access token: {response.status} - {error_text}"
                     )
-                    raise NonRetryableError(f"Client error: {response.status}")
+                    raise NonRetryableError(f"Authentication failed: {response.status}")
                 else:
-                    # Server errors can be retried
+                    # Network/server errors can be retried
                     error_text = await response.text()
                     logger.error(
-                        f"Failed to get users by login. Status: {response.status} - {error_text}"
+                        f"Failed to get Twitch access token: {response.status} - {error_text}"
                     )
-                    raise ConnectionError(f"Server error: {response.status}")
-
-    @twitch_api_retry
-    async def get_users_by_id(self, user_ids: List[str]) -> List[Dict[str, Any]]:
-        """Get user data by user ID(s)"""
-        if not user_ids:
-            return []
-
-        token = await self.get_access_token()
+                    raise ConnectionError(
+                        f"Failed to get access token: {response.status}"
+                    )
+        return self._access_token
 
-        async with aiohttp.ClientSession() as session:
+    async def _helix_get(
+        self,
+        path: str,
+        params: List[Tuple[str, str]],
+        access_token: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """GET a Helix endpoint through the pooled session and rate limiter.
+
+        Raises NonRetryableError on client errors and ConnectionError on
+        server errors, like the individual methods did before.
+        """
+        session = await self._get_session()
+        for attempt in range(3):
+            token = access_token or await self.get_access_token()
+            await self.rate_limiter.acquire()
             async with session.get(
-                f"{self.base_url}/users",
-                params={"id": user_ids},
+                f"{self.base_url}{path}",
+                params=params,
                 headers={
                     "Client-ID": self.client_id,
                     "Authorization": f"Bearer {token}",
                 },
             ) as response:
+                self.rate_limiter.update(response.headers)
                 if response.status == 200:
-                    data = await response.json()
-                    return data.get("data", [])
-                elif response.status in [401, 403, 404]:
-                    error_text = await response.text()
-                    logger.error(
-                        f"Failed to get users by ID. Status: {response.status} - {error_text}"
-                    )
+                    return await response.json()
+
+                error_text = await response.text()
+                if response.status == 429:
+                    # Retry only after the bucket resets on the server
+                    self.rate_limiter.hold_until_reset()
+                    logger.warning(f"Helix rate limit hit for {path}, retrying")
+                    continue
+                if response.status == 401 and access_token is None and attempt == 0:
+                    # App access token expired or was revoked
+                    self._access_token = None
+                    continue
+
+                logger.error(
+                    f"Helix request {path} failed. Status: {response.status} - {error_text}"
+                )
+                if response.status in [400, 401, 403, 404]:
                     raise NonRetryableError(f"Client error: {response.status}")
-                else:
-                    error_text = await response.text()
-                    logger.error(
-                        f"Failed to get users by ID. Status: {response.status} - {error_text}"
-                    )
-                    raise ConnectionError(f"Server error: {response.status}")
+                raise ConnectionError(f"Server error: {response.status}")
+
+        raise ConnectionError(f"Helix request {path} failed after retries")
+
+    async def _helix_get_all(
+        self,
+        path: str,
+        params: List[Tuple[str, str]],
+        max_pages: int = HELIX_MAX_PAGES,
+        access_token: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """GET all pages of a Helix collection (cursor pagination)"""
+        items: List[Dict[str, Any]] = []
+        cursor = None
+        for _ in range(max_pages):
+            page_params = params + ([("after", cursor)] if cursor else [])
+            data = await self._helix_get(path, page_params, access_token)
+            page = data.get("data", [])
+            items.extend(page)
+            cursor = (data.get("pagination") or {}).get("cursor")
+            if not cursor or not page:
+                break
+        return items
+
+    @twitch_api_retry
+    async def _fetch_users_by_id(self, user_ids: List[str]) -> List[Dict[str, Any]]:
+        return await self._helix_get_all("/users", [("id", i) for i in user_ids])
+
+    @twitch_api_retry
+    async def _fetch_users_by_login(self, logins: List[str]) -> List[Dict[str, Any]]:
+        return await self._helix_get_all("/users", [("login", n) for n in logins])
+
+    @twitch_api_retry
+    async def _fetch_streams_by_user_id(
+        self, user_ids: List[str]
+    ) -> List[Dict[str, Any]]:
+        params = [("first", str(HELIX_MAX_IDS))] + [("user_id", i) for i in user_ids]
+        return await self._helix_get_all("/streams", params)
+
+    async def _fetch_games_by_id(self, game_ids: List[str]) -> List[Dict[str, Any]]:
+        return await self._helix_get_all("/games", [("id", i) for i in game_ids])
+
+    async def get_users_by_login(self, usernames: List[str]) -> List[Dict[str, Any]]:
+        """Get user data by username(s)"""
+        if not usernames:
+            return []
+        return await self._users_by_login.lookup(usernames)
+
+    async def get_users_by_id(self, user_ids: List[str]) -> List[Dict[str, Any]]:
+        """Get user data by user ID(s)"""
+        if not user_ids:
+            return []
+        return await self._users_by_id.lookup([str(i) for i in user_ids])
 
     @twitch_api_retry
     async def get_games_by_name(self, game_names: List[str]) -> List[Dict[str, Any]]:
@@ -134,194 +375,101 @@ class TwitchAPIService:
         if not game_names:
             return []
 
-        token = await self.get_access_token()
-
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                f"{self.base_url}/games",
-                params={"name": game_names},
-                headers={
-                    "Client-ID": self.client_id,
-                    "Authorization": f"Bearer {token}",
-                },
-            ) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return data.get("data", [])
-                elif response.status in [401, 403, 404]:
-                    error_text = await response.text()
-                    logger.error(
-                        f"Failed to get games by name. Status: {response.status} - {error_text}"
-                    )
-                    raise NonRetryableError(f"Client error: {response.status}")
-                else:
-                    error_text = await response.text()
-                    logger.error(
-                        f"Failed to get games by name. Status: {response.status} - {error_text}"
-                    )
-                    raise ConnectionError(f"Server error: {response.status}")
+        games = []
+        for chunk in _chunks(game_names):
+            games.extend(
+                await self._helix_get_all("/games", [("name", n) for n in chunk])
+            )
+        return games
 
     async def get_games_by_id(self, game_ids: List[str]) -> List[Dict[str, Any]]:
         """Get game/category data by ID(s)"""
         if not game_ids:
             return []
 
-        token = await self.get_access_token()
-
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                f"{self.base_url}/games",
-                params={"id": game_ids},
-                headers={
-                    "Client-ID": self.client_id,
-                    "Authorization": f"Bearer {token}",
-                },
-            ) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return data.get("data", [])
-                else:
-                    error_text = await response.text()
-                    logger.error(
-                        f"Failed to get games by ID. Status: {response.status} - {error_text}"
-                    )
-                    return []
+        try:
+            return await self._games_by_id.lookup([str(i) for i in game_ids])
+        except Exception as e:
+            logger.error(f"Failed to get games by ID: {e}")
+            return []
 
-    @twitch_api_retry
     async def get_streams(
         self,
         user_ids: List[str] = None,
         user_logins: List[str] = None,
         game_ids: List[str] = None,
     ) -> List[Dict[str, Any]]:
-        """Get stream data"""
-        token = await self.get_access_token()
-
-        params = {}
-        if user_ids:
-            params["user_id"] = user_ids
-        if user_logins:
-            params["user_login"] = user_logins
-        if game_ids:
-            params["game_id"] = game_ids
-
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                f"{self.base_url}/streams",
-                params=params,
-                headers={
-                    "Client-ID": self.client_id,
-                    "Authorization": f"Bearer {token}",
-                },
-            ) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return data.get("data", [])
-                elif response.status in [401, 403, 404]:
-                    error_text = await response.text()
-                    logger.error(
-                        f"Failed to get streams. Status: {response.status} - {error_text}"
-                    )
-                    raise NonRetryableError(f"Client error: {response.status}")
-                else:
-                    error_text = await response.text()
-                    logger.error(
-                        f"Failed to get streams. Status: {response.status} - {error_text}"
-                    )
-                    raise ConnectionError(f"Server error: {response.status}")
+        """Get stream data (only live streams are returned)"""
+        if user_ids and not user_logins and not game_ids:
+            # Live-status checks: batched, 100 streamers per request
+            return await self._streams_by_user_id.lookup([str(i) for i in user_ids])
+        return await self._get_streams_filtered(user_ids, user_logins, game_ids)
+
+    @twitch_api_retry
+    async def _get_streams_filtered(
+        self,
+        user_ids: Optional[List[str]],
+        user_logins: Optional[List[str]],
+        game_ids: Optional[List[str]],
+    ) -> List[Dict[str, Any]]:
+        params = [("first", str(HELIX_MAX_IDS))]
+        params += [("user_id", str(i)) for i in user_ids or []]
+        params += [("user_login", n) for n in user_logins or []]
+        params += [("game_id", str(i)) for i in game_ids or []]
+        return await self._helix_get_all("/streams", params)
 
     async def search_categories(self, query: str) -> List[Dict[str, Any]]:
         """Search for games/categories"""
         if not query:
             return []
 
-        token = await self.get_access_token()
-
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                f"{self.base_url}/search/categories",
-                params={"query": query},
-                headers={
-                    "Client-ID": self.client_id,
-                    "Authorization": f"Bearer {token}",
-                },
-            ) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return data.get("data", [])
-                else:
-                    error_text = await response.text()
-                    logger.error(
-                        f"Failed to search categories. Status: {response.status} - {error_text}"
-                    )
-                    return []
+        try:
+            data = await self._helix_get("/search/categories", [("query", query)])
+            return data.get("data", [])
+        except Exception as e:
+            logger.error(f"Failed to search categories: {e}")
+            return []
 
     async def get_top_games(self, first: int = 20) -> List[Dict[str, Any]]:
         """Get top games on Twitch"""
-        token = await self.get_access_token()
-
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                f"{self.base_url}/games/top",
-                params={"first": first},
-                headers={
-                    "Client-ID": self.client_id,
-                    "Authorization": f"Bearer {token}",
-                },
-            ) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return data.get("data", [])
-                else:
-                    error_text = await response.text()
-                    logger.error(
-                        f"Failed to get top games. Status: {response.status} - {error_text}"
-                    )
-                    return []
+        try:
+            data = await self._helix_get("/games/top", [("first", str(first))])
+            return data.get("data", [])
+        except Exception as e:
+            logger.error(f"Failed to get top games: {e}")
+            return []
 
     async def get_user_followed_streamers(
         self, user_id: str, access_token: str
     ) -> List[Dict[str, Any]]:
         """Get followed streamers for a user (requires user access token)"""
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                f"{self.base_url}/channels/followed",
-                params={"user_id": user_id},
-                headers={
-                    "Client-ID": self.client_id,
-                    "Authorization": f"Bearer {access_token}",
-                },
-            ) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return data.get("data", [])
-                else:
-                    error_text = await response.text()
-                    logger.error(
-                        f"Failed to get followed streamers. Status: {response.status} - {error_text}"
-                    )
-                    return []
+        try:
+            return await self._helix_get_all(
+                "/channels/followed",
+                [("user_id", user_id), ("first", str(HELIX_MAX_IDS))],
+                access_token=access_token,
+            )
+        except Exception as e:
+            logger.error(f"Failed to get followed streamers: {e}")
+            return []
 
     @twitch_api_retry
     async def validate_token(self, access_token: str) -> Optional[Dict[str, Any]]:
         """Validate an access token and get user info"""
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                "https://id.twitch.tv/oauth2/validate",
-                headers={"Authorization": f"OAuth {access_token}"},
-            ) as response:
-                if response.status == 200:
-                    return await response.json()
-                elif response.status in [401, 403]:
-                    logger.error(f"Failed to validate token. Status: {response.status}")
-                    raise NonRetryableError(
-                        f"Token validation failed: {response.status}"
-                    )
-                else:
-                    logger.error(f"Failed to validate token. Status: {response.status}")
-                    raise ConnectionError(f"Token validation error: {response.status}")
+        session = await self._get_session()
+        async with session.get(
+            "https://id.twitch.tv/oauth2/validate",
+            headers={"Authorization": f"OAuth {access_token}"},
+        ) as response:
+            if response.status == 200:
+                return await response.json()
+            elif response.status in [401, 403]:
+                logger.error(f"Failed to validate token. Status: {response.status}")
+                raise NonRetryableError(f"Token validation failed: {response.status}")
+            else:
+                logger.error(f"Failed to validate token. Status: {response.status}")
+                raise ConnectionError(f"Token validation error: {response.status}")
 
-    @twitch_api_retry
     async def get_stream_by_user_id(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Get single stream data by user ID"""
         if not user_id:
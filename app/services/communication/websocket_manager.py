@@ -1,23 +1,127 @@
 from fastapi import WebSocket
 from starlette.websockets import WebSocketState
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set, Tuple
 import logging
 from datetime import datetime, timezone
 import asyncio
-import copy
+import json
 from collections import deque
+from app.config.constants import TIMEOUTS
 from app.utils.client_ip import get_client_info
 
 logger = logging.getLogger("streamvault")
 
+# Periodic snapshot messages: a newer one fully supersedes an older one, so a
+# lagging client only ever needs the latest pending frame of each type.
+COALESCED_MESSAGE_TYPES = frozenset({"active_recordings_update", "queue_stats_update"})
+
+
+def _serialize(message: Dict[str, Any]) -> str:
+    """Serialize a message once for all clients (same format as send_json)"""
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+class _ConnectionChannel:
+    """Bounded outbound queue plus a dedicated writer task for one WebSocket.
+
+    Frames are pre-serialized text. Snapshot types are coalesced (latest
+    wins); any other frame that does not fit means the client is more than
+    max_queue_size messages behind and ``offer`` reports it as lagging.
+    """
+
+    def __init__(
+        self,
+        manager: "ConnectionManager",
+        websocket: WebSocket,
+        max_queue_size: int,
+        send_timeout: float,
+    ):
+        self.websocket = websocket
+        self._manager = manager
+        self._send_timeout = send_timeout
+        # Items are (coalesced_type, None) markers or (None, frame_text)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self._latest: Dict[str, str] = {}
+        self.sent = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.task = asyncio.create_task(self._run())
+
+    def offer(self, message_type: Optional[str], text: str) -> bool:
+        """Queue a frame without blocking; False if the client is lagging"""
+        if message_type in COALESCED_MESSAGE_TYPES:
+            if message_type in self._latest:
+                self._latest[message_type] = text
+                self.coalesced += 1
+                return True
+            try:
+                self.queue.put_nowait((message_type, None))
+            except asyncio.QueueFull:
+                # Superseded by the next snapshot anyway
+                self.dropped += 1
+                return True
+            self._latest[message_type] = text
+            return True
+
+        try:
+            self.queue.put_nowait((None, text))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+        return True
+
+    async def _run(self):
+        while True:
+            message_type, text = await self.queue.get()
+            try:
+                if message_type is not None:
+                    text = self._latest.pop(message_type, None)
+                    if text is None:
+                        continue
+                await asyncio.wait_for(
+                    self.websocket.send_text(text), timeout=self._send_timeout
+                )
+                self.sent += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(
+                    f"WebSocketManager: Failed to send to {getattr(self.websocket, 'client', None)}: {e}"
+                )
+                self._manager._disconnect_in_background(self.websocket)
+                return
+            finally:
+                self.queue.task_done()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queued": self.queue.qsize(),
+            "sent": self.sent,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+        }
+
 
 class ConnectionManager:
-    def __init__(self, event_log_size: int = 500):
+    def __init__(
+        self,
+        event_log_size: int = 500,
+        max_queue_size: int = 256,
+        send_timeout: float = TIMEOUTS.WEBSOCKET_SEND_TIMEOUT,
+    ):
         self.active_connections: Dict[int, WebSocket] = {}  # Use dict instead of list
         self._lock = asyncio.Lock()
         self._event_log_size = event_log_size
-        self._event_log = deque(maxlen=event_log_size)
+        # Replay log holds (event_id, serialized_event) - no per-event deepcopy
+        self._event_log: deque = deque(maxlen=event_log_size)
         self._next_event_id = 0
+        # Per-connection outbound queues and writer tasks
+        self._channels: Dict[int, _ConnectionChannel] = {}
+        self._max_queue_size = max_queue_size
+        self._send_timeout = send_timeout
+        self.slow_consumer_disconnects = 0
+        # Disconnects started by writer tasks, which cannot await them
+        self._background_tasks: Set[asyncio.Task] = set()
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
@@ -85,6 +189,7 @@ class ConnectionManager:
     async def disconnect(self, websocket: WebSocket):
         async with self._lock:
             connection_id = id(websocket)
+            self._close_channel(connection_id)
             if connection_id in self.active_connections:
                 del self.active_connections[connection_id]
                 connection_count = len(self.active_connections)
@@ -105,6 +210,12 @@ class ConnectionManager:
                     f"🔌 WebSocket disconnected: {real_ip} (ID: {connection_id}) - Remaining: {connection_count} total, {remaining_from_client} from this client"
                 )
 
+    def _disconnect_in_background(self, websocket: WebSocket):
+        """Disconnect a client from its own writer task without awaiting it"""
+        task = asyncio.create_task(self.disconnect(websocket))
+        self._background_tasks.add(task)
+        task.add_done_callback(lambda t: self._background_tasks.discard(t))
+
     async def _cleanup_stale_connections(self):
         """Remove stale/closed WebSocket connections"""
         stale_connections = []
@@ -123,6 +234,7 @@ class ConnectionManager:
 
         for connection_id in stale_connections:
             del self.active_connections[connection_id]
+            self._close_channel(connection_id)
             logger.debug(f"🧹 Cleaned up stale connection: {connection_id}")
 
         if stale_connections:
@@ -130,23 +242,68 @@ class ConnectionManager:
 
     async def send_notification_to_socket(
         self, websocket: WebSocket, message: Dict[str, Any]
-    ):
+    ) -> bool:
+        """Send a message to one client through its outbound channel.
+
+        Going through the channel keeps the writer task the only coroutine
+        writing to the socket.
+        """
+        text = _serialize(message)
+        async with self._lock:
+            connection_id = id(websocket)
+            if connection_id not in self.active_connections:
+                return False
+            channel = self._get_channel(connection_id, websocket)
+            queued = channel.offer(message.get("type"), text)
+
+        if not queued:
+            await self._disconnect_slow_consumer(websocket)
+        return queued
+
+    def _get_channel(self, connection_id: int, websocket: WebSocket):
+        """Return the connection's outbound channel, creating it on first use"""
+        channel = self._channels.get(connection_id)
+        if channel is None:
+            channel = _ConnectionChannel(
+                self, websocket, self._max_queue_size, self._send_timeout
+            )
+            self._channels[connection_id] = channel
+        return channel
+
+    def _close_channel(self, connection_id: int):
+        """Stop a connection's writer task (caller holds the lock)"""
+        channel = self._channels.pop(connection_id, None)
+        if channel and channel.task is not asyncio.current_task():
+            channel.task.cancel()
+
+    async def _disconnect_slow_consumer(self, websocket: WebSocket):
+        """Drop a client that fell more than max_queue_size messages behind"""
+        self.slow_consumer_disconnects += 1
+        logger.warning(
+            f"WebSocketManager: Disconnecting slow consumer {getattr(websocket, 'client', None)} "
+            f"(more than {self._max_queue_size} messages behind)"
+        )
+        await self.disconnect(websocket)
         try:
-            # Check if the connection is still active using proper enum comparison
-            if (
-                hasattr(websocket, "client_state")
-                and websocket.client_state == WebSocketState.CONNECTED
-            ):
-                await websocket.send_json(message)
-                return True
+            await asyncio.wait_for(
+                websocket.close(code=1013, reason="Client too slow"),
+                timeout=self._send_timeout,
+            )
         except Exception as e:
-            logger.error(f"Failed to send message to {websocket.client}: {e}")
-            await self.disconnect(websocket)
-            return False
+            logger.debug(f"WebSocketManager: Close of slow consumer failed: {e}")
 
     async def send_notification(self, message: dict):
+        """Broadcast a message to all clients.
+
+        The payload is serialized once and handed to each connection's
+        bounded queue; per-connection writer tasks deliver concurrently, so a
+        slow client never delays the others.
+        """
         replay_event = await self._record_replayable_event(message)
-        outbound_message = replay_event if replay_event else message
+        if replay_event:
+            outbound_message, text = replay_event
+        else:
+            outbound_message, text = message, _serialize(message)
 
         # Only log for non-routine broadcasts or when there's actual data
         should_log = (
@@ -157,68 +314,89 @@ class ConnectionManager:
 
         if should_log:
             logger.debug(
-                f"WebSocketManager: Attempting to send notification: {message}"
+                "WebSocketManager: Attempting to send notification: %s",
+                outbound_message.get("type"),
             )
 
+        lagging = []
         async with self._lock:
-            active_sockets = list(self.active_connections.values())
+            if not self.active_connections:
+                if should_log:
+                    logger.warning("WebSocketManager: No active WebSocket connections")
+                return
 
-        if not active_sockets:
-            if should_log:
-                logger.warning("WebSocketManager: No active WebSocket connections")
-            return
+            message_type = outbound_message.get("type")
+            for connection_id, ws in self.active_connections.items():
+                channel = self._get_channel(connection_id, ws)
+                if not channel.offer(message_type, text):
+                    lagging.append(ws)
 
-        for ws in active_sockets:
-            try:
-                await ws.send_json(outbound_message)
-                if should_log:
-                    logger.debug(f"WebSocketManager: Notification sent to {ws.client}")
-            except Exception as e:
-                logger.error(f"WebSocketManager: Failed to send to {ws.client}: {e}")
-                # Remove failed connection
-                await self.disconnect(ws)
+        for ws in lagging:
+            await self._disconnect_slow_consumer(ws)
 
-    async def _record_replayable_event(self, message: dict) -> Optional[Dict[str, Any]]:
+    async def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued frame has been written (or timeout)"""
+        async with self._lock:
+            queues = [channel.queue for channel in self._channels.values()]
+        if not queues:
+            return True
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(queue.join() for queue in queues)), timeout=timeout
+            )
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def get_connection_stats(self, connection_id: int) -> Dict[str, int]:
+        """Outbound queue statistics for one connection"""
+        channel = self._channels.get(connection_id)
+        if channel is None:
+            return {"queued": 0, "sent": 0, "coalesced": 0, "dropped": 0}
+        return channel.stats()
+
+    async def _record_replayable_event(
+        self, message: dict
+    ) -> Optional[Tuple[Dict[str, Any], str]]:
         """Assign a monotonic cursor and keep a bounded replay log.
 
         Retention is intentionally in memory and bounded to the most recent
         events. The replay API is authenticated, so reconnecting clients can
         request missed events without exposing realtime data publicly.
+
+        Returns the outbound event and its serialized form; the log keeps
+        only the serialized text, so callers mutating their dict afterwards
+        cannot alter replayed events.
         """
         if message.get("type") == "connection.status":
             return None
 
-        event = copy.deepcopy(message)
+        event = dict(message)
 
         async with self._lock:
             self._next_event_id += 1
             event["event_id"] = self._next_event_id
             event.setdefault("timestamp", datetime.now(timezone.utc).isoformat())
-            self._event_log.append(event)
+            text = _serialize(event)
+            self._event_log.append((event["event_id"], text))
 
-        return event
+        return event, text
 
     async def get_events_since(
         self, since: int = 0, limit: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """Return replayable events with event_id greater than since."""
         async with self._lock:
-            events = [
-                copy.deepcopy(event)
-                for event in self._event_log
-                if event.get("event_id", 0) > since
-            ]
+            texts = [text for event_id, text in self._event_log if event_id > since]
 
         if limit is not None:
-            events = events[:limit]
-        return events
+            texts = texts[:limit]
+        return [json.loads(text) for text in texts]
 
     async def get_replay_state(self) -> Dict[str, Any]:
         """Return current replay cursor and retention metadata."""
         async with self._lock:
-            oldest_event_id = (
-                self._event_log[0]["event_id"] if self._event_log else None
-            )
+            oldest_event_id = self._event_log[0][0] if self._event_log else None
             latest_event_id = self._next_event_id
             retained_events = len(self._event_log)
 
@@ -1,3 +1,5 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session as DBSession
 from app.models import User, Session
 from argon2 import PasswordHasher
@@ -5,8 +7,11 @@ from argon2.exceptions import VerifyMismatchError
 import hashlib
 import secrets
 import logging
-from typing import Optional
+import threading
+from typing import Optional, Tuple, Union
+from cachetools import TTLCache
 from app.schemas.auth import UserCreate, UserResponse
+from app.config.constants import CACHE_CONFIG
 from datetime import datetime, timedelta, timezone
 
 logger = logging.getLogger("streamvault")
@@ -23,13 +28,115 @@ def _hash_token(token: str) -> str:
     return hashlib.sha256(token.encode("utf-8")).hexdigest()
 
 
+class SessionValidationCache:
+    """In-process TTL+LRU cache of validated sessions.
+
+    Keyed by the SHA-256 token hash (raw tokens are never kept in memory
+    longer than a request). Entries hold the user id and the session expiry,
+    so an expired session is never served from cache. The short TTL bounds
+    staleness for sessions deleted outside AuthService.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = CACHE_CONFIG.SMALL_CACHE_SIZE,
+        ttl: int = CACHE_CONFIG.SESSION_VALIDATION_CACHE_TTL,
+    ):
+        # token_hash -> (user_id, expires_at)
+        self._sessions: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        # Admins are never deleted, so only a positive result is cached
+        self._admin_exists = False
+        self._lock = threading.Lock()
+
+    @property
+    def admin_exists(self) -> bool:
+        return self._admin_exists
+
+    def mark_admin_exists(self) -> None:
+        self._admin_exists = True
+
+    def get(self, token_hash: str) -> Optional[int]:
+        """Return the cached user id for a still-valid session, else None"""
+        with self._lock:
+            entry: Optional[Tuple[int, datetime]] = self._sessions.get(token_hash)
+            if entry is None:
+                return None
+            user_id, expires_at = entry
+            if expires_at <= datetime.now(timezone.utc):
+                self._sessions.pop(token_hash, None)
+                return None
+            return user_id
+
+    def store(self, token_hash: str, user_id: int, expires_at: datetime) -> None:
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        with self._lock:
+            self._sessions[token_hash] = (user_id, expires_at)
+
+    def invalidate(self, token_hash: str) -> None:
+        with self._lock:
+            self._sessions.pop(token_hash, None)
+
+    def purge_expired(self) -> None:
+        """Drop entries whose session has expired"""
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            expired = [
+                token_hash
+                for token_hash, (_, expires_at) in self._sessions.items()
+                if expires_at <= now
+            ]
+            for token_hash in expired:
+                self._sessions.pop(token_hash, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sessions.clear()
+            self._admin_exists = False
+
+
+# Shared by AuthMiddleware and all per-request AuthService instances
+session_cache = SessionValidationCache()
+
+
+def is_session_cached(token: str) -> bool:
+    """Check a raw session token against the cache only (no DB access)"""
+    return session_cache.get(_hash_token(token)) is not None
+
+
 class AuthService:
-    def __init__(self, db: DBSession):
+    """Authentication and sessions.
+
+    ``admin_exists`` and ``validate_session`` also accept an ``AsyncSession``
+    so the auth middleware can check sessions without blocking the event
+    loop; the remaining methods need a sync session.
+    """
+
+    def __init__(self, db: Union[DBSession, AsyncSession]):
         self.db = db
         self.session_timeout_hours = 24  # 24 hour session timeout for production
 
+    async def _first(self, model, **criteria):
+        if isinstance(self.db, AsyncSession):
+            result = await self.db.execute(select(model).filter_by(**criteria).limit(1))
+            return result.scalars().first()
+        return self.db.query(model).filter_by(**criteria).first()
+
+    async def _delete_and_commit(self, instance) -> None:
+        if isinstance(self.db, AsyncSession):
+            await self.db.delete(instance)
+            await self.db.commit()
+        else:
+            self.db.delete(instance)
+            self.db.commit()
+
     async def admin_exists(self) -> bool:
-        return bool(self.db.query(User).filter_by(is_admin=True).first())
+        if session_cache.admin_exists:
+            return True
+        exists = bool(await self._first(User, is_admin=True))
+        if exists:
+            session_cache.mark_admin_exists()
+        return exists
 
     async def create_admin(self, user_data: UserCreate) -> UserResponse:
         hashed_password = ph.hash(user_data.password)
@@ -64,7 +171,10 @@ class AuthService:
         """Validate session with automatic cleanup of expired sessions"""
         try:
             token_hash = _hash_token(token)
-            session = self.db.query(Session).filter_by(token=token_hash).first()
+            if session_cache.get(token_hash) is not None:
+                return True
+
+            session = await self._first(Session, token=token_hash)
             if not session:
                 return False
 
@@ -74,11 +184,15 @@ class AuthService:
             )
             if session.created_at < cutoff_time:
                 # Session is expired, delete it immediately
-                self.db.delete(session)
-                self.db.commit()
+                await self._delete_and_commit(session)
                 logger.debug("Removed expired session")
                 return False
 
+            session_cache.store(
+                token_hash,
+                session.user_id,
+                session.created_at + timedelta(hours=self.session_timeout_hours),
+            )
             return True
 
         except Exception as e:
@@ -100,6 +214,7 @@ class AuthService:
                 # Expired - remove and reject
                 self.db.delete(session)
                 self.db.commit()
+                session_cache.invalidate(token_hash)
                 logger.debug("Tried to refresh expired session; deleted")
                 return False
 
@@ -107,6 +222,11 @@ class AuthService:
             session.created_at = datetime.now(timezone.utc)
             self.db.add(session)
             self.db.commit()
+            session_cache.store(
+                token_hash,
+                session.user_id,
+                session.created_at + timedelta(hours=self.session_timeout_hours),
+            )
             return True
         except Exception as e:
             logger.error(f"Error refreshing session: {e}")
@@ -133,6 +253,7 @@ class AuthService:
                 self.db.commit()
                 logger.info(f"Cleaned up {expired_count} expired sessions")
 
+            session_cache.purge_expired()
             return expired_count
 
         except Exception as e:
@@ -144,6 +265,8 @@ class AuthService:
         """Delete a specific session token"""
         try:
             token_hash = _hash_token(token)
+            # Drop the cache entry first so a failed delete can't leave it valid
+            session_cache.invalidate(token_hash)
             session = self.db.query(Session).filter_by(token=token_hash).first()
             if session:
                 self.db.delete(session)
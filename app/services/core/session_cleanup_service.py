@@ -12,6 +12,7 @@ from sqlalchemy.orm import Session as DBSession
 from app.models import Session
 from app.database import SessionLocal
 from app.config.constants import ASYNC_DELAYS
+from app.services.core.auth_service import session_cache
 
 logger = logging.getLogger("streamvault")
 
@@ -101,6 +102,8 @@ class SessionCleanupService:
             else:
                 logger.debug("No expired sessions to clean up")
 
+            session_cache.purge_expired()
+
         except Exception as e:
             logger.error(f"Error cleaning up expired sessions: {e}")
             if db:
@@ -4,6 +4,7 @@ from app.schemas.settings import (
     GlobalSettingsSchema,
     StreamerNotificationSettingsSchema,
 )
+from app.services.core.settings_snapshot import invalidate_settings_snapshot
 from apprise import Apprise
 import logging
 
@@ -28,6 +29,7 @@ class SettingsService:
             settings = GlobalSettings()
             self.db.add(settings)
             self.db.commit()
+            invalidate_settings_snapshot("global settings created")
         return settings
 
     async def update_settings(
@@ -37,6 +39,7 @@ class SettingsService:
         for key, value in settings_data.dict(exclude_unset=True).items():
             setattr(settings, key, value)
         self.db.commit()
+        invalidate_settings_snapshot("global settings updated")
         return settings
 
     async def get_streamer_settings(
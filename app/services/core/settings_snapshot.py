@@ -0,0 +1,175 @@
+"""
+Settings snapshots
+
+Recording starts, notifications and the proxy health loop read
+GlobalSettings, RecordingSettings and StreamerRecordingSettings on every
+call. This service keeps immutable snapshots of those rows in memory. All of
+them are loaded together on the first read (three queries), so later reads
+cost no database work.
+
+There is no TTL. Every write path (the settings, recording, proxy and
+streamer routes and the streamer repository) calls ``invalidate()`` after
+committing (``invalidate_settings_snapshot``). The next read then loads a new version, so changes apply
+immediately instead of after a cache timeout.
+"""
+
+import logging
+import threading
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional
+
+from app.database import SessionLocal
+from app.models import GlobalSettings, RecordingSettings, StreamerRecordingSettings
+
+logger = logging.getLogger("streamvault")
+
+# Secrets and values maintained by their own services are not snapshotted
+EXCLUDED_COLUMNS = frozenset(
+    {
+        "proxy_encryption_key",
+        "twitch_refresh_token",
+        "twitch_token_expires_at",
+        "twitch_access_token",
+    }
+)
+
+
+class SettingsSnapshot:
+    """Read-only copy of a settings row; columns are attributes"""
+
+    __slots__ = ("_values",)
+
+    def __init__(self, values: Mapping[str, Any]):
+        object.__setattr__(self, "_values", MappingProxyType(dict(values)))
+
+    @classmethod
+    def from_row(cls, row) -> "SettingsSnapshot":
+        return cls(
+            {
+                column.key: getattr(row, column.key)
+                for column in row.__table__.columns
+                if column.key not in EXCLUDED_COLUMNS
+            }
+        )
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self._values[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("Settings snapshots are read-only")
+
+    def __repr__(self) -> str:
+        return f"SettingsSnapshot({dict(self._values)!r})"
+
+
+class _Snapshots:
+    """One consistent version of all settings"""
+
+    def __init__(
+        self,
+        version: int,
+        global_settings: Optional[SettingsSnapshot],
+        recording: Optional[SettingsSnapshot],
+        streamers: Dict[int, SettingsSnapshot],
+    ):
+        self.version = version
+        self.global_settings = global_settings
+        self.recording = recording
+        self.streamers = streamers
+        self.proxy = _proxy_settings(global_settings)
+
+
+def _proxy_settings(
+    global_settings: Optional[SettingsSnapshot],
+) -> Mapping[str, str]:
+    proxy_settings = {}
+    if global_settings:
+        if global_settings.http_proxy and global_settings.http_proxy.strip():
+            proxy_settings["http"] = global_settings.http_proxy.strip()
+        if global_settings.https_proxy and global_settings.https_proxy.strip():
+            proxy_settings["https"] = global_settings.https_proxy.strip()
+    return MappingProxyType(proxy_settings)
+
+
+class SettingsSnapshotService:
+    """Versioned in-memory snapshots of the settings tables"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshots: Optional[_Snapshots] = None
+        self._version = 0
+        self.loads = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def invalidate(self, reason: str = "") -> None:
+        """Drop the current snapshots; the next read loads fresh ones"""
+        with self._lock:
+            self._version += 1
+            self._snapshots = None
+        if reason:
+            logger.debug(f"Settings snapshot invalidated: {reason}")
+
+    def _current(self) -> Optional[_Snapshots]:
+        snapshots = self._snapshots
+        if snapshots is not None:
+            return snapshots
+
+        with self._lock:
+            version = self._version
+        try:
+            with SessionLocal() as db:
+                global_row = db.query(GlobalSettings).first()
+                recording_row = db.query(RecordingSettings).first()
+                streamer_rows = db.query(StreamerRecordingSettings).all()
+                snapshots = _Snapshots(
+                    version,
+                    SettingsSnapshot.from_row(global_row) if global_row else None,
+                    SettingsSnapshot.from_row(recording_row) if recording_row else None,
+                    {
+                        row.streamer_id: SettingsSnapshot.from_row(row)
+                        for row in streamer_rows
+                    },
+                )
+        except Exception as e:
+            # Tables may not exist yet during migrations; retry on next read
+            logger.warning(f"Could not load settings snapshot: {e}")
+            return None
+
+        with self._lock:
+            self.loads += 1
+            # An invalidation during the load makes this version stale
+            if version == self._version:
+                self._snapshots = snapshots
+        return snapshots
+
+    def get_global_settings(self) -> Optional[SettingsSnapshot]:
+        snapshots = self._current()
+        return snapshots.global_settings if snapshots else None
+
+    def get_recording_settings(self) -> Optional[SettingsSnapshot]:
+        snapshots = self._current()
+        return snapshots.recording if snapshots else None
+
+    def get_streamer_settings(self, streamer_id: int) -> Optional[SettingsSnapshot]:
+        snapshots = self._current()
+        return snapshots.streamers.get(streamer_id) if snapshots else None
+
+    def get_proxy_settings(self) -> Mapping[str, str]:
+        """http/https proxy URLs configured in the global settings"""
+        snapshots = self._current()
+        return snapshots.proxy if snapshots else MappingProxyType({})
+
+
+# Global instance
+settings_snapshot = SettingsSnapshotService()
+
+
+def invalidate_settings_snapshot(reason: str = "") -> None:
+    """Drop the settings snapshots (call after committing settings writes)"""
+    settings_snapshot.invalidate(reason)
@@ -10,7 +10,7 @@ import logging
 import os
 import tempfile
 from pathlib import Path
-from typing import Dict, Optional, List, Set
+from typing import Dict, Iterable, Optional, List, Set
 from cachetools import TTLCache
 from app.database import SessionLocal
 from app.models import Category
@@ -32,6 +32,12 @@ class CategoryImageService:
         self._category_cache: TTLCache = TTLCache(
             maxsize=CACHE_CONFIG.DEFAULT_CACHE_SIZE, ttl=CACHE_CONFIG.IMAGE_CACHE_TTL
         )
+        # Categories without a usable image, so repeated lookups skip the database
+        self._missing_cache: TTLCache = TTLCache(
+            maxsize=CACHE_CONFIG.DEFAULT_CACHE_SIZE, ttl=CACHE_CONFIG.MISSING_IMAGE_TTL
+        )
+        # File names in the categories directory, kept current by download/cleanup
+        self._file_index: Set[str] = set()
         self._background_tasks: Set[asyncio.Task] = set()
         self.categories_dir = None
         self._load_existing_cache()
@@ -55,7 +61,12 @@ class CategoryImageService:
             self._ensure_categories_dir()
 
             if self.categories_dir is not None and self.categories_dir.exists():
+                categories_dir = os.path.realpath(os.fspath(self.categories_dir))
                 for image_file in self.categories_dir.glob("*.jpg"):
+                    # Only files really inside the directory (no symlink escapes)
+                    if os.path.dirname(os.path.realpath(image_file)) != categories_dir:
+                        continue
+                    self._file_index.add(image_file.name)
                     category_name = self._filename_to_category(image_file.stem)
                     if category_name:
                         self._category_cache[category_name] = (
@@ -69,6 +80,7 @@ class CategoryImageService:
             logger.error(f"Error loading category image cache: {e}")
             # Cache is already initialized as TTLCache in __init__, just clear it
             self._category_cache.clear()
+            self._file_index.clear()
 
     def _filename_to_category(self, filename: str) -> Optional[str]:
         """Convert filename back to category name"""
@@ -195,6 +207,8 @@ class CategoryImageService:
             if success:
                 relative_path = f"/api/media/categories/{filename}"
                 self._category_cache[category_name] = relative_path
+                self._file_index.add(filename)
+                self._missing_cache.pop(category_name, None)
                 logger.info(f"Successfully cached category image for {category_name}")
                 return relative_path
             else:
@@ -207,102 +221,99 @@ class CategoryImageService:
             self.download_service.mark_download_failed(box_art_url)
             return None
 
+    def _has_image_file(self, category_name: str) -> bool:
+        """Check the directory index instead of the filesystem"""
+        safe_name = self.download_service.sanitize_filename(category_name or "")
+        if not safe_name or not safe_name.strip("."):
+            return False
+        return f"{safe_name}.jpg" in self._file_index
+
     def get_cached_category_image(self, category_name: str) -> Optional[str]:
         """Get cached category image path"""
-        # First check the memory cache (fastest)
-        cached_path = self._category_cache.get(category_name)
-        if cached_path:
-            return cached_path
-
-        # Check if we have a database entry and verify if file exists locally
-        try:
-            with SessionLocal() as db:
-                category = (
-                    db.query(Category).filter(Category.name == category_name).first()
-                )
-                if category and category.box_art_url:
-                    # If it's already a local path, check if file exists
-                    if category.box_art_url.startswith("/api/media/categories/"):
-                        try:
-                            file_path = self._category_image_path(category_name)
-                        except ValueError as e:
-                            logger.warning(
-                                f"Invalid category image path for {category_name}: {e}"
-                            )
-                            return None
-
-                        categories_dir = os.path.realpath(
-                            os.fspath(self.categories_dir)
-                        )
-                        destination = os.path.realpath(
-                            os.path.abspath(os.fspath(file_path))
-                        )
-                        if not destination.startswith(categories_dir + os.sep):
-                            logger.warning(
-                                f"Invalid category image path for {category_name}"
-                            )
-                            return None
-                        file_path = Path(destination)
-
-                        if file_path.exists():
-                            # Cache it and return
-                            self._category_cache[category_name] = category.box_art_url
-                            return category.box_art_url
-
-                    # If it's a Twitch URL, return None to trigger download via API
-                    return None
-        except Exception as e:
-            logger.error(f"Error getting category from database: {e}")
-
-        # No cached image and no database entry - return None for icon fallback
-        return None
+        return self.get_category_images([category_name], download=False)[category_name]
 
     def get_cached_category_image_with_download(
         self, category_name: str
     ) -> Optional[str]:
         """Get cached category image path and trigger download if not cached (for API usage)"""
-        # First check the memory cache (fastest)
-        cached_path = self._category_cache.get(category_name)
-        if cached_path:
-            return cached_path
+        return self.get_category_images([category_name], download=True)[category_name]
+
+    def get_category_images(
+        self, category_names: Iterable[str], download: bool = True
+    ) -> Dict[str, Optional[str]]:
+        """Resolve image URLs for many categories with at most one query
+
+        Cached images come from memory. For the rest, one ``IN (...)`` query
+        loads the box art URLs. A local path is returned if its file is in the
+        directory index. A Twitch URL is returned as is (with ``download``) and
+        a background download is started; without ``download`` it resolves to
+        None so the caller can download it. Categories without any image are
+        remembered for a few minutes.
+        """
+        results: Dict[str, Optional[str]] = {}
+        pending = []
+        for name in category_names:
+            if name in results:
+                continue
+            cached_path = self._category_cache.get(name)
+            if cached_path:
+                results[name] = cached_path
+            else:
+                results[name] = None
+                if name and name not in self._missing_cache:
+                    pending.append(name)
+
+        if not pending:
+            return results
 
-        # If not cached, try to get the original Twitch URL from database and trigger download
         try:
             with SessionLocal() as db:
-                category = (
-                    db.query(Category).filter(Category.name == category_name).first()
+                rows = dict(
+                    db.query(Category.name, Category.box_art_url)
+                    .filter(Category.name.in_(pending))
+                    .all()
                 )
-                if category and category.box_art_url:
-                    # Start async download in background (fire and forget)
-                    try:
-                        # Create background task for downloading
-                        loop = asyncio.get_event_loop()
-                        task = loop.create_task(
-                            self._download_category_image_background(
-                                category_name, category.box_art_url
-                            )
-                        )
-                        self._background_tasks.add(task)
-                        task.add_done_callback(
-                            lambda t: self._background_tasks.discard(t)
-                        )
-                    except RuntimeError as e:
-                        # Check if the error is due to no current event loop
-                        if "There is no current event loop in thread" in str(e):
-                            logger.warning(
-                                "No event loop running, skipping background download."
-                            )
-                        else:
-                            raise
-
-                    # Return the original Twitch URL so frontend can display it
-                    # while background download happens
-                    return category.box_art_url
         except Exception as e:
-            logger.error(f"Error getting category from database: {e}")
-
-        # No cached image and no database entry - return None for icon fallback
-        return None
+            logger.error(f"Error getting categories from database: {e}")
+            return results
+
+        for name in pending:
+            box_art_url = rows.get(name)
+            if not box_art_url:
+                # No database entry or no image - icon fallback
+                self._missing_cache[name] = True
+            elif box_art_url.startswith("/api/media/categories/"):
+                if self._has_image_file(name):
+                    self._category_cache[name] = box_art_url
+                    results[name] = box_art_url
+                elif download:
+                    self._start_background_download(name, box_art_url)
+                    results[name] = box_art_url
+                else:
+                    self._missing_cache[name] = True
+            elif download:
+                # Return the original Twitch URL so the frontend can display it
+                # while the background download happens
+                self._start_background_download(name, box_art_url)
+                results[name] = box_art_url
+            # A Twitch URL without download: None triggers a download via the API
+
+        return results
+
+    def _start_background_download(self, category_name: str, box_art_url: str):
+        try:
+            loop = asyncio.get_event_loop()
+            task = loop.create_task(
+                self._download_category_image_background(category_name, box_art_url)
+            )
+            self._background_tasks.add(task)
+            task.add_done_callback(lambda t: self._background_tasks.discard(t))
+        except RuntimeError as e:
+            # Check if the error is due to no current event loop
+            if "There is no current event loop in thread" in str(e):
+                logger.warning("No event loop running, skipping background download.")
+            else:
+                raise
 
     async def _download_category_image_background(
         self, category_name: str, box_art_url: str
@@ -429,6 +440,8 @@ class CategoryImageService:
         """Get statistics about category image cache"""
         return {
             "cached_categories": len(self._category_cache),
+            "missing_categories": len(self._missing_cache),
+            "indexed_files": len(self._file_index),
             "failed_downloads": len(
                 [
                     url
@@ -458,6 +471,7 @@ class CategoryImageService:
                         image_file.unlink()
                         # Remove from cache
                         self._category_cache.pop(category_name, None)
+                        self._file_index.discard(image_file.name)
                         cleaned_count += 1
                         logger.info(f"Removed unused category image: {image_file.name}")
                     except Exception as e:
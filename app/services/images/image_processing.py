@@ -0,0 +1,106 @@
+"""
+Image processing off the event loop.
+
+Pillow work (decoding, resizing, statistics) is CPU-bound and was done
+inline in async methods. It now runs on a small dedicated thread pool;
+Pillow releases the GIL for decoding and resampling, so this also keeps
+the rest of the application responsive while images are analysed.
+
+Analysis results are cached by content hash: Twitch serves the same
+placeholder image over and over, and it only has to be decoded once.
+"""
+
+import asyncio
+import functools
+import hashlib
+import io
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Tuple
+
+from cachetools import LRUCache
+from PIL import Image, ImageStat
+
+logger = logging.getLogger("streamvault")
+
+IMAGE_WORKERS = 2
+
+# Images are reduced to at most this size before computing statistics
+ANALYSIS_SIZE = (64, 64)
+
+# Analysis results kept by content hash
+ANALYSIS_CACHE_SIZE = 512
+
+_executor: Optional[ThreadPoolExecutor] = None
+_analysis_cache: LRUCache = LRUCache(maxsize=ANALYSIS_CACHE_SIZE)
+
+
+@dataclass(frozen=True)
+class ImageAnalysis:
+    """Dimensions and color statistics of a decoded image"""
+
+    width: int
+    height: int
+    average_color: Tuple[int, int, int]
+    # Share of pixels in the most common value of each channel (0..1)
+    dominant_ratio: float
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=IMAGE_WORKERS, thread_name_prefix="image-processing"
+        )
+    return _executor
+
+
+async def run_image_task(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking Pillow function on the image-processing executor"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_executor(), functools.partial(func, *args, **kwargs)
+    )
+
+
+def analyze_image(image_data: bytes) -> ImageAnalysis:
+    """Decode an image and compute its statistics on a downscaled copy"""
+    img = Image.open(io.BytesIO(image_data))
+    width, height = img.size
+
+    # JPEG can decode at 1/2, 1/4 or 1/8 scale directly
+    img.draft("RGB", ANALYSIS_SIZE)
+    img = img.convert("RGB")
+    img.thumbnail(ANALYSIS_SIZE)
+
+    mean = ImageStat.Stat(img).mean
+    histogram = img.histogram()
+    dominant = sum(max(histogram[i : i + 256]) for i in range(0, 768, 256))
+    pixel_count = img.width * img.height
+
+    return ImageAnalysis(
+        width=width,
+        height=height,
+        average_color=(int(mean[0]), int(mean[1]), int(mean[2])),
+        dominant_ratio=dominant / (pixel_count * 3),
+    )
+
+
+async def analyze_image_async(image_data: bytes) -> ImageAnalysis:
+    """analyze_image on the executor, cached by content hash"""
+    key = hashlib.md5(image_data, usedforsecurity=False).hexdigest()
+    cached = _analysis_cache.get(key)
+    if cached is not None:
+        return cached
+
+    analysis = await run_image_task(analyze_image, image_data)
+    _analysis_cache[key] = analysis
+    return analysis
+
+
+def shutdown_image_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
@@ -0,0 +1,310 @@
+"""
+In-memory HLS segmentation for live playback.
+
+FFmpeg remuxes the live stream to MPEG-TS on stdout; MpegTsSegmenter cuts
+that byte stream into HLS segments at video keyframes (random access points)
+and LiveSegmentBuffer keeps the most recent ones in a bounded ring. Nothing
+is written to disk; the playlist is rendered once per new segment and
+players can block on ``_HLS_msn`` until the next segment is ready.
+"""
+
+import asyncio
+import math
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, List, Optional
+
+TS_PACKET_SIZE = 188
+TS_SYNC_BYTE = 0x47
+PTS_CLOCK = 90000
+PTS_WRAP = 1 << 33
+
+# PMT stream types carrying video (MPEG-1/2, MPEG-4, H.264, H.265, AVS)
+VIDEO_STREAM_TYPES = {0x01, 0x02, 0x10, 0x1B, 0x24, 0x42}
+
+
+@dataclass(frozen=True)
+class LiveSegment:
+    """One HLS media segment held in memory"""
+
+    sequence: int
+    duration: float
+    data: bytes
+
+    @property
+    def name(self) -> str:
+        return f"segment_{self.sequence}.ts"
+
+
+def _parse_section(payload: bytes) -> Optional[bytes]:
+    """Return the PSI section following the pointer field"""
+    if not payload:
+        return None
+    start = 1 + payload[0]
+    section = payload[start:]
+    if len(section) < 3:
+        return None
+    section_length = ((section[1] & 0x0F) << 8) | section[2]
+    return section[: 3 + section_length]
+
+
+def _parse_pts(payload: bytes) -> Optional[int]:
+    """PTS of a PES packet starting in this payload"""
+    if len(payload) < 14 or payload[0:3] != b"\x00\x00\x01":
+        return None
+    if not payload[7] & 0x80:
+        return None
+    b = payload[9:14]
+    return (
+        ((b[0] >> 1) & 0x07) << 30
+        | b[1] << 22
+        | (b[2] >> 1) << 15
+        | b[3] << 7
+        | b[4] >> 1
+    )
+
+
+class MpegTsSegmenter:
+    """Cut an MPEG-TS byte stream into segments at random access points.
+
+    Segment durations come from the PTS of the timing stream (the first
+    video stream, or the first elementary stream for audio-only renditions).
+    """
+
+    def __init__(
+        self,
+        target_duration: float,
+        on_segment: Callable[[float, bytes], None],
+    ):
+        self.target_duration = target_duration
+        self.on_segment = on_segment
+        self._pending = b""
+        self._current = bytearray()
+        self._segment_start_pts: Optional[int] = None
+        self._last_pts: Optional[int] = None
+        self._pmt_pid: Optional[int] = None
+        self._timing_pid: Optional[int] = None
+        self._timing_is_video = False
+        self._pat_packet: Optional[bytes] = None
+        self._pmt_packet: Optional[bytes] = None
+
+    def feed(self, data: bytes) -> None:
+        """Consume a chunk of the TS stream"""
+        buffer = self._pending + data
+        offset = 0
+        end = len(buffer)
+        chunk_start = 0
+
+        while offset + TS_PACKET_SIZE <= end:
+            if buffer[offset] != TS_SYNC_BYTE:
+                # Lost sync: drop bytes up to the next sync byte
+                self._append(buffer[chunk_start:offset])
+                next_sync = buffer.find(bytes([TS_SYNC_BYTE]), offset + 1)
+                offset = next_sync if next_sync != -1 else end
+                chunk_start = offset
+                continue
+
+            boundary_pts = self._inspect_packet(
+                buffer[offset : offset + TS_PACKET_SIZE]
+            )
+            if boundary_pts is not None:
+                # A new segment starts with this packet
+                self._append(buffer[chunk_start:offset])
+                chunk_start = offset
+                self._start_segment(boundary_pts)
+
+            offset += TS_PACKET_SIZE
+
+        self._append(buffer[chunk_start:offset])
+        self._pending = buffer[offset:]
+
+    def flush(self) -> None:
+        """Emit whatever is buffered as a final segment"""
+        if self._segment_start_pts is None or not self._current:
+            return
+        duration = self._elapsed(self._last_pts) or self.target_duration
+        self.on_segment(duration, bytes(self._current))
+        self._current = bytearray()
+        self._segment_start_pts = None
+
+    def _append(self, data: bytes) -> None:
+        # Bytes before the first random access point are not decodable
+        if self._segment_start_pts is not None:
+            self._current += data
+
+    def _elapsed(self, pts: Optional[int]) -> float:
+        if pts is None or self._segment_start_pts is None:
+            return 0.0
+        return ((pts - self._segment_start_pts) % PTS_WRAP) / PTS_CLOCK
+
+    def _start_segment(self, pts: int) -> None:
+        duration = self._elapsed(pts)
+        if self._current and duration > 0:
+            self.on_segment(duration, bytes(self._current))
+        self._current = bytearray()
+        self._segment_start_pts = pts
+        self._last_pts = pts
+        # Each segment starts with the latest PAT/PMT so it decodes on its own
+        for packet in (self._pat_packet, self._pmt_packet):
+            if packet is not None:
+                self._current += packet
+
+    def _inspect_packet(self, packet: bytes) -> Optional[int]:
+        """Track PSI/PTS; return the PTS if a new segment starts at this packet"""
+        pid = ((packet[1] & 0x1F) << 8) | packet[2]
+        payload_start = bool(packet[1] & 0x40)
+        adaptation = (packet[3] >> 4) & 0x03
+
+        random_access = False
+        payload_offset = 4
+        if adaptation in (2, 3):
+            af_length = packet[4]
+            if af_length > 0:
+                random_access = bool(packet[5] & 0x40)
+            payload_offset = 5 + af_length
+        payload = packet[payload_offset:] if adaptation in (1, 3) else b""
+
+        if pid == 0 and payload_start:
+            self._pat_packet = packet
+            self._parse_pat(payload)
+            return None
+        if pid == self._pmt_pid and payload_start:
+            self._pmt_packet = packet
+            self._parse_pmt(payload)
+            return None
+        if pid != self._timing_pid or not payload_start:
+            return None
+
+        pts = _parse_pts(payload)
+        if pts is None:
+            return None
+
+        # Audio-only renditions can be cut at any access unit
+        cut_allowed = random_access or not self._timing_is_video
+        if self._segment_start_pts is None:
+            return pts if cut_allowed else None
+
+        self._last_pts = pts
+        if cut_allowed and self._elapsed(pts) >= self.target_duration:
+            return pts
+        return None
+
+    def _parse_pat(self, payload: bytes) -> None:
+        section = _parse_section(payload)
+        if not section or section[0] != 0x00:
+            return
+        # Program loop between the 8-byte header and the CRC
+        for index in range(8, len(section) - 4, 4):
+            program_number = (section[index] << 8) | section[index + 1]
+            if program_number != 0:
+                self._pmt_pid = ((section[index + 2] & 0x1F) << 8) | section[index + 3]
+                return
+
+    def _parse_pmt(self, payload: bytes) -> None:
+        section = _parse_section(payload)
+        if not section or section[0] != 0x02 or len(section) < 12:
+            return
+        program_info_length = ((section[10] & 0x0F) << 8) | section[11]
+        index = 12 + program_info_length
+        streams = []
+        while index + 5 <= len(section) - 4:
+            stream_type = section[index]
+            pid = ((section[index + 1] & 0x1F) << 8) | section[index + 2]
+            es_info_length = ((section[index + 3] & 0x0F) << 8) | section[index + 4]
+            streams.append((stream_type, pid))
+            index += 5 + es_info_length
+        if not streams or self._timing_pid is not None:
+            return
+
+        for stream_type, pid in streams:
+            if stream_type in VIDEO_STREAM_TYPES:
+                self._timing_pid = pid
+                self._timing_is_video = True
+                return
+        self._timing_pid = streams[0][1]
+
+
+class LiveSegmentBuffer:
+    """Bounded ring of recent live segments with a cached playlist"""
+
+    # Segments kept after they left the playlist window, for slow fetches
+    EXTRA_SEGMENTS = 2
+
+    def __init__(self, list_size: int, target_duration: float):
+        self.list_size = list_size
+        self.target_duration = target_duration
+        self._segments: Deque[LiveSegment] = deque(
+            maxlen=list_size + self.EXTRA_SEGMENTS
+        )
+        self._next_sequence = 0
+        self._max_duration = float(target_duration)
+        self._playlist: Optional[str] = None
+        self._changed = asyncio.Event()
+        self.ended = False
+
+    @property
+    def version(self) -> int:
+        """Changes whenever a segment is added (the next media sequence)"""
+        return self._next_sequence
+
+    @property
+    def last_sequence(self) -> int:
+        return self._next_sequence - 1
+
+    def add_segment(self, duration: float, data: bytes) -> LiveSegment:
+        segment = LiveSegment(self._next_sequence, duration, data)
+        self._segments.append(segment)
+        self._next_sequence += 1
+        self._max_duration = max(self._max_duration, duration)
+        self._playlist = None
+        self._notify()
+        return segment
+
+    def end(self) -> None:
+        """Mark the stream finished and release blocked playlist requests"""
+        self.ended = True
+        self._notify()
+
+    def _notify(self) -> None:
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def get_segment(self, sequence: int) -> Optional[LiveSegment]:
+        if not self._segments:
+            return None
+        index = sequence - self._segments[0].sequence
+        if 0 <= index < len(self._segments):
+            return self._segments[index]
+        return None
+
+    async def wait_for_sequence(self, sequence: int, timeout: float) -> bool:
+        """Block until the segment exists (LL-HLS blocking playlist reload)"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while self.last_sequence < sequence and not self.ended:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+            try:
+                await asyncio.wait_for(self._changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                return False
+        return self.last_sequence >= sequence
+
+    def render_playlist(self) -> str:
+        """Media playlist for the current window, rendered once per segment"""
+        if self._playlist is None:
+            window: List[LiveSegment] = list(self._segments)[-self.list_size :]
+            first_sequence = window[0].sequence if window else self._next_sequence
+            lines = [
+                "#EXTM3U",
+                "#EXT-X-VERSION:6",
+                f"#EXT-X-TARGETDURATION:{math.ceil(self._max_duration)}",
+                f"#EXT-X-MEDIA-SEQUENCE:{first_sequence}",
+                "#EXT-X-SERVER-CONTROL:CAN-BLOCK-RELOAD=YES",
+            ]
+            for segment in window:
+                lines.append(f"#EXTINF:{segment.duration:.3f},")
+                lines.append(segment.name)
+            self._playlist = "\n".join(lines) + "\n"
+        return self._playlist
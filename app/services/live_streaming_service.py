@@ -7,10 +7,19 @@ Uses Streamlink -> FFmpeg -> HLS segments pipeline.
 Architecture:
     1. User clicks "Watch Live" on a streamer card
     2. Backend starts Streamlink with --stdout (no file output)
-    3. FFmpeg reads MPEG-TS from stdin and generates HLS segments
-    4. Segments are served via FastAPI static file endpoints
+    3. FFmpeg remuxes stdin to MPEG-TS on stdout
+    4. MpegTsSegmenter cuts it into HLS segments kept in a memory ring
+       (LiveSegmentBuffer); playlist and segments are served from memory
     5. Browser plays via hls.js or native HLS support
 
+Shared ingest:
+    Sessions for the same (streamer, quality, codecs) share one pipeline.
+    The first viewer starts Streamlink + FFmpeg; later viewers only get a
+    session with their own playback token that reads the same HLS output.
+    The pipeline is ref-counted and torn down when its last session stops
+    or expires. If ProcessManager is already recording the streamer, the
+    pipeline tails the recording file instead of pulling from Twitch again.
+
 Features:
     - Automatic Twitch OAuth token injection (via TwitchTokenService)
     - Dynamic proxy selection (via ProxyHealthService)
@@ -26,10 +35,10 @@ import secrets
 import shutil
 import uuid
 from datetime import datetime
-from pathlib import Path
-from typing import Dict, Optional, Set
+from typing import Callable, Dict, Optional, Set, Tuple
 
 from app.database import SessionLocal
+from app.services.live_segment_buffer import LiveSegmentBuffer, MpegTsSegmenter
 from app.services.proxy.proxy_health_service import proxy_health_service
 from app.services.system.twitch_token_service import TwitchTokenService
 from app.utils.streamlink_utils import _add_proxy_settings
@@ -47,28 +56,31 @@ class LiveStreamSession:
         quality: str,
         streamlink_process: asyncio.subprocess.Process,
         ffmpeg_process: asyncio.subprocess.Process,
-        output_dir: Path,
         user_id: Optional[str] = None,
+        pipeline: Optional["LivePipeline"] = None,
     ):
         self.session_id = session_id
         self.streamer_name = streamer_name
         self.quality = quality
         self.streamlink_process = streamlink_process
         self.ffmpeg_process = ffmpeg_process
-        self.output_dir = output_dir
         self.user_id = user_id
         self.playback_token = secrets.token_urlsafe(32)
         self.created_at = datetime.utcnow()
         self.last_accessed = datetime.utcnow()
         self.is_active = True
+        # Set when the processes belong to a (shared) LivePipeline
+        self.pipeline = pipeline
+        # (segment buffer version, token-rewritten playlist)
+        self.playlist_cache: Optional[Tuple[int, str]] = None
 
     def touch(self):
         """Update last accessed timestamp"""
         self.last_accessed = datetime.utcnow()
 
     @property
-    def playlist_path(self) -> Path:
-        return self.output_dir / "playlist.m3u8"
+    def segments(self) -> Optional[LiveSegmentBuffer]:
+        return self.pipeline.segments if self.pipeline else None
 
     def validate_playback_token(self, token: Optional[str]) -> bool:
         """Validate the bearer token used by native HLS/video requests."""
@@ -81,15 +93,65 @@ class LiveStreamSession:
         ).total_seconds() > timeout_seconds
 
 
+class LivePipeline:
+    """One ingest + FFmpeg HLS muxer, shared by all sessions with the same key"""
+
+    def __init__(
+        self,
+        key: Tuple[str, str, str],
+        pipeline_id: str,
+        streamer_name: str,
+        quality: str,
+        ffmpeg_process: asyncio.subprocess.Process,
+        segments: LiveSegmentBuffer,
+        streamlink_process: Optional[asyncio.subprocess.Process] = None,
+        feed_task: Optional[asyncio.Task] = None,
+        segment_task: Optional[asyncio.Task] = None,
+        source: str = "twitch",
+    ):
+        self.key = key
+        self.pipeline_id = pipeline_id
+        self.streamer_name = streamer_name
+        self.quality = quality
+        self.ffmpeg_process = ffmpeg_process
+        self.streamlink_process = streamlink_process
+        self.segments = segments
+        self.feed_task = feed_task
+        self.segment_task = segment_task
+        self.source = source  # "twitch" or "recording"
+        self.session_ids: Set[str] = set()
+        self.created_at = datetime.utcnow()
+
+    @property
+    def is_alive(self) -> bool:
+        if self.ffmpeg_process.returncode is not None:
+            return False
+        if self.streamlink_process is not None:
+            return self.streamlink_process.returncode is None
+        return True
+
+
 class LiveStreamingService:
     """Service for managing live streaming sessions"""
 
     # Session timeout - auto-cleanup after X seconds of inactivity
     SESSION_TIMEOUT_SECONDS = 60
 
-    # Global maximum concurrent live streams
+    # Global maximum concurrent live ingests (shared pipelines, not viewers)
     MAX_CONCURRENT_STREAMS = 5
 
+    # Share one ingest between sessions for the same streamer/quality/codecs
+    SHARED_PIPELINES = True
+
+    # Read from an in-progress recording instead of opening another connection
+    TAP_RECORDINGS = True
+
+    # How far behind the live edge a recording tap starts (bytes)
+    TAP_BACKLOG_BYTES = 4 * 1024 * 1024
+
+    # Stop a recording tap once the file stopped growing for this long
+    TAP_IDLE_TIMEOUT_SECONDS = 30
+
     # Segment duration in seconds for HLS
     HLS_SEGMENT_DURATION = 2
 
@@ -99,6 +161,8 @@ class LiveStreamingService:
     def __init__(self):
         self.sessions: Dict[str, LiveStreamSession] = {}
         self.user_sessions: Dict[str, Set[str]] = {}  # user_id -> set of session_ids
+        self.pipelines: Dict[Tuple[str, str, str], LivePipeline] = {}
+        self._pipeline_locks: Dict[Tuple[str, str, str], asyncio.Lock] = {}
         self._cleanup_task: Optional[asyncio.Task] = None
         self._lock = asyncio.Lock()
 
@@ -137,6 +201,9 @@ class LiveStreamingService:
         """
         Start a new live streaming session.
 
+        Joins the running pipeline for the same streamer/quality/codecs if
+        there is one, otherwise starts a new ingest.
+
         Args:
             streamer_name: Twitch username to stream
             quality: Stream quality (best, 1080p, 720p, etc.)
@@ -150,28 +217,121 @@ class LiveStreamingService:
         Raises:
             RuntimeError: If max concurrent streams reached or stream start fails
         """
-        if replace_existing and user_id:
-            await self._stop_existing_user_streams(user_id, streamer_name)
+        normalized_codecs = self._normalize_supported_codecs(supported_codecs)
+        key = (streamer_name.lower(), quality, normalized_codecs)
+        if not self.SHARED_PIPELINES:
+            # Every session gets its own ingest
+            key = (*key[:2], f"{normalized_codecs}#{uuid.uuid4()}")
 
         async with self._lock:
-            # Check global concurrent limit
-            active_count = sum(1 for s in self.sessions.values() if s.is_active)
-            if active_count >= self.MAX_CONCURRENT_STREAMS:
-                raise RuntimeError(
-                    f"Maximum concurrent streams reached"
-                    f" ({self.MAX_CONCURRENT_STREAMS})."
-                    " Please stop another stream first."
-                )
+            # Sessions this one replaces are stopped after it has joined, so a
+            # shared pipeline isn't torn down and restarted in between
+            replaced = (
+                self._find_user_streams(user_id, streamer_name)
+                if replace_existing and user_id
+                else []
+            )
 
             # Limit per-user concurrent streams
             if user_id:
                 user_stream_count = len(self.user_sessions.get(user_id, set()))
-                if user_stream_count >= 2:
+                if user_stream_count - len(replaced) >= 2:
                     raise RuntimeError(
                         "Maximum 2 concurrent streams per user."
                         " Please stop another stream first."
                     )
 
+        pipeline_lock = self._pipeline_locks.setdefault(key, asyncio.Lock())
+        try:
+            async with pipeline_lock:
+                session = None
+                async with self._lock:
+                    pipeline = self.pipelines.get(key)
+                    if pipeline is not None and pipeline.is_alive:
+                        session = self._attach_session(pipeline, user_id)
+                    else:
+                        # Check global concurrent limit
+                        active_count = sum(
+                            1 for p in self.pipelines.values() if p.is_alive
+                        )
+                        if active_count >= self.MAX_CONCURRENT_STREAMS:
+                            raise RuntimeError(
+                                f"Maximum concurrent streams reached"
+                                f" ({self.MAX_CONCURRENT_STREAMS})."
+                                " Please stop another stream first."
+                            )
+
+                if session is None:
+                    pipeline = await self._start_pipeline(
+                        key, streamer_name, quality, supported_codecs
+                    )
+                    async with self._lock:
+                        # A dead pipeline under this key is left to its monitor
+                        self.pipelines[key] = pipeline
+                        session = self._attach_session(pipeline, user_id)
+
+                    # Start background monitoring
+                    asyncio.create_task(self._monitor_pipeline(pipeline))
+                else:
+                    logger.info(
+                        f"[LIVE] Session {session.session_id} joined shared pipeline "
+                        f"{pipeline.pipeline_id} for {streamer_name} "
+                        f"({len(pipeline.session_ids)} viewers)"
+                    )
+        except BaseException:
+            # A failed start leaves no pipeline behind to clean up the lock
+            self._discard_pipeline_lock(key)
+            raise
+
+        for session_id in replaced:
+            logger.info(
+                "[LIVE] Replacing existing session %s for user %s (%s)",
+                session_id,
+                user_id,
+                streamer_name,
+            )
+            await self.stop_stream(session_id)
+
+        logger.info(f"[LIVE] Session {session.session_id} started successfully")
+        return session.session_id
+
+    def _discard_pipeline_lock(self, key: Tuple[str, str, str]) -> None:
+        """Forget the start lock of a key that has no pipeline and no holder"""
+        if key in self.pipelines:
+            return
+        pipeline_lock = self._pipeline_locks.get(key)
+        if pipeline_lock is not None and not pipeline_lock.locked():
+            del self._pipeline_locks[key]
+
+    def _attach_session(
+        self, pipeline: LivePipeline, user_id: Optional[str]
+    ) -> LiveStreamSession:
+        """Create a session reading from a pipeline (caller holds self._lock)"""
+        session = LiveStreamSession(
+            session_id=str(uuid.uuid4())[:8],
+            streamer_name=pipeline.streamer_name,
+            quality=pipeline.quality,
+            streamlink_process=pipeline.streamlink_process,
+            ffmpeg_process=pipeline.ffmpeg_process,
+            user_id=user_id,
+            pipeline=pipeline,
+        )
+        pipeline.session_ids.add(session.session_id)
+        self.sessions[session.session_id] = session
+        if user_id:
+            if user_id not in self.user_sessions:
+                self.user_sessions[user_id] = set()
+            self.user_sessions[user_id].add(session.session_id)
+        return session
+
+    async def _start_pipeline(
+        self,
+        key: Tuple[str, str, str],
+        streamer_name: str,
+        quality: str,
+        supported_codecs: str,
+    ) -> LivePipeline:
+        """Start an ingest (Twitch or recording tap) and wait for a first segment"""
         # Verify FFmpeg is available before starting anything
         ffmpeg_bin = os.environ.get("FFMPEG_PATH") or "ffmpeg"
         if shutil.which(ffmpeg_bin) is None:
@@ -179,65 +339,83 @@ class LiveStreamingService:
                 f"FFmpeg not found at '{ffmpeg_bin}'. Live streaming unavailable."
             )
 
-        # Generate unique session ID
-        session_id = str(uuid.uuid4())[:8]
+        # Generate unique pipeline ID
+        pipeline_id = str(uuid.uuid4())[:8]
 
-        # Create output directory for HLS segments
-        output_dir = Path(f"/tmp/streamvault-live/{session_id}")
-        output_dir.mkdir(parents=True, exist_ok=True)
+        # HLS segments are kept in memory, never written to disk
+        segments = LiveSegmentBuffer(
+            list_size=self.HLS_LIST_SIZE, target_duration=self.HLS_SEGMENT_DURATION
+        )
 
         streamlink_process = None
         ffmpeg_process = None
+        feed_task = None
+        segment_task = None
         try:
-            # Get fresh OAuth token and proxy settings
-            streamlink_cmd = await self._build_streamlink_command(
-                streamer_name, quality, supported_codecs=supported_codecs
-            )
+            recording_path = self._find_recording_tap(key)
 
             # Build FFmpeg HLS command
-            ffmpeg_cmd = self._build_ffmpeg_command(output_dir)
+            ffmpeg_cmd = self._build_ffmpeg_command()
 
             logger.info(
-                f"[LIVE] Starting stream session {session_id} for {streamer_name} "
-                f"(quality: {quality}, codecs: "
-                f"{self._normalize_supported_codecs(supported_codecs)})"
+                f"[LIVE] Starting pipeline {pipeline_id} for {streamer_name} "
+                f"(quality: {quality}, codecs: {key[2]}, "
+                f"source: {'recording' if recording_path else 'twitch'})"
             )
 
             # Start FFmpeg first (reads from stdin)
             ffmpeg_process = await asyncio.create_subprocess_exec(
                 *ffmpeg_cmd,
                 stdin=asyncio.subprocess.PIPE,
-                stdout=asyncio.subprocess.DEVNULL,
-                stderr=asyncio.subprocess.PIPE,
-            )
-
-            # Start Streamlink with stdout captured
-            streamlink_process = await asyncio.create_subprocess_exec(
-                *streamlink_cmd,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
             )
-
-            # Start background stderr loggers so we can diagnose failures
             asyncio.create_task(
-                self._log_stderr(streamlink_process, f"streamlink-{session_id}")
+                self._log_stderr(ffmpeg_process, f"ffmpeg-{pipeline_id}")
             )
-            asyncio.create_task(
-                self._log_stderr(ffmpeg_process, f"ffmpeg-{session_id}")
+            segment_task = asyncio.create_task(
+                self._segment_ffmpeg_output(ffmpeg_process, segments)
             )
 
-            # Start piping data from streamlink stdout -> ffmpeg stdin
-            asyncio.create_task(
-                self._pipe_streamlink_to_ffmpeg(streamlink_process, ffmpeg_process)
-            )
+            if recording_path:
+                # Tail the file ProcessManager is already writing
+                feed_task = asyncio.create_task(
+                    self._pipe_recording_to_ffmpeg(
+                        recording_path,
+                        lambda: self._get_recording_path(streamer_name),
+                        ffmpeg_process,
+                    )
+                )
+            else:
+                # Get fresh OAuth token and proxy settings
+                streamlink_cmd = await self._build_streamlink_command(
+                    streamer_name, quality, supported_codecs=supported_codecs
+                )
+
+                # Start Streamlink with stdout captured
+                streamlink_process = await asyncio.create_subprocess_exec(
+                    *streamlink_cmd,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                )
 
-            # Wait for the HLS playlist to appear (with timeout)
-            playlist_path = output_dir / "playlist.m3u8"
-            playlist_ready = await self._wait_for_playlist(playlist_path, timeout=15)
+                # Start background stderr logger so we can diagnose failures
+                asyncio.create_task(
+                    self._log_stderr(streamlink_process, f"streamlink-{pipeline_id}")
+                )
+
+                # Start piping data from streamlink stdout -> ffmpeg stdin
+                feed_task = asyncio.create_task(
+                    self._pipe_streamlink_to_ffmpeg(streamlink_process, ffmpeg_process)
+                )
+
+            # Wait for the first HLS segment (with timeout)
+            logger.info(f"[LIVE] Waiting for first HLS segment of {pipeline_id}")
+            playlist_ready = await segments.wait_for_sequence(0, timeout=15)
 
             if not playlist_ready:
                 # Check if processes already died
-                sl_code = streamlink_process.returncode
+                sl_code = streamlink_process.returncode if streamlink_process else None
                 ff_code = ffmpeg_process.returncode
                 if sl_code is not None or ff_code is not None:
                     raise RuntimeError(
@@ -249,75 +427,39 @@ class LiveStreamingService:
                     "Streamer may be offline or stream is not accessible."
                 )
 
-            # Create session
-            session = LiveStreamSession(
-                session_id=session_id,
+            return LivePipeline(
+                key=key,
+                pipeline_id=pipeline_id,
                 streamer_name=streamer_name,
                 quality=quality,
-                streamlink_process=streamlink_process,
                 ffmpeg_process=ffmpeg_process,
-                output_dir=output_dir,
-                user_id=user_id,
+                segments=segments,
+                streamlink_process=streamlink_process,
+                feed_task=feed_task,
+                segment_task=segment_task,
+                source="recording" if recording_path else "twitch",
             )
 
-            async with self._lock:
-                self.sessions[session_id] = session
-                if user_id:
-                    if user_id not in self.user_sessions:
-                        self.user_sessions[user_id] = set()
-                    self.user_sessions[user_id].add(session_id)
-
-            # Start background monitoring
-            asyncio.create_task(self._monitor_session(session_id))
-
-            logger.info(f"[LIVE] Session {session_id} started successfully")
-            return session_id
-
         except Exception:
             # Cleanup on any failure
+            for task in (feed_task, segment_task):
+                if task and not task.done():
+                    task.cancel()
             if streamlink_process and streamlink_process.returncode is None:
                 streamlink_process.kill()
             if ffmpeg_process and ffmpeg_process.returncode is None:
                 ffmpeg_process.kill()
-            shutil.rmtree(output_dir, ignore_errors=True)
             raise
 
-    async def _stop_existing_user_streams(
-        self, user_id: str, streamer_name: str
-    ) -> None:
-        """Stop older sessions for the same user and streamer before replacement."""
-        async with self._lock:
-            session_ids = [
-                session_id
-                for session_id, session in self.sessions.items()
-                if session.is_active
-                and session.user_id == user_id
-                and session.streamer_name.lower() == streamer_name.lower()
-            ]
-
-        for session_id in session_ids:
-            logger.info(
-                "[LIVE] Replacing existing session %s for user %s (%s)",
-                session_id,
-                user_id,
-                streamer_name,
-            )
-            await self.stop_stream(session_id)
-
-    async def _wait_for_playlist(self, playlist_path: Path, timeout: int = 15) -> bool:
-        """Poll until the HLS playlist file exists or timeout is reached."""
-        logger.info(f"[LIVE] Waiting for HLS playlist to appear: {playlist_path}")
-        deadline = asyncio.get_event_loop().time() + timeout
-        while asyncio.get_event_loop().time() < deadline:
-            if playlist_path.exists() and playlist_path.stat().st_size > 0:
-                elapsed = timeout - (deadline - asyncio.get_event_loop().time())
-                logger.info(f"[LIVE] HLS playlist ready after {elapsed:.1f}s")
-                return True
-            await asyncio.sleep(0.5)
-        logger.warning(
-            f"[LIVE] HLS playlist did not appear within {timeout}s: {playlist_path}"
-        )
-        return False
+    def _find_user_streams(self, user_id: str, streamer_name: str) -> list:
+        """Active sessions of a user for a streamer (caller holds self._lock)"""
+        return [
+            session_id
+            for session_id, session in self.sessions.items()
+            if session.is_active
+            and session.user_id == user_id
+            and session.streamer_name.lower() == streamer_name.lower()
+        ]
 
     async def _log_stderr(
         self,
@@ -342,6 +484,9 @@ class LiveStreamingService:
         """
         Stop a live streaming session and cleanup resources.
 
+        Sessions on a shared pipeline only release their reference; the
+        pipeline itself is stopped when its last session goes away.
+
         Args:
             session_id: The session to stop
 
@@ -349,19 +494,57 @@ class LiveStreamingService:
             True if session was stopped, False if not found
         """
         async with self._lock:
-            session = self.sessions.get(session_id)
+            session = self.sessions.pop(session_id, None)
             if not session:
                 return False
 
+            # Mark as inactive
+            session.is_active = False
+            if session.user_id and session.user_id in self.user_sessions:
+                self.user_sessions[session.user_id].discard(session_id)
+
+            pipeline = session.pipeline
+            if pipeline is not None:
+                pipeline.session_ids.discard(session_id)
+                if pipeline.session_ids:
+                    pipeline = None  # Still watched by other sessions
+                elif self.pipelines.get(pipeline.key) is pipeline:
+                    del self.pipelines[pipeline.key]
+                    self._discard_pipeline_lock(pipeline.key)
+
         logger.info(f"[LIVE] Stopping session {session_id} ({session.streamer_name})")
 
-        # Mark as inactive
-        session.is_active = False
+        if pipeline is not None:
+            await self._stop_pipeline(pipeline)
+
+        logger.info(f"[LIVE] Session {session_id} stopped and cleaned up")
+        return True
+
+    async def _stop_pipeline(self, pipeline: LivePipeline):
+        """Stop an ingest pipeline that has no sessions left"""
+        logger.info(
+            f"[LIVE] Stopping pipeline {pipeline.pipeline_id} "
+            f"({pipeline.streamer_name}, source: {pipeline.source})"
+        )
+        if pipeline.feed_task and not pipeline.feed_task.done():
+            pipeline.feed_task.cancel()
+        await self._terminate_processes(
+            pipeline.streamlink_process, pipeline.ffmpeg_process
+        )
+        if pipeline.segment_task and not pipeline.segment_task.done():
+            pipeline.segment_task.cancel()
+        pipeline.segments.end()
 
+    async def _terminate_processes(
+        self,
+        streamlink_process: Optional[asyncio.subprocess.Process],
+        ffmpeg_process: Optional[asyncio.subprocess.Process],
+    ):
+        """Terminate Streamlink/FFmpeg gracefully, killing them if needed"""
         # Terminate processes gracefully
-        for proc, name in [
-            (session.streamlink_process, "streamlink"),
-            (session.ffmpeg_process, "ffmpeg"),
+        for proc, proc_name in [
+            (streamlink_process, "streamlink"),
+            (ffmpeg_process, "ffmpeg"),
         ]:
             if proc and proc.returncode is None:
                 try:
@@ -371,31 +554,13 @@ class LiveStreamingService:
                         await asyncio.wait_for(proc.wait(), timeout=5.0)
                     except asyncio.TimeoutError:
                         logger.warning(
-                            f"[LIVE] {name} process did not terminate"
+                            f"[LIVE] {proc_name} process did not terminate"
                             " gracefully, killing..."
                         )
                         proc.kill()
                         await proc.wait()
                 except Exception as e:
-                    logger.error(f"[LIVE] Error stopping {name}: {e}")
-
-        # Cleanup files
-        try:
-            if session.output_dir.exists():
-                shutil.rmtree(session.output_dir, ignore_errors=True)
-                logger.debug(f"[LIVE] Cleaned up output directory for {session_id}")
-        except Exception as e:
-            logger.error(f"[LIVE] Error cleaning up session {session_id}: {e}")
-
-        # Remove from tracking
-        async with self._lock:
-            if session_id in self.sessions:
-                del self.sessions[session_id]
-            if session.user_id and session.user_id in self.user_sessions:
-                self.user_sessions[session.user_id].discard(session_id)
-
-        logger.info(f"[LIVE] Session {session_id} stopped and cleaned up")
-        return True
+                    logger.error(f"[LIVE] Error stopping {proc_name}: {e}")
 
     def get_session(self, session_id: str) -> Optional[LiveStreamSession]:
         """Get a session by ID and update its access time"""
@@ -411,10 +576,14 @@ class LiveStreamingService:
         if not session:
             return None
 
+        pipeline = session.pipeline
+
         return {
             "session_id": session.session_id,
             "streamer_name": session.streamer_name,
             "quality": session.quality,
+            "source": pipeline.source if pipeline else "twitch",
+            "viewers": len(pipeline.session_ids) if pipeline else 1,
             "is_active": session.is_active,
             "created_at": session.created_at.isoformat(),
             "last_accessed": session.last_accessed.isoformat(),
@@ -435,6 +604,48 @@ class LiveStreamingService:
         # playback implicitly. HEVC/AV1 must be requested by the browser/player.
         return ",".join(codecs) if codecs else "h264"
 
+    def _get_live_recording(self, streamer_name: str) -> Optional[dict]:
+        """What ProcessManager is currently recording for the streamer, if any"""
+        try:
+            from app.services.recording.process_manager import ProcessManager
+
+            process_manager = ProcessManager.get_existing_instance()
+            if process_manager is None:
+                return None
+            return process_manager.get_live_recording(streamer_name)
+        except Exception as e:
+            logger.debug(f"[LIVE] Could not look up active recording: {e}")
+            return None
+
+    def _get_recording_path(self, streamer_name: str) -> Optional[str]:
+        recording = self._get_live_recording(streamer_name)
+        return recording["path"] if recording else None
+
+    def _find_recording_tap(self, key: Tuple[str, str, str]) -> Optional[str]:
+        """Return the recording file to tap if it matches the requested stream.
+
+        The recording must use a quality the viewer asked for ("best" takes
+        whatever is recorded) and only codecs the player can decode.
+        """
+        if not self.TAP_RECORDINGS:
+            return None
+        streamer_name, quality, codecs = key
+        recording = self._get_live_recording(streamer_name)
+        if not recording or not recording.get("path"):
+            return None
+
+        if quality != "best" and quality != recording.get("quality"):
+            return None
+        recorded_codecs = recording.get("supported_codecs")
+        if not recorded_codecs:
+            return None  # Unknown codecs; the player may not decode them
+        player_codecs = set(codecs.split("#")[0].split(","))
+        if not {c.strip().lower() for c in recorded_codecs.split(",")} <= (
+            player_codecs
+        ):
+            return None
+        return recording["path"]
+
     async def _build_streamlink_command(
         self,
         streamer_name: str,
@@ -477,12 +688,10 @@ class LiveStreamingService:
 
         return cmd
 
-    def _build_ffmpeg_command(self, output_dir: Path) -> list:
-        """Build FFmpeg command for HLS generation from stdin"""
+    def _build_ffmpeg_command(self) -> list:
+        """Build FFmpeg command remuxing stdin to MPEG-TS on stdout"""
         ffmpeg_bin = os.environ.get("FFMPEG_PATH") or "ffmpeg"
 
-        playlist_path = output_dir / "playlist.m3u8"
-
         return [
             ffmpeg_bin,
             "-hide_banner",
@@ -493,18 +702,35 @@ class LiveStreamingService:
             "-c",
             "copy",  # Copy streams without re-encoding
             "-f",
-            "hls",
-            "-hls_time",
-            str(self.HLS_SEGMENT_DURATION),
-            "-hls_list_size",
-            str(self.HLS_LIST_SIZE),
-            "-hls_flags",
-            "delete_segments+omit_endlist",
-            "-hls_segment_filename",
-            str(output_dir / "segment_%03d.ts"),
-            str(playlist_path),
+            "mpegts",
+            "-",  # Write to stdout for in-memory segmentation
         ]
 
+    async def _segment_ffmpeg_output(
+        self,
+        ffmpeg_process: asyncio.subprocess.Process,
+        segments: LiveSegmentBuffer,
+    ):
+        """Cut FFmpeg's MPEG-TS output into HLS segments held in memory"""
+        segmenter = MpegTsSegmenter(
+            target_duration=self.HLS_SEGMENT_DURATION,
+            on_segment=segments.add_segment,
+        )
+        try:
+            if ffmpeg_process.stdout:
+                while True:
+                    chunk = await ffmpeg_process.stdout.read(65536)
+                    if not chunk:
+                        break
+                    segmenter.feed(chunk)
+                segmenter.flush()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"[LIVE] Error segmenting ffmpeg output: {e}")
+        finally:
+            segments.end()
+
     async def _pipe_streamlink_to_ffmpeg(
         self,
         streamlink_process: asyncio.subprocess.Process,
@@ -523,31 +749,85 @@ class LiveStreamingService:
         except Exception as e:
             logger.error(f"[LIVE] Error piping streamlink to ffmpeg: {e}")
 
-    async def _monitor_session(self, session_id: str):
-        """Monitor a session and auto-cleanup if processes die"""
+    async def _pipe_recording_to_ffmpeg(
+        self,
+        recording_path: str,
+        resolve_path: Callable[[], Optional[str]],
+        ffmpeg_process: asyncio.subprocess.Process,
+    ):
+        """Follow a growing recording file and pipe it into FFmpeg stdin.
+
+        Starts TAP_BACKLOG_BYTES behind the live edge, switches to the next
+        segment file when ProcessManager rotates, and ends once the file
+        stopped growing for TAP_IDLE_TIMEOUT_SECONDS.
+        """
+        current_path = recording_path
+        handle = None
+        from_live_edge = True
+        idle_seconds = 0.0
         try:
-            session = self.sessions.get(session_id)
-            if not session:
+            if not ffmpeg_process.stdin:
                 return
+            while current_path:
+                if handle is None:
+                    handle = await asyncio.to_thread(open, current_path, "rb")
+                    if from_live_edge:
+                        size = await asyncio.to_thread(os.path.getsize, current_path)
+                        offset = max(0, size - self.TAP_BACKLOG_BYTES)
+                        # Stay aligned to 188-byte MPEG-TS packets
+                        await asyncio.to_thread(handle.seek, offset - offset % 188)
+
+                chunk = await asyncio.to_thread(handle.read, 256 * 1024)
+                if chunk:
+                    idle_seconds = 0.0
+                    ffmpeg_process.stdin.write(chunk)
+                    await ffmpeg_process.stdin.drain()
+                    continue
+
+                await asyncio.sleep(0.5)
+                idle_seconds += 0.5
+
+                latest_path = resolve_path()
+                if latest_path and latest_path != current_path:
+                    # Segment rotation: continue with the new file from its start
+                    handle.close()
+                    handle = None
+                    current_path = latest_path
+                    from_live_edge = False
+                    idle_seconds = 0.0
+                elif idle_seconds >= self.TAP_IDLE_TIMEOUT_SECONDS:
+                    logger.info(f"[LIVE] Recording tap ended: {current_path}")
+                    break
 
-            # Wait for either process to exit
-            while session.is_active:
-                # Check if processes are still running
-                streamlink_done = session.streamlink_process.returncode is not None
-                ffmpeg_done = session.ffmpeg_process.returncode is not None
+            ffmpeg_process.stdin.close()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"[LIVE] Error piping recording to ffmpeg: {e}")
+        finally:
+            if handle is not None:
+                handle.close()
 
-                if streamlink_done or ffmpeg_done:
+    async def _monitor_pipeline(self, pipeline: LivePipeline):
+        """Monitor a pipeline and stop its sessions if the ingest dies"""
+        try:
+            # Wait for either process to exit while anyone is watching
+            while pipeline.session_ids:
+                if not pipeline.is_alive:
                     logger.info(
-                        f"[LIVE] Process exited for session {session_id}, "
+                        f"[LIVE] Process exited for pipeline {pipeline.pipeline_id}, "
                         f"cleaning up..."
                     )
-                    await self.stop_stream(session_id)
                     break
-
                 await asyncio.sleep(2)
-
+            else:
+                return
         except Exception as e:
-            logger.error(f"[LIVE] Error monitoring session {session_id}: {e}")
+            logger.error(
+                f"[LIVE] Error monitoring pipeline {pipeline.pipeline_id}: {e}"
+            )
+
+        for session_id in list(pipeline.session_ids):
             await self.stop_stream(session_id)
 
     async def _cleanup_loop(self):
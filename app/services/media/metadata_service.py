@@ -14,11 +14,13 @@ import xml.etree.ElementTree as ET
 from sqlalchemy.orm import Session, joinedload
 
 from app.database import SessionLocal
-from app.models import Stream, StreamMetadata, StreamEvent, Streamer, RecordingSettings
+from app.models import Stream, StreamMetadata, StreamEvent, Streamer
 from app.services.system.logging_service import logging_service
 
 # artwork_service imported lazily to avoid directory creation at import time
 from app.utils.file_utils import sanitize_filename
+from app.utils.media_probe import media_probe
+from app.services.core.settings_snapshot import settings_snapshot
 
 logger = logging.getLogger("streamvault")
 
@@ -1163,9 +1165,7 @@ class MetadataService:
                 return False
 
             # Get the current filename preset from settings
-            recording_settings = None
-            if db:
-                recording_settings = db.query(RecordingSettings).first()
+            recording_settings = settings_snapshot.get_recording_settings()
 
             # Default to generic files if no specific preset found
             filename_preset = "default"
@@ -1594,39 +1594,23 @@ class MetadataService:
                 return str(thumbnail_path)
 
             # Check if the file has a video stream first (skip audio-only)
-            check_cmd = [
-                "ffprobe",
-                "-v",
-                "error",
-                "-select_streams",
-                "v:0",
-                "-show_entries",
-                "stream=codec_type",
-                "-of",
-                "default=noprint_wrappers=1:nokey=1",
-                str(video_path_obj),
-            ]
-            check_process = await asyncio.create_subprocess_exec(
-                *check_cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            check_stdout, _ = await check_process.communicate()
-            if (
-                check_process.returncode != 0
-                or not check_stdout
-                or "video" not in check_stdout.decode("utf-8", errors="ignore").lower()
-            ):
+            probe = await media_probe.probe(str(video_path_obj))
+            if probe is None or not probe.has_video:
                 logger.info(
                     f"Audio-only file detected, skipping thumbnail extraction: {video_path}"
                 )
                 return None
 
-            # FFmpeg command to grab a frame at 10s for better quality
+            # Grab a frame at 10s for better quality, or from the middle of
+            # recordings shorter than that
+            seek_seconds = 10.0
+            if probe.duration is not None and probe.duration < 2 * seek_seconds:
+                seek_seconds = probe.duration / 2
+
             cmd = [
                 "ffmpeg",
                 "-ss",
-                "00:00:10",
+                f"{seek_seconds:.3f}",
                 "-i",
                 str(video_path_obj),
                 "-vframes",
@@ -2581,7 +2565,11 @@ class MetadataService:
     async def embed_all_metadata(
         self, mp4_path: str, chapters_path: str, stream_id: int
     ) -> bool:
-        """Embed both chapters and all other metadata in one pass."""
+        """Embed both chapters and all other metadata in one pass.
+
+        This is a full -c copy pass over the file; the TS->MP4 remux already
+        writes the same tags and chapters, so its outputs do not need it.
+        """
         try:
             logger.info(
                 f"Starting metadata embedding for stream {stream_id}, mp4: {mp4_path}"
@@ -2850,6 +2838,30 @@ class MetadataService:
         secs = seconds % 60
         return f"{hours:02d}:{minutes:02d}:{secs:09.6f}"
 
+    def build_container_metadata(
+        self, stream: Stream, streamer_name: str
+    ) -> Dict[str, Any]:
+        """Global tags written into the recording container.
+
+        Shared by the TS->MP4 remux (which embeds them in the same pass) and
+        embed_metadata_with_ffmpeg_service, so both produce the same tags.
+        """
+        started_at = stream.started_at
+        return {
+            "title": stream.title or "Stream Recording",
+            "artist": streamer_name,
+            "album": f"{streamer_name} Streams",
+            "date": (started_at or datetime.now()).strftime("%Y-%m-%d"),
+            "year": str((started_at or datetime.now()).year),
+            "creation_time": started_at.isoformat() if started_at else None,
+            "genre": stream.category_name or "Gaming",
+            "comment": f"Recorded stream from {streamer_name}",
+            "description": stream.title or "Twitch stream recording",
+            "streamer": streamer_name,
+            "game": stream.category_name,
+            "stream_date": (started_at or datetime.now()).strftime("%Y-%m-%d"),
+        }
+
     async def embed_metadata_with_ffmpeg_service(
         self,
         db: Session,
@@ -2877,55 +2889,21 @@ class MetadataService:
             logger.info(f"Embedding metadata using FFmpeg for stream {stream.id}")
 
             # Prepare metadata dictionary for FFmpeg
-            metadata_dict = {
-                "title": stream.title or "Stream Recording",
-                "artist": streamer.username,
-                "album": f"{streamer.username} Streams",
-                "year": str(stream.started_at.year)
-                if stream.started_at
-                else str(datetime.now().year),
-                "genre": stream.category_name or "Gaming",
-                "comment": f"Recorded stream from {streamer.username}",
-                "description": stream.title or "Twitch stream recording",
-                "streamer": streamer.username,
-                "game": stream.category_name,
-                "stream_date": (
-                    stream.started_at.strftime("%Y-%m-%d")
-                    if stream.started_at
-                    else datetime.now().strftime("%Y-%m-%d")
-                ),
-            }
+            metadata_dict = self.build_container_metadata(stream, streamer.username)
 
             # Build FFmpeg command for metadata embedding
-            cmd = [
-                "ffmpeg",
-                "-i",
-                input_path,
-                "-c",
-                "copy",
-                "-metadata",
-                f"title={metadata_dict['title']}",
-                "-metadata",
-                f"artist={metadata_dict['artist']}",
-                "-metadata",
-                f"album={metadata_dict['album']}",
-                "-metadata",
-                f"year={metadata_dict['year']}",
-                "-metadata",
-                f"genre={metadata_dict['genre']}",
-                "-metadata",
-                f"comment={metadata_dict['comment']}",
-                "-metadata",
-                f"description={metadata_dict['description']}",
-                "-metadata",
-                f"streamer={metadata_dict['streamer']}",
-                "-metadata",
-                f"game={metadata_dict['game']}",
-                "-metadata",
-                f"stream_date={metadata_dict['stream_date']}",
-                "-y",  # Overwrite output file if exists
-                output_path,
-            ]
+            cmd = ["ffmpeg", "-i", input_path, "-c", "copy"]
+            for key, value in metadata_dict.items():
+                if value:
+                    cmd.extend(["-metadata", f"{key}={value}"])
+            cmd.extend(
+                [
+                    "-f",
+                    "mp4",
+                    "-y",  # Overwrite output file if exists
+                    output_path,
+                ]
+            )
 
             logger.debug(f"FFmpeg command for metadata embedding: {' '.join(cmd)}")
 
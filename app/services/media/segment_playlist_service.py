@@ -0,0 +1,522 @@
+"""
+Segment Playlist Service - HLS VOD playlists for segmented recordings
+
+Long streams are recorded into a ``*_segments`` directory of
+``*_partNNN.ts`` files (see ProcessManager._initialize_segmented_recording)
+and only concatenated into a single file at the end. This service exposes the
+parts as one seekable HLS playlist so those recordings can be watched right
+away instead of waiting for the concat.
+
+Parts are hours long, so each one is split into byte-range sub-segments
+(EXT-X-BYTERANGE) of roughly HLS_TARGET_CHUNK_SECONDS each; players then only
+fetch the bytes they are about to play.
+
+Ideally chunks start on video keyframes (found with one ``ffprobe
+-show_packets`` run per part) and, where the part has one right before the
+keyframe, on the PAT/PMT that precedes it, so a player can start decoding at
+any chunk. That scan reads the whole part - tens of GB for a day-long part -
+so it never blocks a playlist request: parts without a known keyframe layout
+are served with average-bitrate splits right away while a background task
+scans them, one part at a time, in a worker thread. Finished layouts are
+cached by (path, size, mtime) and persisted in a ``.{name}.keyframes.json``
+sidecar next to the part, so every part is scanned at most once.
+
+The playlist only claims EXT-X-INDEPENDENT-SEGMENTS when every listed part
+has a keyframe layout whose chunks all start on a PAT.
+"""
+
+import asyncio
+import json
+import logging
+import math
+import os
+import re
+import subprocess
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from cachetools import LRUCache
+
+from app.config.constants import CACHE_CONFIG
+from app.utils import ffmpeg_utils
+
+logger = logging.getLogger("streamvault")
+
+SEGMENT_PART_PATTERN = re.compile(r"_part(\d+)\.ts$")
+
+# Approximate length of one virtual HLS segment
+HLS_TARGET_CHUNK_SECONDS = 10
+
+# MPEG-TS packet size; byte ranges stay packet-aligned
+TS_PACKET_SIZE = 188
+
+# TS sync byte and the PID of the program association table
+TS_SYNC_BYTE = 0x47
+PAT_PID = 0
+
+# How far before a keyframe to look for the PAT/PMT that introduces it
+PAT_SEARCH_PACKETS = 64
+
+# Bound concurrent duration probes when a playlist is built for the first time
+MAX_CONCURRENT_PROBES = 4
+
+# Keyframe scans read whole parts; run them one after another
+MAX_CONCURRENT_KEYFRAME_SCANS = 1
+
+# Listing every video packet reads the whole part once
+KEYFRAME_PROBE_TIMEOUT_SECONDS = 600
+
+Chunk = Tuple[float, int, int]
+
+
+@dataclass(frozen=True)
+class SegmentPart:
+    """One ``*_partNNN.ts`` file of a segmented recording"""
+
+    path: str
+    number: int
+    size: int
+    mtime: float
+    duration: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class Keyframe:
+    """A video keyframe of a part: presentation time and TS packet offset"""
+
+    time: float
+    offset: int
+
+
+@dataclass(frozen=True)
+class PartLayout:
+    """Byte-range chunks of one part and whether each starts independently"""
+
+    chunks: List[Chunk]
+    independent: bool
+
+
+def is_segment_directory(path: Path) -> bool:
+    return path.is_dir() and path.name.endswith("_segments")
+
+
+def list_segment_parts(segment_dir: Path) -> List[SegmentPart]:
+    """List part files ordered by part number (blocking)"""
+    parts = []
+    with os.scandir(segment_dir) as entries:
+        for entry in entries:
+            match = SEGMENT_PART_PATTERN.search(entry.name)
+            if not match or not entry.is_file():
+                continue
+            st = entry.stat()
+            parts.append(
+                SegmentPart(
+                    path=entry.path,
+                    number=int(match.group(1)),
+                    size=st.st_size,
+                    mtime=st.st_mtime,
+                )
+            )
+    parts.sort(key=lambda part: part.number)
+    return parts
+
+
+def split_part(part: SegmentPart) -> List[Chunk]:
+    """Split a part into (duration, length, offset) byte-range chunks.
+
+    Chunk sizes follow the part's average bitrate, so chunk durations are
+    estimates; they add up to the probed duration of the part.
+    """
+    if not part.duration or part.duration <= 0 or part.size <= 0:
+        return []
+
+    bytes_per_second = part.size / part.duration
+    chunk_size = int(bytes_per_second * HLS_TARGET_CHUNK_SECONDS)
+    chunk_size = max(TS_PACKET_SIZE, chunk_size - chunk_size % TS_PACKET_SIZE)
+
+    chunks = []
+    offset = 0
+    while offset < part.size:
+        length = min(chunk_size, part.size - offset)
+        # Fold a tiny tail into the previous chunk
+        if chunks and length < chunk_size // 4:
+            _, previous_length, previous_offset = chunks.pop()
+            length += previous_length
+            offset = previous_offset
+        chunks.append((length / bytes_per_second, length, offset))
+        offset += length
+    return chunks
+
+
+def layout_sidecar_path(path: str) -> Path:
+    p = Path(path)
+    return p.parent / f".{p.name}.keyframes.json"
+
+
+def read_layout_sidecar(part: SegmentPart) -> Optional[PartLayout]:
+    """Load a persisted keyframe layout if it matches the part (blocking)"""
+    try:
+        with open(layout_sidecar_path(part.path), "r", encoding="utf-8") as f:
+            stored = json.load(f)
+        if stored.get("size") != part.size or stored.get("mtime") != part.mtime:
+            return None
+        chunks = [
+            (float(duration), int(length), int(offset))
+            for duration, length, offset in stored["chunks"]
+        ]
+        return PartLayout(chunks=chunks, independent=bool(stored["independent"]))
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def write_layout_sidecar(part: SegmentPart, layout: PartLayout) -> None:
+    """Persist a keyframe layout next to its part (blocking)"""
+    target = layout_sidecar_path(part.path)
+    try:
+        tmp = target.with_name(target.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "size": part.size,
+                    "mtime": part.mtime,
+                    "chunks": layout.chunks,
+                    "independent": layout.independent,
+                },
+                f,
+            )
+        os.replace(tmp, target)
+    except OSError as e:
+        logger.debug(f"Could not write keyframe sidecar {target}: {e}")
+
+
+def scan_keyframes(path: str) -> Optional[Tuple[float, List[Keyframe]]]:
+    """List the video keyframes of a TS file with ffprobe (blocking).
+
+    Meant for a worker thread: the packet list of a long part is hundreds of
+    thousands of lines. Returns the timestamp of the first video packet and
+    every keyframe, or None if the file has no video, ffprobe is unavailable,
+    fails or takes longer than KEYFRAME_PROBE_TIMEOUT_SECONDS.
+    """
+    try:
+        process = subprocess.Popen(
+            [
+                "ffprobe",
+                "-v",
+                "error",
+                "-select_streams",
+                "v:0",
+                "-show_entries",
+                "packet=pts_time,pos,flags",
+                "-of",
+                "csv=p=0",
+                path,
+            ],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+    except OSError as e:
+        logger.warning(f"Cannot run ffprobe for keyframes of {path}: {e}")
+        return None
+
+    timer = threading.Timer(KEYFRAME_PROBE_TIMEOUT_SECONDS, process.kill)
+    timer.daemon = True
+    timer.start()
+
+    first_time: Optional[float] = None
+    keyframes: List[Keyframe] = []
+    try:
+        # Parse as the lines arrive instead of buffering the whole list
+        for raw in process.stdout:
+            fields = raw.decode("ascii", errors="replace").strip().split(",")
+            if len(fields) < 3:
+                continue
+            try:
+                time, offset = float(fields[0]), int(fields[1])
+            except ValueError:
+                continue
+            if first_time is None:
+                first_time = time
+            if "K" in fields[2]:
+                keyframes.append(Keyframe(time=time, offset=offset))
+    finally:
+        process.stdout.close()
+        process.wait()
+        timed_out = not timer.is_alive()
+        timer.cancel()
+
+    if timed_out:
+        logger.warning(f"Keyframe probe timed out for {path}")
+        return None
+    if process.returncode != 0 or first_time is None or not keyframes:
+        return None
+    return first_time, keyframes
+
+
+def compute_part_layout(part: SegmentPart) -> Optional[PartLayout]:
+    """Keyframe layout of a part from its sidecar or a fresh scan (blocking)"""
+    layout = read_layout_sidecar(part)
+    if layout is not None:
+        return layout
+
+    scanned = scan_keyframes(part.path)
+    if scanned is None:
+        return None
+    try:
+        layout = split_part_at_keyframes(part, *scanned)
+    except OSError as e:
+        logger.warning(f"Cannot align chunks of {part.path}: {e}")
+        return None
+    write_layout_sidecar(part, layout)
+    return layout
+
+
+def _packet_pid(packet: bytes) -> Optional[int]:
+    if len(packet) < 3 or packet[0] != TS_SYNC_BYTE:
+        return None
+    return ((packet[1] & 0x1F) << 8) | packet[2]
+
+
+def find_pat_before(file, offset: int) -> Optional[int]:
+    """Offset of the PAT that directly introduces the packet at ``offset``.
+
+    Walks back packet by packet; only non-video packets (audio, PMT, ...) may
+    sit between the PAT and the keyframe. Returns None if there is none.
+    """
+    file.seek(offset)
+    video_pid = _packet_pid(file.read(TS_PACKET_SIZE))
+    if video_pid is None:
+        return None
+    window_start = max(0, offset - PAT_SEARCH_PACKETS * TS_PACKET_SIZE)
+    file.seek(window_start)
+    window = file.read(offset - window_start)
+    for end in range(len(window), TS_PACKET_SIZE - 1, -TS_PACKET_SIZE):
+        pid = _packet_pid(window[end - TS_PACKET_SIZE : end])
+        if pid is None or pid == video_pid:
+            return None
+        if pid == PAT_PID:
+            return window_start + end - TS_PACKET_SIZE
+    return None
+
+
+def split_part_at_keyframes(
+    part: SegmentPart, first_time: float, keyframes: List[Keyframe]
+) -> PartLayout:
+    """Split a part into keyframe-aligned chunks (blocking, reads the file).
+
+    The first chunk always starts at offset 0. Every later chunk starts at
+    the PAT right before its keyframe, or at the keyframe itself when there
+    is none; the layout is only independent if every chunk starts on a PAT
+    followed by a keyframe.
+    """
+    starts: List[Keyframe] = []
+    for keyframe in keyframes:
+        if keyframe.offset <= 0 or keyframe.offset >= part.size:
+            continue
+        previous = starts[-1].time if starts else first_time
+        if keyframe.time - previous >= HLS_TARGET_CHUNK_SECONDS:
+            starts.append(keyframe)
+
+    with open(part.path, "rb") as file:
+        # Offset 0 is independent if the part opens with a PAT and the first
+        # video packet is a keyframe
+        independent = (
+            _packet_pid(file.read(TS_PACKET_SIZE)) == PAT_PID
+            and keyframes[0].time == first_time
+            and find_pat_before(file, keyframes[0].offset) is not None
+        )
+        boundaries = [(first_time, 0)]
+        for keyframe in starts:
+            pat_offset = find_pat_before(file, keyframe.offset)
+            if pat_offset is None:
+                independent = False
+            offset = keyframe.offset if pat_offset is None else pat_offset
+            if offset > boundaries[-1][1]:
+                boundaries.append((keyframe.time, offset))
+
+    end_time = first_time + part.duration
+    chunks: List[Chunk] = []
+    for index, (time, offset) in enumerate(boundaries):
+        if index + 1 < len(boundaries):
+            next_time, next_offset = boundaries[index + 1]
+        else:
+            next_time, next_offset = max(end_time, time), part.size
+        chunks.append((next_time - time, next_offset - offset, offset))
+    return PartLayout(chunks=chunks, independent=independent)
+
+
+class SegmentPlaylistService:
+    """Builds virtual HLS playlists over recording segment directories"""
+
+    def __init__(self, maxsize: int = CACHE_CONFIG.DEFAULT_CACHE_SIZE):
+        # (path, size, mtime) -> duration in seconds / PartLayout
+        self._durations: LRUCache = LRUCache(maxsize=maxsize)
+        self._layouts: LRUCache = LRUCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self._probe_semaphore = asyncio.Semaphore(MAX_CONCURRENT_PROBES)
+        self._scan_semaphore = asyncio.Semaphore(MAX_CONCURRENT_KEYFRAME_SCANS)
+        # In-flight keyframe scans, coalesced by cache key
+        self._scans: Dict[Tuple[str, int, float], asyncio.Task] = {}
+
+    def _cache_key(self, part: SegmentPart) -> Tuple[str, int, float]:
+        return part.path, part.size, part.mtime
+
+    def get_cached_duration(self, part: SegmentPart) -> Optional[float]:
+        with self._lock:
+            return self._durations.get(self._cache_key(part))
+
+    async def _probe_duration(self, part: SegmentPart) -> Optional[float]:
+        cached = self.get_cached_duration(part)
+        if cached is not None:
+            return cached
+
+        async with self._probe_semaphore:
+            duration = await ffmpeg_utils.extract_video_duration(part.path)
+
+        if duration:
+            with self._lock:
+                self._durations[self._cache_key(part)] = duration
+        return duration
+
+    def _fallback_layout(self, part: SegmentPart) -> PartLayout:
+        return PartLayout(chunks=split_part(part), independent=False)
+
+    async def get_layouts(self, parts: List[SegmentPart]) -> List[PartLayout]:
+        """Chunks of probed parts without waiting for keyframe scans.
+
+        Known layouts come from the cache or a sidecar; every other part is
+        split by average bitrate for now and queued for a background scan.
+        """
+        with self._lock:
+            layouts = [self._layouts.get(self._cache_key(part)) for part in parts]
+
+        missing = [part for part, layout in zip(parts, layouts) if layout is None]
+        if missing:
+            stored = await asyncio.to_thread(
+                lambda: [read_layout_sidecar(part) for part in missing]
+            )
+            found = dict(zip(missing, stored))
+            with self._lock:
+                for part, layout in found.items():
+                    if layout is not None:
+                        self._layouts[self._cache_key(part)] = layout
+            layouts = [
+                layout if layout is not None else found[part]
+                for part, layout in zip(parts, layouts)
+            ]
+
+        result = []
+        for part, layout in zip(parts, layouts):
+            if layout is None:
+                self._schedule_scan(part)
+                layout = self._fallback_layout(part)
+            result.append(layout)
+        return result
+
+    def _schedule_scan(self, part: SegmentPart) -> None:
+        key = self._cache_key(part)
+        if key in self._scans:
+            return
+        task = asyncio.create_task(self._scan_layout(part))
+        self._scans[key] = task
+        task.add_done_callback(lambda _: self._scans.pop(key, None))
+
+    async def _scan_layout(self, part: SegmentPart) -> None:
+        async with self._scan_semaphore:
+            layout = await asyncio.to_thread(compute_part_layout, part)
+        if layout is None:
+            logger.warning(
+                f"No keyframes for {part.path}, splitting by average bitrate"
+            )
+            # Not persisted: ffprobe may work after a restart
+            layout = self._fallback_layout(part)
+        with self._lock:
+            self._layouts[self._cache_key(part)] = layout
+
+    async def wait_for_scans(self) -> None:
+        """Wait until every queued keyframe scan has finished"""
+        while self._scans:
+            await asyncio.gather(*list(self._scans.values()))
+
+    async def get_parts(
+        self, segment_dir: Path, include_last: bool = True
+    ) -> List[SegmentPart]:
+        """List parts with their probed durations.
+
+        Pass include_last=False while the recording is still running: the last
+        part is growing and would change its byte ranges between reloads.
+        """
+        parts = await asyncio.to_thread(list_segment_parts, segment_dir)
+        if not include_last:
+            parts = parts[:-1]
+
+        durations = await asyncio.gather(
+            *(self._probe_duration(part) for part in parts)
+        )
+        probed = []
+        for part, duration in zip(parts, durations):
+            if not duration:
+                logger.warning(f"Skipping segment without duration: {part.path}")
+                continue
+            probed.append(
+                SegmentPart(
+                    path=part.path,
+                    number=part.number,
+                    size=part.size,
+                    mtime=part.mtime,
+                    duration=duration,
+                )
+            )
+        return probed
+
+    async def build_playlist(
+        self,
+        segment_dir: Path,
+        segment_url: Callable[[str], str],
+        is_complete: bool = True,
+    ) -> str:
+        """Build an HLS media playlist for a segment directory.
+
+        Args:
+            segment_dir: The ``*_segments`` directory
+            segment_url: Maps a part file name to the URL it is served from
+            is_complete: False while still recording (EVENT playlist, no ENDLIST)
+        """
+        parts = await self.get_parts(segment_dir, include_last=is_complete)
+
+        layouts = await self.get_layouts(parts)
+
+        lines = []
+        max_duration = 0.0
+        for index, (part, layout) in enumerate(zip(parts, layouts)):
+            if index > 0:
+                # Each part is a separate streamlink run with its own timestamps
+                lines.append("#EXT-X-DISCONTINUITY")
+            uri = segment_url(Path(part.path).name)
+            for duration, length, offset in layout.chunks:
+                max_duration = max(max_duration, duration)
+                lines.append(f"#EXTINF:{duration:.3f},")
+                lines.append(f"#EXT-X-BYTERANGE:{length}@{offset}")
+                lines.append(uri)
+
+        header = [
+            "#EXTM3U",
+            "#EXT-X-VERSION:4",
+            f"#EXT-X-TARGETDURATION:{max(1, math.ceil(max_duration))}",
+            "#EXT-X-MEDIA-SEQUENCE:0",
+            f"#EXT-X-PLAYLIST-TYPE:{'VOD' if is_complete else 'EVENT'}",
+        ]
+        if layouts and all(layout.independent for layout in layouts):
+            header.append("#EXT-X-INDEPENDENT-SEGMENTS")
+        footer = ["#EXT-X-ENDLIST"] if is_complete else []
+        return "\n".join(header + lines + footer) + "\n"
+
+    def clear(self) -> None:
+        with self._lock:
+            self._durations.clear()
+            self._layouts.clear()
+
+
+# Global instance
+segment_playlist_service = SegmentPlaylistService()
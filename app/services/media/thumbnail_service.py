@@ -3,20 +3,25 @@ from pathlib import Path
 import asyncio
 import logging
 import time
-from PIL import Image
-import io
 from typing import Optional
 
 from sqlalchemy.orm import joinedload
 
 from app.database import SessionLocal
 from app.models import Stream, StreamMetadata
+from app.services.images.image_processing import analyze_image_async
+from app.utils.media_probe import media_probe
 
 # unified_image_service imported lazily to avoid directory creation at import time
 
 logger = logging.getLogger("streamvault")
 
 
+def _timestamp_seconds(timestamp: str) -> int:
+    hours, minutes, seconds = (int(part) for part in timestamp.split(":"))
+    return hours * 3600 + minutes * 60 + seconds
+
+
 class ThumbnailService:
     def __init__(self):
         pass
@@ -157,18 +162,12 @@ class ThumbnailService:
     async def _is_placeholder_image(self, image_data):
         """Prüft, ob das Bild ein Platzhalter (graue Kamera) ist"""
         try:
-            # Öffne das Bild mit PIL
-            img = Image.open(io.BytesIO(image_data))
-
-            # Konvertiere zu RGB falls notwendig
-            if img.mode != "RGB":
-                img = img.convert("RGB")
-
-            # Berechne die durchschnittliche Farbe
-            avg_color = self._get_average_color(img)
+            # Dekodieren und Statistik im Image-Executor (gecacht per Hash)
+            analysis = await analyze_image_async(image_data)
 
             # Twitch Placeholder ist typischerweise grau (RGB um 100-120)
             # Prüfe auch auf sehr einheitliche Farben (geringer Kontrast)
+            avg_color = analysis.average_color
             r, g, b = avg_color
 
             # Graue Placeholder-Erkennung (erweitert)
@@ -184,21 +183,8 @@ class ThumbnailService:
             # Prüfe auch auf sehr kleine Dateien (unter 5KB sind meist Placeholder)
             is_too_small = len(image_data) < 5120  # 5KB
 
-            # Zusätzlich: Prüfe auf sehr einheitliche Farben (Histogramm-Analyse)
-            histogram = img.histogram()
-            # Bei Placeholder-Bildern sind wenige Farben dominant
-            if len(histogram) >= 768:  # RGB = 3 * 256
-                max_values = []
-                for i in range(0, 768, 256):  # R, G, B Kanäle
-                    channel_hist = histogram[i : i + 256]
-                    max_values.append(max(channel_hist))
-
-                total_pixels = img.width * img.height
-                # Wenn über 70% der Pixel in den dominanten Farben sind, ist es wahrscheinlich ein Placeholder
-                dominant_ratio = sum(max_values) / (total_pixels * 3)
-                is_low_contrast = dominant_ratio > 0.7
-            else:
-                is_low_contrast = False
+            # Wenn über 70% der Pixel in den dominanten Farben sind, ist es wahrscheinlich ein Placeholder
+            is_low_contrast = analysis.dominant_ratio > 0.7
 
             result = is_gray_placeholder or is_too_small or is_low_contrast
 
@@ -214,27 +200,6 @@ class ThumbnailService:
             # Bei Fehlern nehmen wir an, dass es kein Placeholder ist
             return False
 
-    def _get_average_color(self, img):
-        """Berechnet die durchschnittliche Farbe eines Bildes"""
-        # Verkleinere das Bild für schnellere Berechnung
-        img = img.resize((50, 50))
-        pixels = list(img.getdata())
-
-        # Berechne den Durchschnitt für jeden Kanal
-        r_total = 0
-        g_total = 0
-        b_total = 0
-
-        for pixel in pixels:
-            if len(pixel) >= 3:  # RGB oder RGBA
-                r, g, b = pixel[0:3]
-                r_total += r
-                g_total += g
-                b_total += b
-
-        pixel_count = len(pixels)
-        return (r_total // pixel_count, g_total // pixel_count, b_total // pixel_count)
-
     async def ensure_thumbnail(self, stream_id: int, output_dir: str):
         """Stellt sicher, dass ein Thumbnail existiert - versucht zuerst Twitch, dann Video-Extraktion"""
         with SessionLocal() as db:
@@ -769,8 +734,14 @@ class ThumbnailService:
                 output_dir, f"{streamer.username}_thumbnail.jpg"
             )
 
-            # Try different timestamps to find a good frame
+            # Try different timestamps to find a good frame, skipping those
+            # past the end of the recording
             timestamps = ["00:02:00", "00:05:00", "00:01:00", "00:10:00", "00:00:30"]
+            probe = await media_probe.probe(mp4_path)
+            if probe is not None and probe.duration is not None:
+                timestamps = [
+                    ts for ts in timestamps if _timestamp_seconds(ts) < probe.duration
+                ] or [f"{probe.duration / 2:.3f}"]
 
             for timestamp in timestamps:
                 logger.info(
@@ -10,8 +10,9 @@ import re
 from typing import Optional
 from urllib.parse import quote
 from apprise import Apprise, NotifyFormat
-from app.models import GlobalSettings, Streamer
+from app.models import Streamer
 from app.database import SessionLocal
+from app.services.core.settings_snapshot import settings_snapshot
 from .notification_formatter import NotificationFormatter
 
 logger = logging.getLogger("streamvault")
@@ -114,26 +115,27 @@ class ExternalNotificationService:
     def _initialize_apprise(self):
         """Initialize Apprise with the notification URL from settings"""
         try:
-            with SessionLocal() as db:
-                settings = db.query(GlobalSettings).first()
-                if not settings or not settings.notifications_enabled:
-                    logger.debug("Notifications disabled")
-                    return
-
-                if not settings.notification_url:
-                    logger.debug("No notification URL configured")
-                    return
-
-                url = settings.notification_url.strip()
-                self._notification_url = url
-                self.apprise = Apprise()
+            settings = settings_snapshot.get_global_settings()
+            if not settings or not settings.notifications_enabled:
+                logger.debug("Notifications disabled")
+                return
 
-                # Try to add the URL to Apprise
-                if self.apprise.add(url):
-                    logger.info(f"Apprise initialized successfully with URL: {url}")
-                else:
-                    logger.error(f"Failed to initialize Apprise with URL: {url}")
-                    self._notification_url = None
+            if not settings.notification_url:
+                logger.debug("No notification URL configured")
+                return
+
+            url = settings.notification_url.strip()
+            if url == self._notification_url:
+                return
+            self._notification_url = url
+            self.apprise = Apprise()
+
+            # Try to add the URL to Apprise
+            if self.apprise.add(url):
+                logger.info(f"Apprise initialized successfully with URL: {url}")
+            else:
+                logger.error(f"Failed to initialize Apprise with URL: {url}")
+                self._notification_url = None
 
         except Exception as e:
             logger.error(f"Error initializing Apprise: {e}")
@@ -143,14 +145,13 @@ class ExternalNotificationService:
         self, message: str, title: str = "StreamVault Notification"
     ) -> bool:
         """Send a basic notification"""
-        with SessionLocal() as db:
-            settings = db.query(GlobalSettings).first()
-            if not settings or not settings.notifications_enabled:
-                logger.debug("Notifications are disabled, skipping")
-                return False
-            if not settings.notification_url:
-                logger.debug("No notification URLs configured, skipping")
-                return False
+        settings = settings_snapshot.get_global_settings()
+        if not settings or not settings.notifications_enabled:
+            logger.debug("Notifications are disabled, skipping")
+            return False
+        if not settings.notification_url:
+            logger.debug("No notification URLs configured, skipping")
+            return False
 
         # Refresh URLs before sending
         self._initialize_apprise()
@@ -177,7 +178,7 @@ class ExternalNotificationService:
             )
 
             with SessionLocal() as db:
-                settings = db.query(GlobalSettings).first()
+                settings = settings_snapshot.get_global_settings()
                 if not settings or not settings.notifications_enabled:
                     logger.debug("Global notifications disabled")
                     return False
@@ -587,10 +588,10 @@ class ExternalNotificationService:
         try:
             # Check if this specific event type is enabled
             from app.database import SessionLocal
-            from app.models import GlobalSettings, Streamer
+            from app.models import Streamer
 
             with SessionLocal() as db:
-                settings = db.query(GlobalSettings).first()
+                settings = settings_snapshot.get_global_settings()
                 if not settings:
                     logger.debug("No global settings found")
                     return False
@@ -7,8 +7,9 @@ Handles browser push notifications for subscribers.
 
 import json
 import logging
-from app.models import PushSubscription, GlobalSettings, NotificationSettings
+from app.models import PushSubscription, NotificationSettings
 from app.database import SessionLocal
+from app.services.core.settings_snapshot import settings_snapshot
 from app.services.communication.enhanced_push_service import enhanced_push_service
 
 logger = logging.getLogger("streamvault")
@@ -23,7 +24,7 @@ class PushNotificationService:
     async def should_notify(self, streamer_id: int, event_type: str) -> bool:
         """Check if notifications should be sent for this streamer and event type"""
         with SessionLocal() as db:
-            global_settings = db.query(GlobalSettings).first()
+            global_settings = settings_snapshot.get_global_settings()
             logger.debug(
                 f"Global settings: notifications_enabled={global_settings.notifications_enabled if global_settings else 'None'}"
             )
@@ -19,7 +19,7 @@ Usage::
 If ``progress_callback`` is provided, the tracker invokes it with the
 current percent (0..99) as new ``-progress`` chunks arrive. ``percent``
 is computed from ``out_time_us / total_duration_us`` when an input
-duration can be probed via ``ffprobe``; otherwise the callback is never
+duration can be probed via ``ffprobe`` (see app.utils.media_probe); otherwise the callback is never
 invoked (UI stays indeterminate).
 
 The tracker injects ``-progress pipe:1 -nostats`` automatically. The
@@ -34,6 +34,8 @@ import logging
 from pathlib import Path
 from typing import Awaitable, Callable, List, Optional, Tuple, Union
 
+from app.utils.media_probe import media_probe
+
 logger = logging.getLogger("streamvault")
 
 ProgressCallback = Callable[[float], Union[None, Awaitable[None]]]
@@ -216,32 +218,10 @@ class FFmpegProgressTracker:
             return int(total_duration_seconds * 1_000_000)
         if not input_path:
             return None
-        try:
-            probe = await asyncio.create_subprocess_exec(
-                "ffprobe",
-                "-v",
-                "error",
-                "-show_entries",
-                "format=duration",
-                "-of",
-                "default=noprint_wrappers=1:nokey=1",
-                str(input_path),
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            out, _ = await asyncio.wait_for(probe.communicate(), timeout=10)
-            text = out.decode("utf-8", errors="ignore").strip()
-            if not text:
-                return None
-            seconds = float(text)
-            if seconds <= 0:
-                return None
-            return int(seconds * 1_000_000)
-        except (asyncio.TimeoutError, FileNotFoundError, ValueError):
-            return None
-        except Exception as exc:
-            logger.debug(f"ffprobe duration lookup failed for {input_path}: {exc}")
+        result = await media_probe.probe(str(input_path))
+        if result is None or result.duration is None:
             return None
+        return int(result.duration * 1_000_000)
 
     async def _emit(self, callback: ProgressCallback, percent: float) -> None:
         try:
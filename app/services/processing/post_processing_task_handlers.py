@@ -18,7 +18,12 @@ from app.models import Stream, StreamMetadata, RecordingProcessingState
 from app.services.media.metadata_service import MetadataService
 from app.services.media.thumbnail_service import ThumbnailService
 from app.services.communication.websocket_manager import websocket_manager
+from app.services.queues.processing_state_cache import (
+    STEP_STATUS_COLUMNS,
+    processing_state_cache,
+)
 from app.utils import ffmpeg_utils
+from app.utils.file_stat_index import file_stat_index
 from app.utils.structured_logging import log_with_context
 from app.config.constants import CACHE_CONFIG, ASYNC_DELAYS
 
@@ -392,19 +397,11 @@ class PostProcessingTaskHandlers:
                     .first()
                 )
 
-                # Build metadata dict for embedding
-                metadata_dict = {
-                    "title": stream.title or f"{streamer_name} Stream",
-                    "artist": streamer_name,
-                    "date": stream.started_at.strftime("%Y-%m-%d")
-                    if stream.started_at
-                    else None,
-                    "creation_time": stream.started_at.isoformat()
-                    if stream.started_at
-                    else None,
-                    "comment": f"Stream by {streamer_name}",
-                    "genre": stream.category_name or "Livestream",
-                }
+                # Same tags MetadataService.embed_all_metadata writes, so the
+                # remuxed MP4 does not need a second rewrite
+                metadata_dict = self.metadata_service.build_container_metadata(
+                    stream, streamer_name
+                )
 
                 # Get chapters if available
                 chapters = None
@@ -440,7 +437,13 @@ class PostProcessingTaskHandlers:
                                                 / 1000.0,  # Convert ms to seconds
                                                 "end_time": int(chapter_data["END"])
                                                 / 1000.0,
-                                                "title": chapter_data["title"],
+                                                # Stored escaped; re-escaped when
+                                                # the metadata file is built
+                                                "title": re.sub(
+                                                    r"\\(.)",
+                                                    r"\1",
+                                                    chapter_data["title"],
+                                                ),
                                             }
                                         )
 
@@ -455,15 +458,26 @@ class PostProcessingTaskHandlers:
                         )
                         chapters = None
 
-            # Convert TS to MP4 with metadata
-            result = await ffmpeg_utils.embed_metadata_with_ffmpeg_wrapper(
-                input_path=ts_file_path,
-                output_path=mp4_output_path,
-                metadata=metadata_dict,
-                chapters=chapters,
-                streamer_name=streamer_name,
-                logging_service=self.logging_service,
-            )
+            live_remux_path = payload.get("live_remux_path")
+            if live_remux_path and os.path.exists(live_remux_path):
+                # Remuxed while recording: only the finished MP4 needs moving
+                os.replace(live_remux_path, mp4_output_path)
+                logger.info(
+                    f"Using live remux output for stream {stream_id}: {mp4_output_path}"
+                )
+                # Not rewritten: tags are the ones written at segment start and
+                # chapters stay in the sidecar files from chapters_generation
+                result = {"success": True}
+            else:
+                # Convert TS to MP4 with metadata and chapters in a single pass
+                result = await ffmpeg_utils.embed_metadata_with_ffmpeg_wrapper(
+                    input_path=ts_file_path,
+                    output_path=mp4_output_path,
+                    metadata=metadata_dict,
+                    chapters=chapters,
+                    streamer_name=streamer_name,
+                    logging_service=self.logging_service,
+                )
 
             if not result.get("success"):
                 raise Exception(
@@ -474,6 +488,9 @@ class PostProcessingTaskHandlers:
             if not await ffmpeg_utils.validate_mp4(mp4_output_path):
                 raise Exception("MP4 validation failed")
 
+            # The .ts/.mp4 pair changed on disk
+            file_stat_index.invalidate(mp4_output_path)
+
             # Update Stream.recording_path to the MP4 file
             with SessionLocal() as db:
                 stream = (
@@ -613,6 +630,8 @@ class PostProcessingTaskHandlers:
             if not thumbnail_path:
                 raise Exception("Thumbnail generation failed")
 
+            file_stat_index.invalidate(mp4_path)
+
             log_with_context(
                 logger,
                 "info",
@@ -888,6 +907,9 @@ class PostProcessingTaskHandlers:
                 else:
                     logger.debug(f"🧹 CLEANUP_SKIP_MISSING: path={file_path}")
 
+            for file_path in removed_files:
+                file_stat_index.invalidate(file_path)
+
             # Update StreamMetadata with segments directory tracking
             if segments_dirs_removed and not is_deletion_cleanup:
                 try:
@@ -1114,18 +1136,7 @@ class PostProcessingTaskHandlers:
             state = self._get_or_create_state(db, recording_id, stream_id)
             if not state:
                 return
-            step_map = {
-                "metadata_generation": "metadata_status",
-                "metadata": "metadata_status",
-                "chapters_generation": "chapters_status",
-                "chapters": "chapters_status",
-                "mp4_remux": "mp4_remux_status",
-                "mp4_validation": "mp4_validation_status",
-                "thumbnail_generation": "thumbnail_status",
-                "thumbnail": "thumbnail_status",
-                "cleanup": "cleanup_status",
-            }
-            attr = step_map.get(step)
+            attr = STEP_STATUS_COLUMNS.get(step)
             if not attr:
                 logger.debug(
                     f"_set_status: unknown step '{step}' for recording {recording_id}"
@@ -1135,6 +1146,8 @@ class PostProcessingTaskHandlers:
             if last_error is not None:
                 state.last_error = last_error
             db.commit()
+            # Keep the queue manager's view in sync (write-through)
+            processing_state_cache.update_from_state(state)
             # Try to refresh updated_at set by DB trigger
             try:
                 db.refresh(state)
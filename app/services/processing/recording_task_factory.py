@@ -10,6 +10,7 @@ from datetime import datetime
 from pathlib import Path
 
 from app.services.processing.task_dependency_manager import Task
+from app.services.recording.live_remuxer import live_mp4_path
 from app.database import SessionLocal
 from app.models import RecordingProcessingState, Stream
 
@@ -184,6 +185,8 @@ class RecordingTaskFactory:
                 payload={
                     **common_payload,
                     "mp4_output_path": mp4_path,
+                    # Finished MP4 of a live-remuxed recording, if there is one
+                    "live_remux_path": live_mp4_path(validated_ts_file_path),
                     "overwrite": True,
                     "include_metadata": True,
                     "include_chapters": True,
@@ -4,8 +4,11 @@ Manages task dependencies to ensure proper execution order
 """
 
 import asyncio
+import heapq
+import itertools
 import logging
-from typing import Dict, List, Set, Optional, Any
+from collections import defaultdict
+from typing import Dict, List, Set, Optional, Any, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
@@ -50,6 +53,21 @@ class TaskDependencyManager:
         self.failed_tasks: Set[str] = set()
         self._shutdown = False
 
+        # Reverse-dependency index (task -> direct dependents), count of
+        # dependencies not yet completed per task, and stream -> task ids, so
+        # completion/failure/cancellation only touches direct dependents.
+        self.dependents: Dict[str, Set[str]] = defaultdict(set)
+        self._unsatisfied: Dict[str, int] = {}
+        self._stream_tasks: Dict[Any, Set[str]] = defaultdict(set)
+
+        # Push-based scheduling: tasks enter the heap when they become READY and
+        # the dispatcher is woken through the event instead of polling.
+        # Entries are (priority, created_at, seq, task_id); stale entries are
+        # discarded lazily when popped.
+        self._ready_heap: List[Tuple[int, datetime, int, str]] = []
+        self._ready_seq = itertools.count()
+        self._ready_event = asyncio.Event()
+
     async def add_task(self, task: Task) -> str:
         """Add a task to the dependency manager"""
         task_id = task.id
@@ -60,6 +78,14 @@ class TaskDependencyManager:
                 raise ValueError(f"Dependency {dep_id} not found for task {task_id}")
 
         self.tasks[task_id] = task
+        for dep_id in task.dependencies:
+            self.dependents[dep_id].add(task_id)
+        self._unsatisfied[task_id] = sum(
+            1 for dep_id in task.dependencies if dep_id not in self.completed_tasks
+        )
+        stream_id = task.payload.get("stream_id")
+        if stream_id is not None:
+            self._stream_tasks[stream_id].add(task_id)
         logger.info(f"Added task {task_id} with dependencies: {task.dependencies}")
 
         # Check if task is immediately ready
@@ -84,8 +110,9 @@ class TaskDependencyManager:
             return
 
         # Check if all dependencies are completed
-        if all(dep_id in self.completed_tasks for dep_id in task.dependencies):
+        if self._unsatisfied.get(task_id, 0) == 0:
             task.status = TaskStatus.READY
+            self._push_ready(task)
             # Diagnostic: log detailed dependency satisfaction
             if task.dependencies:
                 logger.info(
@@ -103,19 +130,46 @@ class TaskDependencyManager:
             if failed_deps:
                 task.status = TaskStatus.FAILED
                 task.error = f"Dependencies failed: {failed_deps}"
+                task.completed_at = datetime.now()
+                self.failed_tasks.add(task_id)
                 logger.error(
                     f"Task {task_id} failed due to failed dependencies: {failed_deps}"
                 )
-
-    async def get_ready_tasks(self) -> List[Task]:
-        """Get tasks that are ready to execute, sorted by priority"""
-        ready_tasks = [
-            task for task in self.tasks.values() if task.status == TaskStatus.READY
-        ]
-
-        # Sort by priority (lower number = higher priority), then by creation time
-        ready_tasks.sort(key=lambda t: (t.priority, t.created_at))
-
+                # Propagate down the chain so no descendant is left pending
+                await self._update_dependent_tasks(task_id)
+
+    def _push_ready(self, task: Task):
+        """Add a READY task to the ready heap and wake the dispatcher"""
+        heapq.heappush(
+            self._ready_heap,
+            (task.priority, task.created_at, next(self._ready_seq), task.id),
+        )
+        self._ready_event.set()
+
+    def requeue_ready_task(self, task_id: str):
+        """Put a READY task back on the heap (e.g. when dispatch had to be deferred)"""
+        task = self.tasks.get(task_id)
+        if task and task.status == TaskStatus.READY:
+            self._push_ready(task)
+
+    async def wait_for_ready_tasks(self):
+        """Block until at least one task is waiting on the ready heap"""
+        while not self._ready_heap:
+            self._ready_event.clear()
+            await self._ready_event.wait()
+
+    def pop_ready_tasks(self) -> List[Task]:
+        """Drain the ready heap, returning READY tasks in priority order"""
+        ready_tasks = []
+        seen = set()
+        while self._ready_heap:
+            _, _, _, task_id = heapq.heappop(self._ready_heap)
+            task = self.tasks.get(task_id)
+            # Skip stale entries (task removed, cancelled, already dispatched)
+            if task is None or task.status != TaskStatus.READY or task_id in seen:
+                continue
+            seen.add(task_id)
+            ready_tasks.append(task)
         return ready_tasks
 
     async def mark_task_running(self, task_id: str):
@@ -134,7 +188,11 @@ class TaskDependencyManager:
         task.status = TaskStatus.COMPLETED
         task.completed_at = datetime.now()
 
-        self.completed_tasks.add(task_id)
+        if task_id not in self.completed_tasks:
+            self.completed_tasks.add(task_id)
+            for dependent_id in self.dependents.get(task_id, ()):
+                if dependent_id in self._unsatisfied:
+                    self._unsatisfied[dependent_id] -= 1
 
         if task_id in self.running_tasks:
             del self.running_tasks[task_id]
@@ -166,9 +224,12 @@ class TaskDependencyManager:
 
     async def _update_dependent_tasks(self, completed_task_id: str):
         """Update the status of tasks that depend on the completed task"""
-        for task_id, task in self.tasks.items():
-            if completed_task_id in task.dependencies:
-                await self._update_task_status(task_id)
+        for task_id in list(self.dependents.get(completed_task_id, ())):
+            await self._update_task_status(task_id)
+
+    def get_dependents(self, task_id: str) -> List[str]:
+        """Get the ids of tasks that directly depend on the given task"""
+        return list(self.dependents.get(task_id, ()))
 
     async def retry_failed_task(self, task_id: str) -> bool:
         """Retry a failed task if retries are available"""
@@ -226,8 +287,9 @@ class TaskDependencyManager:
 
     async def _cancel_dependent_tasks(self, cancelled_task_id: str):
         """Cancel tasks that depend on the cancelled task"""
-        for task_id, task in self.tasks.items():
-            if cancelled_task_id in task.dependencies and task.status not in [
+        for task_id in list(self.dependents.get(cancelled_task_id, ())):
+            task = self.tasks.get(task_id)
+            if task is not None and task.status not in [
                 TaskStatus.COMPLETED,
                 TaskStatus.FAILED,
                 TaskStatus.CANCELLED,
@@ -269,9 +331,9 @@ class TaskDependencyManager:
     def get_task_chain_info(self, stream_id: int) -> Dict[str, Any]:
         """Get information about all tasks for a specific stream"""
         stream_tasks = [
-            task
-            for task in self.tasks.values()
-            if task.payload.get("stream_id") == stream_id
+            self.tasks[task_id]
+            for task_id in self._stream_tasks.get(stream_id, ())
+            if task_id in self.tasks
         ]
 
         return {
@@ -307,14 +369,35 @@ class TaskDependencyManager:
                         to_remove.append(task_id)
 
         for task_id in to_remove:
-            del self.tasks[task_id]
-            self.completed_tasks.discard(task_id)
-            self.failed_tasks.discard(task_id)
+            self._remove_task(task_id)
             logger.debug(f"Cleaned up old task {task_id}")
 
         if to_remove:
             logger.info(f"Cleaned up {len(to_remove)} old tasks")
 
+    def _remove_task(self, task_id: str):
+        """Drop a task and its entries in the dependency indexes"""
+        task = self.tasks.pop(task_id)
+        self.completed_tasks.discard(task_id)
+        self.failed_tasks.discard(task_id)
+        self._unsatisfied.pop(task_id, None)
+
+        for dep_id in task.dependencies:
+            dependents = self.dependents.get(dep_id)
+            if dependents is not None:
+                dependents.discard(task_id)
+                if not dependents:
+                    del self.dependents[dep_id]
+        # Only finished tasks are removed, so dependents already counted it
+        self.dependents.pop(task_id, None)
+
+        stream_id = task.payload.get("stream_id")
+        stream_tasks = self._stream_tasks.get(stream_id)
+        if stream_tasks is not None:
+            stream_tasks.discard(task_id)
+            if not stream_tasks:
+                del self._stream_tasks[stream_id]
+
     async def shutdown(self):
         """Shutdown the dependency manager"""
         self._shutdown = True
@@ -0,0 +1,225 @@
+"""
+AdmissionController - Global resource budgets for post-processing
+
+With streamer isolation every streamer has its own queue and worker, so
+when many streams end together dozens of full-file remuxes and thumbnail
+extractions would hit the same disks at once and all of them slow down.
+Every task now has to be admitted before it runs:
+
+- Task types are grouped into resource classes (``io``, ``cpu``, ``light``),
+  each with its own concurrency budget.
+- When a budget is full, waiting streamers take turns (fair sharing): the
+  streamer admitted least often in that class goes next, so one streamer
+  with many recordings cannot starve others.
+- The ``io`` budget adapts to the observed disk throughput (hill
+  climbing): it grows while more parallel remuxes move more bytes per
+  second and shrinks again when they don't.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import defaultdict, deque
+from contextlib import asynccontextmanager
+from typing import Any, Deque, Dict, Optional, Tuple
+
+logger = logging.getLogger("streamvault")
+
+TASK_CLASSES = {
+    "mp4_remux": "io",
+    "segment_concatenation": "io",
+    "thumbnail_generation": "cpu",
+}
+DEFAULT_TASK_CLASS = "light"
+
+DEFAULT_BUDGETS = {"io": 2, "cpu": 2, "light": 6}
+
+# Bounds for the adaptive io budget
+MIN_IO_SLOTS = 1
+MAX_IO_SLOTS = 6
+
+# io tasks completed per throughput window
+ADAPT_WINDOW_TASKS = 3
+
+# Throughput must improve by this much to keep moving in one direction
+ADAPT_TOLERANCE = 0.1
+
+# io tasks faster than this (e.g. renaming a live remux) are not samples
+MIN_SAMPLE_SECONDS = 1.0
+
+
+def task_class(task_type: str) -> str:
+    return TASK_CLASSES.get(task_type, DEFAULT_TASK_CLASS)
+
+
+def payload_size_bytes(payload: Dict[str, Any]) -> int:
+    """Size of the input files of an io task, 0 if unknown"""
+    paths = payload.get("segment_files") or [payload.get("ts_file_path")]
+    total = 0
+    for path in paths:
+        if not path:
+            continue
+        try:
+            total += os.path.getsize(path)
+        except OSError:
+            pass
+    return total
+
+
+class _ResourceClass:
+    """Budget and fair-share bookkeeping of one resource class"""
+
+    def __init__(self, name: str, limit: int):
+        self.name = name
+        self.limit = limit
+        self.active = 0
+        self.waiters: Dict[str, Deque[Tuple[int, asyncio.Future]]] = defaultdict(deque)
+        # Admissions per streamer (virtual time)
+        self.served: Dict[str, int] = defaultdict(int)
+
+    def waiting(self) -> int:
+        return sum(len(queue) for queue in self.waiters.values())
+
+
+class AdmissionController:
+    """Admits post-processing tasks into global resource budgets"""
+
+    def __init__(self, budgets: Optional[Dict[str, int]] = None):
+        budgets = {**DEFAULT_BUDGETS, **(budgets or {})}
+        self.classes = {
+            name: _ResourceClass(name, limit) for name, limit in budgets.items()
+        }
+        self._sequence = 0
+
+        # Throughput window for the io budget
+        self._window_bytes = 0
+        self._window_seconds = 0.0
+        self._window_tasks = 0
+        self._last_throughput: Optional[float] = None
+        self._direction = 1
+
+    @asynccontextmanager
+    async def slot(self, task_type: str, streamer_name: str, size_bytes: int = 0):
+        """Hold a slot of the task's resource class while the task runs"""
+        resource = self.classes[task_class(task_type)]
+        await self._acquire(resource, streamer_name)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self._release(resource)
+            if resource.name == "io":
+                self._record_io(size_bytes, time.monotonic() - started)
+
+    async def _acquire(self, resource: _ResourceClass, streamer_name: str) -> None:
+        if resource.active < resource.limit and not resource.waiting():
+            self._admit(resource, streamer_name)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._sequence += 1
+        resource.waiters[streamer_name].append((self._sequence, future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Admitted just before the cancellation - give the slot back
+                self._release(resource)
+            else:
+                self._remove_waiter(resource, streamer_name, future)
+            raise
+
+    def _admit(self, resource: _ResourceClass, streamer_name: str) -> None:
+        resource.active += 1
+        # A streamer returning after a pause starts at the current minimum
+        # instead of catching up on service it did not ask for
+        floor = min(
+            (
+                resource.served[name]
+                for name in resource.waiters
+                if name != streamer_name
+            ),
+            default=resource.served[streamer_name],
+        )
+        resource.served[streamer_name] = max(resource.served[streamer_name], floor)
+        resource.served[streamer_name] += 1
+
+    def _release(self, resource: _ResourceClass) -> None:
+        resource.active -= 1
+        self._grant(resource)
+
+    def _grant(self, resource: _ResourceClass) -> None:
+        while resource.active < resource.limit:
+            candidates = [
+                (resource.served[name], queue[0][0], name)
+                for name, queue in resource.waiters.items()
+                if queue
+            ]
+            if not candidates:
+                return
+            _, _, streamer_name = min(candidates)
+            _, future = resource.waiters[streamer_name].popleft()
+            if not resource.waiters[streamer_name]:
+                del resource.waiters[streamer_name]
+            if future.done():
+                continue
+            self._admit(resource, streamer_name)
+            future.set_result(None)
+
+    def _remove_waiter(
+        self, resource: _ResourceClass, streamer_name: str, future: asyncio.Future
+    ) -> None:
+        queue = resource.waiters.get(streamer_name)
+        if not queue:
+            return
+        for entry in list(queue):
+            if entry[1] is future:
+                queue.remove(entry)
+        if not queue:
+            del resource.waiters[streamer_name]
+
+    def _record_io(self, size_bytes: int, seconds: float) -> None:
+        if size_bytes <= 0 or seconds < MIN_SAMPLE_SECONDS:
+            return
+        self._window_bytes += size_bytes
+        self._window_seconds += seconds
+        self._window_tasks += 1
+        if self._window_tasks < ADAPT_WINDOW_TASKS:
+            return
+
+        resource = self.classes["io"]
+        # Bytes per task-second times the parallelism gives aggregate throughput
+        throughput = self._window_bytes / self._window_seconds * resource.limit
+        self._window_bytes = 0
+        self._window_seconds = 0.0
+        self._window_tasks = 0
+
+        previous = self._last_throughput
+        self._last_throughput = throughput
+        if previous is not None and throughput < previous * (1 + ADAPT_TOLERANCE):
+            # The last step did not pay off - go the other way
+            self._direction = -self._direction
+
+        new_limit = min(
+            max(resource.limit + self._direction, MIN_IO_SLOTS), MAX_IO_SLOTS
+        )
+        if new_limit == resource.limit:
+            self._direction = -self._direction
+            return
+        logger.info(
+            f"⚖️ IO budget {resource.limit} -> {new_limit} "
+            f"(aggregate throughput {throughput / 1024 / 1024:.1f} MiB/s)"
+        )
+        resource.limit = new_limit
+        self._grant(resource)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {
+            name: {
+                "limit": resource.limit,
+                "active": resource.active,
+                "waiting": resource.waiting(),
+            }
+            for name, resource in self.classes.items()
+        }
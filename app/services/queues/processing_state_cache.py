@@ -0,0 +1,116 @@
+"""
+ProcessingStateCache - Write-through view of RecordingProcessingState
+
+Lets the dependency worker decide whether a post-processing step already
+completed without a DB round-trip per ready task. Entries are written through
+by PostProcessingTaskHandlers._set_status; missing recordings are loaded with
+one bulk IN (...) query per dispatch cycle.
+"""
+
+import logging
+import threading
+from typing import Dict, Iterable, Optional
+
+from cachetools import TTLCache
+
+from app.config.constants import CACHE_CONFIG
+
+logger = logging.getLogger("streamvault")
+
+# Task type / step alias -> RecordingProcessingState column
+STEP_STATUS_COLUMNS: Dict[str, str] = {
+    "metadata_generation": "metadata_status",
+    "metadata": "metadata_status",
+    "chapters_generation": "chapters_status",
+    "chapters": "chapters_status",
+    "mp4_remux": "mp4_remux_status",
+    "mp4_validation": "mp4_validation_status",
+    "thumbnail_generation": "thumbnail_status",
+    "thumbnail": "thumbnail_status",
+    "cleanup": "cleanup_status",
+}
+
+_STATUS_COLUMNS = sorted(set(STEP_STATUS_COLUMNS.values()))
+
+
+class ProcessingStateCache:
+    """Thread-safe TTL cache of per-recording step statuses"""
+
+    def __init__(
+        self,
+        maxsize: int = CACHE_CONFIG.DEFAULT_CACHE_SIZE,
+        ttl: int = CACHE_CONFIG.PROCESSING_STATE_CACHE_TTL,
+    ):
+        # recording_id -> {column: status}; an empty dict caches "no state row"
+        self._states: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+
+    def is_cached(self, recording_id: int) -> bool:
+        """Check whether the recording's state is currently cached"""
+        with self._lock:
+            return recording_id in self._states
+
+    def get_step_status(self, recording_id: int, step: str) -> Optional[str]:
+        """Get the cached status of a step, or None if unknown"""
+        column = STEP_STATUS_COLUMNS.get(step)
+        if not column:
+            return None
+        with self._lock:
+            statuses = self._states.get(recording_id)
+        if statuses is None:
+            return None
+        return statuses.get(column)
+
+    def update_from_state(self, state) -> None:
+        """Write-through from a RecordingProcessingState row"""
+        statuses = {column: getattr(state, column, None) for column in _STATUS_COLUMNS}
+        with self._lock:
+            self._states[state.recording_id] = statuses
+
+    def invalidate(self, recording_id: int) -> None:
+        """Drop a recording so its state is reloaded on next use"""
+        with self._lock:
+            self._states.pop(recording_id, None)
+
+    def clear(self) -> None:
+        """Drop all cached states"""
+        with self._lock:
+            self._states.clear()
+
+    def load(self, recording_ids: Iterable[int]) -> int:
+        """Bulk-load states not yet cached with a single IN (...) query.
+
+        Blocking; call through asyncio.to_thread from async code.
+        Returns the number of recordings that were queried.
+        """
+        with self._lock:
+            missing = {rid for rid in recording_ids if rid not in self._states}
+        if not missing:
+            return 0
+
+        try:
+            from app.database import SessionLocal
+            from app.models import RecordingProcessingState
+
+            with SessionLocal() as db:
+                states = (
+                    db.query(RecordingProcessingState)
+                    .filter(RecordingProcessingState.recording_id.in_(missing))
+                    .all()
+                )
+                for state in states:
+                    self.update_from_state(state)
+        except Exception as e:
+            logger.debug(f"Bulk load of processing states failed: {e}")
+            return 0
+
+        # Cache recordings without a state row as misses
+        with self._lock:
+            for rid in missing:
+                if rid not in self._states:
+                    self._states[rid] = {}
+        return len(missing)
+
+
+# Global instance shared by the queue manager and the task handlers
+processing_state_cache = ProcessingStateCache()
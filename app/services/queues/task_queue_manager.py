@@ -21,6 +21,12 @@ from .task_progress_tracker import (
     TaskProgressTracker,
 )
 from .worker_manager import WorkerManager
+from .admission_controller import (
+    AdmissionController,
+    payload_size_bytes,
+    task_class,
+)
+from .processing_state_cache import processing_state_cache
 from app.services.processing.task_dependency_manager import (
     TaskDependencyManager,
     Task,
@@ -60,6 +66,8 @@ class TaskQueueManager:
             self.global_max_streamers = (
                 15  # Increased: Support more concurrent streamers
             )
+            # Global IO/CPU budgets shared by all streamer queues
+            self.admission = AdmissionController()
             logger.info(
                 "TaskQueueManager initialized with streamer isolation for production - max 4 workers per streamer, 15 max streamers"
             )
@@ -78,6 +86,7 @@ class TaskQueueManager:
             max_workers, self.progress_tracker, self.mark_task_completed
         )
         self.dependency_manager = TaskDependencyManager()
+        self.processing_state_cache = processing_state_cache
 
         # Dependency management
         self.dependency_worker: Optional[asyncio.Task] = None
@@ -342,10 +351,22 @@ class TaskQueueManager:
                         )
 
                     try:
-                        # Execute the task using worker manager's task execution logic
-                        success = await self.worker_manager._execute_task(
-                            task, worker_name
-                        )
+                        # Input size only feeds the io throughput samples;
+                        # stat the (possibly NAS-hosted) files off the loop
+                        size_bytes = 0
+                        if task_class(task.task_type) == "io":
+                            size_bytes = await asyncio.to_thread(
+                                payload_size_bytes, task.payload
+                            )
+
+                        # Wait for a slot in the task's global resource budget
+                        async with self.admission.slot(
+                            task.task_type, streamer_name, size_bytes
+                        ):
+                            # Execute the task using worker manager's task execution logic
+                            success = await self.worker_manager._execute_task(
+                                task, worker_name
+                            )
 
                         # Mark task as completed
                         if self.progress_tracker:
@@ -445,86 +466,26 @@ class TaskQueueManager:
         return task_id
 
     async def _dependency_worker(self):
-        """Worker that manages task dependencies"""
+        """Worker that dispatches tasks as soon as their dependencies are met.
+
+        Event-driven: sleeps on the dependency manager's ready heap and only
+        wakes when a task becomes READY (on enqueue, completion or retry).
+        """
         logger.info("Dependency worker started")
 
         while self._is_running:
             try:
-                # Get ready tasks from dependency manager
-                ready_tasks = await self.dependency_manager.get_ready_tasks()
+                await self.dependency_manager.wait_for_ready_tasks()
+                ready_tasks = self.dependency_manager.pop_ready_tasks()
                 if ready_tasks:
                     logger.debug(
                         "🧩 DEP_WORKER_READY: count=%d tasks=%s",
                         len(ready_tasks),
                         ",".join([t.id for t in ready_tasks]),
                     )
+                    await self._prefetch_processing_states(ready_tasks)
                 for dep_task in ready_tasks:
-                    # Skip tasks already completed in persistent state
-                    try:
-                        from app.database import SessionLocal
-                        from app.models import RecordingProcessingState
-
-                        with SessionLocal() as db:
-                            rec_id = dep_task.payload.get("recording_id")
-                            if rec_id:
-                                state = (
-                                    db.query(RecordingProcessingState)
-                                    .filter(
-                                        RecordingProcessingState.recording_id == rec_id
-                                    )
-                                    .first()
-                                )
-                                if state:
-                                    step = dep_task.type
-                                    status_map = {
-                                        "metadata_generation": state.metadata_status,
-                                        "chapters_generation": state.chapters_status,
-                                        "mp4_remux": state.mp4_remux_status,
-                                        "mp4_validation": state.mp4_validation_status,
-                                        "thumbnail_generation": state.thumbnail_status,
-                                        "cleanup": state.cleanup_status,
-                                    }
-                                    if status_map.get(step) == "completed":
-                                        logger.info(
-                                            f"⏭️ Skipping already-completed task {dep_task.id} ({step}) for recording {rec_id}"
-                                        )
-                                        await (
-                                            self.dependency_manager.mark_task_completed(
-                                                dep_task.id
-                                            )
-                                        )
-                                        continue
-                    except Exception as e:
-                        logger.debug(
-                            "Exception while checking completed state for dep_task %s: %s",
-                            getattr(dep_task, "id", None),
-                            e,
-                            exc_info=True,
-                        )
-                    # Find corresponding queue task
-                    queue_task = self.progress_tracker.get_task(dep_task.id)
-                    if queue_task:
-                        # Mark dependency task as running
-                        await self.dependency_manager.mark_task_running(dep_task.id)
-
-                        # Enqueue the actual task with proper routing
-                        if self.enable_streamer_isolation:
-                            streamer_name = self._extract_streamer_name(
-                                queue_task.payload
-                            )
-                            await self._enqueue_to_streamer_queue(
-                                queue_task, streamer_name
-                            )
-                        else:
-                            priority_value = -queue_task.priority.value
-                            await self.task_queue.put((priority_value, queue_task))
-
-                        logger.debug(
-                            f"Dependency worker enqueued ready task {dep_task.id}"
-                        )
-
-                # Brief pause before checking again - faster for multiple streams
-                await asyncio.sleep(ASYNC_DELAYS.TASK_QUEUE_POLL_REDUCED)
+                    await self._dispatch_ready_task(dep_task)
 
             except asyncio.CancelledError:
                 logger.info("Dependency worker cancelled")
@@ -535,6 +496,70 @@ class TaskQueueManager:
 
         logger.info("Dependency worker stopped")
 
+    async def _dispatch_ready_task(self, dep_task: Task):
+        """Route a single READY dependency task to its execution queue"""
+        # Cancelled or failed while earlier tasks of this batch were dispatched
+        if dep_task.status != DepTaskStatus.READY:
+            return
+
+        # Skip tasks already completed in persistent state
+        if self._is_step_already_completed(dep_task):
+            logger.info(
+                f"⏭️ Skipping already-completed task {dep_task.id} ({dep_task.type}) for recording {dep_task.payload.get('recording_id')}"
+            )
+            # Completion makes dependents READY, which wakes the worker again
+            await self.dependency_manager.mark_task_completed(dep_task.id)
+            return
+
+        # Find corresponding queue task
+        queue_task = self.progress_tracker.get_task(dep_task.id)
+        if not queue_task:
+            # Queue task not registered yet - retry shortly instead of dropping it
+            asyncio.get_running_loop().call_later(
+                ASYNC_DELAYS.BRIEF_PAUSE,
+                self.dependency_manager.requeue_ready_task,
+                dep_task.id,
+            )
+            return
+
+        # Mark dependency task as running
+        await self.dependency_manager.mark_task_running(dep_task.id)
+
+        # Enqueue the actual task with proper routing
+        if self.enable_streamer_isolation:
+            streamer_name = self._extract_streamer_name(queue_task.payload)
+            await self._enqueue_to_streamer_queue(queue_task, streamer_name)
+        else:
+            priority_value = -queue_task.priority.value
+            await self.task_queue.put((priority_value, queue_task))
+
+        logger.debug(f"Dependency worker enqueued ready task {dep_task.id}")
+
+    async def _prefetch_processing_states(self, ready_tasks: list):
+        """Load persistent states for a dispatch cycle with one bulk query"""
+        recording_ids = {
+            t.payload.get("recording_id")
+            for t in ready_tasks
+            if t.payload.get("recording_id")
+        }
+        recording_ids = {
+            rid
+            for rid in recording_ids
+            if not self.processing_state_cache.is_cached(rid)
+        }
+        if recording_ids:
+            await asyncio.to_thread(self.processing_state_cache.load, recording_ids)
+
+    def _is_step_already_completed(self, dep_task: Task) -> bool:
+        """Check the cached persistent state for an already-completed step"""
+        rec_id = dep_task.payload.get("recording_id")
+        if not rec_id:
+            return False
+        return (
+            self.processing_state_cache.get_step_status(rec_id, dep_task.type)
+            == "completed"
+        )
+
     async def _stats_broadcast_worker(self):
         """Worker that periodically broadcasts queue statistics"""
         logger.info("Stats broadcast worker started")
@@ -566,11 +591,7 @@ class TaskQueueManager:
                     task_id, "Task execution failed"
                 )
             # Diagnostic: find tasks that depend on this one and log their statuses
-            dependents = [
-                t.id
-                for t in self.dependency_manager.tasks.values()
-                if task_id in t.dependencies
-            ]
+            dependents = self.dependency_manager.get_dependents(task_id)
             if dependents:
                 statuses = {}
                 for d in dependents:
@@ -648,6 +669,7 @@ class TaskQueueManager:
                     "isolation_enabled": True,
                 },
                 "streamers": streamer_stats,
+                "admission": self.admission.get_statistics(),
                 "registered_handlers": self.worker_manager.get_registered_handlers(),
             }
         else:
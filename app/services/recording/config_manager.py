@@ -1,15 +1,14 @@
 """
 Configuration manager for the recording service.
 
-This module handles all configuration access with efficient caching.
+This module handles all configuration access. Values come from the
+in-memory settings snapshots, which are refreshed whenever settings change.
 """
 
 import logging
-from datetime import datetime
 from typing import Optional
 
-from app.database import SessionLocal
-from app.models import RecordingSettings, StreamerRecordingSettings
+from app.services.core.settings_snapshot import SettingsSnapshot, settings_snapshot
 
 logger = logging.getLogger("streamvault")
 
@@ -25,105 +24,19 @@ FILENAME_PRESETS = {
 
 
 class ConfigManager:
-    """Manages and caches recording configuration settings"""
+    """Recording configuration backed by the shared settings snapshots"""
 
-    def __init__(self):
-        self.cache_timeout = 300  # 5 minutes cache timeout
-        self.last_refresh = datetime.min
-        self._global_settings = None
-        self._streamer_settings = {}
+    def invalidate_cache(self):
+        """Force a reload of the settings snapshots"""
+        settings_snapshot.invalidate("config manager cache invalidated")
 
-    def _is_cache_valid(self) -> bool:
-        """Check if the cached settings are still valid"""
-        return (datetime.now() - self.last_refresh).total_seconds() < self.cache_timeout
+    def get_global_settings(self) -> Optional[SettingsSnapshot]:
+        """Get global recording settings"""
+        return settings_snapshot.get_recording_settings()
 
-    def invalidate_cache(self):
-        """Force invalidation of the cache"""
-        self._global_settings = None
-        self._streamer_settings = {}
-        self.last_refresh = datetime.min
-
-    def _categorize_database_error(
-        self, error: Exception, table_name: str
-    ) -> Optional[str]:
-        """Categorize database errors for better handling.
-
-        Args:
-            error: The exception that was raised
-            table_name: Name of the table being accessed
-
-        Returns:
-            Error category string or None to continue default handling
-        """
-        error_msg = str(error).lower()
-
-        # Check for table/relation doesn't exist
-        if "relation" in error_msg and "does not exist" in error_msg:
-            logger.warning(f"{table_name} table doesn't exist yet: {error}")
-            logger.info(
-                f"Using default settings - {table_name} table may not exist yet during migration"
-            )
-            return "table_not_exists"
-
-        # Check for connection issues
-        elif "connection" in error_msg or "database" in error_msg:
-            logger.error(f"Database connection error accessing {table_name}: {error}")
-            return "connection_error"
-
-        # Check for specific SQLAlchemy errors by type
-        error_type = type(error).__name__
-        if "ProgrammingError" in error_type or "OperationalError" in error_type:
-            # These are typically schema/table issues
-            logger.warning(f"Database schema error accessing {table_name}: {error}")
-            return "schema_error"
-
-        # Other unexpected errors
-        logger.error(f"Unexpected error accessing {table_name}: {error}")
-        return "unexpected_error"
-
-    def get_global_settings(self) -> Optional[RecordingSettings]:
-        """Get global recording settings, using cache if valid"""
-        if not self._global_settings or not self._is_cache_valid():
-            try:
-                with SessionLocal() as db:
-                    self._global_settings = db.query(RecordingSettings).first()
-                    self.last_refresh = datetime.now()
-            except Exception as e:
-                error_category = self._categorize_database_error(e, "RecordingSettings")
-                if error_category in [
-                    "table_not_exists",
-                    "connection_error",
-                    "schema_error",
-                    "unexpected_error",
-                ]:
-                    return None
-        return self._global_settings
-
-    def get_streamer_settings(
-        self, streamer_id: int
-    ) -> Optional[StreamerRecordingSettings]:
-        """Get streamer-specific recording settings, using cache if valid"""
-        if streamer_id not in self._streamer_settings or not self._is_cache_valid():
-            try:
-                with SessionLocal() as db:
-                    self._streamer_settings[streamer_id] = (
-                        db.query(StreamerRecordingSettings)
-                        .filter(StreamerRecordingSettings.streamer_id == streamer_id)
-                        .first()
-                    )
-                    self.last_refresh = datetime.now()
-            except Exception as e:
-                error_category = self._categorize_database_error(
-                    e, "StreamerRecordingSettings"
-                )
-                if error_category in [
-                    "table_not_exists",
-                    "connection_error",
-                    "schema_error",
-                    "unexpected_error",
-                ]:
-                    return None
-        return self._streamer_settings.get(streamer_id)
+    def get_streamer_settings(self, streamer_id: int) -> Optional[SettingsSnapshot]:
+        """Get streamer-specific recording settings"""
+        return settings_snapshot.get_streamer_settings(streamer_id)
 
     def is_recording_enabled(self, streamer_id: int) -> bool:
         """Check if recording is enabled for a streamer"""
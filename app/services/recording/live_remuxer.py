@@ -0,0 +1,205 @@
+"""
+Live remux of a recording segment to fragmented MP4.
+
+Streamlink keeps writing the .ts segment as before (it stays the safety
+copy). Next to it, LiveRemuxer follows the growing file like ``tail -f``
+and pipes it into ffmpeg, which writes a fragmented MP4
+(``frag_keyframe+empty_moov``). Every fragment is self-contained, so the
+MP4 is playable while it grows and needs no moov rewrite at the end.
+
+When the segment ends, finish() drains the rest of the .ts file, lets
+ffmpeg close the last fragment and renames ``<segment>.mp4.part`` to
+``<segment>.mp4``. That replaces the full TS -> MP4 remux after
+stream.offline with a short finalization step.
+"""
+
+import asyncio
+import logging
+import os
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, Optional
+
+logger = logging.getLogger("streamvault")
+
+# Bytes read from the growing .ts file per iteration
+READ_CHUNK_SIZE = 1024 * 1024
+
+# How often to look for new data once the reader has caught up
+POLL_INTERVAL_SECONDS = 0.5
+
+# Maximum time to drain the remaining data and close the MP4 at stream end
+FINISH_TIMEOUT_SECONDS = 300
+
+# Suffix of the finalized live remux output next to the final .ts file
+LIVE_MP4_SUFFIX = ".live.mp4"
+
+
+def live_mp4_path(ts_path: str) -> str:
+    """Where the finalized live remux of a recording is stored"""
+    return str(Path(ts_path).with_suffix(LIVE_MP4_SUFFIX))
+
+
+class LiveRemuxer:
+    """Remuxes one growing .ts segment to fragmented MP4 while it is recorded"""
+
+    def __init__(
+        self,
+        ts_path: str,
+        output_path: str,
+        metadata: Optional[Dict[str, Any]] = None,
+    ):
+        self.ts_path = ts_path
+        self.output_path = output_path
+        self.part_path = f"{output_path}.part"
+        self.metadata = metadata or {}
+
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._pump_task: Optional[asyncio.Task] = None
+        self._stderr_task: Optional[asyncio.Task] = None
+        self._finish_task: Optional[asyncio.Task] = None
+        self._source_done = asyncio.Event()
+        self._stderr_tail: Deque[str] = deque(maxlen=20)
+        self.bytes_fed = 0
+
+    def build_command(self) -> list:
+        cmd = [
+            "ffmpeg",
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-f",
+            "mpegts",
+            "-i",
+            "pipe:0",
+            "-map",
+            "0:v?",
+            "-map",
+            "0:a?",
+            "-c",
+            "copy",
+            "-bsf:a",
+            "aac_adtstoasc",  # Fix for AAC audio in TS container
+        ]
+        for key, value in self.metadata.items():
+            if value:
+                cmd.extend(["-metadata", f"{key}={value}"])
+        cmd.extend(
+            [
+                "-movflags",
+                "+frag_keyframe+empty_moov+default_base_moof",
+                "-f",
+                "mp4",
+                "-y",
+                self.part_path,
+            ]
+        )
+        return cmd
+
+    async def start(self) -> None:
+        """Start ffmpeg and begin following the segment file"""
+        self._process = await asyncio.create_subprocess_exec(
+            *self.build_command(),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        self._stderr_task = asyncio.create_task(self._collect_stderr())
+        self._pump_task = asyncio.create_task(self._pump())
+        logger.info(f"🎞️ Live remux started: {self.ts_path} -> {self.part_path}")
+
+    async def finish(self, timeout: float = FINISH_TIMEOUT_SECONDS) -> bool:
+        """Signal that the segment is complete and finalize the MP4.
+
+        Safe to call more than once; later calls wait for the same result.
+        Returns True if ``output_path`` holds a complete MP4.
+        """
+        if self._finish_task is None:
+            self._finish_task = asyncio.create_task(self._finish(timeout))
+        return await asyncio.shield(self._finish_task)
+
+    async def abort(self) -> None:
+        """Stop without finalizing (shutdown); the .ts segment is untouched"""
+        self._source_done.set()
+        for task in (self._pump_task, self._stderr_task):
+            if task:
+                task.cancel()
+        if self._process and self._process.returncode is None:
+            try:
+                self._process.kill()
+                await self._process.wait()
+            except ProcessLookupError:
+                pass
+
+    async def _finish(self, timeout: float) -> bool:
+        self._source_done.set()
+        try:
+            if self._pump_task:
+                await asyncio.wait_for(asyncio.shield(self._pump_task), timeout)
+            if self._process:
+                await asyncio.wait_for(self._process.wait(), timeout)
+            if self._stderr_task:
+                await self._stderr_task
+        except asyncio.TimeoutError:
+            logger.error(f"Live remux of {self.ts_path} did not finish in {timeout}s")
+            await self.abort()
+            return False
+
+        if not self._process or self._process.returncode != 0:
+            logger.error(
+                f"Live remux of {self.ts_path} failed "
+                f"(exit code {self._process.returncode if self._process else None}): "
+                f"{' | '.join(self._stderr_tail)}"
+            )
+            return False
+        if not os.path.exists(self.part_path) or os.path.getsize(self.part_path) == 0:
+            logger.error(f"Live remux produced no output for {self.ts_path}")
+            return False
+
+        os.replace(self.part_path, self.output_path)
+        logger.info(
+            f"✅ Live remux finalized: {self.output_path} ({self.bytes_fed} bytes fed)"
+        )
+        return True
+
+    async def _pump(self) -> None:
+        """Feed the growing .ts file into ffmpeg until the segment is done"""
+        stdin = self._process.stdin
+        source = None
+        try:
+            while source is None:
+                if os.path.exists(self.ts_path):
+                    source = await asyncio.to_thread(open, self.ts_path, "rb")
+                elif self._source_done.is_set():
+                    return
+                else:
+                    await asyncio.sleep(POLL_INTERVAL_SECONDS)
+
+            while True:
+                # Checked before reading: an empty read after the writer
+                # stopped is the real end of the file
+                writer_done = self._source_done.is_set()
+                chunk = await asyncio.to_thread(source.read, READ_CHUNK_SIZE)
+                if chunk:
+                    stdin.write(chunk)
+                    await stdin.drain()
+                    self.bytes_fed += len(chunk)
+                    continue
+                if writer_done:
+                    break
+                await asyncio.sleep(POLL_INTERVAL_SECONDS)
+        except (BrokenPipeError, ConnectionResetError):
+            logger.warning(f"Live remux ffmpeg exited early for {self.ts_path}")
+        finally:
+            if source is not None:
+                source.close()
+            try:
+                stdin.close()
+            except Exception:
+                pass
+
+    async def _collect_stderr(self) -> None:
+        async for line in self._process.stderr:
+            text = line.decode("utf-8", errors="replace").strip()
+            if text:
+                self._stderr_tail.append(text)
@@ -36,8 +36,16 @@ except ImportError:
 from app.utils.streamlink_utils import get_streamlink_command
 from app.services.recording.exceptions import ProcessError
 from app.models import Stream
+from app.services.recording.live_remuxer import LiveRemuxer, live_mp4_path
+from app.utils.subprocess_runner import (
+    OutputDrain,
+    parse_ffmpeg_line,
+    parse_streamlink_line,
+    run_process,
+)
 from app.utils import async_file
 from app.config.constants import ASYNC_DELAYS
+from app.services.core.settings_snapshot import settings_snapshot
 
 logger = logging.getLogger("streamvault")
 
@@ -92,6 +100,7 @@ class ProcessManager:
 
         self.active_processes = {}
         self.long_stream_processes = {}  # Track processes that need segmentation
+        self.output_drains: Dict[asyncio.subprocess.Process, OutputDrain] = {}
         self.lock = asyncio.Lock()
         self.config_manager = config_manager
         self.post_processing_callback = post_processing_callback  # Injected dependency
@@ -255,6 +264,9 @@ class ProcessManager:
             "segment_start_time": datetime.now(),
             "total_segments": [],
             "monitor_task": None,
+            # Fragmented MP4 written alongside each segment (recording setting)
+            "live_remux": self._live_remux_enabled(),
+            "live_remuxers": {},
         }
 
         process_id = f"stream_{stream.id}"
@@ -266,6 +278,77 @@ class ProcessManager:
         )
         return segment_info
 
+    def _live_remux_enabled(self) -> bool:
+        """Whether recordings are remuxed to MP4 while they are recorded"""
+        try:
+            recording_settings = settings_snapshot.get_recording_settings()
+            return bool(getattr(recording_settings, "live_remux", False))
+        except Exception as e:
+            logger.warning(f"Could not read live remux setting: {e}")
+            return False
+
+    async def _start_live_remux(
+        self, stream: Stream, segment_path: str, segment_info: Dict
+    ) -> None:
+        """Start remuxing a new segment to fragmented MP4 while it is recorded.
+
+        Failures only disable live remux for this segment; the .ts recording
+        and the regular post-processing remux are unaffected.
+        """
+        try:
+            from app.services.media.metadata_service import metadata_service
+
+            remuxer = LiveRemuxer(
+                segment_path,
+                str(Path(segment_path).with_suffix(".mp4")),
+                metadata=metadata_service.build_container_metadata(
+                    stream, segment_info.get("streamer_name") or ""
+                ),
+            )
+            await remuxer.start()
+            segment_info["live_remuxers"][segment_path] = remuxer
+        except Exception as e:
+            logger.warning(f"Live remux not started for {segment_path}: {e}")
+
+    async def _finish_live_remux(
+        self, segment_info: Dict, segment_files: list
+    ) -> Optional[str]:
+        """Finalize the live remuxers of a recording.
+
+        Returns the finished MP4 if the recording is a single live-remuxed
+        segment. Otherwise the partial outputs are removed and the regular
+        concat + remux chain handles the recording.
+        """
+        remuxers = segment_info.get("live_remuxers") or {}
+        if not remuxers:
+            return None
+
+        results = dict(
+            zip(
+                remuxers,
+                await asyncio.gather(
+                    *(remuxer.finish() for remuxer in remuxers.values()),
+                    return_exceptions=True,
+                ),
+            )
+        )
+
+        if len(segment_files) == 1 and results.get(segment_files[0]) is True:
+            return remuxers[segment_files[0]].output_path
+
+        logger.info(
+            f"Live remux not usable for stream {segment_info['stream_id']} "
+            f"({len(segment_files)} segments), falling back to full remux"
+        )
+        for remuxer in remuxers.values():
+            for path in (remuxer.output_path, remuxer.part_path):
+                try:
+                    if await async_file.exists(path):
+                        await async_file.remove(path)
+                except Exception as e:
+                    logger.warning(f"Could not remove live remux output {path}: {e}")
+        return None
+
     async def _start_segment(
         self, stream: Stream, segment_path: str, quality: str, segment_info: Dict
     ) -> Optional[asyncio.subprocess.Process]:
@@ -306,66 +389,62 @@ class ProcessManager:
             # Uses health checks and automatic failover to select best proxy
             proxy_settings = None
 
-            from app.database import SessionLocal
-            from app.models import RecordingSettings
+            recording_settings = settings_snapshot.get_recording_settings()
 
-            with SessionLocal() as db:
-                recording_settings = db.query(RecordingSettings).first()
-
-                # Check if proxy system is enabled
-                if (
-                    recording_settings
-                    and hasattr(recording_settings, "enable_proxy")
-                    and recording_settings.enable_proxy
-                ):
-                    from app.services.proxy.proxy_health_service import (
-                        proxy_health_service,
-                    )
+            # Check if proxy system is enabled
+            if (
+                recording_settings
+                and hasattr(recording_settings, "enable_proxy")
+                and recording_settings.enable_proxy
+            ):
+                from app.services.proxy.proxy_health_service import (
+                    proxy_health_service,
+                )
 
-                    # Get best available proxy from health service
-                    best_proxy_url = await proxy_health_service.get_best_proxy()
+                # Get best available proxy from health service
+                best_proxy_url = await proxy_health_service.get_best_proxy()
 
-                    if best_proxy_url:
-                        # Use selected proxy
-                        proxy_settings = {
-                            "http": best_proxy_url,
-                            "https": best_proxy_url,
-                        }
-                        # SECURITY: Sanitize proxy URL to hide credentials - CWE-532
-                        from app.utils.security import sanitize_proxy_url_for_logging
+                if best_proxy_url:
+                    # Use selected proxy
+                    proxy_settings = {
+                        "http": best_proxy_url,
+                        "https": best_proxy_url,
+                    }
+                    # SECURITY: Sanitize proxy URL to hide credentials - CWE-532
+                    from app.utils.security import sanitize_proxy_url_for_logging
 
-                        logger.info(
-                            f"✅ Using proxy for recording: {sanitize_proxy_url_for_logging(best_proxy_url)}"
+                    logger.info(
+                        f"✅ Using proxy for recording: {sanitize_proxy_url_for_logging(best_proxy_url)}"
+                    )
+                else:
+                    # No healthy proxies available
+                    fallback_enabled = (
+                        hasattr(recording_settings, "fallback_to_direct_connection")
+                        and recording_settings.fallback_to_direct_connection
+                    )
+
+                    if fallback_enabled:
+                        logger.warning(
+                            "⚠️ No healthy proxies available - using direct connection (fallback enabled)"
                         )
+                        proxy_settings = None  # Direct connection
                     else:
-                        # No healthy proxies available
-                        fallback_enabled = (
-                            hasattr(recording_settings, "fallback_to_direct_connection")
-                            and recording_settings.fallback_to_direct_connection
+                        error_msg = f"Cannot start recording for {streamer_name}: No healthy proxies available and fallback disabled"
+                        logger.error(f"🔴 {error_msg}")
+                        raise ProcessError(
+                            "No healthy proxies available. Please check proxy settings or enable fallback to direct connection."
                         )
-
-                        if fallback_enabled:
-                            logger.warning(
-                                "⚠️ No healthy proxies available - using direct connection (fallback enabled)"
-                            )
-                            proxy_settings = None  # Direct connection
-                        else:
-                            error_msg = f"Cannot start recording for {streamer_name}: No healthy proxies available and fallback disabled"
-                            logger.error(f"🔴 {error_msg}")
-                            raise ProcessError(
-                                "No healthy proxies available. Please check proxy settings or enable fallback to direct connection."
-                            )
-                else:
-                    # Proxy system disabled - use direct connection
-                    logger.info("ℹ️ Proxy system disabled - using direct connection")
-                    proxy_settings = None
+            else:
+                # Proxy system disabled - use direct connection
+                logger.info("ℹ️ Proxy system disabled - using direct connection")
+                proxy_settings = None
 
             # Get codec preferences (H.265/AV1 support - Streamlink 8.0.0+)
             # Priority: Streamer-specific > Global default
             supported_codecs = None
             oauth_token = None  # Will be set to fresh token if available
 
-            from app.models import GlobalSettings, StreamerRecordingSettings
+            from app.database import SessionLocal
             from app.services.system.twitch_token_service import TwitchTokenService
 
             with SessionLocal() as db:
@@ -388,10 +467,8 @@ class ProcessManager:
 
                 # === STEP 2: Get codec preferences ===
                 # Try to get per-streamer codec preference first
-                streamer_settings = (
-                    db.query(StreamerRecordingSettings)
-                    .filter(StreamerRecordingSettings.streamer_id == stream.streamer_id)
-                    .first()
+                streamer_settings = settings_snapshot.get_streamer_settings(
+                    stream.streamer_id
                 )
 
                 if streamer_settings and streamer_settings.supported_codecs:
@@ -402,7 +479,7 @@ class ProcessManager:
                     )
                 else:
                     # Fallback to global default
-                    global_settings = db.query(GlobalSettings).first()
+                    global_settings = settings_snapshot.get_global_settings()
                     if global_settings and hasattr(global_settings, "supported_codecs"):
                         supported_codecs = global_settings.supported_codecs
                         logger.debug(
@@ -488,48 +565,51 @@ class ProcessManager:
                 *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
             )
 
+            # Drain output while streamlink runs: lines go to the streamer log,
+            # only a tail and parsed errors/progress stay in memory
+            drain = OutputDrain(
+                process,
+                log_path=streamlink_log_path if self.logging_service else None,
+                parser=parse_streamlink_line,
+            )
+
             # Add immediate check to see if process started successfully
             await asyncio.sleep(ASYNC_DELAYS.PROCESS_START_GRACE)
             if process.returncode is not None:
-                # Process already ended, capture output
-                stdout, stderr = await process.communicate()
+                # Process already ended, wait for its remaining output
+                output = await drain.wait()
                 logger.error(
                     f"🎬 PROCESS_FAILED_IMMEDIATELY: PID would be {process.pid}, exit code {process.returncode}"
                 )
-                logger.error(f"🎬 STDOUT: {stdout.decode()}")
-                logger.error(f"🎬 STDERR: {stderr.decode()}")
+                logger.error(f"🎬 OUTPUT: {output.tail()}")
 
-                # Log to structured logging service
+                # Log to structured logging service (output itself is already streamed)
                 if self.logging_service:
-                    self.logging_service.log_streamlink_output(
+                    self.logging_service.log_streamlink_exit(
                         streamer_name=streamer_name,
-                        stdout=stdout,
-                        stderr=stderr,
                         exit_code=process.returncode,
                         log_path=streamlink_log_path,  # Pass the log path from start
                     )
 
-                    # Also append to the streamer-specific log file using proper logging
-                    streamer_logger = logging.getLogger(f"streamlink.{streamer_name}")
-                    try:
-                        streamer_logger.error(
-                            f"PROCESS FAILED IMMEDIATELY (exit code: {process.returncode})"
-                        )
-                        if stdout:
-                            streamer_logger.error(f"STDOUT:\n{stdout.decode()}")
-                        if stderr:
-                            streamer_logger.error(f"STDERR:\n{stderr.decode()}")
-                    except Exception as e:
-                        logger.warning(f"Could not write to streamlink log file: {e}")
-
                 raise ProcessError(
-                    f"Streamlink process failed immediately: {stderr.decode()}"
+                    f"Streamlink process failed immediately: "
+                    f"{output.error_message or output.stderr_tail.decode()}"
                 )
 
+            self.output_drains[process] = drain
+
             process_id = f"stream_{stream.id}"
             async with self.lock:
                 self.active_processes[process_id] = process
 
+            # Remember what is being recorded so live playback can tap it
+            segment_info["streamer_name"] = streamer_name
+            segment_info["quality"] = quality
+            segment_info["supported_codecs"] = supported_codecs
+
+            if segment_info.get("live_remux"):
+                await self._start_live_remux(stream, segment_path, segment_info)
+
             # Add segment to the list
             segment_info["total_segments"].append(
                 {
@@ -700,6 +780,7 @@ class ProcessManager:
                     # This prevents stuck process references
                     try:
                         self.active_processes.pop(process_id, None)
+                        self.output_drains.pop(current_process, None)
                         logger.debug(
                             f"Removed process {process_id} from active_processes tracking"
                         )
@@ -708,6 +789,13 @@ class ProcessManager:
                             f"Error removing process {process_id} from tracking: {e}"
                         )
 
+            # The old segment is complete; close its live MP4 in the background
+            old_remuxer = (segment_info.get("live_remuxers") or {}).get(
+                segment_info["current_segment_path"]
+            )
+            if old_remuxer:
+                asyncio.create_task(old_remuxer.finish())
+
             # Prepare next segment
             segment_info["segment_count"] += 1
             base_path = Path(segment_info["base_output_path"])
@@ -770,8 +858,10 @@ class ProcessManager:
                 await self._finalize_segmented_recording(segment_info)
                 return 0  # Success for segmented recording
             else:
-                # Normal single-file recording
-                stdout, stderr = await process.communicate()
+                # Normal single-file recording; errors were parsed while the
+                # output was streamed to the log
+                drain = self.output_drains.get(process)
+                output = await drain.wait() if drain else None
 
                 # CRITICAL: Detect recording failure and update database
                 if process.returncode != 0:
@@ -779,29 +869,15 @@ class ProcessManager:
                         f"🚨 Recording process failed with exit code {process.returncode} (PID: {process.pid})"
                     )
 
-                    # Extract error message from stderr
                     error_message = "Unknown error"
                     failure_reason = "streamlink_crash"
 
-                    if stderr:
-                        stderr_text = stderr.decode("utf-8", errors="replace")
-                        logger.error(f"Process stderr: {stderr_text[:1000]}")
+                    if output and output.line_count:
+                        logger.error(f"Process output tail: {output.tail()[-1000:]}")
 
-                        # Parse common failure reasons
-                        if (
-                            "ProxyError" in stderr_text
-                            or "Tunnel connection failed" in stderr_text
-                        ):
-                            failure_reason = "proxy_error"
-                            error_message = (
-                                "Proxy connection failed (500 Internal Server Error)"
-                            )
-                        elif "Unable to open URL" in stderr_text:
-                            failure_reason = "stream_unavailable"
-                            error_message = "Stream unavailable or ended"
-                        elif "No playable streams found" in stderr_text:
-                            failure_reason = "no_streams"
-                            error_message = "No playable streams found"
+                        if output.failure_reason:
+                            failure_reason = output.failure_reason
+                            error_message = output.error_message
                         else:
                             error_message = (
                                 f"Streamlink exited with code {process.returncode}"
@@ -845,15 +921,10 @@ class ProcessManager:
 
                                 if stream and stream.streamer and stream.recording_path:
                                     # Get quality from streamer recording settings
-                                    from app.models import StreamerRecordingSettings
-
                                     recording_settings = (
-                                        db.query(StreamerRecordingSettings)
-                                        .filter(
-                                            StreamerRecordingSettings.streamer_id
-                                            == stream.streamer_id
+                                        settings_snapshot.get_streamer_settings(
+                                            stream.streamer_id
                                         )
-                                        .first()
                                     )
                                     quality = (
                                         recording_settings.quality
@@ -926,10 +997,8 @@ class ProcessManager:
                                         log_path = self.logging_service.get_streamlink_log_path(
                                             streamer.username
                                         )
-                                        self.logging_service.log_streamlink_output(
+                                        self.logging_service.log_streamlink_exit(
                                             streamer_name=streamer.username,
-                                            stdout=stdout,
-                                            stderr=stderr,
                                             exit_code=process.returncode or 0,
                                             log_path=log_path,
                                         )
@@ -1000,38 +1069,51 @@ class ProcessManager:
                 )
                 return
 
-            # Create concatenation list file for FFmpeg
-            concat_list_path = Path(segment_info["segment_dir"]) / "concat_list.txt"
-            with open(concat_list_path, "w") as f:
-                for segment_file in segment_files:
-                    f.write(f"file '{segment_file}'\n")
-
-            # Use FFmpeg to concatenate segments
             output_path = segment_info["base_output_path"]
-            cmd = [
-                "ffmpeg",
-                "-f",
-                "concat",
-                "-safe",
-                "0",
-                "-i",
-                str(concat_list_path),
-                "-c",
-                "copy",
-                "-y",
-                output_path,
-            ]
+            live_mp4 = await self._finish_live_remux(segment_info, segment_files)
 
-            logger.info(
-                f"Concatenating {len(segment_files)} segments for stream {segment_info['stream_id']}"
-            )
-            process = await asyncio.create_subprocess_exec(
-                *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-            )
+            if live_mp4:
+                # Single segment already remuxed live: nothing to concatenate
+                await async_file.move(segment_files[0], output_path)
+                concat_succeeded = True
+                logger.info(
+                    f"Live-remuxed recording for stream {segment_info['stream_id']} "
+                    f"needs no concatenation"
+                )
+            else:
+                # Create concatenation list file for FFmpeg
+                concat_list_path = Path(segment_info["segment_dir"]) / "concat_list.txt"
+                with open(concat_list_path, "w") as f:
+                    for segment_file in segment_files:
+                        f.write(f"file '{segment_file}'\n")
+
+                # Use FFmpeg to concatenate segments
+                cmd = [
+                    "ffmpeg",
+                    "-f",
+                    "concat",
+                    "-safe",
+                    "0",
+                    "-i",
+                    str(concat_list_path),
+                    "-c",
+                    "copy",
+                    "-y",
+                    output_path,
+                ]
 
-            stdout, stderr = await process.communicate()
+                logger.info(
+                    f"Concatenating {len(segment_files)} segments for stream {segment_info['stream_id']}"
+                )
+                concat_output = await run_process(cmd, parser=parse_ffmpeg_line)
+                concat_succeeded = concat_output.returncode == 0
+                if not concat_succeeded:
+                    logger.error(
+                        f"Failed to concatenate segments: "
+                        f"{concat_output.error_message or concat_output.tail()[-500:]}"
+                    )
 
-            if process.returncode == 0:
+            if concat_succeeded:
                 logger.info(f"Successfully concatenated segments into {output_path}")
 
                 # Send Apprise notification for recording_completed (NEW)
@@ -1056,15 +1138,10 @@ class ProcessManager:
 
                         if stream and stream.streamer:
                             # Get quality from streamer recording settings
-                            from app.models import StreamerRecordingSettings
-
                             recording_settings = (
-                                db.query(StreamerRecordingSettings)
-                                .filter(
-                                    StreamerRecordingSettings.streamer_id
-                                    == stream.streamer_id
+                                settings_snapshot.get_streamer_settings(
+                                    stream.streamer_id
                                 )
-                                .first()
                             )
                             quality = (
                                 recording_settings.quality
@@ -1117,6 +1194,11 @@ class ProcessManager:
                 # Move concatenated file from segments directory to parent directory
                 await self._move_concatenated_file_to_parent(segment_info)
 
+                if live_mp4:
+                    # Next to the final .ts, where the mp4_remux task picks it up
+                    final_ts = segment_info.get("final_output_path", output_path)
+                    await async_file.move(live_mp4, live_mp4_path(final_ts))
+
                 # Trigger post-processing for the moved file
                 await self._trigger_post_processing_for_segmented_recording(
                     segment_info
@@ -1124,10 +1206,6 @@ class ProcessManager:
 
                 # Clean up segment files and directory only after post-processing starts
                 await self._cleanup_segments(segment_info)
-            else:
-                logger.error(
-                    f"Failed to concatenate segments: {stderr.decode('utf-8', errors='replace')[:500]}"
-                )
 
         except Exception as e:
             logger.error(f"Error finalizing segmented recording: {e}", exc_info=True)
@@ -1365,6 +1443,7 @@ class ProcessManager:
 
     async def _cleanup_process(self, process: asyncio.subprocess.Process):
         """Clean up process from tracking"""
+        self.output_drains.pop(process, None)
         async with self.lock:
             # Remove from active processes
             for process_id, active_process in list(self.active_processes.items()):
@@ -1405,6 +1484,7 @@ class ProcessManager:
             process = self.active_processes.pop(
                 process_id
             )  # Handle segmented recording cleanup
+            self.output_drains.pop(process, None)
             if process_id in self.long_stream_processes:
                 segment_info = self.long_stream_processes[process_id]
                 if segment_info["monitor_task"]:
@@ -1445,6 +1525,32 @@ class ProcessManager:
         """Get the number of active recording processes"""
         return len(self.active_processes)
 
+    @classmethod
+    def get_existing_instance(cls) -> Optional["ProcessManager"]:
+        """Return the singleton if it was already created, without creating it"""
+        return cls._instance if cls._initialized else None
+
+    def get_live_recording(self, streamer_name: str) -> Optional[Dict]:
+        """Get the segment currently being recorded for a streamer.
+
+        Used by live playback to read the recording instead of opening a
+        second Twitch connection. Returns None if the streamer isn't recorded.
+        """
+        for process_id, segment_info in list(self.long_stream_processes.items()):
+            recorded_name = segment_info.get("streamer_name") or ""
+            if recorded_name.lower() != streamer_name.lower():
+                continue
+            process = self.active_processes.get(process_id)
+            if process is None or process.returncode is not None:
+                continue
+            return {
+                "stream_id": segment_info["stream_id"],
+                "path": segment_info["current_segment_path"],
+                "quality": segment_info.get("quality"),
+                "supported_codecs": segment_info.get("supported_codecs"),
+            }
+        return None
+
     async def graceful_shutdown(self, timeout: int = 15):
         """Gracefully shutdown all recording processes
 
@@ -1490,6 +1596,12 @@ class ProcessManager:
             if termination_tasks:
                 await asyncio.gather(*termination_tasks, return_exceptions=True)
 
+            # Live MP4s stay partial; recovery resumes into a new segment and
+            # the recording falls back to the regular remux
+            for segment_info in list(self.long_stream_processes.values()):
+                for remuxer in (segment_info.get("live_remuxers") or {}).values():
+                    await remuxer.abort()
+
             # Clear process tracking
             self.active_processes.clear()
             self.long_stream_processes.clear()
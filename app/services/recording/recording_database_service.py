@@ -12,6 +12,7 @@ from sqlalchemy import text
 from sqlalchemy.orm import joinedload
 from app.models import Recording, Stream, Streamer
 from app.database import get_db
+from app.services.streamers.streamer_snapshot import invalidate_streamer_snapshot
 from app.utils.retry_decorator import database_retry, RetryableError, NonRetryableError
 
 logger = logging.getLogger("streamvault")
@@ -87,6 +88,7 @@ class RecordingDatabaseService:
                 recording.end_time = datetime.utcnow()
 
             self.db.commit()
+            invalidate_streamer_snapshot("recording status changed")
             logger.info(
                 f"Recording {recording_id} status updated: {old_status} → {status}"
             )
@@ -116,6 +118,7 @@ class RecordingDatabaseService:
             self.db.add(recording)
             self.db.commit()
             self.db.refresh(recording)
+            invalidate_streamer_snapshot("recording started")
 
             logger.info(f"Created recording {recording.id} for stream {stream_id}")
             return recording
@@ -173,6 +176,7 @@ class RecordingDatabaseService:
             if stream and not stream.ended_at:
                 stream.ended_at = datetime.utcnow()
                 self.db.commit()
+                invalidate_streamer_snapshot("stream ended")
                 logger.info(f"Marked stream {stream_id} as ended")
 
         except Exception as e:
@@ -260,6 +264,7 @@ class RecordingDatabaseService:
                         recording.error_message = error_message
 
                 self.db.commit()
+                invalidate_streamer_snapshot("recording failed")
                 logger.info(f"Marked recording {recording_id} as failed")
             else:
                 raise NonRetryableError(f"Recording {recording_id} not found")
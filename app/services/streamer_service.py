@@ -93,7 +93,7 @@ class StreamerService:
     # Delegate methods to StreamerRepository
     async def get_streamers(self) -> List[StreamerResponse]:
         """Get all streamers with their current status"""
-        return self.repository.get_all_streamers()
+        return await self.repository.get_all_streamers_async()
 
     async def get_streamer_by_username(self, username: str) -> Optional[Streamer]:
         """Get streamer by username"""
@@ -272,18 +272,10 @@ class StreamerService:
         """Check live status for multiple streamers efficiently"""
         try:
             if streamer_ids:
-                streamers = [
-                    self.repository.get_streamer_by_id(sid) for sid in streamer_ids
-                ]
-                streamers = [s for s in streamers if s]  # Filter out None values
+                streamers = self.repository.get_streamers_by_ids(streamer_ids)
             else:
                 # Get all streamers
-                streamer_responses = self.repository.get_all_streamers()
-                streamers = [
-                    self.repository.get_streamer_by_id(sr.id)
-                    for sr in streamer_responses
-                ]
-                streamers = [s for s in streamers if s]
+                streamers = self.repository.get_all_streamers_raw()
 
             if not streamers:
                 return {}
@@ -291,7 +283,7 @@ class StreamerService:
             # Get Twitch IDs
             twitch_ids = [s.twitch_id for s in streamers]
 
-            # Check status in bulk
+            # Check status in bulk (one Helix request per 100 streamers)
             live_status = await self.twitch_service.check_stream_status_bulk(twitch_ids)
 
             # Map back to streamer IDs
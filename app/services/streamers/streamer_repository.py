@@ -8,6 +8,7 @@ Handles all database CRUD operations for streamers and related entities.
 import logging
 from datetime import datetime, timezone
 from typing import List, Optional, Dict, Any
+from sqlalchemy import and_, exists, func, select
 from sqlalchemy.orm import Session
 from app.models import (
     Streamer,
@@ -17,10 +18,98 @@ from app.models import (
     StreamerRecordingSettings,
 )
 from app.schemas.streamers import StreamerResponse
+from app.services.streamers.streamer_snapshot import invalidate_streamer_snapshot
+from app.services.core.settings_snapshot import invalidate_settings_snapshot
+from app.utils.async_db_utils import async_session_scope
 
 logger = logging.getLogger("streamvault")
 
 
+def _streamer_status_query():
+    """Streamers with their latest open stream, recording and settings state"""
+    # Most recent stream that hasn't ended, per streamer
+    open_streams = (
+        select(
+            Stream.id.label("stream_id"),
+            Stream.streamer_id.label("streamer_id"),
+            func.row_number()
+            .over(
+                partition_by=Stream.streamer_id,
+                order_by=Stream.started_at.desc(),
+            )
+            .label("position"),
+        )
+        .where(Stream.ended_at.is_(None))
+        .subquery()
+    )
+    has_active_recording = (
+        exists()
+        .where(
+            Recording.stream_id == open_streams.c.stream_id,
+            Recording.end_time.is_(None),
+        )
+        .label("has_active_recording")
+    )
+
+    # CRITICAL: Filter out test data to prevent appearing in frontend
+    return (
+        select(
+            Streamer,
+            open_streams.c.stream_id,
+            has_active_recording,
+            StreamerRecordingSettings.enabled,
+        )
+        .outerjoin(
+            open_streams,
+            and_(
+                open_streams.c.streamer_id == Streamer.id,
+                open_streams.c.position == 1,
+            ),
+        )
+        .outerjoin(
+            StreamerRecordingSettings,
+            StreamerRecordingSettings.streamer_id == Streamer.id,
+        )
+        .where((Streamer.is_test_data.is_(False)) | (Streamer.is_test_data.is_(None)))
+        .order_by(Streamer.id, StreamerRecordingSettings.id)
+    )
+
+
+def _streamer_responses(rows) -> List[StreamerResponse]:
+    result = []
+    seen = set()
+    for streamer, stream_id, is_recording, enabled in rows:
+        # Keep the first settings row if a streamer somehow has several
+        if streamer.id in seen:
+            continue
+        seen.add(streamer.id)
+
+        is_recording = bool(stream_id is not None and is_recording)
+        result.append(
+            StreamerResponse(
+                id=streamer.id,
+                username=streamer.username,
+                twitch_id=streamer.twitch_id,
+                profile_image_url=streamer.profile_image_url,
+                is_live=streamer.is_live,
+                is_recording=is_recording,
+                # Recording is enabled by default without settings
+                recording_enabled=enabled if enabled is not None else True,
+                active_stream_id=stream_id if is_recording else None,
+                title=streamer.title,
+                category_name=streamer.category_name,
+                language=streamer.language,
+                last_updated=streamer.last_updated,
+                original_profile_image_url=streamer.original_profile_image_url,
+                last_stream_title=streamer.last_stream_title,
+                last_stream_category_name=streamer.last_stream_category_name,
+                last_stream_viewer_count=streamer.last_stream_viewer_count,
+                last_stream_ended_at=streamer.last_stream_ended_at,
+            )
+        )
+    return result
+
+
 class StreamerRepository:
     """Handles database operations for streamers and related entities"""
 
@@ -28,85 +117,25 @@ class StreamerRepository:
         self.db = db
 
     def get_all_streamers(self) -> List[StreamerResponse]:
-        """Get all streamers with their current status (excludes test data)"""
-        try:
-            # CRITICAL: Filter out test data to prevent appearing in frontend
-            streamers = (
-                self.db.query(Streamer)
-                .filter(
-                    (Streamer.is_test_data.is_(False))
-                    | (Streamer.is_test_data.is_(None))
-                )
-                .all()
-            )
-            result = []
-
-            for streamer in streamers:
-                # Check if recording is active by looking for active recordings
-                is_recording = False
-                active_stream_id = None
-
-                # Find the most recent stream that hasn't ended
-                active_stream = (
-                    self.db.query(Stream)
-                    .filter(
-                        Stream.streamer_id == streamer.id, Stream.ended_at.is_(None)
-                    )
-                    .order_by(Stream.started_at.desc())
-                    .first()
-                )
-
-                # Check if this stream has an active recording
-                if active_stream:
-                    # Check if there's an active recording for this stream
-                    active_recording = (
-                        self.db.query(Recording)
-                        .filter(
-                            Recording.stream_id == active_stream.id,
-                            Recording.end_time.is_(None),
-                        )
-                        .first()
-                    )
+        """Get all streamers with their current status (excludes test data)
 
-                    if active_recording:
-                        is_recording = True
-                        active_stream_id = active_stream.id
-
-                # Check if recording is enabled from StreamerRecordingSettings
-                recording_enabled = True  # Default
-                try:
-                    settings = (
-                        self.db.query(StreamerRecordingSettings)
-                        .filter(StreamerRecordingSettings.streamer_id == streamer.id)
-                        .first()
-                    )
-                    if settings:
-                        recording_enabled = settings.enabled
-                except Exception as e:
-                    logger.warning(
-                        f"Could not check recording settings for streamer {streamer.id}: {e}"
-                    )
-
-                # Create StreamerResponse object
-                streamer_response = StreamerResponse(
-                    id=streamer.id,
-                    username=streamer.username,
-                    twitch_id=streamer.twitch_id,
-                    profile_image_url=streamer.profile_image_url,
-                    is_live=streamer.is_live,
-                    is_recording=is_recording,
-                    recording_enabled=recording_enabled,
-                    active_stream_id=active_stream_id,
-                    title=streamer.title,
-                    category_name=streamer.category_name,
-                    language=streamer.language,
-                    last_updated=streamer.last_updated,
-                    original_profile_image_url=streamer.original_profile_image_url,
-                )
-                result.append(streamer_response)
-
-            return result
+        Resolves the latest open stream, its active recording and the
+        recording settings for every streamer in a single query.
+        """
+        try:
+            rows = self.db.execute(_streamer_status_query()).all()
+            return _streamer_responses(rows)
+        except Exception as e:
+            logger.error(f"Error getting streamers: {e}", exc_info=True)
+            # Return empty list on error to prevent frontend issues
+            return []
 
+    async def get_all_streamers_async(self) -> List[StreamerResponse]:
+        """Same as get_all_streamers, on an async session (request handlers)"""
+        try:
+            async with async_session_scope() as session:
+                rows = (await session.execute(_streamer_status_query())).all()
+            return _streamer_responses(rows)
         except Exception as e:
             logger.error(f"Error getting streamers: {e}", exc_info=True)
             # Return empty list on error to prevent frontend issues
@@ -123,6 +152,12 @@ class StreamerRepository:
             .all()
         )
 
+    def get_streamers_by_ids(self, streamer_ids: List[int]) -> List[Streamer]:
+        """Get several streamers by ID in one query"""
+        if not streamer_ids:
+            return []
+        return self.db.query(Streamer).filter(Streamer.id.in_(streamer_ids)).all()
+
     def get_streamer_by_username(self, username: str) -> Optional[Streamer]:
         """Get streamer by username (case insensitive)"""
         return self.db.query(Streamer).filter(Streamer.username.ilike(username)).first()
@@ -248,6 +283,8 @@ class StreamerRepository:
 
             self.db.commit()
             self.db.refresh(new_streamer)
+            invalidate_streamer_snapshot("streamer added")
+            invalidate_settings_snapshot("streamer added")
 
             return new_streamer
 
@@ -266,6 +303,7 @@ class StreamerRepository:
             streamer.last_updated = datetime.now(timezone.utc)
             self.db.commit()
             self.db.refresh(streamer)
+            invalidate_streamer_snapshot("streamer updated")
 
             return streamer
         except Exception as e:
@@ -309,6 +347,8 @@ class StreamerRepository:
             # Delete the streamer
             self.db.delete(streamer)
             self.db.commit()
+            invalidate_streamer_snapshot("streamer deleted")
+            invalidate_settings_snapshot("streamer deleted")
 
             logger.info(f"Deleted streamer: {streamer_data['username']}")
             return streamer_data
@@ -387,6 +427,8 @@ class StreamerRepository:
 
             self.db.commit()
             self.db.refresh(recording_settings)
+            invalidate_streamer_snapshot("recording settings updated")
+            invalidate_settings_snapshot("streamer recording settings updated")
 
             return recording_settings
         except Exception as e:
@@ -426,6 +468,7 @@ class StreamerRepository:
             self.db.add(new_stream)
             self.db.commit()
             self.db.refresh(new_stream)
+            invalidate_streamer_snapshot("stream created")
 
             return new_stream
         except Exception as e:
@@ -441,6 +484,7 @@ class StreamerRepository:
                 stream.ended_at = datetime.now(timezone.utc)
                 self.db.commit()
                 self.db.refresh(stream)
+                invalidate_streamer_snapshot("stream ended")
                 return stream
             return None
         except Exception as e:
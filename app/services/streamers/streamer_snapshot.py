@@ -0,0 +1,67 @@
+"""
+Streamer list snapshot cache
+
+GET /api/streamers is polled by every open dashboard but only changes when a
+stream goes online/offline, a recording starts/stops or a streamer is edited.
+The rendered list is kept for a few seconds and dropped as soon as one of
+those events happens, so most requests skip the database entirely.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from app.config.constants import CACHE_CONFIG
+
+logger = logging.getLogger("streamvault")
+
+
+class StreamerSnapshotCache:
+    """Single-value TTL cache with event-driven invalidation"""
+
+    def __init__(self, ttl: float = CACHE_CONFIG.STREAMER_SNAPSHOT_TTL):
+        self.ttl = ttl
+        self._value: Optional[Any] = None
+        self._expires_at = 0.0
+        # Bumped on every invalidation; a snapshot built before the bump
+        # is never stored, so a racing rebuild can't resurrect stale data
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self) -> Optional[Any]:
+        with self._lock:
+            if self._value is not None and time.monotonic() < self._expires_at:
+                return self._value
+            return None
+
+    def invalidate(self, reason: str = "") -> None:
+        with self._lock:
+            self._generation += 1
+            self._value = None
+        if reason:
+            logger.debug(f"Streamer snapshot invalidated: {reason}")
+
+    async def get_or_build(self, build: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached snapshot or build and cache a new one"""
+        cached = self.get()
+        if cached is not None:
+            return cached
+
+        with self._lock:
+            generation = self._generation
+        value = await build()
+        with self._lock:
+            if generation == self._generation:
+                self._value = value
+                self._expires_at = time.monotonic() + self.ttl
+        return value
+
+
+# Global instance
+streamer_snapshot_cache = StreamerSnapshotCache()
+
+
+def invalidate_streamer_snapshot(reason: str = "") -> None:
+    """Drop the cached streamer list (call after status-changing writes)"""
+    streamer_snapshot_cache.invalidate(reason)
@@ -10,15 +10,15 @@ from sqlalchemy import desc, asc
 from app.models import (
     Stream,
     Streamer,
-    RecordingSettings,
-    StreamerRecordingSettings,
     FavoriteCategory,
     StreamMetadata,
 )
 from app.database import SessionLocal
 from app.services.recording.config_manager import ConfigManager
+from app.services.core.settings_snapshot import settings_snapshot
 from app.schemas.recording import CleanupPolicyType
 from app.utils.security import validate_path_security, is_path_within_base
+from app.utils.file_stat_index import file_stat_index
 from app.config.settings import get_settings
 
 logger = logging.getLogger("streamvault")
@@ -43,11 +43,7 @@ class CleanupService:
     def _get_effective_cleanup_policy(streamer_id: int, db: Session) -> Dict[str, Any]:
         """Get the effective cleanup policy for a streamer, considering overrides"""
         # First check streamer-specific settings
-        streamer_settings = (
-            db.query(StreamerRecordingSettings)
-            .filter(StreamerRecordingSettings.streamer_id == streamer_id)
-            .first()
-        )
+        streamer_settings = settings_snapshot.get_streamer_settings(streamer_id)
 
         # If streamer has settings and explicitly wants to use custom policy
         if (
@@ -65,7 +61,7 @@ class CleanupService:
                 return policy
 
         # Use global settings (default behavior)
-        global_settings = db.query(RecordingSettings).first()
+        global_settings = settings_snapshot.get_recording_settings()
         if global_settings and global_settings.cleanup_policy:
             policy = CleanupService._parse_cleanup_policy(
                 global_settings.cleanup_policy
@@ -645,6 +641,7 @@ class CleanupService:
                     try:
                         if os.path.exists(file_path) or os.path.islink(file_path):
                             os.remove(file_path)
+                            file_stat_index.invalidate(file_path)
                             deleted_paths.append(file_path)
                             logger.info(f"Deleted file: {file_path}")
                     except Exception as e:
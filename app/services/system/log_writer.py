@@ -0,0 +1,211 @@
+"""
+Non-blocking log output.
+
+Writing a log line used to mean a synchronous ``open()``/``write()`` on the
+event loop; on a busy NAS a single slow disk write stalled every coroutine.
+Everything that touches log files now goes through a queue instead:
+
+- ``queue_handlers()`` puts a QueueHandler in front of the regular logging
+  handlers (console, TimedRotatingFileHandler). Records are formatted and
+  written by a QueueListener thread.
+- ``log_file_writer`` appends text to per-streamer log files from a writer
+  thread, in batches, keeping recently used files open in a small LRU.
+
+Both queues are bounded: when the disk cannot keep up, new records are
+dropped and counted instead of blocking the caller (see get_logging_stats).
+"""
+
+import atexit
+import logging
+import queue
+import threading
+from collections import OrderedDict
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, List, Optional, TextIO, Tuple
+
+logger = logging.getLogger("streamvault")
+
+# Records/lines buffered before new ones are dropped
+MAX_QUEUED_RECORDS = 10000
+
+# Per-streamer log files kept open by the writer thread
+MAX_OPEN_LOG_FILES = 64
+
+# Lines written per batch before the open files are flushed
+WRITE_BATCH_SIZE = 500
+
+# Open files are closed after the writer has been idle this long
+IDLE_CLOSE_SECONDS = 30
+
+
+class CountingQueueHandler(QueueHandler):
+    """QueueHandler with a bounded queue that counts dropped records"""
+
+    def __init__(self, maxsize: int = MAX_QUEUED_RECORDS):
+        super().__init__(queue.Queue(maxsize=maxsize))
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_queue_handlers: List[CountingQueueHandler] = []
+_listeners: List[QueueListener] = []
+
+
+def queue_handlers(target: logging.Logger, *handlers: logging.Handler) -> None:
+    """Attach ``handlers`` to ``target`` behind a queue and listener thread"""
+    queue_handler = CountingQueueHandler()
+    listener = QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+    listener.start()
+    target.addHandler(queue_handler)
+    _queue_handlers.append(queue_handler)
+    _listeners.append(listener)
+
+
+def stop_queue_listeners() -> None:
+    """Write out all queued records (registered for interpreter exit)"""
+    while _listeners:
+        _listeners.pop().stop()
+    log_file_writer.close()
+
+
+atexit.register(stop_queue_listeners)
+
+
+class LogFileWriter:
+    """Appends text to log files from a background thread"""
+
+    def __init__(
+        self,
+        maxsize: int = MAX_QUEUED_RECORDS,
+        max_open_files: int = MAX_OPEN_LOG_FILES,
+    ):
+        self.max_open_files = max_open_files
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+
+        self._queue: "queue.Queue[Optional[Tuple[str, str]]]" = queue.Queue(
+            maxsize=maxsize
+        )
+        self._files: "OrderedDict[str, TextIO]" = OrderedDict()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def write(self, path: str, text: str) -> bool:
+        """Queue ``text`` to be appended to ``path``; False if it was dropped"""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((str(path), text))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def flush(self) -> None:
+        """Block until everything queued so far is written"""
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self) -> None:
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout=10)
+        self._thread = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queued": self._queue.qsize(),
+            "dropped": self.dropped,
+            "written": self.written,
+            "failed": self.failed,
+            "open_files": len(self._files),
+        }
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="log-file-writer", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                item = self._queue.get(timeout=IDLE_CLOSE_SECONDS)
+            except queue.Empty:
+                self._close_files()
+                continue
+
+            batch = [item]
+            while item is not None and len(batch) < WRITE_BATCH_SIZE:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                batch.append(item)
+
+            for entry in batch:
+                if entry is not None:
+                    self._append(*entry)
+            self._flush_files()
+            for _ in batch:
+                self._queue.task_done()
+
+            if batch[-1] is None:
+                self._close_files()
+                return
+
+    def _append(self, path: str, text: str) -> None:
+        try:
+            handle = self._files.get(path)
+            if handle is None:
+                handle = open(path, "a", encoding="utf-8")
+                self._files[path] = handle
+                while len(self._files) > self.max_open_files:
+                    _, oldest = self._files.popitem(last=False)
+                    oldest.close()
+            else:
+                self._files.move_to_end(path)
+            handle.write(text)
+            self.written += 1
+        except Exception as e:
+            self.failed += 1
+            logger.error(f"❌ Could not write to log file {path}: {e}")
+
+    def _flush_files(self) -> None:
+        for path, handle in list(self._files.items()):
+            try:
+                handle.flush()
+            except Exception as e:
+                logger.error(f"❌ Could not flush log file {path}: {e}")
+                self._files.pop(path, None)
+
+    def _close_files(self) -> None:
+        while self._files:
+            _, handle = self._files.popitem()
+            try:
+                handle.close()
+            except Exception:
+                pass
+
+
+def get_logging_stats() -> Dict[str, Any]:
+    """Backpressure metrics of the logging queues"""
+    return {
+        "records_queued": sum(h.queue.qsize() for h in _queue_handlers),
+        "records_dropped": sum(h.dropped for h in _queue_handlers),
+        "log_files": log_file_writer.stats(),
+    }
+
+
+# Global instance
+log_file_writer = LogFileWriter()
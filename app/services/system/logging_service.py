@@ -8,6 +8,8 @@ from pathlib import Path
 from typing import Optional, Dict, Any, List
 from logging.handlers import TimedRotatingFileHandler
 
+from app.services.system.log_writer import log_file_writer, queue_handlers
+
 logger = logging.getLogger("streamvault")
 
 # Import settings at module level for better performance
@@ -224,7 +226,11 @@ class LoggingService:
         return result
 
     def _setup_loggers(self):
-        """Setup separate loggers for different components"""
+        """Setup separate loggers for different components
+
+        File handlers run behind a queue (see log_writer); per-streamer files
+        are appended through log_file_writer instead of being opened here.
+        """
         # Streamlink logger
         self.streamlink_logger = logging.getLogger("streamvault.streamlink")
         streamlink_handler = TimedRotatingFileHandler(
@@ -237,7 +243,7 @@ class LoggingService:
         streamlink_handler.setFormatter(
             logging.Formatter("[{asctime}][{name}][{levelname}] {message}", style="{")
         )
-        self.streamlink_logger.addHandler(streamlink_handler)
+        queue_handlers(self.streamlink_logger, streamlink_handler)
         self.streamlink_logger.setLevel(logging.DEBUG)
 
         # FFmpeg logger (only for system-level FFmpeg messages without streamer context)
@@ -252,7 +258,7 @@ class LoggingService:
         ffmpeg_handler.setFormatter(
             logging.Formatter("[{asctime}][{name}][{levelname}] {message}", style="{")
         )
-        self.ffmpeg_logger.addHandler(ffmpeg_handler)
+        queue_handlers(self.ffmpeg_logger, ffmpeg_handler)
         self.ffmpeg_logger.setLevel(logging.INFO)  # Changed to INFO to reduce noise
 
         # Recording logger for recording activities
@@ -267,7 +273,7 @@ class LoggingService:
         recording_handler.setFormatter(
             logging.Formatter("[{asctime}][{name}][{levelname}] {message}", style="{")
         )
-        self.recording_logger.addHandler(recording_handler)
+        queue_handlers(self.recording_logger, recording_handler)
         self.recording_logger.setLevel(logging.DEBUG)
 
     def get_streamlink_log_path(self, streamer_name: str) -> str:
@@ -339,24 +345,16 @@ class LoggingService:
 
         safe_cmd = sanitize_command_for_logging(cmd)
 
-        try:
-            with open(log_path, "w", encoding="utf-8") as f:
-                f.write(
-                    f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Starting recording for {streamer_name}\n"
-                )
-                f.write(
-                    f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Quality: {quality}\n"
-                )
-                f.write(
-                    f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Output: {output_path}\n"
-                )
-                f.write(
-                    f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Command: {safe_cmd}\n"
-                )
-
-            logger.debug(f"✅ Streamlink start logged to: {log_path}")
-        except Exception as e:
-            logger.error(f"❌ Could not create streamlink log {log_path}: {e}")
+        # The file name is unique per session, so appending creates it
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        log_file_writer.write(
+            log_path,
+            f"[{timestamp}] Starting recording for {streamer_name}\n"
+            f"[{timestamp}] Quality: {quality}\n"
+            f"[{timestamp}] Output: {output_path}\n"
+            f"[{timestamp}] Command: {safe_cmd}\n",
+        )
+        logger.debug(f"✅ Streamlink start queued for: {log_path}")
 
         # Also log to main streamlink logger
         self.streamlink_logger.info(f"Starting recording for {streamer_name}")
@@ -366,63 +364,34 @@ class LoggingService:
 
         return log_path
 
-    def log_streamlink_output(
-        self,
-        streamer_name: str,
-        stdout: bytes,
-        stderr: bytes,
-        exit_code: int,
-        log_path: str = None,
+    def log_streamlink_exit(
+        self, streamer_name: str, exit_code: int, log_path: str = None
     ):
-        """Log streamlink process output to streamer-specific file"""
+        """Record the streamlink exit code in the streamer-specific file.
+
+        The process output itself is streamed to the same file by OutputDrain
+        while streamlink runs.
+        """
         if not streamer_name:
             streamer_name = "unknown"
 
-        logger.debug(
-            f"🎯 Logging streamlink output for {streamer_name} (exit code: {exit_code})"
-        )
-
         # Get log path if not provided
         if not log_path:
             log_path = self.get_streamlink_log_path(streamer_name)
 
-        try:
-            with open(log_path, "a", encoding="utf-8") as f:
-                f.write(
-                    f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Streamlink completed with exit code: {exit_code}\n"
-                )
-
-                if stdout:
-                    stdout_text = stdout.decode("utf-8", errors="ignore")
-                    f.write(
-                        f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] STDOUT:\n{stdout_text}\n"
-                    )
-
-                if stderr:
-                    stderr_text = stderr.decode("utf-8", errors="ignore")
-                    f.write(
-                        f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] STDERR:\n{stderr_text}\n"
-                    )
-
-            logger.debug(f"✅ Streamlink output logged to: {log_path}")
-        except Exception as e:
-            logger.error(f"❌ Could not write to streamlink log {log_path}: {e}")
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        log_file_writer.write(
+            log_path,
+            f"[{timestamp}] Streamlink completed with exit code: {exit_code}\n",
+        )
 
         # Also log to main streamlink logger
-        if stdout:
-            stdout_text = stdout.decode("utf-8", errors="ignore")
-            self.streamlink_logger.info(f"[{streamer_name}] STDOUT:\n{stdout_text}")
-
-        if stderr:
-            stderr_text = stderr.decode("utf-8", errors="ignore")
-            if exit_code == 0:
-                self.streamlink_logger.info(f"[{streamer_name}] STDERR:\n{stderr_text}")
-            else:
-                self.streamlink_logger.error(
-                    f"[{streamer_name}] STDERR (exit {exit_code}):\n{stderr_text}"
-                )
-
-        logger.debug(f"✅ Streamlink output logged for {streamer_name}")
+        if exit_code == 0:
+            self.streamlink_logger.info(f"[{streamer_name}] Streamlink exited (0)")
+        else:
+            self.streamlink_logger.error(
+                f"[{streamer_name}] Streamlink exited with code {exit_code}"
+            )
 
     def log_streamlink_error(
         self, streamer_name: str, error_message: str, log_path: str = None
@@ -446,16 +415,11 @@ class LoggingService:
         if not log_path:
             log_path = self.get_streamlink_log_path(streamer_name)
 
-        try:
-            with open(log_path, "a", encoding="utf-8") as f:
-                f.write(
-                    f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ERROR: {error_message}\n"
-                )
-                f.write("=" * 80 + "\n")
-
-            logger.debug(f"✅ Streamlink error logged to: {log_path}")
-        except Exception as e:
-            logger.error(f"❌ Could not write streamlink error to log {log_path}: {e}")
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        log_file_writer.write(
+            log_path, f"[{timestamp}] ERROR: {error_message}\n" + "=" * 80 + "\n"
+        )
+        logger.debug(f"✅ Streamlink error queued for: {log_path}")
 
         # Also log to main streamlink logger
         self.streamlink_logger.error(f"[{streamer_name}] {error_message}")
@@ -485,24 +449,14 @@ class LoggingService:
                 f"⚠️ Write permission issue for {log_dir}, attempting to create log anyway"
             )
 
-        try:
-            with open(log_path, "w", encoding="utf-8") as f:
-                f.write(
-                    f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Starting {operation} operation for streamer: {streamer_name}\n"
-                )
-                f.write(
-                    f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Command: {safe_cmd}\n"
-                )
-            logger.debug(f"✅ FFmpeg per-streamer log created: {log_path}")
-        except (OSError, PermissionError) as e:
-            logger.error(f"❌ Could not create per-streamer log file {log_path}: {e}")
-            # Force re-test permissions on failure for more accurate diagnostics
-            if not self._force_permission_retest(log_dir):
-                logger.error(f"❌ Confirmed: No write permissions for {log_dir}")
-        except Exception as e:
-            logger.error(
-                f"❌ Unexpected error creating per-streamer log file {log_path}: {e}"
-            )
+        # The file name is unique per operation, so appending creates it
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        log_file_writer.write(
+            log_path,
+            f"[{timestamp}] Starting {operation} operation for streamer: {streamer_name}\n"
+            f"[{timestamp}] Command: {safe_cmd}\n",
+        )
+        logger.debug(f"✅ FFmpeg per-streamer log queued: {log_path}")
 
         logger.debug(f"✅ FFmpeg start logged for {streamer_name}")
         return log_path
@@ -524,67 +478,100 @@ class LoggingService:
 
         # Write to per-streamer log file (PRIMARY destination for FFmpeg output)
         log_path = self.get_ffmpeg_log_path(operation, streamer_name)
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        text = f"[{timestamp}] {operation} operation completed with exit code: {exit_code}\n"
 
-        try:
-            with open(log_path, "a", encoding="utf-8") as f:
-                f.write(
-                    f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {operation} operation completed with exit code: {exit_code}\n"
-                )
+        if stdout:
+            stdout_text = (
+                stdout.decode("utf-8", errors="ignore")
+                if isinstance(stdout, bytes)
+                else stdout
+            )
+            text += f"[{timestamp}] STDOUT:\n{stdout_text}\n"
+            # Only log summary to app logs at DEBUG level
+            self.ffmpeg_logger.debug(
+                f"{prefix} STDOUT written to {log_path} ({len(stdout_text)} chars)"
+            )
 
-                if stdout:
-                    stdout_text = (
-                        stdout.decode("utf-8", errors="ignore")
-                        if isinstance(stdout, bytes)
-                        else stdout
-                    )
-                    f.write(
-                        f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] STDOUT:\n{stdout_text}\n"
-                    )
-                    # Only log summary to app logs at DEBUG level
-                    self.ffmpeg_logger.debug(
-                        f"{prefix} STDOUT written to {log_path} ({len(stdout_text)} chars)"
-                    )
-
-                if stderr:
-                    stderr_text = (
-                        stderr.decode("utf-8", errors="ignore")
-                        if isinstance(stderr, bytes)
-                        else stderr
-                    )
-                    f.write(
-                        f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] STDERR:\n{stderr_text}\n"
-                    )
-                    # Only log summary to app logs at DEBUG level (or ERROR if failed)
-                    if exit_code == 0:
-                        self.ffmpeg_logger.debug(
-                            f"{prefix} STDERR written to {log_path} ({len(stderr_text)} chars)"
-                        )
-                    else:
-                        self.ffmpeg_logger.error(
-                            f"{prefix} Failed with exit code {exit_code} - see {log_path}"
-                        )
-
-            # Log success summary to app logs (INFO level, concise)
+        if stderr:
+            stderr_text = (
+                stderr.decode("utf-8", errors="ignore")
+                if isinstance(stderr, bytes)
+                else stderr
+            )
+            text += f"[{timestamp}] STDERR:\n{stderr_text}\n"
+            # Only log summary to app logs at DEBUG level (or ERROR if failed)
             if exit_code == 0:
-                logger.info(
-                    f"✅ {operation} completed for {streamer_name} - logs: {log_path}"
+                self.ffmpeg_logger.debug(
+                    f"{prefix} STDERR written to {log_path} ({len(stderr_text)} chars)"
                 )
             else:
-                logger.error(
-                    f"❌ {operation} failed for {streamer_name} (exit {exit_code}) - logs: {log_path}"
+                self.ffmpeg_logger.error(
+                    f"{prefix} Failed with exit code {exit_code} - see {log_path}"
                 )
 
-        except (OSError, PermissionError) as e:
-            logger.error(f"Could not write to per-streamer log file {log_path}: {e}")
-            # Force re-test permissions on failure for more accurate diagnostics
-            log_dir = Path(log_path).parent
-            if not self._force_permission_retest(log_dir):
-                logger.error(f"❌ Confirmed: No write permissions for {log_dir}")
-        except Exception as e:
+        log_file_writer.write(log_path, text)
+
+        # Log success summary to app logs (INFO level, concise)
+        if exit_code == 0:
+            logger.info(
+                f"✅ {operation} completed for {streamer_name} - logs: {log_path}"
+            )
+        else:
             logger.error(
-                f"Unexpected error writing to per-streamer log file {log_path}: {e}"
+                f"❌ {operation} failed for {streamer_name} (exit {exit_code}) - logs: {log_path}"
             )
 
+    def log_ffmpeg_exit(
+        self,
+        operation: str,
+        streamer_name: str,
+        exit_code: int,
+        log_path: str = None,
+        error_message: str = None,
+        stderr_tail: bytes = b"",
+    ):
+        """Record the FFmpeg exit code in the file from log_ffmpeg_start.
+
+        The process output itself is streamed to the same file while FFmpeg
+        runs; on failure the error and the stderr tail also go to the FFmpeg
+        logger.
+        """
+        if not streamer_name:
+            streamer_name = "unknown"
+
+        # Get log path if not provided
+        if not log_path:
+            log_path = self.get_ffmpeg_log_path(operation, streamer_name)
+
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        log_file_writer.write(
+            log_path,
+            f"[{timestamp}] {operation} operation completed with exit code: {exit_code}\n",
+        )
+
+        if exit_code == 0:
+            logger.info(
+                f"✅ {operation} completed for {streamer_name} - logs: {log_path}"
+            )
+            return
+
+        prefix = f"[{operation}_{streamer_name}]"
+        reason = f": {error_message}" if error_message else ""
+        self.ffmpeg_logger.error(
+            f"{prefix} Failed with exit code {exit_code}{reason} - see {log_path}"
+        )
+        if stderr_tail:
+            stderr_text = (
+                stderr_tail.decode("utf-8", errors="ignore")
+                if isinstance(stderr_tail, bytes)
+                else stderr_tail
+            )
+            self.ffmpeg_logger.error(f"{prefix} STDERR (tail):\n{stderr_text}")
+        logger.error(
+            f"❌ {operation} failed for {streamer_name} (exit {exit_code}) - logs: {log_path}"
+        )
+
     def cleanup_old_logs(self):
         """Clean up old log files based on retention settings.
 
@@ -834,12 +821,8 @@ class LoggingService:
         # Format the log message
         log_message = f"[{timestamp}] [{activity_type.upper()}] {details}\n"
 
-        try:
-            with open(log_path, "a", encoding="utf-8") as f:
-                f.write(log_message)
-            logger.debug(f"✅ Recording activity logged to: {log_path}")
-        except Exception as e:
-            logger.error(f"❌ Could not write recording activity log {log_path}: {e}")
+        log_file_writer.write(log_path, log_message)
+        logger.debug(f"✅ Recording activity queued for: {log_path}")
 
     def log_post_processing_activity(
         self,
@@ -871,12 +854,8 @@ class LoggingService:
             log_message += f"  Details: {details}\n"
         log_message += "\n"
 
-        try:
-            with open(log_path, "a", encoding="utf-8") as f:
-                f.write(log_message)
-            logger.debug(f"✅ Post-processing activity logged to: {log_path}")
-        except Exception as e:
-            logger.error(f"❌ Could not write post-processing log {log_path}: {e}")
+        log_file_writer.write(log_path, log_message)
+        logger.debug(f"✅ Post-processing activity queued for: {log_path}")
 
     def log_stream_event_to_file(
         self, event_type: str, streamer_name: str, details: str = ""
@@ -890,12 +869,8 @@ class LoggingService:
 
         log_message = f"[{timestamp}] [STREAM_{event_type.upper()}] {details}\n"
 
-        try:
-            with open(log_path, "a", encoding="utf-8") as f:
-                f.write(log_message)
-            logger.debug(f"✅ Stream event logged to: {log_path}")
-        except Exception as e:
-            logger.error(f"❌ Could not write stream event log {log_path}: {e}")
+        log_file_writer.write(log_path, log_message)
+        logger.debug(f"✅ Stream event queued for: {log_path}")
 
 
 # Lazy-initialized global logging service instance
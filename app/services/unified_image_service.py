@@ -165,6 +165,12 @@ class UnifiedImageService:
             category_name
         )
 
+    def get_category_image_urls(
+        self, category_names: List[str]
+    ) -> Dict[str, Optional[str]]:
+        """Get image URLs for many categories with a single database query"""
+        return self.category_service.get_category_images(category_names)
+
     async def update_category_image(self, category_name: str, box_art_url: str) -> bool:
         """Update a category's image"""
         return await self.category_service.update_category_image(
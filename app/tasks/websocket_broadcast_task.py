@@ -7,9 +7,9 @@ import logging
 import hashlib
 import json
 from app.dependencies import websocket_manager
-from app.database import SessionLocal
 from app.models import Recording, Stream
-from sqlalchemy import and_
+from app.utils.async_db_utils import async_session_scope
+from sqlalchemy import and_, select
 from sqlalchemy.orm import joinedload
 from datetime import datetime
 from app.config.constants import ASYNC_DELAYS
@@ -96,19 +96,19 @@ class WebSocketBroadcastTask:
     async def _broadcast_active_recordings(self):
         """Broadcast current active recordings to all WebSocket clients (only on changes)"""
         try:
-            with SessionLocal() as db:
+            async with async_session_scope() as db:
                 # Get all currently active recordings with joined relationships
-                active_recordings = (
-                    db.query(Recording)
+                result = await db.execute(
+                    select(Recording)
                     .options(joinedload(Recording.stream).joinedload(Stream.streamer))
-                    .filter(
+                    .where(
                         and_(
                             Recording.status.in_(["recording", "processing"]),
                             Recording.path.isnot(None),
                         )
                     )
-                    .all()
                 )
+                active_recordings = result.scalars().all()
 
                 # Convert to dict format for frontend
                 recordings_data = []
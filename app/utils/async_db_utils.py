@@ -1,9 +1,14 @@
 """
 Async database utilities for StreamVault
+
+Request handlers and background loops that run on the event loop use these
+sessions so a slow query only suspends the calling coroutine instead of
+blocking every other request, HLS segment and WebSocket broadcast.
 """
 
 import asyncio
-from typing import List, Any
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Any
 from sqlalchemy import select, desc
 from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
@@ -18,6 +23,18 @@ logger = logging.getLogger("streamvault")
 _async_engine = None
 _async_session_maker = None
 
+# Async pool settings. Only request-path reads (auth checks, the video and
+# streamer lists, the recording broadcast) use it, so it stays small: together
+# with the sync engine (20 + 50) it must fit in PostgreSQL's default
+# max_connections of 100.
+ASYNC_POOL_OPTIONS = {
+    "pool_pre_ping": True,
+    "pool_recycle": 1800,
+    "pool_size": 5,
+    "max_overflow": 5,
+    "pool_timeout": 15,
+}
+
 
 async def get_recent_streams(limit: int = 10) -> List[Stream]:
     """
@@ -77,10 +94,31 @@ def get_async_engine():
         logger.debug(
             f"Original URL scheme: {parsed_url.scheme} -> Async scheme: {async_scheme}"
         )
-        _async_engine = create_async_engine(async_url, echo=False)
+        if async_scheme == "sqlite+aiosqlite":
+            # SQLite has no server-side connection limit to size a pool for
+            _async_engine = create_async_engine(async_url, echo=False)
+        else:
+            _async_engine = create_async_engine(
+                async_url,
+                echo=False,
+                connect_args={
+                    "connect_timeout": 5,
+                    "application_name": "StreamVault-async",
+                },
+                **ASYNC_POOL_OPTIONS,
+            )
     return _async_engine
 
 
+async def dispose_async_engine() -> None:
+    """Close all pooled async connections (called on shutdown)"""
+    global _async_engine, _async_session_maker
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    _async_engine = None
+    _async_session_maker = None
+
+
 def get_async_session_maker():
     """Get or create async session maker"""
     global _async_session_maker
@@ -97,6 +135,23 @@ def get_async_session():
     return async_session_maker()
 
 
+@asynccontextmanager
+async def async_session_scope() -> AsyncIterator[AsyncSession]:
+    """Async session that is rolled back on error and always closed"""
+    async with get_async_session_maker()() as session:
+        try:
+            yield session
+        except Exception:
+            await session.rollback()
+            raise
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """FastAPI dependency providing an async database session"""
+    async with async_session_scope() as session:
+        yield session
+
+
 async def get_all_streamers() -> List[Streamer]:
     """
     Get all streamers using async database session.
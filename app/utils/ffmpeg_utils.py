@@ -1,12 +1,13 @@
 """FFmpeg utility functions for StreamVault."""
 
 import os
-import asyncio
 import logging
 import tempfile
 from datetime import datetime
 from typing import Optional, Dict, Any
 
+from app.utils.media_probe import media_probe
+from app.utils.subprocess_runner import parse_ffmpeg_line, run_process
 
 logger = logging.getLogger("streamvault")
 
@@ -70,6 +71,53 @@ async def create_metadata_file(metadata: dict) -> Optional[str]:
         return None
 
 
+def escape_ffmetadata_value(value: Any) -> str:
+    """Escape a value for an FFmpeg metadata (;FFMETADATA1) file."""
+    text = str(value)
+    # Backslash first, otherwise the escapes added below get doubled
+    for char in ("\\", "=", ";", "#"):
+        text = text.replace(char, f"\\{char}")
+    return text.replace("\n", "\\\n")
+
+
+def build_ffmetadata(metadata: Dict[str, Any], chapters: Optional[list] = None) -> str:
+    """
+    Build an FFmpeg metadata file with global tags and chapters.
+
+    Used with ``-i <file> -map_metadata 1`` so the remux writes streams,
+    tags and chapters in a single pass.
+
+    Args:
+        metadata: Global tags; empty values are skipped
+        chapters: Optional list of dicts with start_time, end_time (seconds)
+            and title
+
+    Returns:
+        File content
+    """
+    tags = {key: value for key, value in metadata.items() if value}
+    date = tags.get("date")
+    if date and "year" not in tags:
+        tags["year"] = str(date).split("-")[0]
+
+    lines = [";FFMETADATA1"]
+    for key, value in tags.items():
+        lines.append(f"{key}={escape_ffmetadata_value(value)}")
+
+    for chapter in chapters or []:
+        lines.extend(
+            [
+                "",
+                "[CHAPTER]",
+                "TIMEBASE=1/1000",
+                f"START={int(float(chapter.get('start_time', 0)) * 1000)}",
+                f"END={int(float(chapter.get('end_time', 0)) * 1000)}",
+                f"title={escape_ffmetadata_value(chapter.get('title') or 'Chapter')}",
+            ]
+        )
+    return "\n".join(lines) + "\n"
+
+
 async def embed_metadata_in_mp4(
     input_path: str,
     output_path: str,
@@ -103,22 +151,16 @@ async def embed_metadata_in_mp4(
         cmd.extend(["-c", "copy", "-y", output_path])
 
         # Execute FFmpeg
-        process = await asyncio.create_subprocess_exec(
-            *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-        )
+        output = await run_process(cmd, parser=parse_ffmpeg_line)
 
-        stdout, stderr = await process.communicate()
-
-        if process.returncode == 0:
+        if output.returncode == 0:
             logger.info("Successfully embedded metadata with FFmpeg")
             return True
         else:
             logger.error(
-                f"FFmpeg metadata embedding failed with return code {process.returncode}"
-            )
-            logger.error(
-                f"FFmpeg stderr: {stderr.decode('utf-8', errors='replace')[:500]}"
+                f"FFmpeg metadata embedding failed with return code {output.returncode}"
             )
+            logger.error(f"FFmpeg stderr: {output.tail('stderr')[-500:]}")
             return False
 
     except Exception as e:
@@ -187,6 +229,7 @@ async def convert_ts_to_mp4(
         cmd.append(output_path)
 
         # Use the logging service to create per-streamer logs
+        streamer_log_path = None
         if logging_service:
             streamer_log_path = logging_service.log_ffmpeg_start(
                 "ts_to_mp4", cmd, streamer_name
@@ -197,36 +240,37 @@ async def convert_ts_to_mp4(
         logger.info(f"Converting {input_path} to {output_path}")
         logger.debug(f"FFmpeg command: {' '.join(cmd)}")
 
-        process = await asyncio.create_subprocess_exec(
-            *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        # Output is streamed to the per-streamer log; only a tail is returned
+        output = await run_process(
+            cmd, log_path=streamer_log_path, parser=parse_ffmpeg_line
         )
 
-        stdout, stderr = await process.communicate()
-
-        # Log the FFmpeg output using the logging service
         if logging_service:
-            logging_service.log_ffmpeg_output(
-                "ts_to_mp4", stdout, stderr, process.returncode, streamer_name
+            logging_service.log_ffmpeg_exit(
+                "ts_to_mp4",
+                streamer_name,
+                output.returncode,
+                log_path=streamer_log_path,
+                error_message=output.error_message,
+                stderr_tail=output.stderr_tail,
             )
 
-        if process.returncode == 0:
+        if output.returncode == 0:
             logger.info(f"Successfully converted {input_path} to {output_path}")
             return {
                 "success": True,
                 "code": 0,
-                "stdout": stdout.decode("utf-8", errors="replace"),
-                "stderr": stderr.decode("utf-8", errors="replace"),
+                "stdout": output.tail("stdout"),
+                "stderr": output.tail("stderr"),
             }
         else:
             logger.error(f"Failed to convert {input_path} to {output_path}")
-            logger.error(
-                f"FFmpeg stderr: {stderr.decode('utf-8', errors='replace')[:1000]}"
-            )
+            logger.error(f"FFmpeg stderr: {output.tail('stderr')[-1000:]}")
             return {
                 "success": False,
-                "code": process.returncode,
-                "stdout": stdout.decode("utf-8", errors="replace"),
-                "stderr": stderr.decode("utf-8", errors="replace"),
+                "code": output.returncode,
+                "stdout": output.tail("stdout"),
+                "stderr": output.tail("stderr"),
             }
     except Exception as e:
         logger.error(f"Error during TS to MP4 conversion: {e}", exc_info=True)
@@ -235,7 +279,7 @@ async def convert_ts_to_mp4(
 
 async def extract_video_duration(video_path: str) -> Optional[float]:
     """
-    Extract video duration in seconds using FFmpeg.
+    Extract video duration in seconds using the shared ffprobe cache.
 
     Args:
         video_path: Path to the video file
@@ -243,34 +287,11 @@ async def extract_video_duration(video_path: str) -> Optional[float]:
     Returns:
         Duration in seconds or None if extraction failed
     """
-    try:
-        cmd = [
-            "ffprobe",
-            "-v",
-            "quiet",
-            "-show_entries",
-            "format=duration",
-            "-of",
-            "csv=p=0",
-            video_path,
-        ]
-
-        process = await asyncio.create_subprocess_exec(
-            *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-        )
-
-        stdout, stderr = await process.communicate()
-
-        if process.returncode == 0:
-            duration_str = stdout.decode("utf-8").strip()
-            return float(duration_str)
-        else:
-            logger.error(f"Failed to extract duration from {video_path}")
-            return None
-
-    except Exception as e:
-        logger.error(f"Error extracting video duration: {e}")
+    result = await media_probe.probe(video_path)
+    if result is None or result.duration is None:
+        logger.error(f"Failed to extract duration from {video_path}")
         return None
+    return result.duration
 
 
 async def embed_metadata_with_ffmpeg_wrapper(
@@ -350,33 +371,13 @@ async def embed_metadata_with_ffmpeg_wrapper(
                 f"[FFMPEG_METADATA_START] {streamer_name} - {input_path} -> {output_path}"
             )
 
-        # Create a temporary file for FFmpeg chapters
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False) as f:
+        # Global tags and chapters go into the remux itself, so the MP4 does
+        # not have to be rewritten again to embed them afterwards
+        with tempfile.NamedTemporaryFile(
+            mode="w", suffix=".txt", delete=False, encoding="utf-8"
+        ) as f:
             metadata_file = f.name
-            # Write global metadata
-            f.write(";FFMETADATA1\n")
-            if "title" in metadata:
-                f.write(f"title={metadata['title']}\n")
-            if "artist" in metadata:
-                f.write(f"artist={metadata['artist']}\n")
-            if "date" in metadata:
-                f.write(f"date={metadata['date']}\n")
-                f.write(
-                    f"year={metadata['date'].split('-')[0] if '-' in metadata['date'] else metadata['date']}\n"
-                )
-            if "creation_time" in metadata:
-                f.write(f"creation_time={metadata['creation_time']}\n")
-
-            # Write chapter information if available
-            if chapters:
-                for chapter in chapters:
-                    f.write("\n[CHAPTER]\n")
-                    f.write("TIMEBASE=1/1000\n")
-                    f.write(
-                        f"START={int(float(chapter.get('start_time', 0)) * 1000)}\n"
-                    )
-                    f.write(f"END={int(float(chapter.get('end_time', 0)) * 1000)}\n")
-                    f.write(f"title={chapter.get('title', 'Chapter')}\n")
+            f.write(build_ffmetadata(metadata, chapters))
 
         # Use FFmpeg to remux with metadata
         cmd = [
@@ -398,25 +399,28 @@ async def embed_metadata_with_ffmpeg_wrapper(
         ]
 
         # Use the logging service to create per-streamer logs
+        streamer_log_path = None
         if logging_service:
             streamer_log_path = logging_service.log_ffmpeg_start(
                 "metadata_embed", cmd, streamer_name
             )
             logger.info(f"FFmpeg logs will be written to: {streamer_log_path}")
 
-        # Execute FFmpeg command
+        # Execute FFmpeg command; output is streamed to the per-streamer log
         logger.debug(f"Running FFmpeg command: {' '.join(cmd)}")
-        process = await asyncio.create_subprocess_exec(
-            *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        output = await run_process(
+            cmd, log_path=streamer_log_path, parser=parse_ffmpeg_line
         )
+        success_code = output.returncode == 0
 
-        stdout, stderr = await process.communicate()
-        success_code = process.returncode == 0
-
-        # Log the FFmpeg output using the logging service
         if logging_service:
-            logging_service.log_ffmpeg_output(
-                "metadata_embed", stdout, stderr, process.returncode, streamer_name
+            logging_service.log_ffmpeg_exit(
+                "metadata_embed",
+                streamer_name,
+                output.returncode,
+                log_path=streamer_log_path,
+                error_message=output.error_message,
+                stderr_tail=output.stderr_tail,
             )
 
         # Clean up temporary metadata file
@@ -455,8 +459,8 @@ async def embed_metadata_with_ffmpeg_wrapper(
             return {
                 "success": True,
                 "code": 0,
-                "stdout": stdout.decode("utf-8", errors="replace"),
-                "stderr": stderr.decode("utf-8", errors="replace"),
+                "stdout": output.tail("stdout"),
+                "stderr": output.tail("stderr"),
             }
         else:
             logger.error(
@@ -482,9 +486,9 @@ async def embed_metadata_with_ffmpeg_wrapper(
 
             return {
                 "success": False,
-                "code": process.returncode,
-                "stdout": stdout.decode("utf-8", errors="replace"),
-                "stderr": stderr.decode("utf-8", errors="replace"),
+                "code": output.returncode,
+                "stdout": output.tail("stdout"),
+                "stderr": output.tail("stderr"),
             }
 
     except Exception as e:
@@ -0,0 +1,129 @@
+"""
+In-memory file-stat index for recordings
+
+Caches existence, size, mtime and thumbnail location per recording path so
+list endpoints such as GET /api/videos don't stat the (often NAS-backed)
+filesystem for every row on every request. Entries are invalidated when
+recordings finish, remux or get deleted; a TTL bounds staleness for changes
+made outside the application.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from cachetools import TTLCache
+
+from app.config.constants import CACHE_CONFIG
+
+logger = logging.getLogger("streamvault")
+
+
+@dataclass(frozen=True)
+class FileStat:
+    """Result of probing a recording path"""
+
+    exists: bool
+    is_file: bool = False
+    size: int = 0
+    mtime: float = 0.0
+    thumbnail_path: Optional[str] = None
+
+
+def thumbnail_candidates(recording_path: str) -> List[Path]:
+    """Thumbnail files for a recording, in priority order.
+
+    1. {base_filename}-thumb.jpg (Plex format, usually correct)
+    2. {base_filename}_thumbnail.jpg (fallback)
+    """
+    path = Path(recording_path)
+    return [
+        path.parent / f"{path.stem}-thumb.jpg",
+        path.parent / f"{path.stem}_thumbnail.jpg",
+    ]
+
+
+def probe_file(recording_path: str) -> FileStat:
+    """Stat a recording and look up its thumbnail (blocking)"""
+    try:
+        st = os.stat(recording_path)
+    except OSError:
+        return FileStat(exists=False)
+
+    thumbnail_path = None
+    for candidate in thumbnail_candidates(recording_path):
+        if candidate.is_file():
+            thumbnail_path = str(candidate)
+            break
+
+    return FileStat(
+        exists=True,
+        is_file=os.path.isfile(recording_path),
+        size=st.st_size,
+        mtime=st.st_mtime,
+        thumbnail_path=thumbnail_path,
+    )
+
+
+class FileStatIndex:
+    """Thread-safe TTL index of FileStat entries keyed by path"""
+
+    def __init__(
+        self,
+        maxsize: int = CACHE_CONFIG.FILE_STAT_INDEX_SIZE,
+        ttl: int = CACHE_CONFIG.FILE_STAT_INDEX_TTL,
+    ):
+        self._entries: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+
+    def get(self, path: str) -> Optional[FileStat]:
+        with self._lock:
+            return self._entries.get(path)
+
+    def refresh(self, path: str) -> FileStat:
+        """Probe a path now and store the result (blocking)"""
+        stat = probe_file(path)
+        with self._lock:
+            self._entries[path] = stat
+        return stat
+
+    def refresh_many(self, paths: Iterable[str]) -> Dict[str, FileStat]:
+        """Probe several paths in one go (blocking)"""
+        return {path: self.refresh(path) for path in paths}
+
+    async def lookup_many(self, paths: Iterable[str]) -> Dict[str, FileStat]:
+        """Return stats for all paths, probing misses off the event loop"""
+        results: Dict[str, FileStat] = {}
+        missing: List[str] = []
+        with self._lock:
+            for path in dict.fromkeys(paths):
+                stat = self._entries.get(path)
+                if stat is None:
+                    missing.append(path)
+                else:
+                    results[path] = stat
+        if missing:
+            results.update(await asyncio.to_thread(self.refresh_many, missing))
+        return results
+
+    def invalidate(self, path: Optional[str]) -> None:
+        """Drop a recording and its .ts/.mp4 siblings from the index"""
+        if not path:
+            return
+        p = Path(path)
+        keys = {str(p), str(p.with_suffix(".ts")), str(p.with_suffix(".mp4"))}
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Global instance shared by the videos routes and the recording pipeline
+file_stat_index = FileStatIndex()
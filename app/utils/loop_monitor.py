@@ -0,0 +1,257 @@
+"""
+Event-loop stall detector
+
+Optional instrumentation (LOOP_MONITOR_ENABLED) that shows where the event
+loop gets blocked. A heartbeat coroutine measures how late each wake-up is,
+which gives the loop lag. A sampling thread watches the heartbeat. When it
+has not run for longer than the threshold, the thread reads the loop
+thread's stack from ``sys._current_frames()``. Stalls are aggregated by
+call site: the innermost application frame, or the innermost frame if no
+application frame is on the stack.
+
+Results are served by /admin/event-loop as JSON and by
+/admin/event-loop/metrics as Prometheus text.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+logger = logging.getLogger("streamvault")
+
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEARTBEAT_INTERVAL = 0.05
+LAG_SAMPLES = 4096
+STACK_DEPTH = 12
+TOP_SITES = 20
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+class _Site:
+    """Stalls attributed to one call site"""
+
+    __slots__ = ("stalls", "samples", "total_seconds", "max_seconds", "stack")
+
+    def __init__(self, stack: List[str]):
+        self.stalls = 0
+        self.samples = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.stack = stack
+
+
+def _call_site(frame) -> tuple:
+    """Pick the frame that identifies a stall and format the stack"""
+    summary = traceback.extract_stack(frame)
+    frames = [f for f in summary if f.filename != __file__]
+    site = next(
+        (f for f in reversed(frames) if f.filename.startswith(APP_ROOT)),
+        frames[-1] if frames else None,
+    )
+    if site is None:
+        return "unknown", []
+    filename = site.filename
+    if filename.startswith(APP_ROOT):
+        filename = os.path.relpath(filename, os.path.dirname(APP_ROOT))
+    stack = [f"{f.filename}:{f.lineno} in {f.name}" for f in frames[-STACK_DEPTH:]]
+    return f"{filename}:{site.lineno} in {site.name}", stack
+
+
+def _quantile(ordered: List[float], q: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class LoopMonitor:
+    """Measures event-loop lag and samples the stack of long stalls"""
+
+    def __init__(
+        self,
+        threshold_seconds: float = 0.1,
+        interval: float = HEARTBEAT_INTERVAL,
+    ):
+        self.threshold = threshold_seconds
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._lags: Deque[float] = deque(maxlen=LAG_SAMPLES)
+        self._sites: Dict[str, _Site] = {}
+        self._beat = 0
+        self._last_beat = time.monotonic()
+        # heartbeat number -> call site first sampled during that stall
+        self._stall_sites: Dict[int, str] = {}
+        self._loop_thread_id: Optional[int] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._sampler: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.beats = 0
+        self.stalls = 0
+        self.lag_seconds_total = 0.0
+
+    @property
+    def is_running(self) -> bool:
+        return self._heartbeat_task is not None
+
+    async def start(self, threshold_seconds: Optional[float] = None) -> None:
+        """Start the heartbeat on the running loop and the sampling thread"""
+        if self.is_running:
+            return
+        if threshold_seconds is not None:
+            self.threshold = threshold_seconds
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop.clear()
+        self._heartbeat_task = asyncio.create_task(self._heartbeat())
+        self._sampler = threading.Thread(
+            target=self._sample, name="loop-monitor", daemon=True
+        )
+        self._sampler.start()
+        logger.info(
+            f"Event-loop monitor started (stall threshold {self.threshold * 1000:.0f}ms)"
+        )
+
+    async def stop(self) -> None:
+        if not self.is_running:
+            return
+        self._stop.set()
+        self._heartbeat_task.cancel()
+        try:
+            await self._heartbeat_task
+        except asyncio.CancelledError:
+            pass
+        self._heartbeat_task = None
+        if self._sampler is not None:
+            await asyncio.to_thread(self._sampler.join, 1.0)
+            self._sampler = None
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            with self._lock:
+                lag = max(0.0, now - self._last_beat - self.interval)
+                self._record_lag(lag)
+                self._beat += 1
+                self._last_beat = now
+
+    def _record_lag(self, lag: float) -> None:
+        self.beats += 1
+        self.lag_seconds_total += lag
+        self._lags.append(lag)
+        site_key = self._stall_sites.pop(self._beat, None)
+        if lag < self.threshold and site_key is None:
+            return
+        # The sampler may miss a stall that ends between two samples
+        site = self._sites.setdefault(site_key or "unknown", _Site([]))
+        self.stalls += 1
+        site.stalls += 1
+        site.total_seconds += lag
+        site.max_seconds = max(site.max_seconds, lag)
+
+    def _sample(self) -> None:
+        period = max(self.threshold / 2, 0.005)
+        while not self._stop.wait(period):
+            with self._lock:
+                beat = self._beat
+                late = time.monotonic() - self._last_beat - self.interval
+            if late < self.threshold:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            site_key, stack = _call_site(frame)
+            del frame
+            with self._lock:
+                if beat != self._beat:
+                    continue  # The loop caught up while the stack was read
+                site = self._sites.get(site_key)
+                if site is None:
+                    site = self._sites[site_key] = _Site(stack)
+                site.samples += 1
+                self._stall_sites.setdefault(beat, site_key)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._lags.clear()
+            self._sites.clear()
+            self._stall_sites.clear()
+            self.beats = 0
+            self.stalls = 0
+            self.lag_seconds_total = 0.0
+
+    def get_statistics(self, top: int = TOP_SITES) -> Dict[str, Any]:
+        with self._lock:
+            lags = sorted(self._lags)
+            sites = sorted(
+                self._sites.items(),
+                key=lambda item: (item[1].total_seconds, item[1].samples),
+                reverse=True,
+            )[:top]
+            return {
+                "enabled": self.is_running,
+                "threshold_ms": self.threshold * 1000,
+                "beats": self.beats,
+                "stalls": self.stalls,
+                "lag_ms": {
+                    **{
+                        f"p{int(q * 100)}": _quantile(lags, q) * 1000 for q in QUANTILES
+                    },
+                    "max": (lags[-1] if lags else 0.0) * 1000,
+                },
+                "top_offenders": [
+                    {
+                        "site": key,
+                        "stalls": site.stalls,
+                        "samples": site.samples,
+                        "total_ms": site.total_seconds * 1000,
+                        "max_ms": site.max_seconds * 1000,
+                        "stack": site.stack,
+                    }
+                    for key, site in sites
+                ],
+            }
+
+    def render_prometheus(self, top: int = TOP_SITES) -> str:
+        """Statistics in the Prometheus text exposition format"""
+        stats = self.get_statistics(top)
+        with self._lock:
+            lags = sorted(self._lags)
+            beats = self.beats
+            lag_total = self.lag_seconds_total
+
+        lines = [
+            "# HELP streamvault_event_loop_lag_seconds Event-loop wake-up lag",
+            "# TYPE streamvault_event_loop_lag_seconds summary",
+        ]
+        for q in QUANTILES:
+            lines.append(
+                f'streamvault_event_loop_lag_seconds{{quantile="{q}"}} '
+                f"{_quantile(lags, q):.6f}"
+            )
+        lines += [
+            f"streamvault_event_loop_lag_seconds_sum {lag_total:.6f}",
+            f"streamvault_event_loop_lag_seconds_count {beats}",
+            "# HELP streamvault_event_loop_stalls_total Heartbeats later than the threshold",
+            "# TYPE streamvault_event_loop_stalls_total counter",
+            f"streamvault_event_loop_stalls_total {stats['stalls']}",
+            "# HELP streamvault_event_loop_stall_seconds_total Stall time by call site",
+            "# TYPE streamvault_event_loop_stall_seconds_total counter",
+        ]
+        for offender in stats["top_offenders"]:
+            site = offender["site"].replace("\\", "\\\\").replace('"', '\\"')
+            lines.append(
+                f'streamvault_event_loop_stall_seconds_total{{site="{site}"}} '
+                f"{offender['total_ms'] / 1000:.6f}"
+            )
+        return "\n".join(lines) + "\n"
+
+
+# Global instance
+loop_monitor = LoopMonitor()
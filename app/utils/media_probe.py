@@ -0,0 +1,227 @@
+"""
+Shared ffprobe result cache
+
+Duration, stream and tag lookups used to spawn their own ``ffprobe`` for the
+same file: the remux progress tracker, the metadata check after a remux, the
+audio-only check before thumbnail extraction and the segment playlist all
+probed recordings independently. ``media_probe`` runs a single
+``ffprobe -show_format -show_streams -show_chapters`` per file version and
+answers all of them from the parsed result.
+
+Entries are keyed by (path, size, mtime), so a file that is still being
+written or gets rewritten is probed again automatically. Concurrent lookups
+of the same file share one ffprobe run. Optionally the result is also stored
+in a hidden sidecar next to the recording, which lets recovery after a
+restart skip probing files it has already seen.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from cachetools import LRUCache
+
+from app.config.constants import CACHE_CONFIG
+
+logger = logging.getLogger("streamvault")
+
+PROBE_TIMEOUT_SECONDS = 30
+
+ProbeKey = Tuple[str, int, float]
+
+
+@dataclass(frozen=True)
+class ProbeResult:
+    """Parsed ffprobe output of one file version"""
+
+    format: Dict[str, Any] = field(default_factory=dict)
+    streams: List[Dict[str, Any]] = field(default_factory=list)
+    chapters: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def duration(self) -> Optional[float]:
+        try:
+            duration = float(self.format.get("duration"))
+        except (TypeError, ValueError):
+            return None
+        return duration if duration > 0 else None
+
+    @property
+    def tags(self) -> Dict[str, str]:
+        return self.format.get("tags") or {}
+
+    @property
+    def has_video(self) -> bool:
+        return any(s.get("codec_type") == "video" for s in self.streams)
+
+
+def sidecar_path(path: str) -> Path:
+    p = Path(path)
+    return p.parent / f".{p.name}.ffprobe.json"
+
+
+async def run_ffprobe(path: str) -> Optional[Dict[str, Any]]:
+    """Run ffprobe on a file and return its JSON output"""
+    process = await asyncio.create_subprocess_exec(
+        "ffprobe",
+        "-v",
+        "quiet",
+        "-print_format",
+        "json",
+        "-show_format",
+        "-show_streams",
+        "-show_chapters",
+        path,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        stdout, _ = await asyncio.wait_for(
+            process.communicate(), timeout=PROBE_TIMEOUT_SECONDS
+        )
+    except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+        # Never leave ffprobe running behind a timed-out or cancelled caller
+        try:
+            process.kill()
+        except ProcessLookupError:
+            pass
+        await asyncio.shield(process.wait())
+        if isinstance(e, asyncio.CancelledError):
+            raise
+        logger.warning(f"ffprobe timed out for {path}")
+        return None
+
+    if process.returncode != 0:
+        return None
+    return json.loads(stdout.decode("utf-8", errors="replace") or "{}")
+
+
+class MediaProbe:
+    """Thread-safe cache of ProbeResult entries keyed by (path, size, mtime)"""
+
+    def __init__(
+        self, maxsize: int = CACHE_CONFIG.DEFAULT_CACHE_SIZE, sidecar: bool = False
+    ):
+        self._results: LRUCache = LRUCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self._in_flight: Dict[ProbeKey, asyncio.Future] = {}
+        self.sidecar = sidecar
+        self.probes = 0
+        self.hits = 0
+
+    async def probe(self, path: str) -> Optional[ProbeResult]:
+        """Return the probe result of a file, running ffprobe only if needed"""
+        path = str(path)
+        try:
+            st = await asyncio.to_thread(os.stat, path)
+        except OSError:
+            return None
+        key: ProbeKey = (path, st.st_size, st.st_mtime)
+
+        while True:
+            with self._lock:
+                result = self._results.get(key)
+                if result is not None:
+                    self.hits += 1
+                    return result
+
+            pending = self._in_flight.get(key)
+            if pending is None:
+                break
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                # The owner was cancelled, not us: take over the probe
+                if pending.cancelled() and not asyncio.current_task().cancelling():
+                    continue
+                raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            result = await self._load(key)
+            future.set_result(result)
+        except Exception as e:
+            logger.debug(f"Could not probe {path}: {e}")
+            future.set_result(None)
+        finally:
+            self._in_flight.pop(key, None)
+            if not future.done():
+                # Cancelled owner: wake the waiters so they can retry
+                future.cancel()
+        return future.result()
+
+    async def _load(self, key: ProbeKey) -> Optional[ProbeResult]:
+        path = key[0]
+        data = None
+        if self.sidecar:
+            data = await asyncio.to_thread(self._read_sidecar, key)
+
+        if data is None:
+            self.probes += 1
+            data = await run_ffprobe(path)
+            if data is None:
+                # Not cached: the file may simply not be readable yet
+                return None
+            if self.sidecar:
+                await asyncio.to_thread(self._write_sidecar, key, data)
+
+        result = ProbeResult(
+            format=data.get("format") or {},
+            streams=data.get("streams") or [],
+            chapters=data.get("chapters") or [],
+        )
+        with self._lock:
+            self._results[key] = result
+        return result
+
+    def _read_sidecar(self, key: ProbeKey) -> Optional[Dict[str, Any]]:
+        try:
+            with open(sidecar_path(key[0]), "r", encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if stored.get("size") != key[1] or stored.get("mtime") != key[2]:
+            return None
+        return stored.get("probe")
+
+    def _write_sidecar(self, key: ProbeKey, data: Dict[str, Any]) -> None:
+        target = sidecar_path(key[0])
+        try:
+            tmp = target.with_name(target.name + ".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"size": key[1], "mtime": key[2], "probe": data}, f)
+            os.replace(tmp, target)
+        except OSError as e:
+            logger.debug(f"Could not write probe sidecar {target}: {e}")
+
+    def invalidate(self, path: Optional[str]) -> None:
+        """Drop all cached versions of a file"""
+        if not path:
+            return
+        path = str(path)
+        with self._lock:
+            for key in [k for k in self._results.keys() if k[0] == path]:
+                self._results.pop(key, None)
+        if self.sidecar:
+            try:
+                os.remove(sidecar_path(path))
+            except OSError:
+                pass
+
+    def get_statistics(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._results),
+                "probes": self.probes,
+                "hits": self.hits,
+            }
+
+
+# Global instance shared by ffmpeg_utils and the media services
+media_probe = MediaProbe()
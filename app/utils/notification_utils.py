@@ -45,7 +45,8 @@ async def send_push_notification(
     try:
         # Import here to avoid circular dependencies
         from app.database import get_db
-        from app.models import PushSubscription, GlobalSettings
+        from app.models import PushSubscription
+        from app.services.core.settings_snapshot import settings_snapshot
 
         # Lazy import the enhanced_push_service
         global _enhanced_push_service
@@ -93,7 +94,7 @@ async def send_push_notification(
         }
 
         # Check if notifications are globally enabled
-        global_settings = db.query(GlobalSettings).first()
+        global_settings = settings_snapshot.get_global_settings()
         if not global_settings or not global_settings.notifications_enabled:
             logger.debug("Push notifications are disabled globally")
             return {"sent": 0, "failed": 0, "skipped": 0}
@@ -66,6 +66,7 @@ class ProxyEncryption:
                     encryption_key = new_key.decode("utf-8")
 
                     # Save to database
+                    created = not settings
                     if not settings:
                         settings = GlobalSettings(
                             notifications_enabled=True,
@@ -76,6 +77,12 @@ class ProxyEncryption:
                         settings.proxy_encryption_key = encryption_key
 
                     db.commit()
+                    if created:
+                        from app.services.core.settings_snapshot import (
+                            invalidate_settings_snapshot,
+                        )
+
+                        invalidate_settings_snapshot("global settings created")
                     logger.info(
                         "✅ Proxy encryption key generated and saved to database"
                     )
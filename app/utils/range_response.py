@@ -0,0 +1,82 @@
+"""
+Range-aware file response for serving recordings.
+
+Builds on Starlette's FileResponse (single and multi-range requests,
+If-Range, ETag/Last-Modified) and adds:
+
+- 304 Not Modified for If-None-Match / If-Modified-Since revalidation
+- 1 MiB async reads instead of small per-iteration chunks
+
+Byte serving itself (including ``http.response.pathsend`` when the server
+advertises it) is left entirely to FileResponse; only its public
+interface is used here.
+"""
+
+import os
+import stat
+from email.utils import parsedate_to_datetime
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.types import Receive, Scope, Send
+
+# Large buffer so a multi-GB file needs a few thousand sends, not ~125k
+RECORDING_CHUNK_SIZE = 1024 * 1024
+
+_VALIDATOR_HEADERS = ("etag", "last-modified", "cache-control", "accept-ranges")
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, as required for If-None-Match
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+def is_not_modified(request_headers: Headers, stat_result: os.stat_result, etag: str):
+    """Evaluate conditional GET headers against the file's validators"""
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match takes precedence over If-Modified-Since
+        return _etag_matches(if_none_match, etag)
+
+    if_modified_since = request_headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError, IndexError, OverflowError):
+            return False
+        return int(stat_result.st_mtime) <= since
+
+    return False
+
+
+class RecordingFileResponse(FileResponse):
+    """FileResponse tuned for large recordings, with conditional requests"""
+
+    chunk_size = RECORDING_CHUNK_SIZE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if self.stat_result is None:
+            try:
+                stat_result = await anyio.to_thread.run_sync(os.stat, self.path)
+            except FileNotFoundError:
+                raise RuntimeError(f"File at path {self.path} does not exist.")
+            if not stat.S_ISREG(stat_result.st_mode):
+                raise RuntimeError(f"File at path {self.path} is not a file.")
+            self.stat_result = stat_result
+            self.set_stat_headers(stat_result)
+
+        request_headers = Headers(scope=scope)
+        if is_not_modified(request_headers, self.stat_result, self.headers["etag"]):
+            not_modified_headers = {
+                name: self.headers[name]
+                for name in _VALIDATOR_HEADERS
+                if name in self.headers
+            }
+            response = Response(status_code=304, headers=not_modified_headers)
+            return await response(scope, receive, send)
+
+        await super().__call__(scope, receive, send)
@@ -14,7 +14,6 @@ from typing import List, Optional, Dict, Any, Tuple
 from pathlib import Path
 from urllib.parse import urlparse
 
-from app.models import GlobalSettings
 
 # Get the logger
 logger = logging.getLogger(__name__)
@@ -412,19 +411,9 @@ def get_proxy_settings_from_db() -> Dict[str, str]:
     Returns:
         Dictionary with http and https proxy settings
     """
-    from app.database import SessionLocal
+    from app.services.core.settings_snapshot import settings_snapshot
 
-    proxy_settings = {}
-
-    with SessionLocal() as db:
-        global_settings = db.query(GlobalSettings).first()
-        if global_settings:
-            if global_settings.http_proxy and global_settings.http_proxy.strip():
-                proxy_settings["http"] = global_settings.http_proxy.strip()
-            if global_settings.https_proxy and global_settings.https_proxy.strip():
-                proxy_settings["https"] = global_settings.https_proxy.strip()
-
-    return proxy_settings
+    return dict(settings_snapshot.get_proxy_settings())
 
 
 def _validate_twitch_video_id(video_id: str) -> str:
@@ -0,0 +1,252 @@
+"""
+Streaming output handling for long-running subprocesses.
+
+Streamlink runs for hours and ffmpeg remuxes multi-GB files; collecting
+their output with ``communicate()`` keeps everything in memory until the
+process exits (and a full pipe stalls the child). OutputDrain reads
+stdout/stderr line by line while the process runs instead:
+
+- every line is appended to an optional log file (via log_file_writer)
+- only the last ``tail_lines`` lines are kept in memory
+- a line parser extracts progress and known errors as they happen, so a
+  failure can be classified without re-reading the whole output
+
+Usage::
+
+    process = await asyncio.create_subprocess_exec(*cmd, stdout=PIPE, stderr=PIPE)
+    drain = OutputDrain(process, log_path=log_path, parser=parse_streamlink_line)
+    ...
+    output = await drain.wait()
+    output.failure_reason, output.error_message, output.stderr_tail
+
+or, for short commands, ``result = await run_process(cmd, log_path=...)``.
+"""
+
+import asyncio
+import logging
+import re
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("streamvault")
+
+# Lines kept in memory per process for error reporting
+DEFAULT_TAIL_LINES = 200
+
+# Longest line kept; ffmpeg/streamlink progress never get close
+MAX_LINE_LENGTH = 8192
+
+READ_CHUNK_SIZE = 4096
+
+# (failure_reason, error_message) for a line, or progress values, or nothing
+LineParser = Callable[[str], Optional[Dict[str, Any]]]
+
+_LINE_SPLIT = re.compile(rb"[\r\n]")
+
+
+@dataclass
+class ProcessOutput:
+    """What is kept of a process's output: a tail plus parsed events"""
+
+    tail_lines: int = DEFAULT_TAIL_LINES
+    lines: Deque[Tuple[str, str]] = field(default_factory=deque)
+    progress: Dict[str, Any] = field(default_factory=dict)
+    failure_reason: Optional[str] = None
+    error_message: Optional[str] = None
+    line_count: int = 0
+    returncode: Optional[int] = None
+
+    def __post_init__(self):
+        self.lines = deque(self.lines, maxlen=self.tail_lines)
+
+    def add(self, stream: str, text: str, parser: Optional[LineParser]) -> None:
+        self.lines.append((stream, text))
+        self.line_count += 1
+        if parser is None:
+            return
+        try:
+            parsed = parser(text)
+        except Exception as e:
+            logger.debug(f"Output line parser failed: {e}")
+            return
+        if not parsed:
+            return
+        # The first error is the cause; later ones are usually follow-ups
+        if "failure_reason" in parsed and self.failure_reason is None:
+            self.failure_reason = parsed["failure_reason"]
+            self.error_message = parsed.get("error_message")
+        self.progress.update(parsed.get("progress") or {})
+
+    def tail(self, stream: Optional[str] = None) -> str:
+        return "\n".join(
+            text for source, text in self.lines if stream is None or source == stream
+        )
+
+    @property
+    def stdout_tail(self) -> bytes:
+        return self.tail("stdout").encode("utf-8")
+
+    @property
+    def stderr_tail(self) -> bytes:
+        return self.tail("stderr").encode("utf-8")
+
+
+class OutputDrain:
+    """Drains a running process's stdout/stderr into a ProcessOutput"""
+
+    def __init__(
+        self,
+        process: asyncio.subprocess.Process,
+        *,
+        log_path: Optional[str] = None,
+        parser: Optional[LineParser] = None,
+        tail_lines: int = DEFAULT_TAIL_LINES,
+    ):
+        self.process = process
+        self.log_path = log_path
+        self.parser = parser
+        self.output = ProcessOutput(tail_lines=tail_lines)
+
+        self._task = asyncio.create_task(self._drain())
+
+    async def wait(self) -> ProcessOutput:
+        """Wait for the process to exit and all output to be drained"""
+        await asyncio.shield(self._task)
+        self.output.returncode = await self.process.wait()
+        return self.output
+
+    async def _drain(self) -> None:
+        readers = [
+            self._read(stream, name)
+            for stream, name in (
+                (self.process.stdout, "stdout"),
+                (self.process.stderr, "stderr"),
+            )
+            if stream is not None
+        ]
+        await asyncio.gather(*readers, return_exceptions=True)
+
+    async def _read(self, stream: asyncio.StreamReader, name: str) -> None:
+        buffer = b""
+        while True:
+            chunk = await stream.read(READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            buffer += chunk
+            *complete, buffer = _LINE_SPLIT.split(buffer)
+            # Never let a line without terminator grow without bound
+            if len(buffer) > MAX_LINE_LENGTH:
+                complete.append(buffer)
+                buffer = b""
+            self._add(name, complete)
+        if buffer:
+            self._add(name, [buffer])
+
+    def _add(self, name: str, raw_lines: List[bytes]) -> None:
+        log_lines = []
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        prefix = "" if name == "stdout" else "STDERR "
+        for raw in raw_lines:
+            text = raw[:MAX_LINE_LENGTH].decode("utf-8", errors="replace").rstrip()
+            if not text:
+                continue
+            self.output.add(name, text, self.parser)
+            log_lines.append(f"[{timestamp}] {prefix}{text}\n")
+        # One queued write per chunk; the writer thread does the disk I/O
+        if log_lines and self.log_path is not None:
+            # Lazy import: app.services imports ffmpeg_utils, which imports us
+            from app.services.system.log_writer import log_file_writer
+
+            log_file_writer.write(self.log_path, "".join(log_lines))
+
+
+async def run_process(
+    cmd: List[str],
+    *,
+    log_path: Optional[str] = None,
+    parser: Optional[LineParser] = None,
+    tail_lines: int = DEFAULT_TAIL_LINES,
+    timeout: Optional[float] = None,
+) -> ProcessOutput:
+    """Run a command to completion with streamed, bounded output handling"""
+    process = await asyncio.create_subprocess_exec(
+        *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    drain = OutputDrain(
+        process, log_path=log_path, parser=parser, tail_lines=tail_lines
+    )
+    try:
+        return await asyncio.wait_for(drain.wait(), timeout=timeout)
+    except BaseException:
+        if process.returncode is None:
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+        raise
+
+
+# ----- Line parsers -----
+
+_STREAMLINK_ERRORS = (
+    (
+        "ProxyError",
+        "proxy_error",
+        "Proxy connection failed (500 Internal Server Error)",
+    ),
+    (
+        "Tunnel connection failed",
+        "proxy_error",
+        "Proxy connection failed (500 Internal Server Error)",
+    ),
+    ("Unable to open URL", "stream_unavailable", "Stream unavailable or ended"),
+    ("No playable streams found", "no_streams", "No playable streams found"),
+)
+
+# "[download] Written 1.23 GiB to file.ts (1h02m03s @ 2.34 MiB/s)"
+_STREAMLINK_PROGRESS = re.compile(
+    r"Written (?P<written>[\d.]+ \w+) .*?\((?P<elapsed>[\dhms]+) @ (?P<rate>[\d.]+ \w+/s)\)"
+)
+
+# "frame= 100 ... size=  2048kB time=00:01:02.03 bitrate=1234.5kbits/s speed=40x"
+_FFMPEG_PROGRESS = re.compile(r"(size|time|bitrate|speed)=\s*(\S+)")
+
+# Messages ffmpeg prints when it gives up. Decoder complaints such as
+# "[h264 @ 0x...] error while decoding MB" are recoverable and not listed.
+_FFMPEG_FATAL_ERRORS = (
+    "invalid data found when processing input",
+    "no such file or directory",
+    "permission denied",
+    "no space left on device",
+    "moov atom not found",
+    "error opening input",
+    "error opening output",
+    "error initializing output stream",
+    "could not write header",
+    "error writing trailer",
+    "does not contain any stream",
+    "conversion failed",
+)
+
+
+def parse_streamlink_line(line: str) -> Optional[Dict[str, Any]]:
+    """Known Streamlink failures and download progress"""
+    for needle, reason, message in _STREAMLINK_ERRORS:
+        if needle in line:
+            return {"failure_reason": reason, "error_message": message}
+    match = _STREAMLINK_PROGRESS.search(line)
+    if match:
+        return {"progress": match.groupdict()}
+    return None
+
+
+def parse_ffmpeg_line(line: str) -> Optional[Dict[str, Any]]:
+    """ffmpeg stats (size/time/bitrate/speed) and fatal errors"""
+    if "bitrate=" in line or "speed=" in line:
+        return {"progress": dict(_FFMPEG_PROGRESS.findall(line))}
+    lowered = line.lower()
+    if any(needle in lowered for needle in _FFMPEG_FATAL_ERRORS):
+        return {"failure_reason": "ffmpeg_error", "error_message": line}
+    return None
@@ -0,0 +1,83 @@
+"""
+Migration 040: Add eventsub_inbox table
+
+EventSub notifications used to be handled inside the webhook request, with
+Twitch waiting for the handler (5 s timeout) before getting its 204. Slow
+handlers at the top of the hour timed out and Twitch retried them, adding
+more load. Notifications are now written to this table, acknowledged right
+away and dispatched asynchronously. Pending rows are replayed on startup.
+
+Idempotent: safe to run multiple times.
+"""
+
+import logging
+from sqlalchemy import text
+from app.database import SessionLocal
+
+logger = logging.getLogger("streamvault")
+
+
+def run_migration():
+    """Create the eventsub_inbox table (PostgreSQL)."""
+
+    with SessionLocal() as session:
+        try:
+            logger.info("🔄 Running Migration 040: Add eventsub_inbox")
+
+            exists = session.execute(
+                text("SELECT to_regclass('public.eventsub_inbox') AS reg")
+            ).fetchone()
+
+            if exists and exists[0]:
+                logger.info("✅ Table 'eventsub_inbox' already exists, skipping create")
+            else:
+                session.execute(
+                    text(
+                        """
+                        CREATE TABLE eventsub_inbox (
+                            id SERIAL PRIMARY KEY,
+                            message_id VARCHAR NOT NULL UNIQUE,
+                            event_type VARCHAR NOT NULL,
+                            broadcaster_user_id VARCHAR,
+                            payload TEXT NOT NULL,
+                            status VARCHAR NOT NULL DEFAULT 'pending',
+                            attempts INTEGER NOT NULL DEFAULT 0,
+                            last_error TEXT,
+                            received_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+                            processed_at TIMESTAMP WITH TIME ZONE
+                        )
+                        """
+                    )
+                )
+                logger.info("✅ Created 'eventsub_inbox' table")
+
+            session.execute(
+                text(
+                    """
+                    CREATE INDEX IF NOT EXISTS idx_eventsub_inbox_status_id
+                    ON eventsub_inbox (status, id)
+                    """
+                )
+            )
+
+            session.commit()
+            logger.info("✅ Migration 040 completed successfully")
+
+        except Exception as e:
+            session.rollback()
+            logger.error(f"❌ Migration 040 failed: {e}")
+            raise
+
+
+def rollback_migration():
+    """Rollback migration 040"""
+    with SessionLocal() as session:
+        try:
+            logger.info("🔄 Rolling back Migration 040")
+            session.execute(text("DROP TABLE IF EXISTS eventsub_inbox CASCADE"))
+            session.commit()
+            logger.info("✅ Migration 040 rollback completed")
+        except Exception as e:
+            session.rollback()
+            logger.error(f"❌ Migration 040 rollback failed: {e}")
+            raise
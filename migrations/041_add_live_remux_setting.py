@@ -0,0 +1,56 @@
+"""
+Migration 041: Add recording_settings.live_remux
+
+When enabled, each recording segment is remuxed to a fragmented MP4 while
+Streamlink is still writing the .ts file. At stream end the MP4 only has to
+be finalized instead of remuxing the whole recording again.
+
+Idempotent: safe to run multiple times.
+"""
+
+import logging
+from sqlalchemy import text
+from app.database import SessionLocal
+
+logger = logging.getLogger("streamvault")
+
+
+def run_migration():
+    """Add the live_remux column (PostgreSQL)."""
+
+    with SessionLocal() as session:
+        try:
+            logger.info("🔄 Running Migration 041: Add recording_settings.live_remux")
+
+            session.execute(
+                text(
+                    """
+                    ALTER TABLE recording_settings
+                    ADD COLUMN IF NOT EXISTS live_remux BOOLEAN NOT NULL DEFAULT false
+                    """
+                )
+            )
+
+            session.commit()
+            logger.info("✅ Migration 041 completed successfully")
+
+        except Exception as e:
+            session.rollback()
+            logger.error(f"❌ Migration 041 failed: {e}")
+            raise
+
+
+def rollback_migration():
+    """Rollback migration 041"""
+    with SessionLocal() as session:
+        try:
+            logger.info("🔄 Rolling back Migration 041")
+            session.execute(
+                text("ALTER TABLE recording_settings DROP COLUMN IF EXISTS live_remux")
+            )
+            session.commit()
+            logger.info("✅ Migration 041 rollback completed")
+        except Exception as e:
+            session.rollback()
+            logger.error(f"❌ Migration 041 rollback failed: {e}")
+            raise
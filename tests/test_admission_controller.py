@@ -0,0 +1,97 @@
+"""
+Tests for global admission control of post-processing tasks.
+"""
+
+import asyncio
+
+from app.services.queues import admission_controller as admission_module
+from app.services.queues.admission_controller import AdmissionController
+
+
+def test_budgets_are_shared_fairly_between_streamers():
+    controller = AdmissionController({"io": 1})
+    order = []
+
+    async def task(streamer, release):
+        async with controller.slot("mp4_remux", streamer):
+            order.append(streamer)
+            await release.wait()
+
+    async def run_test():
+        releases = [asyncio.Event() for _ in range(5)]
+        # "busy" queues three remuxes before the other streamers end
+        tasks = [
+            asyncio.create_task(task("busy", releases[0])),
+            asyncio.create_task(task("busy", releases[1])),
+            asyncio.create_task(task("busy", releases[2])),
+        ]
+        await asyncio.sleep(0)
+        tasks += [
+            asyncio.create_task(task("a", releases[3])),
+            asyncio.create_task(task("b", releases[4])),
+        ]
+        await asyncio.sleep(0)
+
+        stats = controller.get_statistics()
+        assert stats["io"] == {"limit": 1, "active": 1, "waiting": 4}
+
+        # Light tasks are not held back by the io budget
+        async with controller.slot("metadata_generation", "a"):
+            assert controller.get_statistics()["light"]["active"] == 1
+
+        for release in releases:
+            release.set()
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+
+    asyncio.run(run_test())
+
+    assert order == ["busy", "a", "b", "busy", "busy"]
+    assert controller.get_statistics()["io"]["active"] == 0
+
+
+def test_cancelled_waiter_does_not_leak_a_slot():
+    controller = AdmissionController({"cpu": 1})
+
+    async def run_test():
+        release = asyncio.Event()
+
+        async def holder():
+            async with controller.slot("thumbnail_generation", "a"):
+                await release.wait()
+
+        first = asyncio.create_task(holder())
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(holder())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        release.set()
+        await first
+        assert controller.get_statistics()["cpu"] == {
+            "limit": 1,
+            "active": 0,
+            "waiting": 0,
+        }
+
+    asyncio.run(run_test())
+
+
+def test_io_budget_follows_disk_throughput(monkeypatch):
+    monkeypatch.setattr(admission_module, "ADAPT_WINDOW_TASKS", 1)
+    controller = AdmissionController({"io": 2})
+    mib = 1024 * 1024
+
+    # Throughput grows with the first step up, so the budget keeps growing
+    controller._record_io(100 * mib, 10.0)  # 20 MiB/s at 2 slots
+    assert controller.classes["io"].limit == 3
+    controller._record_io(100 * mib, 10.0)  # 30 MiB/s at 3 slots
+    assert controller.classes["io"].limit == 4
+
+    # A saturated disk: per-task speed drops, aggregate stays flat -> back off
+    controller._record_io(75 * mib, 10.0)  # 30 MiB/s at 4 slots
+    assert controller.classes["io"].limit == 3
+
+    # Short tasks (renamed live remuxes) are not throughput samples
+    controller._record_io(100 * mib, 0.1)
+    assert controller.classes["io"].limit == 3
@@ -0,0 +1,215 @@
+"""
+Tests for request handlers that read through async database sessions.
+"""
+
+import asyncio
+import json
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.middleware import auth as middleware_module
+from app.middleware.auth import AuthMiddleware
+from app.models import Stream, Streamer, User
+from app.routes.videos import get_videos
+from app.services.core import auth_service as auth_module
+from app.services.core.auth_service import SessionValidationCache, _hash_token
+from app.utils import async_db_utils
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    path = tmp_path / "async.db"
+    engine = create_engine(f"sqlite:///{path}", future=True)
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine, future=True)
+
+    def no_sync_sessions():
+        raise AssertionError("sync session opened on the event loop")
+
+    monkeypatch.setattr(middleware_module, "SessionLocal", no_sync_sessions)
+
+    cache = SessionValidationCache()
+    monkeypatch.setattr(auth_module, "session_cache", cache)
+    monkeypatch.setattr(middleware_module, "session_cache", cache)
+    yield f"sqlite+aiosqlite:///{path}", factory, cache
+    engine.dispose()
+
+
+def _use_async_engine(monkeypatch, url):
+    async_engine = create_async_engine(url)
+    monkeypatch.setattr(
+        async_db_utils,
+        "_async_session_maker",
+        async_sessionmaker(bind=async_engine, expire_on_commit=False),
+    )
+    return async_engine
+
+
+async def _call(app, path, token=None):
+    headers = [(b"accept", b"application/json")]
+    if token:
+        headers.append((b"cookie", f"session={token}".encode()))
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "headers": headers,
+        "scheme": "http",
+        "server": ("testserver", 80),
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    status = messages[0]["status"]
+    body = b"".join(m.get("body", b"") for m in messages[1:])
+    return status, json.loads(body) if body else None
+
+
+def test_middleware_releases_connection_before_the_request_runs(database, monkeypatch):
+    url, factory, cache = database
+
+    async def run_test():
+        async_engine = _use_async_engine(monkeypatch, url)
+        checked_out = []
+
+        async def downstream(scope, receive, send):
+            checked_out.append(async_engine.pool.checkedout())
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b""})
+
+        middleware = AuthMiddleware(downstream)
+        try:
+            status, body = await _call(middleware, "/api/streamers")
+            assert status == 307
+            assert body["redirect"] == "/auth/setup"
+
+            with factory() as db:
+                db.add(User(username="admin", password="x", is_admin=True))
+                db.commit()
+
+            status, body = await _call(middleware, "/api/streamers")
+            assert status == 401
+            assert cache.admin_exists
+
+            cache._admin_exists = False
+            cache.store(_hash_token("token"), 1, datetime(2100, 1, 1))
+            status, _ = await _call(middleware, "/api/streamers", token="token")
+            assert status == 200
+            assert checked_out == [0]
+        finally:
+            await async_engine.dispose()
+
+    asyncio.run(run_test())
+
+
+def test_get_videos_queries_through_async_session(database, monkeypatch, tmp_path):
+    url, factory, cache = database
+    recording = tmp_path / "stream.mp4"
+    recording.write_bytes(b"x" * 10)
+    with factory() as db:
+        db.add(Streamer(id=1, twitch_id="1", username="streamer"))
+        db.add(
+            Stream(
+                id=1,
+                streamer_id=1,
+                title="Speedrun",
+                started_at=datetime(2026, 1, 1, tzinfo=timezone.utc),
+                recording_path=str(recording),
+            )
+        )
+        db.commit()
+    cache.store(_hash_token("token"), 1, datetime(2100, 1, 1))
+
+    async def run_test():
+        async_engine = _use_async_engine(monkeypatch, url)
+        try:
+            async with async_db_utils.async_session_scope() as db:
+                videos = await get_videos(
+                    request=SimpleNamespace(cookies={"session": "token"}),
+                    response=SimpleNamespace(headers={}),
+                    limit=None,
+                    cursor=None,
+                    streamer_id=None,
+                    category=None,
+                    start_date=None,
+                    end_date=None,
+                    db=db,
+                )
+        finally:
+            await async_engine.dispose()
+        return videos
+
+    videos = asyncio.run(run_test())
+    assert [(v["id"], v["streamer_name"], v["file_size"]) for v in videos] == [
+        (1, "streamer", 10)
+    ]
+
+
+def test_get_videos_pages_with_a_keyset_cursor(database, monkeypatch, tmp_path):
+    url, factory, cache = database
+    with factory() as db:
+        db.add(Streamer(id=1, twitch_id="1", username="streamer"))
+        for stream_id, day in ((1, 1), (2, 2), (3, 2), (4, 3), (5, None)):
+            recording = tmp_path / f"stream{stream_id}.mp4"
+            if stream_id != 4:
+                recording.write_bytes(b"x")
+            db.add(
+                Stream(
+                    id=stream_id,
+                    streamer_id=1,
+                    started_at=(
+                        datetime(2026, 1, day, tzinfo=timezone.utc) if day else None
+                    ),
+                    recording_path=str(recording),
+                )
+            )
+        db.add(Stream(id=6, streamer_id=1, started_at=datetime(2026, 1, 9)))
+        db.commit()
+    cache.store(_hash_token("token"), 1, datetime(2100, 1, 1))
+
+    async def fetch_page(cursor):
+        response = SimpleNamespace(headers={})
+        async with async_db_utils.async_session_scope() as db:
+            videos = await get_videos(
+                request=SimpleNamespace(cookies={"session": "token"}),
+                response=response,
+                limit=2,
+                cursor=cursor,
+                streamer_id=None,
+                category=None,
+                start_date=None,
+                end_date=None,
+                db=db,
+            )
+        return [v["id"] for v in videos], response.headers.get("X-Next-Cursor")
+
+    async def run_test():
+        async_engine = _use_async_engine(monkeypatch, url)
+        pages = []
+        try:
+            cursor = None
+            while True:
+                ids, cursor = await fetch_page(cursor)
+                pages.append(ids)
+                if cursor is None:
+                    return pages
+        finally:
+            await async_engine.dispose()
+
+    # Newest first, ties broken by id, no start time last; stream 4 has no
+    # file and stream 6 has no source at all
+    assert asyncio.run(run_test()) == [[3, 2], [1, 5]]
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Tests for the in-process session validation cache used by AuthService.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.services.core import auth_service as auth_module
+from app.services.core.auth_service import (
+    AuthService,
+    SessionValidationCache,
+    _hash_token,
+    is_session_cached,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    cache = SessionValidationCache()
+    monkeypatch.setattr(auth_module, "session_cache", cache)
+    return cache
+
+
+def _db_with_session(created_at, user_id=1):
+    db = MagicMock()
+    session = SimpleNamespace(user_id=user_id, created_at=created_at)
+    db.query.return_value.filter_by.return_value.first.return_value = session
+    return db
+
+
+def test_validated_session_is_served_from_cache():
+    async def run_test():
+        db = _db_with_session(datetime.now(timezone.utc))
+        service = AuthService(db)
+
+        assert await service.validate_session("token-a")
+        assert await service.validate_session("token-a")
+
+        assert db.query.call_count == 1
+        assert is_session_cached("token-a")
+
+    asyncio.run(run_test())
+
+
+def test_delete_session_invalidates_cache_entry(fresh_cache):
+    async def run_test():
+        db = _db_with_session(datetime.now(timezone.utc))
+        service = AuthService(db)
+
+        assert await service.validate_session("token-b")
+        await service.delete_session("token-b")
+
+        assert not is_session_cached("token-b")
+
+    asyncio.run(run_test())
+
+
+def test_expired_entries_are_never_served(fresh_cache):
+    token_hash = _hash_token("token-c")
+    fresh_cache.store(token_hash, 1, datetime.now(timezone.utc) - timedelta(seconds=1))
+
+    assert fresh_cache.get(token_hash) is None
+
+    fresh_cache.store(token_hash, 1, datetime.now(timezone.utc) - timedelta(seconds=1))
+    fresh_cache.purge_expired()
+    assert fresh_cache.get(token_hash) is None
+
+
+def test_admin_exists_is_cached_once_positive(fresh_cache):
+    async def run_test():
+        db = MagicMock()
+        db.query.return_value.filter_by.return_value.first.return_value = None
+        service = AuthService(db)
+
+        assert not await service.admin_exists()
+        assert not fresh_cache.admin_exists
+
+        db.query.return_value.filter_by.return_value.first.return_value = object()
+        assert await service.admin_exists()
+        assert await service.admin_exists()
+
+        assert db.query.call_count == 2
+        assert fresh_cache.admin_exists
+
+    asyncio.run(run_test())
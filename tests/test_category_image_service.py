@@ -0,0 +1,126 @@
+"""
+Tests for category image lookups: bulk query, negative cache, directory index.
+"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import Category
+from app.services.images import category_image_service as category_module
+from app.services.images.category_image_service import CategoryImageService
+from app.services.images.image_download_service import ImageDownloadService
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'categories.db'}", future=True)
+    Base.metadata.create_all(engine, tables=[Category.__table__])
+    factory = sessionmaker(bind=engine, future=True)
+    monkeypatch.setattr(category_module, "SessionLocal", factory)
+
+    with factory() as db:
+        db.add_all(
+            [
+                Category(
+                    twitch_id="1",
+                    name="Just Chatting",
+                    box_art_url="/api/media/categories/just_chatting.jpg",
+                ),
+                Category(
+                    twitch_id="2",
+                    name="Fortnite",
+                    box_art_url="https://static-cdn.jtvnw.net/fortnite.jpg",
+                ),
+                Category(
+                    twitch_id="3",
+                    name="Ghost",
+                    box_art_url="/api/media/categories/ghost.jpg",
+                ),
+                Category(twitch_id="4", name="No Art", box_art_url=None),
+            ]
+        )
+        db.commit()
+
+    media_dir = tmp_path / ".media"
+    (media_dir / "categories").mkdir(parents=True)
+    (media_dir / "categories" / "just_chatting.jpg").write_bytes(b"jpg")
+
+    download_service = ImageDownloadService.__new__(ImageDownloadService)
+    download_service.session = None
+    download_service._failed_downloads = set()
+    download_service._initialized = True
+    download_service.images_base_dir = media_dir
+
+    queries = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: queries.append(statement),
+    )
+    yield CategoryImageService(download_service), queries
+    engine.dispose()
+
+
+def test_batch_lookup_uses_one_query_and_remembers_misses(service):
+    service, queries = service
+    names = ["Just Chatting", "Fortnite", "Ghost", "No Art", "Unknown"]
+
+    first = service.get_category_images(names + ["Just Chatting"], download=False)
+
+    assert first == {
+        "Just Chatting": "/api/media/categories/just_chatting.jpg",
+        "Fortnite": None,
+        "Ghost": None,
+        "No Art": None,
+        "Unknown": None,
+    }
+    assert len(queries) == 1
+
+    # Hits and known misses are answered from memory; only the category
+    # that still needs a download is looked up again
+    assert service.get_category_images(names, download=False) == first
+    assert len(queries) == 2
+    assert " IN " in queries[-1]
+
+    assert service.get_cached_category_image("No Art") is None
+    assert len(queries) == 2
+
+
+def test_download_updates_directory_index_and_clears_miss(service):
+    service, queries = service
+    assert service.get_cached_category_image("Ghost") is None
+
+    async def fake_download(url, file_path, expected_content_types=None):
+        file_path.write_bytes(b"jpg")
+        return True
+
+    service.download_service.download_image = fake_download
+    path = asyncio.run(
+        service.download_category_image("Ghost", "https://example.com/ghost.jpg")
+    )
+
+    assert path == "/api/media/categories/ghost.jpg"
+    assert "ghost.jpg" in service._file_index
+    assert "Ghost" not in service._missing_cache
+    assert service.get_cached_category_image("Ghost") == path
+
+
+def test_symlinks_leaving_the_directory_are_not_indexed(tmp_path):
+    media_dir = tmp_path / ".media"
+    categories_dir = media_dir / "categories"
+    categories_dir.mkdir(parents=True)
+    (tmp_path / "outside.jpg").write_bytes(b"jpg")
+    (categories_dir / "unsafe.jpg").symlink_to(tmp_path / "outside.jpg")
+    (categories_dir / "safe.jpg").write_bytes(b"jpg")
+
+    download_service = ImageDownloadService.__new__(ImageDownloadService)
+    download_service._initialized = True
+    download_service.images_base_dir = media_dir
+
+    service = CategoryImageService(download_service)
+
+    assert service._file_index == {"safe.jpg"}
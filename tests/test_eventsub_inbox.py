@@ -0,0 +1,114 @@
+"""
+Tests for the durable EventSub inbox: store-then-ACK, ordered dispatch, replay.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.events import eventsub_inbox as inbox_module
+from app.events.eventsub_inbox import EventSubInbox
+from app.models import EventSubInboxMessage
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    # File-based so the worker threads share one database
+    engine = create_engine(f"sqlite:///{tmp_path / 'inbox.db'}", future=True)
+    Base.metadata.create_all(engine, tables=[EventSubInboxMessage.__table__])
+    factory = sessionmaker(bind=engine, future=True)
+    monkeypatch.setattr(inbox_module, "SessionLocal", factory)
+    monkeypatch.setattr(inbox_module, "RETRY_DELAY_SECONDS", 0)
+    yield factory
+    engine.dispose()
+
+
+def _statuses(session_factory):
+    with session_factory() as db:
+        return {
+            row.message_id: (row.status, row.attempts)
+            for row in db.query(EventSubInboxMessage).all()
+        }
+
+
+def test_dispatch_is_ordered_per_broadcaster_and_bounded(session_factory):
+    handled = []
+    running = 0
+    peak = 0
+
+    async def handler(event):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        handled.append((event["broadcaster_user_id"], event["seq"]))
+        running -= 1
+
+    registry = SimpleNamespace(
+        handlers={"stream.online": handler, "channel.update": handler}
+    )
+
+    async def run_test():
+        inbox = EventSubInbox(max_concurrency=2)
+        await inbox.start(registry)
+        for seq in range(3):
+            for broadcaster in ("1", "2", "3"):
+                event = {"broadcaster_user_id": broadcaster, "seq": seq}
+                event_type = "stream.online" if seq == 0 else "channel.update"
+                assert await inbox.accept(f"m-{broadcaster}-{seq}", event_type, event)
+        # Twitch retry of an already stored message
+        assert not await inbox.accept("m-1-0", "stream.online", {})
+
+        while inbox._workers:
+            await asyncio.sleep(0.01)
+        await inbox.stop()
+
+    asyncio.run(run_test())
+
+    assert len(handled) == 9
+    for broadcaster in ("1", "2", "3"):
+        assert [seq for b, seq in handled if b == broadcaster] == [0, 1, 2]
+    assert peak == 2
+    assert set(_statuses(session_factory).values()) == {("done", 1)}
+
+
+def test_pending_messages_are_replayed_and_failures_retried(session_factory):
+    handled = []
+
+    async def online(event):
+        handled.append(event["broadcaster_user_id"])
+
+    async def broken(event):
+        raise RuntimeError("twitch api down")
+
+    registry = SimpleNamespace(
+        handlers={"stream.online": online, "stream.offline": broken}
+    )
+
+    async def run_test():
+        # ACKed but not dispatched before a restart
+        stopped = EventSubInbox()
+        await stopped.accept("m-1", "stream.online", {"broadcaster_user_id": "42"})
+        await stopped.accept("m-2", "stream.offline", {"broadcaster_user_id": "42"})
+        assert handled == []
+
+        inbox = EventSubInbox()
+        assert await inbox.start(registry) == 2
+        while inbox._workers:
+            await asyncio.sleep(0.01)
+        await inbox.stop()
+
+        # Nothing left to replay
+        assert await EventSubInbox().start(registry) == 0
+
+    asyncio.run(run_test())
+
+    assert handled == ["42"]
+    assert _statuses(session_factory) == {
+        "m-1": ("done", 1),
+        "m-2": ("failed", inbox_module.MAX_DISPATCH_ATTEMPTS),
+    }
@@ -0,0 +1,61 @@
+"""
+Tests for image analysis on the image-processing executor.
+"""
+
+import asyncio
+import io
+
+from PIL import Image
+
+from app.services.images import image_processing
+from app.services.media.thumbnail_service import ThumbnailService
+
+
+def _jpeg(img):
+    buffer = io.BytesIO()
+    img.save(buffer, format="JPEG", quality=95)
+    return buffer.getvalue()
+
+
+def _gradient(width, height):
+    horizontal = Image.linear_gradient("L").rotate(90).resize((width, height))
+    vertical = Image.linear_gradient("L").resize((width, height))
+    return Image.merge(
+        "RGB", (horizontal, vertical, Image.new("L", (width, height), 30))
+    )
+
+
+def test_analysis_runs_on_downscaled_image_and_is_cached(monkeypatch):
+    gray = _jpeg(Image.new("RGB", (1280, 720), (110, 112, 108)))
+    calls = []
+    real_run = image_processing.run_image_task
+
+    async def counting_run(func, *args):
+        calls.append(func.__name__)
+        return await real_run(func, *args)
+
+    monkeypatch.setattr(image_processing, "run_image_task", counting_run)
+
+    async def run_test():
+        first = await image_processing.analyze_image_async(gray)
+        second = await image_processing.analyze_image_async(gray)
+        return first, second
+
+    first, second = asyncio.run(run_test())
+
+    assert (first.width, first.height) == (1280, 720)
+    assert all(abs(c - e) <= 2 for c, e in zip(first.average_color, (110, 112, 108)))
+    assert first.dominant_ratio > 0.7
+    assert second is first
+    assert calls == ["analyze_image"]
+
+
+def test_placeholder_detection():
+    service = ThumbnailService()
+    placeholder = _jpeg(Image.new("RGB", (1280, 720), (100, 100, 100)))
+    stream_frame = _jpeg(_gradient(640, 360))
+
+    assert asyncio.run(service._is_placeholder_image(placeholder))
+    assert not asyncio.run(service._is_placeholder_image(stream_frame))
+    # Undecodable data is not treated as a placeholder
+    assert not asyncio.run(service._is_placeholder_image(b"not an image" * 1000))
@@ -0,0 +1,74 @@
+"""
+Tests for remuxing a growing recording segment while it is written.
+"""
+
+import asyncio
+import sys
+
+from app.services.recording import live_remuxer as remuxer_module
+from app.services.recording.live_remuxer import LiveRemuxer, live_mp4_path
+
+
+def _copy_stdin_command(remuxer):
+    # Stand-in for ffmpeg: write everything from stdin to the .part file
+    script = (
+        "import shutil, sys; "
+        f"shutil.copyfileobj(sys.stdin.buffer, open({remuxer.part_path!r}, 'wb'))"
+    )
+    return [sys.executable, "-c", script]
+
+
+def test_growing_segment_is_followed_until_finish(tmp_path, monkeypatch):
+    monkeypatch.setattr(remuxer_module, "POLL_INTERVAL_SECONDS", 0.01)
+    monkeypatch.setattr(remuxer_module, "READ_CHUNK_SIZE", 1000)
+    monkeypatch.setattr(LiveRemuxer, "build_command", _copy_stdin_command)
+
+    ts_path = tmp_path / "stream_part001.ts"
+    mp4_path = tmp_path / "stream_part001.mp4"
+    chunks = [bytes([i]) * 2500 for i in range(8)]
+
+    async def run_test():
+        remuxer = LiveRemuxer(str(ts_path), str(mp4_path))
+        # Started before Streamlink has created the file
+        await remuxer.start()
+        await asyncio.sleep(0.03)
+
+        with open(ts_path, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+                f.flush()
+                await asyncio.sleep(0.02)
+
+        assert not mp4_path.exists()
+        results = await asyncio.gather(remuxer.finish(), remuxer.finish())
+        return remuxer, results
+
+    remuxer, results = asyncio.run(run_test())
+
+    assert results == [True, True]
+    assert mp4_path.read_bytes() == b"".join(chunks)
+    assert remuxer.bytes_fed == 20000
+    assert not (tmp_path / "stream_part001.mp4.part").exists()
+
+
+def test_failed_remux_is_reported(tmp_path, monkeypatch):
+    monkeypatch.setattr(remuxer_module, "POLL_INTERVAL_SECONDS", 0.01)
+    monkeypatch.setattr(
+        LiveRemuxer,
+        "build_command",
+        lambda self: [sys.executable, "-c", "import sys; sys.exit(1)"],
+    )
+    ts_path = tmp_path / "stream_part001.ts"
+    ts_path.write_bytes(b"x" * 100)
+
+    async def run_test():
+        remuxer = LiveRemuxer(str(ts_path), str(tmp_path / "stream_part001.mp4"))
+        await remuxer.start()
+        return await remuxer.finish()
+
+    assert asyncio.run(run_test()) is False
+    assert not (tmp_path / "stream_part001.mp4").exists()
+
+
+def test_live_mp4_sits_next_to_final_recording():
+    assert live_mp4_path("/recordings/a/stream.ts") == "/recordings/a/stream.live.mp4"
@@ -19,7 +19,6 @@ def test_live_stream_session_properties():
         quality="best",
         streamlink_process=MagicMock(),
         ffmpeg_process=MagicMock(),
-        output_dir=MagicMock(),
     )
 
     assert session.session_id == "abc123"
@@ -49,7 +48,6 @@ def test_live_stream_session_touch():
         quality="720p60",
         streamlink_process=MagicMock(),
         ffmpeg_process=MagicMock(),
-        output_dir=MagicMock(),
     )
 
     old_accessed = session.last_accessed
@@ -102,27 +100,20 @@ def test_append_playback_token_to_playlist():
 
 
 def test_build_ffmpeg_command_structure():
-    """Test FFmpeg command contains required arguments"""
+    """Test FFmpeg command remuxes stdin to MPEG-TS on stdout"""
     from app.services.live_streaming_service import LiveStreamingService
-    from pathlib import Path
 
     svc = LiveStreamingService()
-    output_dir = Path("/tmp/test-live")
-    cmd = svc._build_ffmpeg_command(output_dir)
+    cmd = svc._build_ffmpeg_command()
 
     assert cmd[0] == "ffmpeg"
     assert "-hide_banner" in cmd
-    assert "-" in cmd  # stdin
+    assert cmd[cmd.index("-i") + 1] == "-"  # stdin
     assert "-c" in cmd
     assert "copy" in cmd
-    assert "-f" in cmd
-    assert "hls" in cmd
-    assert "-hls_time" in cmd
-    assert "-hls_list_size" in cmd
-    assert "-hls_flags" in cmd
-    assert "delete_segments+omit_endlist" in cmd
-    assert "-hls_segment_filename" in cmd
-    assert str(output_dir / "playlist.m3u8") in cmd
+    assert cmd[cmd.index("-f") + 1] == "mpegts"
+    assert cmd[-1] == "-"  # stdout
+    assert "hls" not in cmd
 
 
 def test_get_session_not_found():
@@ -151,43 +142,263 @@ def test_stop_stream_not_found():
     assert result is False
 
 
-def test_stop_existing_user_streams_replaces_same_streamer():
-    """Test replacement cleanup only stops matching user/streamer sessions."""
+def test_start_stream_replaces_same_streamer_sessions_of_the_user():
+    """Test replacement only stops the user's sessions for the same streamer."""
     import asyncio
+    from app.services.live_segment_buffer import LiveSegmentBuffer
     from app.services.live_streaming_service import (
+        LivePipeline,
         LiveStreamingService,
-        LiveStreamSession,
     )
 
     svc = LiveStreamingService()
+    started = []
+    stopped = []
 
-    def make_session(session_id: str, streamer_name: str, user_id: str):
-        streamlink_process = MagicMock()
-        streamlink_process.returncode = 0
+    async def fake_start_pipeline(key, streamer_name, quality, supported_codecs):
         ffmpeg_process = MagicMock()
-        ffmpeg_process.returncode = 0
-        output_dir = MagicMock()
-        output_dir.exists.return_value = False
-        return LiveStreamSession(
-            session_id=session_id,
+        ffmpeg_process.returncode = None
+        pipeline = LivePipeline(
+            key=key,
+            pipeline_id=f"p{len(started)}",
             streamer_name=streamer_name,
-            quality="best",
-            streamlink_process=streamlink_process,
+            quality=quality,
             ffmpeg_process=ffmpeg_process,
-            output_dir=output_dir,
-            user_id=user_id,
+            segments=LiveSegmentBuffer(list_size=10, target_duration=2),
         )
+        started.append(pipeline)
+        return pipeline
 
-    svc.sessions = {
-        "old": make_session("old", "HandOfBlood", "user-1"),
-        "other-streamer": make_session("other-streamer", "maxim", "user-1"),
-        "other-user": make_session("other-user", "HandOfBlood", "user-2"),
+    async def fake_stop_pipeline(pipeline):
+        stopped.append(pipeline)
+
+    async def fake_monitor(pipeline):
+        return None
+
+    svc._start_pipeline = fake_start_pipeline
+    svc._stop_pipeline = fake_stop_pipeline
+    svc._monitor_pipeline = fake_monitor
+
+    async def run_test():
+        old = await svc.start_stream("HandOfBlood", user_id="user-1")
+        other_streamer = await svc.start_stream("maxim", user_id="user-1")
+        other_user = await svc.start_stream("HandOfBlood", user_id="user-2")
+
+        # Reopening the same stream joins the running pipeline first
+        same = await svc.start_stream("handofblood", user_id="user-1")
+        assert len(started) == 2
+        assert old not in svc.sessions
+        assert svc.sessions[same].pipeline is svc.sessions[other_user].pipeline
+        assert stopped == []
+
+        new = await svc.start_stream("handofblood", quality="720p60", user_id="user-1")
+        assert same not in svc.sessions
+        assert svc.user_sessions["user-1"] == {other_streamer, new}
+        assert other_user in svc.sessions
+        # The pipeline is still watched by user-2
+        assert stopped == []
+
+    asyncio.run(run_test())
+
+
+def test_sessions_share_one_pipeline_until_last_viewer_leaves():
+    """Test viewers of the same streamer/quality/codecs share one ingest."""
+    import asyncio
+    from app.services.live_segment_buffer import LiveSegmentBuffer
+    from app.services.live_streaming_service import (
+        LivePipeline,
+        LiveStreamingService,
+    )
+
+    svc = LiveStreamingService()
+    started = []
+    stopped = []
+
+    async def fake_start_pipeline(key, streamer_name, quality, supported_codecs):
+        ffmpeg_process = MagicMock()
+        ffmpeg_process.returncode = None
+        pipeline = LivePipeline(
+            key=key,
+            pipeline_id=f"p{len(started)}",
+            streamer_name=streamer_name,
+            quality=quality,
+            ffmpeg_process=ffmpeg_process,
+            segments=LiveSegmentBuffer(list_size=10, target_duration=2),
+        )
+        started.append(pipeline)
+        return pipeline
+
+    async def fake_stop_pipeline(pipeline):
+        stopped.append(pipeline)
+
+    async def fake_monitor(pipeline):
+        return None
+
+    svc._start_pipeline = fake_start_pipeline
+    svc._stop_pipeline = fake_stop_pipeline
+    svc._monitor_pipeline = fake_monitor
+
+    async def run_test():
+        first = await svc.start_stream("HandOfBlood", user_id="user-1")
+        second = await svc.start_stream("handofblood", user_id="user-2")
+        other_quality = await svc.start_stream(
+            "handofblood", quality="720p60", user_id="user-3"
+        )
+
+        assert len(started) == 2
+        shared = svc.sessions[first].pipeline
+        assert svc.sessions[second].pipeline is shared
+        assert svc.sessions[other_quality].pipeline is not shared
+        assert svc.sessions[first].playback_token != svc.sessions[second].playback_token
+        assert svc.get_session_status(second)["viewers"] == 2
+
+        await svc.stop_stream(first)
+        assert stopped == []
+
+        await svc.stop_stream(second)
+        assert stopped == [shared]
+        assert shared.key not in svc.pipelines
+
+    asyncio.run(run_test())
+
+
+def test_failed_pipeline_start_releases_the_start_lock():
+    """Test a pipeline that fails to start leaves no lock entry behind."""
+    import asyncio
+    import pytest
+    from app.services.live_streaming_service import LiveStreamingService
+
+    svc = LiveStreamingService()
+
+    async def failing_start_pipeline(key, streamer_name, quality, supported_codecs):
+        raise RuntimeError("Stream is offline")
+
+    svc._start_pipeline = failing_start_pipeline
+
+    async def run_test():
+        with pytest.raises(RuntimeError, match="offline"):
+            await svc.start_stream("HandOfBlood", user_id="user-1")
+
+    asyncio.run(run_test())
+
+    assert svc.pipelines == {}
+    assert svc._pipeline_locks == {}
+
+
+def test_recording_tap_requires_matching_quality_and_playable_codecs():
+    """Test live playback only taps recordings the player can decode."""
+    from app.services.live_streaming_service import LiveStreamingService
+
+    svc = LiveStreamingService()
+    recording = {
+        "stream_id": 1,
+        "path": "/recordings/x/x_part001.ts",
+        "quality": "best",
+        "supported_codecs": "h264",
     }
-    svc.user_sessions = {"user-1": {"old", "other-streamer"}, "user-2": {"other-user"}}
+    svc._get_live_recording = lambda name: dict(recording)
+
+    assert svc._find_recording_tap(("x", "best", "h264")) == recording["path"]
+    assert svc._find_recording_tap(("x", "720p60", "h264")) is None
+
+    recording["supported_codecs"] = "h264,h265"
+    assert svc._find_recording_tap(("x", "best", "h264")) is None
+    assert svc._find_recording_tap(("x", "best", "h264,h265")) == recording["path"]
+
+    svc.TAP_RECORDINGS = False
+    assert svc._find_recording_tap(("x", "best", "h264,h265")) is None
+
+
+def _ts_packet(pid, payload, payload_start=False, random_access=False):
+    """Build a 188-byte MPEG-TS packet (CRCs are not checked by the parser)"""
+    header = bytes([0x47, (0x40 if payload_start else 0) | (pid >> 8), pid & 0xFF])
+    if random_access:
+        stuffing = 184 - 2 - len(payload)
+        adaptation = bytes([1 + stuffing, 0x40]) + b"\xff" * stuffing
+        return header + bytes([0x30]) + adaptation + payload
+    return header + bytes([0x10]) + payload + b"\xff" * (184 - len(payload))
+
+
+def _pes_with_pts(pts):
+    b = [
+        0x21 | ((pts >> 29) & 0x0E),
+        (pts >> 22) & 0xFF,
+        0x01 | ((pts >> 14) & 0xFE),
+        (pts >> 7) & 0xFF,
+        0x01 | ((pts << 1) & 0xFE),
+    ]
+    return b"\x00\x00\x01\xe0\x00\x00\x80\x80\x05" + bytes(b)
+
+
+def _live_ts_stream(keyframe_pts):
+    pat = _ts_packet(
+        0,
+        b"\x00\x00\xb0\x0d\x00\x01\xc1\x00\x00\x00\x01\xf0\x00" + b"\x00" * 4,
+        payload_start=True,
+    )
+    pmt = _ts_packet(
+        0x1000,
+        b"\x00\x02\xb0\x12\x00\x01\xc1\x00\x00\xe1\x00\xf0\x00"
+        b"\x1b\xe1\x00\xf0\x00" + b"\x00" * 4,
+        payload_start=True,
+    )
+    stream = pat + pmt
+    for pts in keyframe_pts:
+        stream += _ts_packet(
+            0x100, _pes_with_pts(pts), payload_start=True, random_access=True
+        )
+        # A non-keyframe access unit and some continuation packets
+        stream += _ts_packet(0x100, _pes_with_pts(pts + 3000), payload_start=True)
+        stream += _ts_packet(0x100, b"\x00" * 10) * 3
+    return stream
+
+
+def test_segmenter_cuts_at_keyframes_into_memory_ring():
+    """Test TS output is cut at keyframes into a bounded in-memory ring."""
+    from app.services.live_segment_buffer import LiveSegmentBuffer, MpegTsSegmenter
+
+    buffer = LiveSegmentBuffer(list_size=3, target_duration=2)
+    segmenter = MpegTsSegmenter(target_duration=2, on_segment=buffer.add_segment)
+
+    # Keyframes every second; segments should hold two of them (2 s)
+    stream = _live_ts_stream([90000 * second for second in range(1, 16)])
+    # Feed in odd-sized chunks to exercise packet reassembly
+    for offset in range(0, len(stream), 1000):
+        segmenter.feed(stream[offset : offset + 1000])
+
+    assert buffer.last_sequence == 6
+    segment = buffer.get_segment(6)
+    assert segment.duration == 2.0
+    assert len(segment.data) % 188 == 0
+    # Every segment starts with PAT + PMT, then a keyframe
+    assert segment.data[:188] == stream[:188]
+    assert segment.data[376 + 3] == 0x30
+
+    # Only the newest segments are kept (window plus a small grace)
+    assert buffer.get_segment(1) is None
+    assert buffer.get_segment(2) is not None
+    playlist = buffer.render_playlist()
+    assert "#EXT-X-MEDIA-SEQUENCE:4" in playlist
+    assert "#EXT-X-SERVER-CONTROL:CAN-BLOCK-RELOAD=YES" in playlist
+    assert playlist.count("#EXTINF:2.000,") == 3
+    assert buffer.render_playlist() is playlist
+
+
+def test_blocking_playlist_reload_waits_for_next_segment():
+    """Test _HLS_msn waits for the next segment instead of polling."""
+    import asyncio
+    from app.services.live_segment_buffer import LiveSegmentBuffer
+
+    async def run_test():
+        buffer = LiveSegmentBuffer(list_size=3, target_duration=2)
+        buffer.add_segment(2.0, b"a")
+
+        waiter = asyncio.create_task(buffer.wait_for_sequence(1, timeout=1))
+        await asyncio.sleep(0)
+        assert not waiter.done()
 
-    asyncio.run(svc._stop_existing_user_streams("user-1", "handofblood"))
+        buffer.add_segment(2.0, b"b")
+        assert await waiter is True
+        assert await buffer.wait_for_sequence(5, timeout=0.01) is False
 
-    assert "old" not in svc.sessions
-    assert "old" not in svc.user_sessions["user-1"]
-    assert "other-streamer" in svc.sessions
-    assert "other-user" in svc.sessions
+    asyncio.run(run_test())
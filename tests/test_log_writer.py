@@ -0,0 +1,40 @@
+"""
+Tests for the queued log writer: batched appends, LRU file handles, drops.
+"""
+
+import logging
+
+from app.services.system.log_writer import CountingQueueHandler, LogFileWriter
+
+
+def test_writes_are_appended_in_order_with_bounded_open_files(tmp_path):
+    writer = LogFileWriter(max_open_files=2)
+    paths = [tmp_path / f"streamer_{i}.log" for i in range(3)]
+
+    for line in range(100):
+        for path in paths:
+            writer.write(str(path), f"line {line}\n")
+    writer.flush()
+
+    stats = writer.stats()
+    assert stats["written"] == 300
+    assert stats["dropped"] == stats["failed"] == stats["queued"] == 0
+    assert stats["open_files"] <= 2
+    for path in paths:
+        assert path.read_text().splitlines() == [f"line {i}" for i in range(100)]
+
+    writer.close()
+    assert writer.stats()["open_files"] == 0
+
+
+def test_full_queue_drops_records_instead_of_blocking():
+    handler = CountingQueueHandler(maxsize=2)
+    record = logging.LogRecord(
+        "streamvault", logging.INFO, __file__, 1, "hi", None, None
+    )
+
+    for _ in range(5):
+        handler.emit(record)
+
+    assert handler.queue.qsize() == 2
+    assert handler.dropped == 3
@@ -0,0 +1,189 @@
+"""
+Tests for concurrent proxy health checks and in-memory proxy selection.
+"""
+
+import asyncio
+import importlib
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import ProxySettings, RecordingSettings
+from app.services.proxy.proxy_health_service import ProxyHealthService
+from app.utils import proxy_encryption
+
+# The package re-exports the singleton under the module's name
+health_module = importlib.import_module("app.services.proxy.proxy_health_service")
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    # File-based so the scoreboard refresh thread sees the same database
+    engine = create_engine(f"sqlite:///{tmp_path / 'proxies.db'}", future=True)
+    Base.metadata.create_all(
+        engine, tables=[ProxySettings.__table__, RecordingSettings.__table__]
+    )
+    factory = sessionmaker(bind=engine, future=True)
+    monkeypatch.setattr(health_module, "SessionLocal", factory)
+    monkeypatch.setattr(
+        proxy_encryption,
+        "_proxy_encryption",
+        SimpleNamespace(encrypt=lambda url: url, decrypt=lambda url: url),
+    )
+
+    with factory() as db:
+        for index, priority in enumerate([0, 0, 0, 1]):
+            db.add(
+                ProxySettings(
+                    proxy_url=f"http://proxy-{index}:8080",
+                    priority=priority,
+                    enabled=True,
+                    health_status="unknown",
+                    consecutive_failures=2 if index == 2 else 0,
+                    total_recordings=0,
+                    failed_recordings=0,
+                )
+            )
+        db.commit()
+
+    yield SimpleNamespace(factory=factory, engine=engine)
+    engine.dispose()
+
+
+def _service(monkeypatch, results):
+    service = ProxyHealthService()
+    running = 0
+    peak = 0
+    tokens = []
+
+    async def get_access_token():
+        tokens.append("token")
+        return "token"
+
+    async def check(proxy_url, access_token=None):
+        nonlocal running, peak
+        assert access_token == "token"
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.05)
+        running -= 1
+        return results[proxy_url]
+
+    async def broadcast(proxy, auto_disabled=False):
+        pass
+
+    monkeypatch.setattr(service, "_get_access_token", get_access_token)
+    monkeypatch.setattr(service, "_check_proxy_health", check)
+    monkeypatch.setattr(service, "_broadcast_proxy_status", broadcast)
+    return service, tokens, lambda: peak
+
+
+def test_health_checks_run_concurrently_with_one_commit(session_factory, monkeypatch):
+    results = {
+        "http://proxy-0:8080": {"status": "healthy", "response_time_ms": 100},
+        "http://proxy-1:8080": {"status": "healthy", "response_time_ms": 300},
+        "http://proxy-2:8080": {"status": "failed", "response_time_ms": None},
+        "http://proxy-3:8080": {"status": "healthy", "response_time_ms": 50},
+    }
+    service, tokens, peak = _service(monkeypatch, results)
+
+    commits = []
+    event.listen(session_factory.engine, "commit", lambda conn: commits.append(1))
+
+    asyncio.run(service.run_health_checks())
+
+    assert peak() == 4
+    assert tokens == ["token"]
+    assert len(commits) == 1
+
+    with session_factory.factory() as db:
+        proxies = {p.proxy_url: p for p in db.query(ProxySettings).all()}
+    assert proxies["http://proxy-0:8080"].average_response_time_ms == 100
+    # Third consecutive failure auto-disables the proxy
+    assert proxies["http://proxy-2:8080"].enabled is False
+    assert sorted(service._scores) == [
+        proxies[url].id
+        for url in ("http://proxy-0:8080", "http://proxy-1:8080", "http://proxy-3:8080")
+    ]
+
+
+def test_results_are_applied_without_reloading_expired_rows(
+    session_factory, monkeypatch
+):
+    results = {
+        f"http://proxy-{index}:8080": {"status": "healthy", "response_time_ms": 10}
+        for index in range(4)
+    }
+    service, _, _ = _service(monkeypatch, results)
+    broadcasts = []
+
+    async def broadcast(proxy_data, auto_disabled=False):
+        broadcasts.append(proxy_data)
+
+    monkeypatch.setattr(service, "_broadcast_proxy_status", broadcast)
+    selects = []
+    event.listen(
+        session_factory.engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: (
+            selects.append(statement)
+            if statement.startswith("SELECT") and "proxy_settings" in statement
+            else None
+        ),
+    )
+
+    asyncio.run(service.run_health_checks())
+
+    # The target list and the rows to update; nothing after the commit
+    assert len(selects) == 2
+    assert [proxy["health_status"] for proxy in broadcasts] == ["healthy"] * 4
+    assert all(proxy["proxy_url"] == proxy["masked_url"] for proxy in broadcasts)
+
+
+def test_hung_probe_is_cut_off(session_factory, monkeypatch):
+    monkeypatch.setattr(health_module, "PROBE_TIMEOUT_SECONDS", 0.01)
+    service = ProxyHealthService()
+
+    async def hang(proxy_url, access_token=None):
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(service, "_check_proxy_health", hang)
+    result = asyncio.run(service._probe("http://proxy-0:8080", "token"))
+
+    assert result["status"] == "failed"
+
+
+def test_best_proxy_is_served_from_scoreboard(session_factory, monkeypatch):
+    results = {
+        "http://proxy-0:8080": {"status": "healthy", "response_time_ms": 100},
+        "http://proxy-1:8080": {"status": "healthy", "response_time_ms": 1000},
+        "http://proxy-2:8080": {"status": "degraded", "response_time_ms": 10},
+        "http://proxy-3:8080": {"status": "healthy", "response_time_ms": 10},
+    }
+    service, _, _ = _service(monkeypatch, results)
+
+    async def run_test():
+        await service.run_health_checks()
+
+        queries = []
+        event.listen(
+            session_factory.engine,
+            "before_cursor_execute",
+            lambda *args: queries.append(1),
+        )
+        picks = [await service.get_best_proxy() for _ in range(200)]
+        assert queries == []
+
+        service.invalidate_scoreboard()
+        await service.get_best_proxy()
+        assert queries
+        return picks
+
+    picks = asyncio.run(run_test())
+
+    # Best status and priority only; the faster proxy gets most of the load
+    assert set(picks) == {"http://proxy-0:8080", "http://proxy-1:8080"}
+    assert picks.count("http://proxy-0:8080") > picks.count("http://proxy-1:8080")
@@ -27,6 +27,8 @@ def _category_image_service(categories_dir: Path) -> CategoryImageService:
     service.download_service = download_service
     service.categories_dir = categories_dir
     service._category_cache = {}
+    service._missing_cache = {}
+    service._file_index = set()
     service._background_tasks = set()
     return service
 
@@ -63,6 +65,9 @@ class _CategoryQuery:
     def first(self):
         return self.category
 
+    def all(self):
+        return [(self.category.name, self.category.box_art_url)]
+
 
 class _CategorySession:
     def __init__(self, category) -> None:
@@ -250,28 +255,27 @@ async def test_category_download_rechecks_path_before_cached_exists(
     assert filesystem_probes == []
 
 
-def test_category_cache_lookup_rechecks_path_before_exists(
+def test_category_index_excludes_files_resolving_outside_categories_dir(
     tmp_path: Path, monkeypatch: pytest.MonkeyPatch
 ) -> None:
     categories_dir = tmp_path / ".media" / "categories"
     categories_dir.mkdir(parents=True)
     outside_path = tmp_path / "outside.jpg"
-    category = SimpleNamespace(box_art_url="/api/media/categories/unsafe.jpg")
+    outside_path.write_bytes(b"outside")
+    (categories_dir / "unsafe.jpg").symlink_to(outside_path)
+    (categories_dir / "safe.jpg").write_bytes(b"inside")
+    category = SimpleNamespace(
+        name="unsafe", box_art_url="/api/media/categories/unsafe.jpg"
+    )
     service = _category_image_service(categories_dir)
-    filesystem_probes = []
-
-    monkeypatch.setattr(service, "_category_image_path", lambda _name: outside_path)
+    service._load_existing_cache()
     monkeypatch.setattr(
         category_images, "SessionLocal", lambda: _CategorySession(category)
     )
-    monkeypatch.setattr(
-        Path,
-        "exists",
-        lambda path: filesystem_probes.append(path) or False,
-    )
 
-    assert service.get_cached_category_image("Unsafe") is None
-    assert filesystem_probes == []
+    assert service._file_index == {"safe.jpg"}
+    assert "unsafe" not in service._category_cache
+    assert service.get_cached_category_image("unsafe") is None
 
 
 def test_recording_path_accepts_file_inside_recording_directory(
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Tests for the virtual HLS playlist over segmented recordings.
+"""
+
+import asyncio
+import os
+
+from app.services.media import segment_playlist_service as playlist_module
+from app.services.media.segment_playlist_service import (
+    TS_PACKET_SIZE,
+    Keyframe,
+    SegmentPart,
+    SegmentPlaylistService,
+    split_part,
+    split_part_at_keyframes,
+)
+
+PMT_PID = 0x1000
+VIDEO_PID = 0x100
+AUDIO_PID = 0x101
+
+
+def _write_parts(tmp_path, sizes):
+    segment_dir = tmp_path / "stream_segments"
+    segment_dir.mkdir()
+    # Written out of order to check part-number sorting
+    for number, size in sorted(sizes.items(), reverse=True):
+        (segment_dir / f"stream_part{number:03d}.ts").write_bytes(b"\0" * size)
+    (segment_dir / "notes.txt").write_text("ignored")
+    return segment_dir
+
+
+def _ts_packet(pid, unit_start=False, counter=0):
+    header = bytes(
+        [
+            0x47,
+            (0x40 if unit_start else 0) | (pid >> 8),
+            pid & 0xFF,
+            0x10 | (counter & 0x0F),
+        ]
+    )
+    return header + b"\xff" * (TS_PACKET_SIZE - len(header))
+
+
+def _write_ts_part(path, gops, gop_seconds=2.0, pat_before=lambda gop: True):
+    """Write a TS file of GOPs; return (keyframes, offsets of their PATs)"""
+    data = bytearray()
+    keyframes = []
+    pats = []
+    for gop in range(gops):
+        if pat_before(gop):
+            pats.append(len(data))
+            data += _ts_packet(0, unit_start=True, counter=gop)
+            data += _ts_packet(PMT_PID, unit_start=True, counter=gop)
+            data += _ts_packet(AUDIO_PID, unit_start=True, counter=gop)
+        else:
+            data += _ts_packet(VIDEO_PID, unit_start=True, counter=gop)
+        keyframes.append(Keyframe(time=gop * gop_seconds, offset=len(data)))
+        data += _ts_packet(VIDEO_PID, unit_start=True, counter=gop)
+        for counter in range(20):
+            data += _ts_packet(VIDEO_PID, counter=counter)
+            if counter % 5 == 0:
+                data += _ts_packet(AUDIO_PID, unit_start=True, counter=counter)
+    path.write_bytes(bytes(data))
+    return keyframes, pats
+
+
+def test_keyframe_split_starts_every_chunk_on_a_pat(tmp_path):
+    path = tmp_path / "stream_part001.ts"
+    keyframes, pats = _write_ts_part(path, gops=12)
+    data = path.read_bytes()
+    part = SegmentPart(path=str(path), number=1, size=len(data), mtime=0, duration=24.0)
+
+    layout = split_part_at_keyframes(part, 0.0, keyframes)
+
+    assert layout.independent
+    assert [offset for _, _, offset in layout.chunks] == [0, pats[5], pats[10]]
+    assert [round(duration, 3) for duration, _, _ in layout.chunks] == [
+        10.0,
+        10.0,
+        4.0,
+    ]
+    assert sum(length for _, length, _ in layout.chunks) == part.size
+    for _, _, offset in layout.chunks:
+        # Each range opens with the PAT (PID 0) and then the PMT
+        assert data[offset : offset + 3] == bytes([0x47, 0x40, 0x00])
+        assert data[offset + TS_PACKET_SIZE + 1 : offset + TS_PACKET_SIZE + 3] == (
+            bytes([0x40 | (PMT_PID >> 8), PMT_PID & 0xFF])
+        )
+
+
+def test_keyframe_without_pat_is_not_independent(tmp_path):
+    path = tmp_path / "stream_part001.ts"
+    keyframes, _ = _write_ts_part(path, gops=12, pat_before=lambda gop: gop != 5)
+    part = SegmentPart(
+        path=str(path), number=1, size=path.stat().st_size, mtime=0, duration=24.0
+    )
+
+    layout = split_part_at_keyframes(part, 0.0, keyframes)
+
+    assert not layout.independent
+    # Still cut on the keyframe itself, not an average-bitrate offset
+    assert layout.chunks[1][2] == keyframes[5].offset
+
+
+def test_playlist_marks_independent_segments_only_when_true(tmp_path, monkeypatch):
+    segment_dir = tmp_path / "stream_segments"
+    segment_dir.mkdir()
+    aligned, _ = _write_ts_part(segment_dir / "stream_part001.ts", gops=12)
+    unaligned, _ = _write_ts_part(
+        segment_dir / "stream_part002.ts", gops=12, pat_before=lambda gop: gop != 5
+    )
+    keyframes = {"stream_part001.ts": aligned, "stream_part002.ts": unaligned}
+
+    async def fake_duration(path):
+        return 24.0
+
+    scanned = []
+
+    def fake_keyframes(path):
+        scanned.append(os.path.basename(path))
+        return 0.0, keyframes[os.path.basename(path)]
+
+    monkeypatch.setattr(
+        playlist_module.ffmpeg_utils, "extract_video_duration", fake_duration
+    )
+    monkeypatch.setattr(playlist_module, "scan_keyframes", fake_keyframes)
+
+    def build(service, is_complete):
+        async def run():
+            first = await service.build_playlist(
+                segment_dir,
+                segment_url=lambda name: f"/seg/{name}",
+                is_complete=is_complete,
+            )
+            # A second request while scanning must not start another scan
+            await service.build_playlist(
+                segment_dir,
+                segment_url=lambda name: f"/seg/{name}",
+                is_complete=is_complete,
+            )
+            await service.wait_for_scans()
+            second = await service.build_playlist(
+                segment_dir,
+                segment_url=lambda name: f"/seg/{name}",
+                is_complete=is_complete,
+            )
+            return first, second
+
+        return asyncio.run(run())
+
+    # While recording only the aligned first part is listed; the first
+    # request is served by bitrate while the part is scanned in the background
+    pending, live = build(SegmentPlaylistService(), is_complete=False)
+    assert "#EXT-X-INDEPENDENT-SEGMENTS" not in pending
+    assert "#EXT-X-INDEPENDENT-SEGMENTS" in live
+    assert live.splitlines()[live.splitlines().index("#EXTINF:10.000,") + 1] == (
+        f"#EXT-X-BYTERANGE:{aligned[5].offset - 3 * TS_PACKET_SIZE}@0"
+    )
+    assert scanned == ["stream_part001.ts"]
+
+    # A fresh service reuses the persisted layout of the first part
+    _, done = build(SegmentPlaylistService(), is_complete=True)
+    assert "#EXT-X-INDEPENDENT-SEGMENTS" not in done
+    assert done.count("@0\n") == 2
+    assert scanned == ["stream_part001.ts", "stream_part002.ts"]
+    assert (segment_dir / ".stream_part001.ts.keyframes.json").exists()
+
+    # The sidecar does not make the part show up as a segment
+    assert ".keyframes.json" not in done
+
+
+def test_split_part_covers_file_with_packet_aligned_ranges():
+    part = SegmentPart(
+        path="p.ts", number=1, size=188 * 1000 + 50, mtime=0, duration=95.0
+    )
+
+    chunks = split_part(part)
+
+    assert sum(length for _, length, _ in chunks) == part.size
+    assert abs(sum(duration for duration, _, _ in chunks) - 95.0) < 1e-6
+    offsets = [offset for _, _, offset in chunks]
+    assert offsets[0] == 0
+    assert all(offset % TS_PACKET_SIZE == 0 for offset in offsets)
+    assert all(duration < 13 for duration, _, _ in chunks)
+
+
+def test_playlist_probes_each_part_once_and_marks_completion(tmp_path, monkeypatch):
+    segment_dir = _write_parts(tmp_path, {1: 188 * 100, 2: 188 * 50, 3: 188 * 10})
+    probed = []
+
+    async def fake_duration(path):
+        probed.append(path)
+        return 20.0
+
+    def no_keyframes(path):
+        return None
+
+    monkeypatch.setattr(
+        playlist_module.ffmpeg_utils, "extract_video_duration", fake_duration
+    )
+    monkeypatch.setattr(playlist_module, "scan_keyframes", no_keyframes)
+    service = SegmentPlaylistService()
+
+    async def run_test():
+        live = await service.build_playlist(
+            segment_dir, segment_url=lambda name: f"/seg/{name}", is_complete=False
+        )
+        done = await service.build_playlist(
+            segment_dir, segment_url=lambda name: f"/seg/{name}"
+        )
+        await service.wait_for_scans()
+        return live, done
+
+    live, done = asyncio.run(run_test())
+
+    # The growing last part is left out while recording
+    assert "#EXT-X-PLAYLIST-TYPE:EVENT" in live
+    assert "#EXT-X-ENDLIST" not in live
+    assert "stream_part003.ts" not in live
+
+    assert "#EXT-X-PLAYLIST-TYPE:VOD" in done
+    assert done.rstrip().endswith("#EXT-X-ENDLIST")
+    uris = [line for line in done.splitlines() if line.startswith("/seg/")]
+    assert uris[0] == "/seg/stream_part001.ts"
+    assert uris[-1] == "/seg/stream_part003.ts"
+    assert done.count("#EXT-X-DISCONTINUITY") == 2
+    assert "notes.txt" not in done
+
+    # Parts 1 and 2 were cached from the first playlist
+    assert len(probed) == 3
@@ -0,0 +1,103 @@
+"""
+Tests for the in-memory settings snapshots.
+"""
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import (
+    GlobalSettings,
+    RecordingSettings,
+    Streamer,
+    StreamerRecordingSettings,
+)
+from app.services.core import settings_snapshot as snapshot_module
+from app.services.core.settings_snapshot import SettingsSnapshotService
+from app.services.recording.config_manager import ConfigManager
+
+
+@pytest.fixture
+def snapshots(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'settings.db'}", future=True)
+    Base.metadata.create_all(
+        engine,
+        tables=[
+            GlobalSettings.__table__,
+            RecordingSettings.__table__,
+            Streamer.__table__,
+            StreamerRecordingSettings.__table__,
+        ],
+    )
+    factory = sessionmaker(bind=engine, future=True)
+    monkeypatch.setattr(snapshot_module, "SessionLocal", factory)
+
+    with factory() as db:
+        db.add(
+            GlobalSettings(
+                http_proxy=" http://proxy:8080 ",
+                supported_codecs="h264,h265",
+                twitch_access_token="secret",
+            )
+        )
+        db.add(RecordingSettings(enabled=True, default_quality="720p"))
+        db.add(Streamer(id=1, twitch_id="1", username="streamer"))
+        db.add(StreamerRecordingSettings(streamer_id=1, quality="1080p60"))
+        db.commit()
+
+    queries = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: queries.append(statement),
+    )
+    service = SettingsSnapshotService()
+    monkeypatch.setattr(snapshot_module, "settings_snapshot", service)
+    yield service, factory, queries
+    engine.dispose()
+
+
+def test_reads_are_served_from_one_load(snapshots, monkeypatch):
+    service, _, queries = snapshots
+    monkeypatch.setattr(
+        "app.services.recording.config_manager.settings_snapshot", service
+    )
+    config = ConfigManager()
+
+    for _ in range(3):
+        assert config.get_quality_setting(1) == "1080p60"
+        assert config.get_quality_setting(2) == "720p"
+        assert service.get_global_settings().supported_codecs == "h264,h265"
+        assert dict(service.get_proxy_settings()) == {"http": "http://proxy:8080"}
+
+    assert len(queries) == 3
+    assert service.loads == 1
+
+
+def test_invalidation_applies_changes_immediately(snapshots):
+    service, factory, _ = snapshots
+    first = service.get_recording_settings()
+    assert first.default_quality == "720p"
+
+    with factory() as db:
+        db.query(RecordingSettings).one().default_quality = "best"
+        db.commit()
+    assert service.get_recording_settings() is first
+
+    version = service.version
+    service.invalidate("test")
+    assert service.version == version + 1
+    assert service.get_recording_settings().default_quality == "best"
+    # Snapshots handed out earlier are immutable
+    assert first.default_quality == "720p"
+    with pytest.raises(AttributeError):
+        first.default_quality = "480p"
+
+
+def test_secrets_are_not_snapshotted(snapshots):
+    service, _, _ = snapshots
+    global_settings = service.get_global_settings()
+
+    assert not hasattr(global_settings, "twitch_access_token")
+    assert not hasattr(global_settings, "proxy_encryption_key")
@@ -0,0 +1,186 @@
+"""
+Tests for the streamer list query and its snapshot cache.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, SessionLocal, engine
+from app.models import Recording, Stream, Streamer, StreamerRecordingSettings
+from app.services.streamers.streamer_repository import StreamerRepository
+from app.services.streamers.streamer_snapshot import StreamerSnapshotCache
+from app.utils import async_db_utils
+
+
+@pytest.fixture()
+def db():
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        session.query(Recording).delete()
+        session.query(Stream).delete()
+        session.query(StreamerRecordingSettings).delete()
+        session.query(Streamer).delete()
+        session.commit()
+        yield session
+    finally:
+        session.close()
+
+
+def _add_streamer(session, index, **fields):
+    fields.setdefault("is_live", False)
+    streamer = Streamer(twitch_id=f"tw{index}", username=f"streamer_{index}", **fields)
+    session.add(streamer)
+    session.flush()
+    return streamer
+
+
+def test_get_all_streamers_resolves_status_in_one_query(db):
+    now = datetime.now(timezone.utc)
+
+    recording = _add_streamer(db, 1, is_live=True)
+    old_open = Stream(streamer_id=recording.id, started_at=now - timedelta(hours=5))
+    latest_open = Stream(streamer_id=recording.id, started_at=now - timedelta(hours=1))
+    db.add_all([old_open, latest_open])
+    db.flush()
+    # Recording on an older open stream does not count, the latest one does
+    db.add(
+        Recording(
+            stream_id=old_open.id, path="old.ts", status="recording", start_time=now
+        )
+    )
+    db.add(
+        Recording(
+            stream_id=latest_open.id, path="new.ts", status="recording", start_time=now
+        )
+    )
+
+    live_not_recording = _add_streamer(db, 2, is_live=True)
+    db.add(Stream(streamer_id=live_not_recording.id, started_at=now))
+    db.add(StreamerRecordingSettings(streamer_id=live_not_recording.id, enabled=False))
+
+    offline = _add_streamer(db, 3, last_stream_title="Yesterday")
+    ended = Stream(
+        streamer_id=offline.id, started_at=now - timedelta(days=1), ended_at=now
+    )
+    db.add(ended)
+    db.flush()
+    db.add(
+        Recording(
+            stream_id=ended.id,
+            path="done.mp4",
+            status="completed",
+            start_time=now,
+            end_time=now,
+        )
+    )
+
+    _add_streamer(db, 4, is_test_data=True)
+    db.commit()
+
+    statements = []
+
+    def count(*args):
+        statements.append(args[2])
+
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        streamers = StreamerRepository(db).get_all_streamers()
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+    assert len(statements) == 1
+    by_name = {streamer.username: streamer for streamer in streamers}
+    assert set(by_name) == {"streamer_1", "streamer_2", "streamer_3"}
+
+    assert by_name["streamer_1"].is_recording is True
+    assert by_name["streamer_1"].active_stream_id == latest_open.id
+    assert by_name["streamer_1"].recording_enabled is True
+
+    assert by_name["streamer_2"].is_recording is False
+    assert by_name["streamer_2"].active_stream_id is None
+    assert by_name["streamer_2"].recording_enabled is False
+
+    assert by_name["streamer_3"].is_recording is False
+    assert by_name["streamer_3"].last_stream_title == "Yesterday"
+
+
+def test_snapshot_is_reused_until_invalidated():
+    cache = StreamerSnapshotCache(ttl=60)
+    builds = []
+
+    async def build():
+        builds.append(1)
+        return f"snapshot-{len(builds)}"
+
+    async def racing_build():
+        # An event arrives while the list is being built from old data
+        cache.invalidate("stream.online")
+        return "stale"
+
+    async def run_test():
+        assert await cache.get_or_build(build) == "snapshot-1"
+        assert await cache.get_or_build(build) == "snapshot-1"
+
+        cache.invalidate("recording started")
+        assert await cache.get_or_build(build) == "snapshot-2"
+
+        cache.invalidate()
+        assert await cache.get_or_build(racing_build) == "stale"
+        assert cache.get() is None
+
+    asyncio.run(run_test())
+    assert len(builds) == 2
+
+
+def test_async_streamer_list_uses_one_async_query(tmp_path, monkeypatch):
+    path = tmp_path / "streamers.db"
+    sync_engine = create_engine(f"sqlite:///{path}", future=True)
+    Base.metadata.create_all(sync_engine)
+    now = datetime.now(timezone.utc)
+    with sessionmaker(bind=sync_engine, future=True)() as session:
+        live = _add_streamer(session, 1, is_live=True)
+        stream = Stream(streamer_id=live.id, started_at=now)
+        session.add(stream)
+        session.flush()
+        session.add(
+            Recording(
+                stream_id=stream.id, path="a.ts", status="recording", start_time=now
+            )
+        )
+        _add_streamer(session, 2)
+        session.commit()
+        stream_id = stream.id
+    sync_engine.dispose()
+
+    async def run_test():
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        monkeypatch.setattr(
+            async_db_utils,
+            "_async_session_maker",
+            async_sessionmaker(bind=async_engine, expire_on_commit=False),
+        )
+        statements = []
+        event.listen(
+            async_engine.sync_engine,
+            "before_cursor_execute",
+            lambda *args: statements.append(args[2]),
+        )
+        try:
+            # The sync session is never touched by the async read path
+            streamers = await StreamerRepository(None).get_all_streamers_async()
+        finally:
+            await async_engine.dispose()
+        return streamers, statements
+
+    streamers, statements = asyncio.run(run_test())
+    assert len(statements) == 1
+    by_name = {streamer.username: streamer for streamer in streamers}
+    assert by_name["streamer_1"].is_recording is True
+    assert by_name["streamer_1"].active_stream_id == stream_id
+    assert by_name["streamer_2"].is_recording is False
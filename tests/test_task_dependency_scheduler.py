@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Tests for the push-based post-processing task scheduler.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from app.services.processing.task_dependency_manager import (
+    Task,
+    TaskDependencyManager,
+    TaskStatus,
+)
+from app.services.queues.processing_state_cache import ProcessingStateCache
+from app.services.queues.task_queue_manager import TaskQueueManager
+
+
+def _processing_state(recording_id, **statuses):
+    state = SimpleNamespace(
+        recording_id=recording_id,
+        metadata_status="pending",
+        chapters_status="pending",
+        mp4_remux_status="pending",
+        mp4_validation_status="pending",
+        thumbnail_status="pending",
+        cleanup_status="pending",
+    )
+    for column, status in statuses.items():
+        setattr(state, column, status)
+    return state
+
+
+def test_ready_heap_orders_by_priority_and_skips_stale_entries():
+    async def run_test():
+        manager = TaskDependencyManager()
+
+        await manager.add_task(Task(id="low", type="cleanup", payload={}, priority=5))
+        await manager.add_task(
+            Task(id="high", type="mp4_remux", payload={}, priority=1)
+        )
+        await manager.add_task(Task(id="gone", type="metadata", payload={}, priority=0))
+        await manager.cancel_task("gone")
+
+        ready = manager.pop_ready_tasks()
+
+        assert [task.id for task in ready] == ["high", "low"]
+        assert manager.pop_ready_tasks() == []
+
+    asyncio.run(run_test())
+
+
+def test_completion_wakes_waiter_with_dependent_task():
+    async def run_test():
+        manager = TaskDependencyManager()
+        await manager.add_task(Task(id="remux", type="mp4_remux", payload={}))
+        await manager.add_task(
+            Task(id="thumb", type="thumbnail", payload={}, dependencies={"remux"})
+        )
+
+        assert [task.id for task in manager.pop_ready_tasks()] == ["remux"]
+        await manager.mark_task_running("remux")
+
+        waiter = asyncio.create_task(manager.wait_for_ready_tasks())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        await manager.mark_task_completed("remux")
+        await asyncio.wait_for(waiter, timeout=1)
+
+        ready = manager.pop_ready_tasks()
+        assert [task.id for task in ready] == ["thumb"]
+        assert ready[0].status == TaskStatus.READY
+
+    asyncio.run(run_test())
+
+
+def test_dependency_worker_dispatches_chain_without_polling():
+    async def run_test():
+        queue_manager = TaskQueueManager(enable_streamer_isolation=False)
+        queue_manager.processing_state_cache = ProcessingStateCache()
+        queue_manager.processing_state_cache.update_from_state(
+            _processing_state(recording_id=1)
+        )
+        queue_manager._is_running = True
+        worker = asyncio.create_task(queue_manager._dependency_worker())
+
+        first_id = await queue_manager.enqueue_task_with_dependencies(
+            "mp4_remux", {"recording_id": 1}
+        )
+        second_id = await queue_manager.enqueue_task_with_dependencies(
+            "thumbnail_generation", {"recording_id": 1}, dependencies=[first_id]
+        )
+
+        _, dispatched = await asyncio.wait_for(
+            queue_manager.task_queue.get(), timeout=1
+        )
+        assert dispatched.id == first_id
+        assert queue_manager.task_queue.empty()
+
+        await queue_manager.mark_task_completed(first_id)
+        _, dispatched = await asyncio.wait_for(
+            queue_manager.task_queue.get(), timeout=1
+        )
+        assert dispatched.id == second_id
+
+        queue_manager._is_running = False
+        worker.cancel()
+        await asyncio.gather(worker, return_exceptions=True)
+
+    asyncio.run(run_test())
+
+
+def test_reverse_index_propagates_completion_to_direct_dependents_only():
+    async def run_test():
+        manager = TaskDependencyManager()
+        await manager.add_task(Task(id="a", type="mp4_remux", payload={"stream_id": 7}))
+        await manager.add_task(Task(id="b", type="metadata", payload={"stream_id": 7}))
+        await manager.add_task(
+            Task(
+                id="c",
+                type="cleanup",
+                payload={"stream_id": 7},
+                dependencies={"a", "b"},
+            )
+        )
+        await manager.add_task(Task(id="x", type="mp4_remux", payload={"stream_id": 8}))
+
+        assert sorted(manager.get_dependents("a")) == ["c"]
+        assert manager.get_dependents("x") == []
+
+        await manager.mark_task_completed("a")
+        assert manager.get_task_status("c") == TaskStatus.PENDING
+
+        # Completing the same dependency twice must not over-count
+        await manager.mark_task_completed("a")
+        assert manager.get_task_status("c") == TaskStatus.PENDING
+
+        await manager.mark_task_completed("b")
+        assert manager.get_task_status("c") == TaskStatus.READY
+
+        chain = manager.get_task_chain_info(7)
+        assert chain["total_tasks"] == 3
+        assert chain["completed"] == 2
+        assert chain["ready"] == 1
+        assert manager.get_task_chain_info(8)["total_tasks"] == 1
+
+    asyncio.run(run_test())
+
+
+def test_failure_and_cancellation_reach_dependents_and_cleanup_drops_indexes():
+    async def run_test():
+        manager = TaskDependencyManager()
+        await manager.add_task(Task(id="a", type="mp4_remux", payload={"stream_id": 1}))
+        await manager.add_task(
+            Task(id="b", type="thumbnail", payload={"stream_id": 1}, dependencies={"a"})
+        )
+        await manager.add_task(Task(id="c", type="mp4_remux", payload={"stream_id": 1}))
+        await manager.add_task(
+            Task(id="d", type="cleanup", payload={"stream_id": 1}, dependencies={"c"})
+        )
+
+        await manager.mark_task_failed("a", "boom")
+        assert manager.get_task_status("b") == TaskStatus.FAILED
+
+        await manager.cancel_task("c")
+        assert manager.get_task_status("d") == TaskStatus.CANCELLED
+
+        await manager.cleanup_completed_tasks(max_age_hours=-1)
+
+        assert manager.tasks == {}
+        assert manager.get_dependents("a") == []
+        assert manager.get_task_chain_info(1)["total_tasks"] == 0
+
+    asyncio.run(run_test())
+
+
+def test_dependency_worker_skips_steps_completed_in_cached_state():
+    async def run_test():
+        queue_manager = TaskQueueManager(enable_streamer_isolation=False)
+        cache = ProcessingStateCache()
+        queue_manager.processing_state_cache = cache
+
+        loaded = []
+
+        def fake_load(recording_ids):
+            loaded.append(set(recording_ids))
+            for rid in recording_ids:
+                cache.update_from_state(
+                    _processing_state(rid, mp4_remux_status="completed")
+                )
+            return len(loaded[-1])
+
+        cache.load = fake_load
+        queue_manager._is_running = True
+        worker = asyncio.create_task(queue_manager._dependency_worker())
+
+        remux_id = await queue_manager.enqueue_task_with_dependencies(
+            "mp4_remux", {"recording_id": 5}
+        )
+        thumb_id = await queue_manager.enqueue_task_with_dependencies(
+            "thumbnail_generation", {"recording_id": 5}, dependencies=[remux_id]
+        )
+
+        _, dispatched = await asyncio.wait_for(
+            queue_manager.task_queue.get(), timeout=1
+        )
+        assert dispatched.id == thumb_id
+        assert queue_manager.dependency_manager.get_task_status(remux_id) == (
+            TaskStatus.COMPLETED
+        )
+        # One bulk load for the recording, later cycles hit the cache
+        assert loaded == [{5}]
+
+        queue_manager._is_running = False
+        worker.cancel()
+        await asyncio.gather(worker, return_exceptions=True)
+
+    asyncio.run(run_test())
+
+
+def test_processing_state_cache_write_through_and_invalidation():
+    cache = ProcessingStateCache()
+    cache.update_from_state(_processing_state(3, thumbnail_status="completed"))
+
+    assert cache.get_step_status(3, "thumbnail_generation") == "completed"
+    assert cache.get_step_status(3, "thumbnail") == "completed"
+    assert cache.get_step_status(3, "mp4_remux") == "pending"
+    assert cache.get_step_status(3, "unknown_step") is None
+    assert cache.get_step_status(4, "mp4_remux") is None
+
+    cache.invalidate(3)
+    assert not cache.is_cached(3)
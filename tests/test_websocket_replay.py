@@ -4,6 +4,8 @@ Tests for realtime WebSocket event replay support.
 """
 
 import asyncio
+import json
+import sys
 from typing import cast
 
 from fastapi import WebSocket
@@ -21,6 +23,9 @@ class _FakeWebSocket:
     async def send_json(self, message):
         self.messages.append(message)
 
+    async def send_text(self, text):
+        self.messages.append(json.loads(text))
+
 
 def test_replayable_events_receive_monotonic_ids_and_can_be_queried_since():
     async def run_test():
@@ -54,6 +59,7 @@ def test_live_notifications_include_the_replay_cursor():
         manager.active_connections[id(websocket)] = cast(WebSocket, websocket)
 
         await manager.send_notification({"type": "streamer.added", "data": {"id": 1}})
+        await manager.flush(timeout=1)
 
         assert len(websocket.messages) == 1
         assert websocket.messages[0]["type"] == "streamer.added"
@@ -99,3 +105,132 @@ def test_connection_status_is_not_replayed():
         }
 
     asyncio.run(run_test())
+
+
+def test_connect_status_is_written_by_the_connection_channel(monkeypatch):
+    monkeypatch.setattr(
+        sys.modules[ConnectionManager.__module__],
+        "get_client_info",
+        lambda _ws: {
+            "real_ip": "127.0.0.1",
+            "proxy_ip": None,
+            "user_agent": "pytest",
+            "is_reverse_proxied": False,
+        },
+    )
+
+    class _ConnectingWebSocket(_FakeWebSocket):
+        async def accept(self):
+            pass
+
+        async def send_json(self, message):
+            raise AssertionError("send_json bypasses the connection channel")
+
+    async def run_test():
+        manager = ConnectionManager(event_log_size=10)
+        websocket = _ConnectingWebSocket()
+
+        await manager.connect(cast(WebSocket, websocket))
+        await manager.send_notification({"type": "streamer.added", "data": {}})
+        assert await manager.flush(timeout=1)
+
+        assert [m["type"] for m in websocket.messages] == [
+            "connection.status",
+            "streamer.added",
+        ]
+        assert manager.get_connection_stats(id(websocket))["sent"] == 2
+
+    asyncio.run(run_test())
+
+
+class _SlowWebSocket(_FakeWebSocket):
+    def __init__(self):
+        super().__init__()
+        self.release = asyncio.Event()
+        self.closed_with = None
+
+    async def send_text(self, text):
+        await self.release.wait()
+        await super().send_text(text)
+
+    async def close(self, code=1000, reason=None):
+        self.closed_with = code
+
+
+def test_slow_client_does_not_delay_fast_clients():
+    async def run_test():
+        manager = ConnectionManager(event_log_size=10)
+        fast = _FakeWebSocket()
+        slow = _SlowWebSocket()
+        manager.active_connections[id(fast)] = cast(WebSocket, fast)
+        manager.active_connections[id(slow)] = cast(WebSocket, slow)
+
+        await manager.send_notification({"type": "streamer.added", "data": {}})
+        await asyncio.sleep(0.01)
+
+        assert [m["type"] for m in fast.messages] == ["streamer.added"]
+        assert slow.messages == []
+
+        slow.release.set()
+        assert await manager.flush(timeout=1)
+        assert [m["type"] for m in slow.messages] == ["streamer.added"]
+
+    asyncio.run(run_test())
+
+
+def test_snapshot_messages_are_coalesced_for_lagging_clients():
+    async def run_test():
+        manager = ConnectionManager(event_log_size=10)
+        slow = _SlowWebSocket()
+        manager.active_connections[id(slow)] = cast(WebSocket, slow)
+
+        for count in range(5):
+            await manager.send_notification(
+                {"type": "queue_stats_update", "data": {"count": count}}
+            )
+
+        slow.release.set()
+        assert await manager.flush(timeout=1)
+
+        counts = [m["data"]["count"] for m in slow.messages]
+        assert counts[-1] == 4
+        assert len(counts) < 5
+        assert manager.get_connection_stats(id(slow))["coalesced"] > 0
+
+    asyncio.run(run_test())
+
+
+def test_client_over_lag_threshold_is_disconnected():
+    async def run_test():
+        manager = ConnectionManager(event_log_size=10, max_queue_size=2)
+        slow = _SlowWebSocket()
+        manager.active_connections[id(slow)] = cast(WebSocket, slow)
+
+        for index in range(5):
+            await manager.send_notification({"type": "event.n", "data": {"n": index}})
+
+        assert id(slow) not in manager.active_connections
+        assert slow.closed_with == 1013
+        assert manager.slow_consumer_disconnects == 1
+
+    asyncio.run(run_test())
+
+
+def test_failed_send_disconnects_client_in_tracked_task():
+    class _BrokenWebSocket(_FakeWebSocket):
+        async def send_text(self, text):
+            raise ConnectionResetError("client went away")
+
+    async def run_test():
+        manager = ConnectionManager(event_log_size=10)
+        broken = _BrokenWebSocket()
+        manager.active_connections[id(broken)] = cast(WebSocket, broken)
+
+        await manager.send_notification({"type": "streamer.added", "data": {}})
+        await asyncio.sleep(0.01)
+
+        assert id(broken) not in manager.active_connections
+        # The disconnect task was tracked and dropped once it finished
+        assert manager._background_tasks == set()
+
+    asyncio.run(run_test())
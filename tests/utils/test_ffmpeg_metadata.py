@@ -0,0 +1,23 @@
+"""
+Tests for metadata embedding during the TS -> MP4 remux.
+"""
+
+from app.utils.ffmpeg_utils import build_ffmetadata
+
+
+def test_ffmetadata_contains_escaped_tags_and_chapters():
+    content = build_ffmetadata(
+        {"title": "Ranked; #1 = me\\you", "artist": "streamer", "date": "2024-05-01"},
+        [
+            {"start_time": 0, "end_time": 90.5, "title": "Just Chatting"},
+            {"start_time": 90.5, "end_time": 200, "title": "Games = fun"},
+        ],
+    )
+
+    lines = content.splitlines()
+    assert lines[0] == ";FFMETADATA1"
+    assert r"title=Ranked\; \#1 \= me\\you" in lines
+    assert "year=2024" in lines
+    assert content.count("[CHAPTER]") == 2
+    assert "END=90500" in lines
+    assert r"title=Games \= fun" in lines
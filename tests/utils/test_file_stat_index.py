@@ -0,0 +1,72 @@
+"""
+Tests for the file-stat index and the /api/videos cursor helpers.
+"""
+
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from app.routes.videos import _decode_video_cursor, _encode_video_cursor
+from app.utils import file_stat_index as index_module
+from app.utils.file_stat_index import FileStatIndex
+
+
+def test_lookup_many_probes_misses_once(tmp_path, monkeypatch):
+    recording = tmp_path / "stream.mp4"
+    recording.write_bytes(b"x" * 10)
+    (tmp_path / "stream-thumb.jpg").write_bytes(b"jpg")
+    missing = tmp_path / "missing.mp4"
+
+    probed = []
+    real_probe = index_module.probe_file
+
+    def counting_probe(path):
+        probed.append(path)
+        return real_probe(path)
+
+    monkeypatch.setattr(index_module, "probe_file", counting_probe)
+    index = FileStatIndex()
+
+    async def run_test():
+        first = await index.lookup_many([str(recording), str(missing)])
+        second = await index.lookup_many([str(recording), str(missing)])
+        return first, second
+
+    first, second = asyncio.run(run_test())
+
+    assert first == second
+    assert sorted(probed) == sorted([str(recording), str(missing)])
+    stat = first[str(recording)]
+    assert stat.exists and stat.is_file and stat.size == 10
+    assert stat.thumbnail_path == str(tmp_path / "stream-thumb.jpg")
+    assert not first[str(missing)].exists
+
+
+def test_invalidate_drops_ts_and_mp4_siblings(tmp_path):
+    ts_path = tmp_path / "stream.ts"
+    ts_path.write_bytes(b"ts")
+    mp4_path = tmp_path / "stream.mp4"
+
+    index = FileStatIndex()
+    index.refresh_many([str(ts_path), str(mp4_path)])
+    assert not index.get(str(mp4_path)).exists
+
+    # Remux replaced the .ts with an .mp4
+    mp4_path.write_bytes(b"mp4")
+    ts_path.unlink()
+    index.invalidate(str(mp4_path))
+
+    assert index.get(str(ts_path)) is None
+    assert index.get(str(mp4_path)) is None
+    assert index.refresh(str(mp4_path)).exists
+
+
+def test_video_cursor_round_trip_and_rejects_garbage():
+    started = datetime(2026, 1, 1, 12, 30, 0, 500, tzinfo=timezone.utc)
+    cursor = _encode_video_cursor(started, 42)
+    assert _decode_video_cursor(cursor) == (started, 42)
+    assert _decode_video_cursor(_encode_video_cursor(None, 3)) == (None, 3)
+
+    with pytest.raises(ValueError):
+        _decode_video_cursor("not-a-cursor")
@@ -0,0 +1,56 @@
+"""
+Tests for the event-loop stall detector.
+"""
+
+import asyncio
+import time
+
+from app.utils.loop_monitor import LoopMonitor
+
+
+def _blocking_call():
+    time.sleep(0.3)
+
+
+def test_stalls_are_attributed_to_the_blocking_call_site():
+    monitor = LoopMonitor(threshold_seconds=0.05, interval=0.01)
+
+    async def run_test():
+        await monitor.start()
+        await asyncio.sleep(0.05)
+        _blocking_call()
+        await asyncio.sleep(0.05)
+        await monitor.stop()
+
+    asyncio.run(run_test())
+    stats = monitor.get_statistics()
+
+    assert not stats["enabled"]
+    assert stats["stalls"] >= 1
+    assert stats["lag_ms"]["max"] >= 200
+    top = stats["top_offenders"][0]
+    assert top["site"].endswith("in _blocking_call")
+    assert top["samples"] >= 1
+    assert top["max_ms"] >= 200
+    assert any("_blocking_call" in line for line in top["stack"])
+
+    metrics = monitor.render_prometheus()
+    assert 'streamvault_event_loop_lag_seconds{quantile="0.99"}' in metrics
+    assert f"streamvault_event_loop_stalls_total {stats['stalls']}" in metrics
+    assert "_blocking_call" in metrics
+
+
+def test_idle_loop_records_lag_without_stalls():
+    monitor = LoopMonitor(threshold_seconds=0.5, interval=0.01)
+
+    async def run_test():
+        await monitor.start()
+        await asyncio.sleep(0.1)
+        await monitor.stop()
+
+    asyncio.run(run_test())
+    stats = monitor.get_statistics()
+
+    assert stats["beats"] > 0
+    assert stats["stalls"] == 0
+    assert stats["top_offenders"] == []
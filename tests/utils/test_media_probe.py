@@ -0,0 +1,97 @@
+"""
+Tests for the shared ffprobe result cache.
+"""
+
+import asyncio
+
+from app.utils import ffmpeg_utils
+from app.utils import media_probe as probe_module
+from app.utils.media_probe import MediaProbe, sidecar_path
+
+PROBE_OUTPUT = {
+    "format": {"duration": "7200.5", "tags": {"title": "Speedrun"}},
+    "streams": [{"codec_type": "video"}, {"codec_type": "audio"}],
+    "chapters": [{"id": 0}, {"id": 1}],
+}
+
+
+def _counting_ffprobe(monkeypatch):
+    calls = []
+
+    async def fake_ffprobe(path):
+        calls.append(path)
+        await asyncio.sleep(0.01)
+        return PROBE_OUTPUT
+
+    monkeypatch.setattr(probe_module, "run_ffprobe", fake_ffprobe)
+    return calls
+
+
+def test_file_is_probed_once_per_version(tmp_path, monkeypatch):
+    calls = _counting_ffprobe(monkeypatch)
+    monkeypatch.setattr(ffmpeg_utils, "media_probe", MediaProbe())
+    recording = tmp_path / "stream.mp4"
+    recording.write_bytes(b"x" * 10)
+
+    async def run_test():
+        # Concurrent lookups of the same file share one ffprobe run
+        duration, container = await asyncio.gather(
+            ffmpeg_utils.extract_video_duration(str(recording)),
+            ffmpeg_utils.media_probe.probe(str(recording)),
+        )
+        assert duration == 7200.5
+        assert container.tags == {"title": "Speedrun"}
+        assert len(container.chapters) == 2
+        assert await ffmpeg_utils.extract_video_duration(str(recording)) == 7200.5
+        assert len(calls) == 1
+
+        # A rewritten file is probed again
+        recording.write_bytes(b"x" * 20)
+        assert (await ffmpeg_utils.media_probe.probe(str(recording))).has_video
+        assert len(calls) == 2
+
+        assert await ffmpeg_utils.extract_video_duration(str(tmp_path / "gone")) is None
+        assert len(calls) == 2
+
+    asyncio.run(run_test())
+
+
+def test_sidecar_survives_a_restart(tmp_path, monkeypatch):
+    calls = _counting_ffprobe(monkeypatch)
+    recording = tmp_path / "stream.ts"
+    recording.write_bytes(b"x" * 10)
+
+    first = asyncio.run(MediaProbe(sidecar=True).probe(str(recording)))
+    assert sidecar_path(str(recording)).exists()
+
+    # A fresh instance (after a restart) reads the sidecar instead of probing
+    second = asyncio.run(MediaProbe(sidecar=True).probe(str(recording)))
+    assert second == first
+    assert len(calls) == 1
+
+    recording.write_bytes(b"x" * 20)
+    asyncio.run(MediaProbe(sidecar=True).probe(str(recording)))
+    assert len(calls) == 2
+
+
+def test_waiters_recover_when_the_probing_task_is_cancelled(tmp_path, monkeypatch):
+    calls = _counting_ffprobe(monkeypatch)
+    probe = MediaProbe()
+    recording = tmp_path / "stream.mp4"
+    recording.write_bytes(b"x" * 10)
+
+    async def run_test():
+        owner = asyncio.create_task(probe.probe(str(recording)))
+        while not calls:
+            await asyncio.sleep(0.001)
+        # The waiter joins the owner's in-flight probe, then the owner is cancelled
+        waiter = asyncio.create_task(probe.probe(str(recording)))
+        await asyncio.sleep(0.005)
+        owner.cancel()
+
+        result = await asyncio.wait_for(waiter, timeout=1)
+        assert result.duration == 7200.5
+        assert owner.cancelled()
+        assert len(calls) == 2
+
+    asyncio.run(run_test())
@@ -0,0 +1,76 @@
+"""
+Tests for the range-aware recording file response.
+"""
+
+import pytest
+from starlette.applications import Starlette
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.utils.range_response import RecordingFileResponse
+
+
+@pytest.fixture
+def recording(tmp_path):
+    path = tmp_path / "stream.mp4"
+    path.write_bytes(bytes(range(256)) * 16)
+    return path
+
+
+@pytest.fixture
+def client(recording):
+    async def serve(request):
+        return RecordingFileResponse(
+            recording, media_type="video/mp4", headers={"Cache-Control": "no-cache"}
+        )
+
+    return TestClient(Starlette(routes=[Route("/video", serve)]))
+
+
+def test_single_and_multi_range_requests(client, recording):
+    data = recording.read_bytes()
+
+    response = client.get("/video", headers={"Range": "bytes=100-199"})
+    assert response.status_code == 206
+    assert response.content == data[100:200]
+    assert response.headers["content-range"] == f"bytes 100-199/{len(data)}"
+
+    response = client.get("/video", headers={"Range": "bytes=0-9,-10"})
+    assert response.status_code == 206
+    assert response.headers["content-type"].startswith("multipart/byteranges")
+    assert data[:10] in response.content
+    assert data[-10:] in response.content
+
+    response = client.get("/video", headers={"Range": f"bytes={len(data)}-"})
+    assert response.status_code == 416
+
+
+def test_conditional_requests_return_304_and_if_range_falls_back(client, recording):
+    full = client.get("/video")
+    assert full.status_code == 200
+    assert full.content == recording.read_bytes()
+    etag = full.headers["etag"]
+    last_modified = full.headers["last-modified"]
+
+    response = client.get("/video", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    assert response.headers["cache-control"] == "no-cache"
+
+    response = client.get("/video", headers={"If-Modified-Since": last_modified})
+    assert response.status_code == 304
+
+    response = client.get("/video", headers={"If-None-Match": '"other"'})
+    assert response.status_code == 200
+
+    # Stale validator: the full (changed) file is sent instead of the range
+    response = client.get(
+        "/video", headers={"Range": "bytes=0-9", "If-Range": '"stale"'}
+    )
+    assert response.status_code == 200
+    assert len(response.content) == recording.stat().st_size
+
+    response = client.get("/video", headers={"Range": "bytes=0-9", "If-Range": etag})
+    assert response.status_code == 206
+
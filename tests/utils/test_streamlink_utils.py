@@ -6,6 +6,8 @@ import os
 import pytest
 from unittest.mock import patch, MagicMock
 
+from app.models import GlobalSettings
+from app.services.core.settings_snapshot import settings_snapshot
 from app.utils.streamlink_utils import (
     get_streamlink_command,
     get_streamlink_vod_command,
@@ -137,7 +139,7 @@ class TestStreamlinkUtils:
                 output_path="/tmp/clip.mp4",
             )
 
-    @patch("app.database.SessionLocal")
+    @patch("app.services.core.settings_snapshot.SessionLocal")
     def test_get_proxy_settings_from_db(self, mock_session):
         """Test getting proxy settings from the database."""
         # Set up mock
@@ -145,13 +147,19 @@ class TestStreamlinkUtils:
         mock_session.return_value.__enter__.return_value = mock_db
 
         # Mock global settings
-        mock_global_settings = MagicMock()
-        mock_global_settings.http_proxy = "http://proxy.example.com:8080"
-        mock_global_settings.https_proxy = "https://proxy.example.com:8443"
+        mock_global_settings = GlobalSettings(
+            http_proxy="http://proxy.example.com:8080",
+            https_proxy="https://proxy.example.com:8443",
+        )
         mock_db.query.return_value.first.return_value = mock_global_settings
-
-        # Call function
-        proxy_settings = get_proxy_settings_from_db()
+        mock_db.query.return_value.all.return_value = []
+
+        # Call function on a freshly loaded snapshot
+        settings_snapshot.invalidate()
+        try:
+            proxy_settings = get_proxy_settings_from_db()
+        finally:
+            settings_snapshot.invalidate()
 
         # Check results
         assert proxy_settings["http"] == "http://proxy.example.com:8080"
@@ -0,0 +1,129 @@
+"""
+Tests for streamed subprocess output: bounded tail, live parsing, log file.
+"""
+
+import asyncio
+import sys
+
+from app.services.system.log_writer import log_file_writer
+from app.utils.subprocess_runner import (
+    parse_ffmpeg_line,
+    parse_streamlink_line,
+    run_process,
+)
+
+STREAMLINK_STANDIN = r"""
+import sys
+for i in range(5000):
+    print(f"[download] Written {i}.0 MiB to out.ts (0h00m{i % 60:02d}s @ 2.50 MiB/s)")
+sys.stderr.write("error: Unable to open URL: https://usher.ttvnw.net (502)\n")
+sys.stderr.write("error: ProxyError follow-up\n")
+sys.exit(1)
+"""
+
+
+def test_output_is_bounded_parsed_and_logged(tmp_path):
+    log_path = tmp_path / "streamlink.log"
+
+    output = asyncio.run(
+        run_process(
+            [sys.executable, "-c", STREAMLINK_STANDIN],
+            log_path=str(log_path),
+            parser=parse_streamlink_line,
+            tail_lines=50,
+        )
+    )
+
+    assert output.returncode == 1
+    assert output.line_count == 5002
+    assert len(output.lines) == 50
+    # The first error is the cause
+    assert output.failure_reason == "stream_unavailable"
+    assert output.error_message == "Stream unavailable or ended"
+    assert output.progress["written"] == "4999.0 MiB"
+    assert output.progress["rate"] == "2.50 MiB/s"
+    assert "ProxyError follow-up" in output.stderr_tail.decode()
+
+    # Everything ends up in the log file, not just the tail
+    log_file_writer.flush()
+    logged = log_path.read_text().splitlines()
+    assert len(logged) == 5002
+    assert "Written 0.0 MiB" in logged[0]
+    assert sum("STDERR error:" in line for line in logged) == 2
+
+
+def test_ffmpeg_progress_lines_split_on_carriage_return():
+    script = (
+        "import sys\n"
+        "for i in range(3):\n"
+        "    sys.stderr.write(f'size=  {i}kB time=00:00:0{i}.00 "
+        "bitrate=1500.0kbits/s speed=42x\\r')\n"
+    )
+
+    output = asyncio.run(
+        run_process([sys.executable, "-c", script], parser=parse_ffmpeg_line)
+    )
+
+    assert output.returncode == 0
+    assert output.line_count == 3
+    assert output.progress == {
+        "size": "2kB",
+        "time": "00:00:02.00",
+        "bitrate": "1500.0kbits/s",
+        "speed": "42x",
+    }
+    assert output.failure_reason is None
+    assert parse_ffmpeg_line("Invalid data found when processing input") == {
+        "failure_reason": "ffmpeg_error",
+        "error_message": "Invalid data found when processing input",
+    }
+    # Recoverable decoder noise is not a failure cause
+    assert parse_ffmpeg_line("[h264 @ 0x55d0] error while decoding MB 12 34") is None
+
+
+def test_ffmpeg_exit_is_appended_to_the_start_log(tmp_path):
+    import logging
+
+    from app.services.system.logging_service import logging_service
+
+    log_path = tmp_path / "ts_to_mp4.log"
+    log_path.write_text("Starting ts_to_mp4 operation\n")
+    output = asyncio.run(
+        run_process(
+            [
+                sys.executable,
+                "-c",
+                "import sys; sys.stderr.write('Conversion failed!\\n'); sys.exit(1)",
+            ],
+            log_path=str(log_path),
+            parser=parse_ffmpeg_line,
+        )
+    )
+
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    ffmpeg_logger = logging.getLogger("streamvault.ffmpeg")
+    ffmpeg_logger.addHandler(handler)
+    try:
+        logging_service.log_ffmpeg_exit(
+            "ts_to_mp4",
+            "streamer",
+            output.returncode,
+            log_path=str(log_path),
+            error_message=output.error_message,
+            stderr_tail=output.stderr_tail,
+        )
+    finally:
+        ffmpeg_logger.removeHandler(handler)
+
+    log_file_writer.flush()
+    logged = log_path.read_text().splitlines()
+    assert logged[0] == "Starting ts_to_mp4 operation"
+    assert logged[-1].endswith("ts_to_mp4 operation completed with exit code: 1")
+    errors = [record.getMessage() for record in records]
+    assert any(
+        "Failed with exit code 1" in message and str(log_path) in message
+        for message in errors
+    )
+    assert any("Conversion failed!" in message for message in errors)